@@ -159,6 +159,18 @@ DB_POOL = env.json('DB_POOL', default=None)
 if DB_POOL:
     DATABASES['default']['OPTIONS']['pool'] = DB_POOL
 
+# When enabled, the item writes don't update the collection row directly but append their changes
+# to the stac_api_collectiondelta table (see stac_api.pgtriggers.deferrable_collection_update).
+# The consolidate_collection_deltas command must then run continuously to fold the changes into
+# the collections.
+COLLECTION_UPDATES_DEFERRED = env.bool('COLLECTION_UPDATES_DEFERRED', default=False)
+if COLLECTION_UPDATES_DEFERRED:
+    # appended to the libpq options that may already be set
+    DATABASES['default']['OPTIONS']['options'] = ' '.join([
+        DATABASES['default']['OPTIONS'].get('options', ''),
+        '-c stac_api.deferred_collection_updates=on'
+    ]).strip()
+
 # Password validation
 # https://docs.djangoproject.com/en/5.2/ref/settings/#auth-password-validators
 
@@ -270,6 +282,12 @@ except KeyError as err:
 
 AWS_PRESIGNED_URL_EXPIRES = env.int('AWS_PRESIGNED_URL_EXPIRES', default=3600)
 
+# Number of presigned part urls returned by the creation and the GET of a multipart upload, the
+# urls of the other parts (and the refreshed urls of the expired ones) are presigned on demand by
+# the upload urls endpoint. The urls are not stored, they are signed locally without request to
+# S3. The default covers all the parts of an upload (at most 100).
+UPLOAD_PRESIGNED_URLS_ON_CREATE = env.int('UPLOAD_PRESIGNED_URLS_ON_CREATE', default=100)
+
 # Configure the caching
 # API default cache control max-age
 try:
@@ -290,6 +308,79 @@ except ValueError as err:
 # content, we disable the cache by default.
 COLLECTIONS_AGGREGATE_CACHE_SECONDS = env.int('COLLECTIONS_AGGREGATE_CACHE_SECONDS', default=0)
 
+# When enabled, the features of the items list and search endpoints are rendered directly by
+# PostgreSQL (see stac_api.serializers.item_db) instead of the DRF ItemSerializer.
+ITEMS_DB_RENDERING = env.bool('ITEMS_DB_RENDERING', default=False)
+
+# Number of items fetched and serialized at once by the streaming export of the collection items
+# (see stac_api.export)
+EXPORT_CHUNK_SIZE = env.int('EXPORT_CHUNK_SIZE', default=1000)
+
+# numberMatched and context of the items list and search endpoints (see stac_api.number_matched).
+# The matching items are counted exactly up to NUMBER_MATCHED_EXACT_THRESHOLD, above it the count
+# is estimated by the DB planner. NUMBER_MATCHED_TIME_BUDGET is the maximum time in milliseconds
+# spent per request, numberMatched is omitted when it is exhausted.
+NUMBER_MATCHED_ENABLED = env.bool('NUMBER_MATCHED_ENABLED', default=False)
+NUMBER_MATCHED_EXACT_THRESHOLD = env.int('NUMBER_MATCHED_EXACT_THRESHOLD', default=10000)
+NUMBER_MATCHED_TIME_BUDGET = env.int('NUMBER_MATCHED_TIME_BUDGET', default=100)
+
+# Complexity limits of the CQL2 filters (see stac_api.cql2): maximum length in characters of a
+# filter text, maximum number of nodes (operators, properties and literals) and maximum nesting
+# depth of a filter expression.
+CQL2_MAX_LENGTH = env.int('CQL2_MAX_LENGTH', default=100000)
+CQL2_MAX_NODES = env.int('CQL2_MAX_NODES', default=100)
+CQL2_MAX_DEPTH = env.int('CQL2_MAX_DEPTH', default=10)
+
+# Spatial filter by large geometries (see stac_api.intersects): the intersects geometries with
+# more vertices than INTERSECTS_SUBDIVIDE_THRESHOLD (0 to disable) are subdivided into pieces of at
+# most INTERSECTS_SUBDIVIDE_MAX_VERTICES vertices and simplified by INTERSECTS_SIMPLIFY_TOLERANCE
+# degrees (0 to disable, the items close to the boundary may then match differently).
+INTERSECTS_SUBDIVIDE_THRESHOLD = env.int('INTERSECTS_SUBDIVIDE_THRESHOLD', default=1000)
+INTERSECTS_SUBDIVIDE_MAX_VERTICES = env.int('INTERSECTS_SUBDIVIDE_MAX_VERTICES', default=256)
+INTERSECTS_SIMPLIFY_TOLERANCE = env.float('INTERSECTS_SIMPLIFY_TOLERANCE', default=0.0)
+
+# Granularity in seconds of the expiry cut-off of the items (see stac_api.views.filters), the
+# expired items remain visible at most this time but the queries are identical in between.
+ITEMS_EXPIRY_GRANULARITY = env.int('ITEMS_EXPIRY_GRANULARITY', default=60)
+
+# Aggregation extension (see stac_api.aggregation): maximum number of buckets of a frequency
+# distribution and maximum time in milliseconds spent on the aggregations of a request.
+AGGREGATION_MAX_BUCKETS = env.int('AGGREGATION_MAX_BUCKETS', default=1000)
+AGGREGATION_TIME_BUDGET = env.int('AGGREGATION_TIME_BUDGET', default=5000)
+
+# Vector tiles of the item footprints (see stac_api.tiles): size of the tile grid, buffer around
+# the tiles and simplification tolerance of the footprints in tile pixels, and maximum number of
+# items per tile.
+TILES_EXTENT = env.int('TILES_EXTENT', default=4096)
+TILES_BUFFER = env.int('TILES_BUFFER', default=64)
+TILES_SIMPLIFY_TOLERANCE = env.float('TILES_SIMPLIFY_TOLERANCE', default=1.0)
+TILES_MAX_FEATURES = env.int('TILES_MAX_FEATURES', default=10000)
+
+# Bulk ingestion of the items (see stac_api.bulk_ingestion): number of features validated and
+# copied to the staging tables at once, and maximum number of feature errors returned.
+BULK_INGESTION_CHUNK_SIZE = env.int('BULK_INGESTION_CHUNK_SIZE', default=1000)
+BULK_INGESTION_MAX_ERRORS = env.int('BULK_INGESTION_MAX_ERRORS', default=100)
+
+# In-process registry of the collections attributes (see stac_api.collection_registry), refreshed
+# by the DB notifications of the collection changes. COLLECTION_REGISTRY_MAX_AGE is the maximum
+# time in seconds between two full reloads, which bounds the staleness on lost notifications.
+COLLECTION_REGISTRY_ENABLED = env.bool('COLLECTION_REGISTRY_ENABLED', default=False)
+COLLECTION_REGISTRY_MAX_AGE = env.int('COLLECTION_REGISTRY_MAX_AGE', default=300)
+
+# Response cache of the collection, items and assets GET endpoints (see stac_api.response_cache).
+# The cached responses are invalidated by the DB notifications of the changes, the timeout only
+# bounds the staleness of the time dependent content (e.g. expired items).
+# RESPONSE_CACHE_URL selects the cache backend, by default a local memory cache per worker, a
+# shared backend (e.g. rediscache://...) can be used to share the cache between the pods.
+RESPONSE_CACHE_ENABLED = env.bool('RESPONSE_CACHE_ENABLED', default=False)
+RESPONSE_CACHE_SECONDS = env.int('RESPONSE_CACHE_SECONDS', default=60)
+CACHES = {
+    'default': {
+        'BACKEND': 'django.core.cache.backends.locmem.LocMemCache',
+    },
+    'response': env.cache('RESPONSE_CACHE_URL', default='locmemcache://stac-api-response'),
+}
+
 # Logging
 # https://docs.djangoproject.com/en/5.2/topics/logging/
 
@@ -322,11 +413,24 @@ TEST_RUNNER = 'tests.runner.TestRunner'
 # set default pagination configuration
 # set authentication schemes
 
-REST_FRAMEWORK = {
-    'DEFAULT_RENDERER_CLASSES': [
+# JSON renderers of the API responses, either the DRF renderers ("json") or the faster orjson
+# based renderers ("orjson")
+JSON_RENDERER = env.str('JSON_RENDERER', default='json')
+JSON_RENDERER_CLASSES = {
+    'json': [
         'rest_framework.renderers.JSONRenderer',
         'helpers.renderers.GeoJSONRenderer',
     ],
+    'orjson': [
+        'helpers.renderers.OrjsonRenderer',
+        'helpers.renderers.OrjsonGeoJSONRenderer',
+    ],
+}
+if JSON_RENDERER not in JSON_RENDERER_CLASSES:
+    raise ValueError(f'Invalid JSON_RENDERER, must be one of {", ".join(JSON_RENDERER_CLASSES)}')
+
+REST_FRAMEWORK = {
+    'DEFAULT_RENDERER_CLASSES': JSON_RENDERER_CLASSES[JSON_RENDERER],
     'DEFAULT_AUTHENTICATION_CLASSES': [
         'middleware.api_gateway_authentication.ApiGatewayAuthentication',
         'middleware.rest_framework_authentication.RestrictedBasicAuthentication',
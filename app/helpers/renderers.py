@@ -1,4 +1,14 @@
+from datetime import timedelta
+
+import orjson
+
+from django.utils.duration import duration_iso_string
+
+from rest_framework.renderers import BaseRenderer
 from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.encoders import JSONEncoder
+
+_json_encoder = JSONEncoder()
 
 
 class GeoJSONRenderer(JSONRenderer):
@@ -10,3 +20,95 @@ class GeoJSONRenderer(JSONRenderer):
     """
     media_type = 'application/geo+json'
     format = 'geojson'
+
+
+def _orjson_default(obj):
+    '''Encode the types that are not natively supported by orjson
+
+    The timedelta are encoded in ISO 8601 like the IsoDurationField, all the other types (lazy
+    translation strings, decimals, querysets, ...) are encoded like the DRF JSON encoder.
+    '''
+    if isinstance(obj, timedelta):
+        return duration_iso_string(obj)
+    return _json_encoder.default(obj)
+
+
+class OrjsonRenderer(JSONRenderer):
+    """ Renders json with orjson.
+
+    Drop-in replacement of the DRF JSONRenderer (see the JSON_RENDERER setting), the output is
+    compact and the UTC datetimes use the 'Z' suffix like stac_api.utils.isoformat. The dict
+    subclasses like ReturnDict and ReturnList are natively encoded.
+
+    """
+    options = orjson.OPT_UTC_Z | orjson.OPT_NON_STR_KEYS | orjson.OPT_SERIALIZE_NUMPY
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        options = self.options
+        # orjson only supports an indentation of 2 spaces
+        if self.get_indent(accepted_media_type, renderer_context or {}):
+            options |= orjson.OPT_INDENT_2
+        return orjson.dumps(data, default=_orjson_default, option=options)
+
+
+class OrjsonGeoJSONRenderer(OrjsonRenderer):
+    """ Renders geojson with orjson.
+
+    See GeoJSONRenderer and OrjsonRenderer.
+
+    """
+    media_type = 'application/geo+json'
+    format = 'geojson'
+
+
+class NDJSONRenderer(BaseRenderer):
+    """ Renders newline delimited json, one json document per line.
+
+    It is used by the streaming export endpoints, which render their documents one by one with
+    render_lines().
+
+    """
+    media_type = 'application/x-ndjson'
+    format = 'ndjson'
+    charset = None
+    record_separator = b''
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b''
+        return b''.join(self.render_lines([data]))
+
+    def render_lines(self, documents):
+        '''Render the documents lazily, one line per document'''
+        for document in documents:
+            yield self.record_separator + orjson.dumps(
+                document, default=_orjson_default, option=OrjsonRenderer.options
+            ) + b'\n'
+
+
+class GeoJSONSeqRenderer(NDJSONRenderer):
+    """ Renders GeoJSON text sequences (RFC 8142).
+
+    Like NDJSONRenderer but each document is prefixed by a record separator.
+
+    """
+    media_type = 'application/geo+json-seq'
+    format = 'geojson-seq'
+    record_separator = b'\x1e'
+
+
+class MVTRenderer(BaseRenderer):
+    """ Renders Mapbox vector tiles.
+
+    It is used by the vector tiles endpoints (see stac_api.tiles), the tiles are already encoded
+    by the DB.
+
+    """
+    media_type = 'application/vnd.mapbox-vector-tile'
+    format = 'mvt'
+    charset = None
+
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        return data
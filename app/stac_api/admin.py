@@ -1,4 +1,3 @@
-import json
 import logging
 
 from admin_auto_filters.filters import AutocompleteFilter
@@ -778,7 +777,6 @@ class AssetUploadAdmin(admin.ModelAdmin):
         'ended',
         'etag',
         'status',
-        'urls_json',
         'number_parts',
         'checksum_multihash',
         'update_interval',
@@ -796,7 +794,6 @@ class AssetUploadAdmin(admin.ModelAdmin):
             {
                 'fields': (
                     'number_parts',
-                    'urls_json',
                     'checksum_multihash',
                     'created',
                     'ended',
@@ -839,11 +836,6 @@ class AssetUploadAdmin(admin.ModelAdmin):
     asset_name.admin_order_field = 'asset__name'
     asset_name.short_description = 'Asset Id'
 
-    def urls_json(self, instance):
-        return json.dumps(instance.urls, indent=1)
-
-    urls_json.short_description = "Urls"
-
     def delete_view(self, request, object_id, extra_context=None):
         try:
             return super().delete_view(request, object_id, extra_context)
@@ -0,0 +1,224 @@
+'''Aggregations of the items (STAC aggregation extension)
+
+The aggregations of the aggregate endpoints are computed in the DB, each one with a single
+GROUP BY query over the same filtered items as the search (or the collection items) endpoint,
+instead of paging through the whole result:
+
+- total_count: number of matching items
+- collection_frequency: number of items per collection
+- datetime_frequency: number of items per datetime interval (datetime_frequency_interval: year,
+  month, day, hour or minute), by start datetime of the items
+- forecast_variable_frequency: number of items per forecast:variable
+- centroid_geohash_grid_frequency: number of items per geohash cell of their centroid
+  (centroid_geohash_grid_frequency_precision: 1 to 12)
+
+A frequency distribution returns at most AGGREGATION_MAX_BUCKETS buckets, a coarser interval or
+precision is required above. All the queries of a request share a time budget of
+AGGREGATION_TIME_BUDGET milliseconds enforced by a statement timeout.
+'''
+import logging
+import time
+from collections import OrderedDict
+from collections import namedtuple
+from datetime import UTC
+
+from django.conf import settings
+from django.contrib.gis.db.models.functions import Centroid
+from django.contrib.gis.db.models.functions import GeoHash
+from django.db.models import Count
+from django.db.models import DateTimeField
+from django.db.models import F
+from django.db.models.functions import Coalesce
+from django.db.models.functions import Trunc
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers
+
+from stac_api.exceptions import AggregationTimeoutError
+from stac_api.number_matched import TimeBudgetExceeded
+from stac_api.number_matched import statement_timeout
+from stac_api.utils import isoformat
+
+logger = logging.getLogger(__name__)
+
+DATETIME_FREQUENCY_INTERVALS = ['year', 'month', 'day', 'hour', 'minute']
+GEOHASH_PRECISIONS = range(1, 13)
+
+# parameters of the aggregate endpoints, in addition to the search parameters
+AGGREGATION_PARAMETERS = [
+    'aggregations',
+    'datetime_frequency_interval',
+    'centroid_geohash_grid_frequency_precision',
+]
+
+AggregationRequest = namedtuple(
+    'AggregationRequest', ['aggregations', 'datetime_interval', 'geohash_precision']
+)
+
+
+def _total_count(queryset, aggregation_request):
+    return queryset.count()
+
+
+def _collection_frequency(queryset, aggregation_request):
+    return queryset.values(key=F('collection__name'))
+
+
+def _datetime_frequency(queryset, aggregation_request):
+    start = Coalesce('properties_start_datetime', 'properties_datetime')
+    return queryset.values(
+        key=Trunc(
+            start,
+            aggregation_request.datetime_interval,
+            output_field=DateTimeField(),
+            tzinfo=UTC,
+        )
+    )
+
+
+def _forecast_variable_frequency(queryset, aggregation_request):
+    return queryset.filter(forecast_variable__isnull=False).values(key=F('forecast_variable'))
+
+
+def _centroid_geohash_grid_frequency(queryset, aggregation_request):
+    return queryset.values(
+        key=GeoHash(Centroid('geometry'), precision=aggregation_request.geohash_precision)
+    )
+
+
+# name: (data_type, query), the query of a frequency_distribution returns the key values
+AGGREGATIONS = OrderedDict([
+    ('total_count', ('integer', _total_count)),
+    ('collection_frequency', ('frequency_distribution', _collection_frequency)),
+    ('datetime_frequency', ('frequency_distribution', _datetime_frequency)),
+    ('forecast_variable_frequency', ('frequency_distribution', _forecast_variable_frequency)),
+    (
+        'centroid_geohash_grid_frequency',
+        ('frequency_distribution', _centroid_geohash_grid_frequency)
+    ),
+])
+
+# the collection frequency of the collection aggregate endpoint is always the collection itself
+COLLECTION_AGGREGATIONS = [name for name in AGGREGATIONS if name != 'collection_frequency']
+
+DEFAULT_AGGREGATIONS = ['total_count', 'datetime_frequency']
+
+
+def parse_aggregation_parameters(params, available=None):
+    '''Parses the aggregations, datetime_frequency_interval and
+    centroid_geohash_grid_frequency_precision parameters
+
+    Args:
+        params: dict
+            Query parameters (GET) or body (POST) of the request
+        available: list
+            Names of the available aggregations, per default all of them
+
+    Returns: AggregationRequest
+
+    Raises:
+        ValidationError: if a parameter is invalid
+    '''
+    available = available or list(AGGREGATIONS)
+    errors = {}
+    names = params.get('aggregations', DEFAULT_AGGREGATIONS)
+    if isinstance(names, str):
+        names = [name.strip() for name in names.split(',') if name.strip()]
+    if not isinstance(names, list) or not names:
+        errors['aggregations'] = _('Must be a non empty list of aggregations')
+    elif unknown := [name for name in names if name not in available]:
+        errors['aggregations'] = _('Unknown aggregations %s, must be one of %s') % (
+            ', '.join(map(str, unknown)), ', '.join(available)
+        )
+
+    interval = params.get('datetime_frequency_interval', 'month')
+    if interval not in DATETIME_FREQUENCY_INTERVALS:
+        errors['datetime_frequency_interval'] = _('Invalid interval %s, must be one of %s') % (
+            interval, ', '.join(DATETIME_FREQUENCY_INTERVALS)
+        )
+
+    precision = params.get('centroid_geohash_grid_frequency_precision', 1)
+    try:
+        precision = int(precision)
+    except (TypeError, ValueError):
+        precision = None
+    if precision not in GEOHASH_PRECISIONS:
+        errors['centroid_geohash_grid_frequency_precision'] = _(
+            'Invalid precision, must be an integer between %d and %d'
+        ) % (GEOHASH_PRECISIONS[0], GEOHASH_PRECISIONS[-1])
+
+    if errors:
+        logger.error('Invalid aggregation parameters: %s', errors)
+        raise serializers.ValidationError(errors)
+    return AggregationRequest(list(dict.fromkeys(names)), interval, precision)
+
+
+def _bucket_key(key):
+    if hasattr(key, 'isoformat'):
+        return isoformat(key)
+    return key
+
+
+def _frequency_distribution(name, queryset):
+    '''Runs the GROUP BY of a frequency distribution, limited to AGGREGATION_MAX_BUCKETS'''
+    max_buckets = settings.AGGREGATION_MAX_BUCKETS
+    buckets = list(
+        queryset.annotate(frequency=Count('pk')
+                         ).order_by('key').values_list('key', 'frequency')[:max_buckets + 1]
+    )
+    if len(buckets) > max_buckets:
+        message = _(
+            'The %s aggregation has more than %d buckets, use a coarser interval or precision'
+        ) % (name, max_buckets)
+        logger.error(message)
+        raise serializers.ValidationError({name: message})
+    return [
+        OrderedDict([
+            ('key', _bucket_key(key)),
+            ('data_type', 'frequency_distribution'),
+            ('frequency', frequency),
+        ]) for key, frequency in buckets
+    ]
+
+
+def aggregate(queryset, aggregation_request):
+    '''Computes the aggregations of the items
+
+    Args:
+        queryset: ItemQuerySet
+            Filtered items
+        aggregation_request: AggregationRequest
+            Parsed aggregation parameters, see parse_aggregation_parameters()
+
+    Returns: list
+        The aggregations of the AggregationCollection
+
+    Raises:
+        ValidationError: if a frequency distribution has too many buckets
+        AggregationTimeoutError: if the time budget is exhausted
+    '''
+    deadline = time.monotonic() + settings.AGGREGATION_TIME_BUDGET / 1000
+    queryset = queryset.select_related(None).prefetch_related(None).order_by()
+    aggregations = []
+    try:
+        for name in aggregation_request.aggregations:
+            data_type, query = AGGREGATIONS[name]
+            with statement_timeout(deadline):
+                if data_type == 'integer':
+                    aggregation = {'value': query(queryset, aggregation_request)}
+                else:
+                    aggregation = {
+                        'buckets':
+                            _frequency_distribution(name, query(queryset, aggregation_request))
+                    }
+            aggregations.append(
+                OrderedDict([('name', name), ('data_type', data_type), *aggregation.items()])
+            )
+    except TimeBudgetExceeded as error:
+        logger.warning(
+            'Aggregations %s not computed within the time budget of %dms',
+            aggregation_request.aggregations,
+            settings.AGGREGATION_TIME_BUDGET
+        )
+        raise AggregationTimeoutError() from error
+    return aggregations
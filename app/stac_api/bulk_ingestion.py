@@ -0,0 +1,479 @@
+'''Bulk ingestion of the items of a collection
+
+The items list POST endpoint validates and creates at most 100 features per request. The forecast
+producers push tens of thousands of items per model run, which are ingested in a single request
+by the bulk endpoint:
+
+- The body is read as a stream of features, either newline delimited json (one feature per line)
+  or a FeatureCollection.
+- The features are validated by chunks of BULK_INGESTION_CHUNK_SIZE with the ItemSerializer, like
+  the items list POST endpoint, and the items, links and assets of each chunk are loaded with
+  COPY into temporary staging tables.
+- The staged items, links and assets are then merged into their tables with one set-based
+  INSERT ... SELECT per table.
+
+The ingestion is all or nothing: when a feature is invalid or an item already exists, nothing is
+created and the errors of the features are returned (at most BULK_INGESTION_MAX_ERRORS).
+
+The upsert (republication of a batch of items) creates the new items and updates the existing ones
+with INSERT ... ON CONFLICT (collection_id, name) DO UPDATE, their links and assets are replaced
+by the ones of the features with a set-based diff: the missing ones are deleted with one DELETE
+per table and the others are upserted with one INSERT ... ON CONFLICT per table. Only the rows
+with different values are written, so that a republication of unchanged items does not touch
+their etags. A feature can have the etag of its item as if_match member, the upsert fails if it
+doesn't match. Each feature is reported as created, updated or unchanged.
+'''
+import json
+import logging
+from collections import namedtuple
+from itertools import batched
+
+from django.conf import settings
+from django.contrib.auth import get_permission_codename
+from django.db import connection
+from django.db import transaction
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.exceptions import PermissionDenied
+
+from stac_api.models.item import Asset
+from stac_api.models.item import AssetContentHash
+from stac_api.models.item import Item
+from stac_api.models.item import ItemLink
+from stac_api.serializers.item import ItemSerializer
+
+logger = logging.getLogger(__name__)
+
+IngestionResult = namedtuple(
+    'IngestionResult', ['created', 'updated', 'unchanged', 'items', 'errors', 'errors_count']
+)
+
+# Staging table of each model, the items have the if_match etag of their feature and the links and
+# assets reference their item by name (extra_column). The key is the unique constraint of the
+# model, used as conflict target by the upsert.
+StagingTable = namedtuple('StagingTable', ['model', 'table', 'reference', 'extra_column', 'key'])
+
+STAGING_TABLES = [
+    StagingTable(Item, 'stac_api_bulk_item', None, 'if_match', ['collection', 'name']),
+    StagingTable(ItemLink, 'stac_api_bulk_itemlink', 'item', 'item_name', ['item', 'rel']),
+    StagingTable(Asset, 'stac_api_bulk_asset', 'item', 'item_name', ['item', 'name']),
+]
+
+# Fields computed by the DB triggers or by the asset upload, kept as they are by the upsert
+UPSERT_KEPT_FIELDS = {
+    Item: [
+        'is_searchable',
+        'bbox_xmin',
+        'bbox_ymin',
+        'bbox_xmax',
+        'bbox_ymax',
+        'created',
+        'updated',
+        'etag',
+        'total_data_size',
+    ],
+    ItemLink: [],
+    Asset: ['created', 'updated', 'etag', 'update_interval', 'file_size'],
+}
+
+
+def iter_ndjson_features(stream):
+    '''Reads the features of a newline delimited json (or GeoJSON text sequence) stream
+
+    Args:
+        stream: file like object
+
+    Yields:
+        The parsed features, or the ValueError of the invalid lines
+    '''
+    for line in iter(stream.readline, b''):
+        line = line.strip(b'\x1e \t\r\n')
+        if not line:
+            continue
+        try:
+            yield json.loads(line)
+        except ValueError as error:
+            yield ValueError(f'Invalid json: {error}')
+
+
+def iter_feature_collection_features(stream):
+    '''Reads the features of a FeatureCollection
+
+    The FeatureCollection is parsed at once, use newline delimited json to stream large bodies.
+
+    Args:
+        stream: file like object
+
+    Yields:
+        The features, or a ValueError if the body is not a FeatureCollection
+    '''
+    try:
+        data = json.loads(stream.read())
+    except ValueError as error:
+        yield ValueError(f'Invalid json: {error}')
+        return
+    if not isinstance(data, dict) or not isinstance(data.get('features'), list):
+        yield ValueError('The body must be a FeatureCollection with a features list')
+        return
+    yield from data['features']
+
+
+def _get_fields(model, reference):
+    return [
+        field for field in model._meta.local_concrete_fields
+        if not field.primary_key and not field.generated and field.name != reference
+    ]
+
+
+def _get_row(obj, fields, extra_value):
+    # same values as the bulk_create
+    return [extra_value
+           ] + [field.get_db_prep_save(field.pre_save(obj, True), connection) for field in fields]
+
+
+def _quote_columns(fields, prefix=None):
+    prefix = f'{prefix}.' if prefix else ''
+    return ', '.join(f'{prefix}{connection.ops.quote_name(field.column)}' for field in fields)
+
+
+class BulkIngestion:
+    '''Ingestion of the features of one request, see the module documentation
+
+    Must be used within a transaction.
+    '''
+
+    def __init__(self, request, collection, upsert=False):
+        self.user = request.user
+        self.collection = collection
+        self.upsert = upsert
+        self.context = {
+            'request': request, 'collection': collection, 'validate_href_reachability': False
+        }
+        self.fields = {
+            spec.model: _get_fields(spec.model, spec.reference) for spec in STAGING_TABLES
+        }
+        self.names = {}  # index of the feature of each item name
+        self.errors = []
+        self.errors_count = 0
+
+    def add_error(self, index, feature_id, errors):
+        self.errors_count += 1
+        if len(self.errors) < settings.BULK_INGESTION_MAX_ERRORS:
+            self.errors.append({'index': index, 'id': feature_id, 'errors': errors})
+
+    def get_update_fields(self, spec):
+        '''Returns the fields written by the upsert of an existing row'''
+        kept = set(spec.key + UPSERT_KEPT_FIELDS[spec.model])
+        return [field for field in self.fields[spec.model] if field.name not in kept]
+
+    def create_staging_tables(self):
+        with connection.cursor() as cursor:
+            for spec in STAGING_TABLES:
+                cursor.execute(f'DROP TABLE IF EXISTS {spec.table}')
+                cursor.execute(
+                    f'CREATE TEMPORARY TABLE {spec.table} ON COMMIT DROP AS '
+                    f'SELECT NULL::varchar AS {spec.extra_column}, '
+                    f'{_quote_columns(self.fields[spec.model])} '
+                    f'FROM {spec.model._meta.db_table} WITH NO DATA'
+                )
+
+    def validate(self, index, feature):
+        '''Validates a feature
+
+        Returns: tuple
+            (item, if_match, links, assets) model instances and the if_match etag of the item,
+            None if the feature is invalid
+        '''
+        if isinstance(feature, ValueError):
+            self.add_error(index, None, [str(feature)])
+            return None
+        if not isinstance(feature, dict):
+            self.add_error(index, None, [_('The feature must be an object')])
+            return None
+        if_match = None
+        if self.upsert and 'if_match' in feature:
+            feature = dict(feature)
+            if_match = feature.pop('if_match')
+            if not isinstance(if_match, str):
+                self.add_error(index, feature.get('id'), {'if_match': [_('Must be an etag')]})
+                return None
+            if_match = if_match.strip('"')
+        serializer = ItemSerializer(data=feature, context=self.context)
+        if not serializer.is_valid():
+            self.add_error(index, feature.get('id'), serializer.errors)
+            return None
+        data = dict(serializer.validated_data)
+        links = data.pop('links', [])
+        assets = data.pop('assets', [])
+        if data['name'] in self.names:
+            self.add_error(
+                index,
+                data['name'], [_('Duplicate id, see the feature %d') % self.names[data['name']]]
+            )
+            return None
+        self.names[data['name']] = index
+        item = Item(**data, collection=self.collection)
+        return (
+            item,
+            if_match,
+            [ItemLink(**link, item=item) for link in links],
+            # Asset files are always hosted externally for bulk upload
+            [Asset(**asset, is_external=True, item=item) for asset in assets],
+        )
+
+    def stage(self, chunk):
+        '''Validates a chunk of (index, feature) and loads it into the staging tables'''
+        rows = {model: [] for model in self.fields}
+        for index, feature in chunk:
+            validated = self.validate(index, feature)
+            if validated is None:
+                continue
+            item, if_match, links, assets = validated
+            rows[Item].append(_get_row(item, self.fields[Item], if_match))
+            rows[ItemLink].extend(_get_row(obj, self.fields[ItemLink], item.name) for obj in links)
+            rows[Asset].extend(_get_row(obj, self.fields[Asset], item.name) for obj in assets)
+        if self.errors_count:
+            # nothing is written, the remaining features are only validated
+            return
+        with connection.cursor() as cursor:
+            for spec in STAGING_TABLES:
+                if not rows[spec.model]:
+                    continue
+                columns = f'{spec.extra_column}, {_quote_columns(self.fields[spec.model])}'
+                with cursor.copy(f'COPY {spec.table} ({columns}) FROM STDIN') as copy:
+                    for row in rows[spec.model]:
+                        copy.write_row(row)
+
+    def get_insert_sql(self, spec):
+        '''Returns the INSERT ... SELECT of the staged rows of a model'''
+        fields = self.fields[spec.model]
+        if not spec.reference:
+            return (
+                f'INSERT INTO {spec.model._meta.db_table} AS target ({_quote_columns(fields)}) '
+                f'SELECT {_quote_columns(fields)} FROM {spec.table} '
+            )
+        reference = connection.ops.quote_name(spec.model._meta.get_field(spec.reference).column)
+        return (
+            f'INSERT INTO {spec.model._meta.db_table} AS target '
+            f'({reference}, {_quote_columns(fields)}) '
+            f'SELECT item.id, {_quote_columns(fields, "staged")} FROM {spec.table} AS staged '
+            f'JOIN {Item._meta.db_table} AS item '
+            'ON item.collection_id = %s AND item.name = staged.item_name '
+        )
+
+    def get_upsert_sql(self, spec):
+        '''Returns the INSERT ... ON CONFLICT DO UPDATE of the staged rows of a model
+
+        The existing rows are only updated when a value differs, the unchanged rows are not
+        written (and not returned).
+        '''
+        key = [spec.model._meta.get_field(name) for name in spec.key]
+        fields = self.get_update_fields(spec)
+        assignments = ', '.join(
+            f'{column} = EXCLUDED.{column}'
+            for column in map(connection.ops.quote_name, (field.column for field in fields))
+        )
+        return (
+            f'{self.get_insert_sql(spec)}'
+            f'ON CONFLICT ({_quote_columns(key)}) DO UPDATE SET {assignments} '
+            f'WHERE ({_quote_columns(fields, "target")}) '
+            f'IS DISTINCT FROM ({_quote_columns(fields, "EXCLUDED")}) '
+        )
+
+    def create(self):
+        '''Creates the staged items, links and assets
+
+        Returns: list
+            Names of the created items, empty if some items already exist
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(
+                f'{self.get_insert_sql(STAGING_TABLES[0])}'
+                'ON CONFLICT (collection_id, name) DO NOTHING RETURNING name'
+            )
+            created = {row[0] for row in cursor.fetchall()}
+            if len(created) < len(self.names):
+                for name, index in self.names.items():
+                    if name not in created:
+                        self.add_error(index, name, [_('The item already exists')])
+                return []
+            for spec in STAGING_TABLES[1:]:
+                cursor.execute(self.get_insert_sql(spec), [self.collection.pk])
+        return list(created)
+
+    def check_preconditions(self, cursor):
+        '''Adds the errors of the staged items that cannot be upserted
+
+        The etag of an item must match its if_match etag, and its staged assets cannot replace
+        assets uploaded to the bucket of the collection.
+        '''
+        cursor.execute(
+            'SELECT staged.name FROM stac_api_bulk_item AS staged '
+            f'LEFT JOIN {Item._meta.db_table} AS item '
+            'ON item.collection_id = %s AND item.name = staged.name '
+            'WHERE staged.if_match IS NOT NULL AND item.etag IS DISTINCT FROM staged.if_match',
+            [self.collection.pk]
+        )
+        for (name,) in cursor.fetchall():
+            self.add_error(
+                self.names[name], name, {'if_match': [_('The etag of the item does not match')]}
+            )
+        cursor.execute(
+            'SELECT staged.item_name, staged.name FROM stac_api_bulk_asset AS staged '
+            f'JOIN {Item._meta.db_table} AS item '
+            'ON item.collection_id = %s AND item.name = staged.item_name '
+            f'JOIN {Asset._meta.db_table} AS asset '
+            'ON asset.item_id = item.id AND asset.name = staged.name '
+            'WHERE NOT asset.is_external', [self.collection.pk]
+        )
+        for name, asset in cursor.fetchall():
+            self.add_error(
+                self.names[name],
+                name, {'assets': [_('The asset %s is not an external asset') % asset]}
+            )
+
+    def delete_stale(self, cursor, spec):
+        '''Deletes the links or assets of the staged items that are not in their features
+
+        The assets uploaded to the bucket of the collection are kept, their files are only
+        deleted with the asset endpoint.
+
+        Returns: set
+            Names of the items with deleted links or assets
+        '''
+        key = connection.ops.quote_name(spec.model._meta.get_field(spec.key[1]).column)
+        external = ''
+        content_hashes = ''
+        if spec.model is Asset:
+            external = 'AND target.is_external'
+            # the foreign keys don't cascade in the DB
+            content_hashes = (
+                f', content_hashes AS (DELETE FROM {AssetContentHash._meta.db_table} '
+                'WHERE asset_id IN (SELECT id FROM deleted))'
+            )
+        cursor.execute(
+            'WITH deleted AS ('
+            f'DELETE FROM {spec.model._meta.db_table} AS target '
+            f'USING {Item._meta.db_table} AS item, stac_api_bulk_item AS staged_item '
+            'WHERE target.item_id = item.id AND item.collection_id = %s '
+            'AND item.name = staged_item.name '
+            f'AND NOT EXISTS (SELECT 1 FROM {spec.table} AS staged '
+            f'WHERE staged.item_name = item.name AND staged.{key} = target.{key}) {external} '
+            f'RETURNING target.id, item.name){content_hashes} '
+            'SELECT DISTINCT name FROM deleted', [self.collection.pk]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def upsert_children(self, cursor, spec):
+        '''Creates or updates the staged links or assets
+
+        Returns: set
+            Names of the items with created or updated links or assets
+        '''
+        cursor.execute(
+            f'WITH changed AS ({self.get_upsert_sql(spec)}RETURNING target.item_id) '
+            f'SELECT DISTINCT item.name FROM changed '
+            f'JOIN {Item._meta.db_table} AS item ON item.id = changed.item_id',
+            [self.collection.pk]
+        )
+        return {row[0] for row in cursor.fetchall()}
+
+    def upsert_all(self):
+        '''Creates or updates the staged items, links and assets
+
+        Each model is merged with a constant number of statements, whatever the number of items.
+
+        Returns: tuple
+            (created, updated) sets of item names, the other staged items are unchanged
+
+        Raises:
+            PermissionDenied: when items are created without the add permission of the items
+        '''
+        with connection.cursor() as cursor:
+            self.check_preconditions(cursor)
+            if self.errors_count:
+                return set(), set()
+            cursor.execute(
+                f'{self.get_upsert_sql(STAGING_TABLES[0])}'
+                'RETURNING target.name, target.xmax = 0'
+            )
+            rows = cursor.fetchall()
+            created = {name for name, inserted in rows if inserted}
+            updated = {name for name, inserted in rows if not inserted}
+            if created and not self.user.has_perm(
+                f'{Item._meta.app_label}.{get_permission_codename("add", Item._meta)}'
+            ):
+                # the endpoint only requires the change permission for a PUT, the exception
+                # rolls back the created items
+                raise PermissionDenied(_('The creation of items is not allowed'))
+            for spec in STAGING_TABLES[1:]:
+                updated |= self.delete_stale(cursor, spec)
+                updated |= self.upsert_children(cursor, spec)
+        return created, updated - created
+
+    def run(self, features):
+        self.create_staging_tables()
+        chunks = batched(enumerate(features), settings.BULK_INGESTION_CHUNK_SIZE)
+        for chunk in chunks:
+            self.stage(chunk)
+            if len(self.errors) >= settings.BULK_INGESTION_MAX_ERRORS:
+                break
+        created, updated = set(), set()
+        if not self.errors_count and self.upsert:
+            created, updated = self.upsert_all()
+        elif not self.errors_count:
+            created = set(self.create())
+        if self.errors_count:
+            # the staged chunks and the items written by the merge are discarded
+            transaction.set_rollback(True)
+            return IngestionResult(0, 0, 0, [], self.errors, self.errors_count)
+        items = []
+        for name, index in sorted(self.names.items(), key=lambda item: item[1]):
+            if name in created:
+                item_status = 'created'
+            elif name in updated:
+                item_status = 'updated'
+            else:
+                item_status = 'unchanged'
+            items.append({'index': index, 'id': name, 'status': item_status})
+        return IngestionResult(
+            len(created),
+            len(updated),
+            len(self.names) - len(created) - len(updated),
+            items,
+            self.errors,
+            self.errors_count,
+        )
+
+
+def ingest_items(request, collection, features, upsert=False):
+    '''Creates, or creates and updates, the items of the features in bulk
+
+    Args:
+        request: Request
+            Request of the ingestion, used by the validation of the features
+        collection: Collection
+            Collection of the items
+        features: iterable
+            Parsed features, see iter_ndjson_features() and iter_feature_collection_features()
+        upsert: bool
+            Update the existing items instead of failing, their links and assets are replaced by
+            the ones of the features. A feature can have the etag of its item as if_match member.
+
+    Returns: IngestionResult
+        Named tuple (created, updated, unchanged, items, errors, errors_count), items are the
+        status of each feature, nothing is written when there are errors
+    '''
+    with transaction.atomic():
+        result = BulkIngestion(request, collection, upsert).run(features)
+    logger.info(
+        'Bulk %s of %d items in collection %s (%d created, %d updated), %d errors',
+        'upsert' if upsert else 'ingestion',
+        len(result.items),
+        collection.name,
+        result.created,
+        result.updated,
+        result.errors_count,
+        extra={'collection': collection.name}
+    )
+    return result
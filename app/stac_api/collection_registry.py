@@ -0,0 +1,209 @@
+'''In-process registry of the collections
+
+Most of the requests need a few attributes of their collection (id, cache_control_header, ...),
+as there are only a few hundred collections these attributes are kept in memory by each worker
+instead of being queried on every request.
+
+The registry is loaded once and then refreshed incrementally: the pgtriggers notify the changes
+of the COLLECTION_REGISTRY_FIELDS on the COLLECTION_REGISTRY_CHANNEL (see
+stac_api.db_notifications), the changed collections are then reloaded by the next lookup. The
+collections are held in an immutable mapping that is replaced on each refresh, the lookups are
+therefore lock free. The whole registry is reloaded on each (re)connection of the listener, as
+the notifications sent in the meantime are lost, and after COLLECTION_REGISTRY_MAX_AGE seconds to
+bound the staleness in case of a lost notification.
+
+The registry is only used while the listener is connected, otherwise the collections are looked
+up in the DB. A collection missing in the registry is also looked up in the DB, so that a newly
+created collection is found before its notification is received.
+'''
+import json
+import logging
+import threading
+import time
+from collections import namedtuple
+from types import MappingProxyType
+
+from prometheus_client import Counter
+from prometheus_client import Gauge
+from prometheus_client import Histogram
+
+from django.conf import settings
+from django.db.models import Subquery
+
+from stac_api.db_notifications import listener
+from stac_api.models.collection import Collection
+from stac_api.pgtriggers import COLLECTION_REGISTRY_CHANNEL
+from stac_api.pgtriggers import COLLECTION_REGISTRY_FIELDS
+
+logger = logging.getLogger(__name__)
+
+CollectionInfo = namedtuple('CollectionInfo', COLLECTION_REGISTRY_FIELDS)
+
+LOOKUPS = Counter(
+    'stac_api_collection_registry_lookups',
+    'Collection registry lookups, "bypass" lookups are done in the DB while the registry is '
+    'unusable', ['result']
+)
+REFRESHES = Counter(
+    'stac_api_collection_registry_refreshes',
+    'Collection registry refreshes, "full" reloads the whole registry and "partial" only the '
+    'notified collections', ['kind']
+)
+NOTIFICATION_LATENCY = Histogram(
+    'stac_api_collection_registry_notification_latency_seconds',
+    'Delay between a collection change and its notification to the collection registry',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+
+def _load(**filters):
+    return [
+        CollectionInfo._make(values)
+        for values in Collection.objects.filter(**filters).values_list(*CollectionInfo._fields)
+    ]
+
+
+class CollectionRegistry:
+    '''Registry of the collections, see the module documentation'''
+
+    def __init__(self):
+        self._collections = None
+        self._loaded_at = None
+        self._changed = set()
+        self._lock = threading.Lock()
+
+    def age(self):
+        '''Returns the number of seconds since the last full load, 0 when not loaded'''
+        if self._loaded_at is None:
+            return 0
+        return time.monotonic() - self._loaded_at
+
+    def is_usable(self):
+        '''Returns True if the registry can be used
+
+        The registry is only usable while its notification listener is connected.
+        '''
+        if not settings.COLLECTION_REGISTRY_ENABLED:
+            return False
+        listener.start()
+        return listener.connected.is_set()
+
+    def _is_expired(self):
+        return self.age() > settings.COLLECTION_REGISTRY_MAX_AGE
+
+    def clear(self):
+        '''Reload the whole registry on the next lookup'''
+        with self._lock:
+            self._collections = None
+            self._changed.clear()
+
+    def on_notify(self, payload):
+        '''Mark a changed collection to be reloaded
+
+        Args:
+            payload: string
+                JSON notification payload with the collection id and the change timestamp
+        '''
+        try:
+            change = json.loads(payload)
+            with self._lock:
+                self._changed.add(change['id'])
+        except (ValueError, KeyError) as error:
+            logger.error('Invalid collection registry notification %s: %s', payload, error)
+            self.clear()
+            return
+        NOTIFICATION_LATENCY.observe(max(0, time.time() - change['timestamp']))
+
+    def get(self, name):
+        '''Returns the CollectionInfo of a collection or None if it doesn't exist
+
+        Args:
+            name: string
+                Name of the collection
+        '''
+        if not self.is_usable():
+            LOOKUPS.labels(result='bypass').inc()
+            return next(iter(_load(name=name)), None)
+
+        collections = self._collections
+        if collections is None or self._changed or self._is_expired():
+            collections = self._refresh()
+        if name in collections:
+            LOOKUPS.labels(result='hit').inc()
+            return collections[name]
+
+        LOOKUPS.labels(result='miss').inc()
+        collection = next(iter(_load(name=name)), None)
+        if collection is not None:
+            with self._lock:
+                if self._collections is not None:
+                    self._collections = MappingProxyType({
+                        **self._collections, collection.name: collection
+                    })
+        return collection
+
+    def _refresh(self):
+        with self._lock:
+            if self._collections is None or self._is_expired():
+                # the notifications received until now are included in the full load
+                self._changed.clear()
+                collections = {collection.name: collection for collection in _load()}
+                self._loaded_at = time.monotonic()
+                REFRESHES.labels(kind='full').inc()
+            elif self._changed:
+                changed, self._changed = self._changed, set()
+                collections = {
+                    name: collection
+                    for name, collection in self._collections.items()
+                    if collection.id not in changed
+                }
+                collections.update({
+                    collection.name: collection for collection in _load(id__in=changed)
+                })
+                REFRESHES.labels(kind='partial').inc()
+            else:
+                return self._collections
+            self._collections = MappingProxyType(collections)
+            return self._collections
+
+
+registry = CollectionRegistry()
+listener.subscribe(COLLECTION_REGISTRY_CHANNEL, registry.on_notify, on_connect=registry.clear)
+
+Gauge(
+    'stac_api_collection_registry_age_seconds',
+    'Number of seconds since the last full load of the collection registry'
+).set_function(registry.age)
+
+
+def get_collection(name):
+    '''Returns the CollectionInfo of a collection or None if it doesn't exist
+
+    Args:
+        name: string
+            Name of the collection
+
+    Returns: CollectionInfo
+        Named tuple with the COLLECTION_REGISTRY_FIELDS of the collection
+    '''
+    return registry.get(name)
+
+
+def get_collection_id(name):
+    '''Returns the id of a collection to filter a queryset on
+
+    Filtering on the collection id greatly improves the performance over filtering by
+    'collection__name'. When the registry is not usable the id is given as subquery, in order to
+    not add a DB round trip.
+
+    Args:
+        name: string
+            Name of the collection
+
+    Returns: int | Subquery | None
+        Id of the collection, None if it doesn't exist
+    '''
+    if not registry.is_usable():
+        return Subquery(Collection.objects.filter(name=name).values('id'))
+    collection = registry.get(name)
+    return collection.id if collection is not None else None
@@ -0,0 +1,97 @@
+'''Detection of the no-op writes with content hashes
+
+Clients often republish identical items and assets with a PUT. Such a write still saves all the
+fields and the links, and the triggers change the etag of the object, of its item and of its
+collection, which invalidates the downstream caches of all of them.
+
+The upsert of an item or an asset therefore computes a hash of its write payload (the validated
+data, with the links of an item). After the write, the hash is stored with the resulting etag of
+the object (ItemContentHash, AssetContentHash). The next upsert with the same hash is skipped and
+returns the unchanged object, as long as the object still has the stored etag: any other write
+(PATCH, asset upload, bulk ingestion, admin, or a change of the assets of an item) changes the
+etag and the stored hash doesn't apply anymore.
+
+The skipped writes are counted by the stac_api_skipped_writes metric.
+'''
+import hashlib
+import json
+import logging
+
+from prometheus_client import Counter
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.db.models import Model
+
+from stac_api.models.item import Asset
+from stac_api.models.item import AssetContentHash
+from stac_api.models.item import Item
+from stac_api.models.item import ItemContentHash
+
+logger = logging.getLogger(__name__)
+
+SKIPPED_WRITES = Counter(
+    'stac_api_skipped_writes',
+    'Upserts skipped because the object already has the same content',
+    ['model'],
+)
+
+# model: (content hash model, name of its relation to the model)
+CONTENT_HASH_MODELS = {
+    Item: (ItemContentHash, 'item'),
+    Asset: (AssetContentHash, 'asset'),
+}
+
+
+def _json_default(value):
+    if isinstance(value, GEOSGeometry):
+        return value.ewkt
+    if isinstance(value, Model):
+        return value.pk
+    return str(value)
+
+
+def get_content_hash(data):
+    '''Returns the hash of the validated data of a write
+
+    Args:
+        data: dict
+            Validated data, the geometries are hashed by their EWKT and the model instances by their
+            primary key
+
+    Returns: str
+        Hex SHA-256 digest
+    '''
+    content = json.dumps(data, sort_keys=True, default=_json_default)
+    return hashlib.sha256(content.encode()).hexdigest()
+
+
+def is_unchanged(instance, content_hash):
+    '''Returns true if the last upsert of the object had the same content hash
+
+    The hash only applies if the object was not changed since, i.e. it still has the etag of this
+    upsert.
+    '''
+    hash_model, field = CONTENT_HASH_MODELS[type(instance)]
+    queryset = hash_model.objects.filter(content_hash=content_hash, etag=instance.etag)
+    unchanged = queryset.filter(**{field: instance}).exists()
+    if unchanged:
+        SKIPPED_WRITES.labels(type(instance).__name__).inc()
+        logger.info(
+            '%s %s unchanged, write skipped',
+            type(instance).__name__,
+            instance.name,
+            extra={'etag': instance.etag}
+        )
+    return unchanged
+
+
+def save_content_hash(instance, content_hash):
+    '''Stores the content hash of an upsert with the etag of the object after the upsert
+
+    Must be called after all the writes of the upsert, including the ones of the related objects
+    (links), which change the etag of the object with the triggers.
+    '''
+    hash_model, field = CONTENT_HASH_MODELS[type(instance)]
+    etag = type(instance).objects.values_list('etag', flat=True).get(pk=instance.pk)
+    defaults = {'content_hash': content_hash, 'etag': etag}
+    hash_model.objects.update_or_create(defaults=defaults, **{field: instance})
@@ -0,0 +1,599 @@
+'''CQL2 filter extension
+
+The `filter` parameter of the search and items list endpoints is written either in CQL2-JSON or in
+CQL2-text. A CQL2-text filter is first parsed into its CQL2-JSON form, the CQL2-JSON expression is
+then compiled into a single Q object on the item fields of the QUERYABLES, which are all backed by
+an index (B-tree for the comparisons and GiST for s_intersects and t_intersects on datetime).
+
+Supported:
+- logical operators: and, or, not
+- comparison operators: =, <>, <, <=, >, >=, isNull, in
+- spatial and temporal functions: s_intersects, t_intersects
+
+The complexity of the filters is bounded by CQL2_MAX_LENGTH, CQL2_MAX_NODES and CQL2_MAX_DEPTH, so
+that a single request cannot exhaust the parser or produce a query that exhausts the planner.
+'''
+import json
+import logging
+import operator
+import re
+from collections import namedtuple
+from datetime import UTC
+from datetime import datetime
+from datetime import time
+from datetime import timedelta
+from functools import reduce
+
+from django.conf import settings
+from django.contrib.gis.gdal.error import GDALException
+from django.contrib.gis.geos import GEOSException
+from django.contrib.gis.geos import GEOSGeometry
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
+from django.db.models import Q
+from django.utils.dateparse import parse_duration
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework import serializers
+
+from stac_api.intersects import intersects_condition
+from stac_api.utils import fromisoformat
+from stac_api.utils import geometry_from_bbox
+from stac_api.utils import utc_aware
+
+logger = logging.getLogger(__name__)
+
+FILTER_LANGS = ['cql2-text', 'cql2-json']
+
+FILTER_CRS = [
+    'http://www.opengis.net/def/crs/OGC/1.3/CRS84',
+    'http://www.opengis.net/def/crs/EPSG/0/4326',
+]
+
+# Queryable item properties with their item field, type and JSON schema (queryables endpoint).
+# The range_field is used by t_intersects instead of the field.
+Queryable = namedtuple('Queryable', ['field', 'type', 'schema', 'range_field'], defaults=[None])
+
+QUERYABLES = {
+    'id': Queryable('name', 'string', {
+        'title': 'Item ID', 'type': 'string'
+    }),
+    'collection':
+        Queryable('collection__name', 'string', {
+            'title': 'Collection ID', 'type': 'string'
+        }),
+    'geometry':
+        Queryable(
+            'geometry',
+            'geometry', {
+                'title': 'Geometry', '$ref': 'https://geojson.org/schema/Geometry.json'
+            }
+        ),
+    'datetime':
+        Queryable(
+            'properties_datetime_range__startswith',
+            'timestamp',
+            {
+                'title': 'Datetime, the start datetime of the items with a datetime range',
+                'type': 'string',
+                'format': 'date-time'
+            },
+            range_field='properties_datetime_range'
+        ),
+    'created':
+        Queryable(
+            'created', 'timestamp', {
+                'title': 'Created', 'type': 'string', 'format': 'date-time'
+            }
+        ),
+    'updated':
+        Queryable(
+            'updated', 'timestamp', {
+                'title': 'Updated', 'type': 'string', 'format': 'date-time'
+            }
+        ),
+    'title': Queryable('properties_title', 'string', {
+        'title': 'Title', 'type': 'string'
+    }),
+    'forecast:reference_datetime':
+        Queryable(
+            'forecast_reference_datetime',
+            'timestamp', {
+                'title': 'Forecast reference datetime', 'type': 'string', 'format': 'date-time'
+            }
+        ),
+    'forecast:horizon':
+        Queryable(
+            'forecast_horizon',
+            'duration', {
+                'title': 'Forecast horizon', 'type': 'string', 'format': 'duration'
+            }
+        ),
+    'forecast:duration':
+        Queryable(
+            'forecast_duration',
+            'duration', {
+                'title': 'Forecast duration', 'type': 'string', 'format': 'duration'
+            }
+        ),
+    'forecast:variable':
+        Queryable('forecast_variable', 'string', {
+            'title': 'Forecast variable', 'type': 'string'
+        }),
+    'forecast:perturbed':
+        Queryable(
+            'forecast_perturbed', 'boolean', {
+                'title': 'Forecast perturbed', 'type': 'boolean'
+            }
+        ),
+}
+
+COMPARISON_LOOKUPS = {'=': 'exact', '<': 'lt', '<=': 'lte', '>': 'gt', '>=': 'gte'}
+# Operators of a comparison with the literal first and the property second
+FLIPPED_COMPARISONS = {'=': '=', '<>': '<>', '<': '>', '<=': '>=', '>': '<', '>=': '<='}
+
+Cql2Filter = namedtuple('Cql2Filter', ['expression', 'condition'])
+
+
+def get_queryables_schema(schema_id):
+    '''Returns the JSON schema of the queryables
+
+    Args:
+        schema_id: string
+            URL of the queryables endpoint
+
+    Returns: dict
+    '''
+    return {
+        '$schema': 'https://json-schema.org/draft/2019-09/schema',
+        '$id': schema_id,
+        'type': 'object',
+        'title': 'Queryables',
+        'properties': {
+            name: queryable.schema for name, queryable in QUERYABLES.items()
+        },
+        'additionalProperties': False,
+    }
+
+
+def parse_filter(value, lang=None):
+    '''Parses and compiles a filter parameter
+
+    Args:
+        value: string | dict
+            The filter, a CQL2-text or CQL2-JSON string, or a parsed CQL2-JSON expression
+        lang: string
+            The filter-lang parameter, per default cql2-json for a parsed expression and cql2-text
+            for a string
+
+    Returns: Cql2Filter
+        Named tuple with the CQL2-JSON expression and the compiled Q object
+
+    Raises:
+        ValidationError: if the filter is invalid or too complex
+    '''
+    if lang is None:
+        lang = 'cql2-text' if isinstance(value, str) else 'cql2-json'
+    if lang not in FILTER_LANGS:
+        raise serializers.ValidationError(
+            _('Invalid filter-lang %s, must be one of %s') % (lang, ', '.join(FILTER_LANGS))
+        )
+    if isinstance(value, str) and len(value) > settings.CQL2_MAX_LENGTH:
+        raise _invalid(f'too long, at most {settings.CQL2_MAX_LENGTH} characters are allowed')
+    if lang == 'cql2-text':
+        if not isinstance(value, str):
+            raise serializers.ValidationError(_('A cql2-text filter must be a string'))
+        expression = Cql2TextParser(value).parse()
+    elif isinstance(value, str):
+        try:
+            expression = json.loads(value)
+        except (json.JSONDecodeError, RecursionError) as error:
+            raise serializers.ValidationError(_('Invalid cql2-json filter: %s') % error) from None
+    else:
+        expression = value
+    return Cql2Filter(expression, Cql2Compiler().compile(expression))
+
+
+def parse_filter_parameters(params):
+    '''Parses the filter, filter-lang and filter-crs parameters
+
+    Args:
+        params: dict
+            Query parameters (GET) or body (POST) of the request
+
+    Returns: Cql2Filter
+        The parsed filter, None without filter parameter
+
+    Raises:
+        ValidationError: if the filter is invalid or too complex
+    '''
+    if 'filter' not in params:
+        return None
+    if params.get('filter-crs', FILTER_CRS[0]) not in FILTER_CRS:
+        raise serializers.ValidationError(
+            _('Invalid filter-crs %s, must be one of %s') %
+            (params['filter-crs'], ', '.join(FILTER_CRS))
+        )
+    return parse_filter(params['filter'], params.get('filter-lang'))
+
+
+def _invalid(message):
+    logger.error('Invalid filter: %s', message)
+    return serializers.ValidationError(_('Invalid filter: %s') % message)
+
+
+def _to_datetime(value):
+    '''Converts a timestamp or date literal to an aware datetime (the start of the day for a date),
+    a timestamp without timezone is in UTC'''
+    if isinstance(value, dict) and 'timestamp' in value:
+        value = value['timestamp']
+    elif isinstance(value, dict) and 'date' in value:
+        value = f'{value["date"]}T00:00:00Z'
+    if not isinstance(value, str):
+        raise _invalid(f'{value} is not a timestamp')
+    try:
+        date_time = fromisoformat(value)
+    except ValueError:
+        raise _invalid(f'{value} is not an ISO 8601 timestamp') from None
+    return utc_aware(date_time) if date_time.tzinfo is None else date_time
+
+
+def _to_interval(value):
+    '''Converts a temporal literal to a (start, end) tuple, None for an open bound'''
+    if isinstance(value, dict) and 'interval' in value:
+        bounds = value['interval']
+        if not isinstance(bounds, list) or len(bounds) != 2:
+            raise _invalid(f'{value} is not an interval')
+        start, end = (None if bound == '..' else _to_datetime(bound) for bound in bounds)
+        if start is not None and end is not None and end < start:
+            raise _invalid(f'the interval {value} ends before its start')
+        return start, end
+    if isinstance(value, dict) and 'date' in value:
+        start = _to_datetime(value)
+        return start, datetime.combine(start.date(), time.max, tzinfo=UTC)
+    start = _to_datetime(value)
+    return start, start
+
+
+def _to_geometry(value):
+    '''Converts a spatial literal (GeoJSON geometry or bbox) to a geometry'''
+    try:
+        if isinstance(value, dict) and 'bbox' in value:
+            bbox = value['bbox']
+            if not isinstance(bbox, list):
+                raise ValueError('the bbox must be a list')
+            return geometry_from_bbox(','.join(map(str, bbox)))
+        if isinstance(value, dict) and 'type' in value:
+            return GEOSGeometry(json.dumps(value))
+    except (ValueError, IndexError, GDALException, GEOSException) as error:
+        raise _invalid(f'{value} is not a valid geometry ({error})') from None
+    raise _invalid(f'{value} is not a geometry')
+
+
+class Cql2Compiler:
+    '''Compiles a CQL2-JSON expression into a Q object'''
+
+    # Name of the compile method of each operator, called with (op, args, depth)
+    operators = {
+        'and': 'compile_logical',
+        'or': 'compile_logical',
+        'not': 'compile_not',
+        'isnull': 'compile_isnull',
+        'in': 'compile_in',
+        's_intersects': 'compile_s_intersects',
+        't_intersects': 'compile_t_intersects',
+        **dict.fromkeys(FLIPPED_COMPARISONS, 'compile_comparison'),
+    }
+
+    def __init__(self):
+        self.nodes = 0
+
+    def count_nodes(self, count=1):
+        self.nodes += count
+        if self.nodes > settings.CQL2_MAX_NODES:
+            raise _invalid(f'too complex, at most {settings.CQL2_MAX_NODES} nodes are allowed')
+
+    def compile(self, node, depth=1):
+        self.count_nodes()
+        if depth > settings.CQL2_MAX_DEPTH:
+            raise _invalid(f'too deep, at most {settings.CQL2_MAX_DEPTH} levels are allowed')
+        if not isinstance(node, dict) or 'op' not in node:
+            raise _invalid(f'{node} is not an expression')
+        op = str(node['op']).lower()
+        args = node.get('args', [])
+        if not isinstance(args, list):
+            raise _invalid(f'the args of {op} must be a list')
+        if op not in self.operators:
+            raise _invalid(f'unsupported operator {op}')
+        return getattr(self, self.operators[op])(op, args, depth)
+
+    def check_args(self, op, args, count):
+        if len(args) != count:
+            raise _invalid(f'{op} requires {count} args')
+        self.count_nodes(count)
+
+    def is_property(self, arg):
+        return isinstance(arg, dict) and 'property' in arg
+
+    def get_queryable(self, arg):
+        if not self.is_property(arg):
+            raise _invalid(f'{arg} is not a property')
+        name = str(arg['property']).removeprefix('properties.')
+        if name not in QUERYABLES:
+            raise _invalid(f'{name} is not queryable, see the queryables')
+        return QUERYABLES[name]
+
+    def get_value(self, queryable, value):
+        '''Converts a literal to the type of the queryable'''
+        if queryable.type == 'timestamp':
+            return _to_datetime(value)
+        if queryable.type == 'duration':
+            duration = parse_duration(value) if isinstance(value, str) else None
+            if not isinstance(duration, timedelta):
+                raise _invalid(f'{value} is not an ISO 8601 duration')
+            return duration
+        if queryable.type == 'boolean' and isinstance(value, bool):
+            return value
+        if queryable.type == 'string' and isinstance(value, str):
+            return value
+        raise _invalid(f'{value} cannot be compared with a {queryable.type}')
+
+    def get_property_and_literal(self, op, args):
+        '''Returns the queryable and the literal of a binary predicate, and whether they were
+        flipped'''
+        self.check_args(op, args, 2)
+        if self.is_property(args[0]):
+            return self.get_queryable(args[0]), args[1], False
+        if self.is_property(args[1]) and not self.is_property(args[0]):
+            return self.get_queryable(args[1]), args[0], True
+        raise _invalid(f'{op} requires a property and a literal')
+
+    def compile_logical(self, op, args, depth):
+        if len(args) < 2:
+            raise _invalid(f'{op} requires at least 2 args')
+        conditions = [self.compile(arg, depth + 1) for arg in args]
+        return reduce(operator.and_ if op == 'and' else operator.or_, conditions)
+
+    def compile_not(self, op, args, depth):
+        self.check_args(op, args, 1)
+        return ~self.compile(args[0], depth + 1)
+
+    def compile_isnull(self, op, args, _depth):
+        self.check_args(op, args, 1)
+        return Q(**{f'{self.get_queryable(args[0]).field}__isnull': True})
+
+    def compile_comparison(self, op, args, _depth):
+        queryable, literal, flipped = self.get_property_and_literal(op, args)
+        if flipped:
+            op = FLIPPED_COMPARISONS[op]
+        value = self.get_value(queryable, literal)
+        if op == '<>':
+            # like in SQL the NULL values don't match
+            return ~Q(**{queryable.field: value}) & Q(**{f'{queryable.field}__isnull': False})
+        return Q(**{f'{queryable.field}__{COMPARISON_LOOKUPS[op]}': value})
+
+    def compile_in(self, op, args, _depth):
+        self.check_args(op, args, 2)
+        queryable = self.get_queryable(args[0])
+        if not isinstance(args[1], list):
+            raise _invalid('the second arg of in must be a list')
+        self.count_nodes(len(args[1]))
+        return Q(**{f'{queryable.field}__in': [self.get_value(queryable, v) for v in args[1]]})
+
+    def compile_s_intersects(self, op, args, _depth):
+        queryable, literal, _flipped = self.get_property_and_literal(op, args)
+        if queryable.type != 'geometry':
+            raise _invalid('s_intersects requires a geometry property')
+        return intersects_condition(_to_geometry(literal), queryable.field)
+
+    def compile_t_intersects(self, op, args, _depth):
+        queryable, literal, _flipped = self.get_property_and_literal(op, args)
+        if queryable.type != 'timestamp':
+            raise _invalid('t_intersects requires a temporal property')
+        start, end = _to_interval(literal)
+        if queryable.range_field:
+            return Q(**{f'{queryable.range_field}__overlap': DateTimeTZRange(start, end, '[]')})
+        condition = Q()
+        if start is not None:
+            condition &= Q(**{f'{queryable.field}__gte': start})
+        if end is not None:
+            condition &= Q(**{f'{queryable.field}__lte': end})
+        return condition
+
+
+Token = namedtuple('Token', ['kind', 'value', 'start', 'end'])
+
+TOKEN_REGEX = re.compile(
+    r'''(?:
+        (?P<number>-?\d+(?:\.\d+)?(?:[eE][-+]?\d+)?)|
+        (?P<string>'(?:[^']|'')*')|
+        (?P<quoted>"[^"]+")|
+        (?P<symbol><>|<=|>=|=|<|>|\(|\)|,)|
+        (?P<word>[A-Za-z_][A-Za-z0-9_:.]*)
+    )''',
+    re.VERBOSE
+)
+WHITESPACE_REGEX = re.compile(r'\s*')
+
+# Literal functions of the operands with their number of args, None for any number
+LITERAL_FUNCTIONS = {'TIMESTAMP': 1, 'DATE': 1, 'INTERVAL': 2, 'BBOX': None}
+
+WKT_TYPES = [
+    'POINT',
+    'LINESTRING',
+    'POLYGON',
+    'MULTIPOINT',
+    'MULTILINESTRING',
+    'MULTIPOLYGON',
+    'GEOMETRYCOLLECTION',
+]
+
+
+class Cql2TextParser:
+    '''Parses a CQL2-text filter into its CQL2-JSON expression
+
+    Recursive descent parser of the CQL2-text subset supported by the Cql2Compiler.
+    '''
+
+    def __init__(self, text):
+        self.text = text
+        self.tokens = self.tokenize(text)
+        self.position = 0
+        self.depth = 0
+
+    def tokenize(self, text):
+        tokens = []
+        position = WHITESPACE_REGEX.match(text).end()
+        while position < len(text):
+            match = TOKEN_REGEX.match(text, position)
+            if not match:
+                raise _invalid(f'unexpected character at {position} in {text}')
+            tokens.append(
+                Token(match.lastgroup, match.group(match.lastgroup), match.start(), match.end())
+            )
+            position = WHITESPACE_REGEX.match(text, match.end()).end()
+        return tokens
+
+    def peek(self, *values):
+        '''Returns the next token if it is one of the (case insensitive) values'''
+        if self.position < len(self.tokens):
+            token = self.tokens[self.position]
+            if token.kind in ['word', 'symbol'] and token.value.upper() in values:
+                return token
+        return None
+
+    def accept(self, *values):
+        token = self.peek(*values)
+        if token:
+            self.position += 1
+        return token
+
+    def expect(self, *values):
+        token = self.accept(*values)
+        if not token:
+            raise self.unexpected(' or '.join(values))
+        return token
+
+    def next(self):
+        if self.position >= len(self.tokens):
+            raise self.unexpected('an operand')
+        self.position += 1
+        return self.tokens[self.position - 1]
+
+    def unexpected(self, expected):
+        if self.position < len(self.tokens):
+            found = self.tokens[self.position].value
+        else:
+            found = 'end of filter'
+        return _invalid(f'expected {expected} instead of {found} in {self.text}')
+
+    def parse(self):
+        expression = self.parse_or()
+        if self.position < len(self.tokens):
+            raise self.unexpected('end of filter')
+        return expression
+
+    def nested(self, parse):
+        self.depth += 1
+        if self.depth > settings.CQL2_MAX_DEPTH:
+            raise _invalid(f'too deep, at most {settings.CQL2_MAX_DEPTH} levels are allowed')
+        expression = parse()
+        self.depth -= 1
+        return expression
+
+    def parse_or(self):
+        args = [self.parse_and()]
+        while self.accept('OR'):
+            args.append(self.parse_and())
+        return args[0] if len(args) == 1 else {'op': 'or', 'args': args}
+
+    def parse_and(self):
+        args = [self.parse_not()]
+        while self.accept('AND'):
+            args.append(self.parse_not())
+        return args[0] if len(args) == 1 else {'op': 'and', 'args': args}
+
+    def parse_not(self):
+        if self.accept('NOT'):
+            return {'op': 'not', 'args': [self.nested(self.parse_not)]}
+        return self.parse_predicate()
+
+    def parse_predicate(self):
+        if self.accept('('):
+            expression = self.nested(self.parse_or)
+            self.expect(')')
+            return expression
+        function = self.accept('S_INTERSECTS', 'T_INTERSECTS')
+        if function:
+            self.expect('(')
+            args = [self.parse_operand()]
+            self.expect(',')
+            args.append(self.parse_operand())
+            self.expect(')')
+            return {'op': function.value.lower(), 'args': args}
+
+        left = self.parse_operand()
+        comparison = self.accept(*FLIPPED_COMPARISONS)
+        if comparison:
+            return {'op': comparison.value, 'args': [left, self.parse_operand()]}
+        if self.accept('IS'):
+            negated = self.accept('NOT')
+            self.expect('NULL')
+            expression = {'op': 'isNull', 'args': [left]}
+            return {'op': 'not', 'args': [expression]} if negated else expression
+        negated = self.accept('NOT')
+        self.expect('IN')
+        expression = {'op': 'in', 'args': [left, self.parse_arguments()]}
+        return {'op': 'not', 'args': [expression]} if negated else expression
+
+    def parse_arguments(self):
+        '''Parses a parenthesized list of operands'''
+        self.expect('(')
+        values = [self.parse_operand()]
+        while self.accept(','):
+            values.append(self.parse_operand())
+        self.expect(')')
+        return values
+
+    def parse_operand(self):
+        token = self.next()
+        if token.kind != 'word':
+            return self.parse_literal(token)
+        keyword = token.value.upper()
+        if keyword in ['TRUE', 'FALSE']:
+            return keyword == 'TRUE'
+        if keyword in LITERAL_FUNCTIONS:
+            return self.parse_literal_function(keyword)
+        if keyword in WKT_TYPES:
+            return self.parse_wkt(token)
+        return {'property': token.value}
+
+    def parse_literal(self, token):
+        '''Parses a number, a string or a quoted property'''
+        if token.kind == 'number':
+            return float(token.value) if re.search('[.eE]', token.value) else int(token.value)
+        if token.kind == 'string':
+            return token.value[1:-1].replace("''", "'")
+        if token.kind == 'quoted':
+            return {'property': token.value[1:-1]}
+        raise _invalid(f'unexpected {token.value} in {self.text}')
+
+    def parse_literal_function(self, keyword):
+        '''Parses a TIMESTAMP, DATE, INTERVAL or BBOX literal'''
+        values = self.parse_arguments()
+        count = LITERAL_FUNCTIONS[keyword]
+        if count is not None and len(values) != count:
+            raise _invalid(f'{keyword} requires {count} args in {self.text}')
+        return {keyword.lower(): values[0] if count == 1 else values}
+
+    def parse_wkt(self, token):
+        '''Parses a WKT geometry into a GeoJSON geometry'''
+        self.expect('(')
+        level = 1
+        while level:
+            parenthesis = self.next().value
+            level += {'(': 1, ')': -1}.get(parenthesis, 0)
+        wkt = self.text[token.start:self.tokens[self.position - 1].end]
+        try:
+            return json.loads(GEOSGeometry(wkt, srid=4326).json)
+        except (ValueError, GDALException, GEOSException) as error:
+            raise _invalid(f'{wkt} is not a valid geometry ({error})') from None
@@ -0,0 +1,98 @@
+'''Listener of the DB notifications (PostgreSQL LISTEN/NOTIFY)
+
+A single background thread per worker listens to the channels of all the subscribers on its own
+DB connection. With the gunicorn gevent workers the thread is a greenlet, as threading is monkey
+patched in wsgi.py before psycopg is imported, so that psycopg waits cooperatively for the
+notifications.
+
+The notifications are only delivered while connected, the subscribers are therefore informed of
+every (re)connection in order to resynchronize their state.
+'''
+import logging
+import threading
+
+import psycopg
+
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+# Delay in seconds before reconnecting the listener after a failure
+LISTENER_RETRY_DELAY = 5
+# Maximum delay in seconds for the listener to notice that it has been stopped
+LISTENER_STOP_TIMEOUT = 1
+
+
+class NotificationListener:
+    '''Listen to the DB notifications in a background thread'''
+
+    def __init__(self):
+        self.connected = threading.Event()
+        self._stopped = threading.Event()
+        self._lock = threading.Lock()
+        self._thread = None
+        self._subscribers = {}
+
+    def subscribe(self, channel, on_notify, on_connect=None):
+        '''Subscribe to the notifications of a channel
+
+        The subscriptions must be done before starting the listener, typically at import time.
+
+        Args:
+            channel: string
+                Notification channel
+            on_notify: callable
+                Called with the payload of each notification of the channel
+            on_connect: callable
+                Called without argument on each (re)connection of the listener
+        '''
+        self._subscribers.setdefault(channel, []).append((on_notify, on_connect))
+
+    def start(self):
+        '''Start the listener thread, if not already running'''
+        if self._thread is not None and self._thread.is_alive():
+            return
+        with self._lock:
+            if self._thread is None or not self._thread.is_alive():
+                self._stopped.clear()
+                self._thread = threading.Thread(
+                    target=self._run, name='db-notifications-listener', daemon=True
+                )
+                self._thread.start()
+
+    def stop(self):
+        '''Stop the listener thread and close its DB connection'''
+        self._stopped.set()
+        with self._lock:
+            if self._thread is not None:
+                self._thread.join()
+                self._thread = None
+
+    def _run(self):
+        while not self._stopped.is_set():
+            try:
+                self._listen()
+            except Exception as error:  # pylint: disable=broad-exception-caught
+                logger.error('DB notifications listener failed: %s', error)
+            finally:
+                self.connected.clear()
+            self._stopped.wait(LISTENER_RETRY_DELAY)
+
+    def _listen(self):
+        with psycopg.connect(**connection.get_connection_params(), autocommit=True) as conn:
+            for channel in self._subscribers:
+                conn.execute(f'LISTEN {channel}')
+            # The changes done while not listening have not been notified
+            for subscribers in self._subscribers.values():
+                for _on_notify, on_connect in subscribers:
+                    if on_connect is not None:
+                        on_connect()
+            self.connected.set()
+            logger.info('DB notifications listener connected to %s', ', '.join(self._subscribers))
+            while not self._stopped.is_set():
+                for notify in conn.notifies(timeout=LISTENER_STOP_TIMEOUT):
+                    for on_notify, _on_connect in self._subscribers.get(notify.channel, []):
+                        on_notify(notify.payload)
+
+
+listener = NotificationListener()
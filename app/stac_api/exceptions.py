@@ -38,3 +38,9 @@ class NotImplementedException(StacAPIException):
     status_code = status.HTTP_501_NOT_IMPLEMENTED
     default_detail = _('Not Implemented')
     default_code = 'not_implemented'
+
+
+class AggregationTimeoutError(StacAPIException):
+    status_code = status.HTTP_503_SERVICE_UNAVAILABLE
+    default_detail = _('Aggregation not computed within the time budget, narrow the search')
+    default_code = 'service_unavailable'
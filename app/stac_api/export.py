@@ -0,0 +1,81 @@
+'''Streaming export of the items of a collection
+
+The items are read with a server-side cursor and serialized chunk by chunk, the memory usage is
+therefore constant whatever the size of the collection. The features are identical to the ones of
+the items list endpoint.
+'''
+import logging
+from itertools import batched
+
+from django.conf import settings
+from django.db.models import Prefetch
+
+from stac_api.collection_registry import get_collection_id
+from stac_api.models.item import Asset
+from stac_api.models.item import Item
+from stac_api.serializers.item import ItemSerializer
+from stac_api.serializers.item_db import serialize_items
+from stac_api.views.filters import create_is_active_filter
+
+logger = logging.getLogger(__name__)
+
+
+def get_collection_items(collection_name, bbox=None, date_time=None, cql2_filter=None):
+    '''Returns the active items of a collection
+
+    Args:
+        collection_name: string
+            Name of the collection
+        bbox: string
+            Optional bbox filter, see ItemQuerySet.filter_by_bbox
+        date_time: string
+            Optional datetime filter, see ItemQuerySet.filter_by_datetime
+        cql2_filter: Cql2Filter
+            Optional CQL2 filter, see ItemQuerySet.filter_by_cql2
+
+    Returns: ItemQuerySet
+        Items of the collection, an unknown collection has no items
+    '''
+    queryset = Item.objects.filter(
+        create_is_active_filter(),
+        # Using the collection id greatly improves the performance over filtering by
+        # 'collection__name', an unknown collection has no id and therefore no items.
+        collection__id=get_collection_id(collection_name)
+    )
+    if bbox:
+        queryset = queryset.filter_by_bbox(bbox)
+    if date_time:
+        queryset = queryset.filter_by_datetime(date_time)
+    if cql2_filter is not None:
+        queryset = queryset.filter_by_cql2(cql2_filter)
+    return queryset
+
+
+def iter_features(request, queryset, chunk_size=None):
+    '''Serialize the items of a queryset lazily
+
+    Args:
+        request: HttpRequest
+            request object, used for the auto links, the assets href and the api version
+        queryset: ItemQuerySet
+            items to serialize, they are exported in primary key order
+        chunk_size: int
+            number of items fetched and serialized at once, per default EXPORT_CHUNK_SIZE
+
+    Yields:
+        The features, identical to the ItemSerializer output
+    '''
+    chunk_size = chunk_size or settings.EXPORT_CHUNK_SIZE
+    queryset = queryset.select_related(None).prefetch_related(None).order_by('pk')
+    if settings.ITEMS_DB_RENDERING:
+        item_ids = queryset.values_list('pk', flat=True).iterator(chunk_size=chunk_size)
+        for chunk in batched(item_ids, chunk_size):
+            yield from serialize_items(request, chunk, asset_ordering='name')
+        return
+
+    # The prefetches are done per chunk by the iterator
+    items = queryset.select_related('collection').prefetch_related(
+        Prefetch('assets', queryset=Asset.objects.order_by('name')), 'links'
+    ).iterator(chunk_size=chunk_size)
+    for chunk in batched(items, chunk_size):
+        yield from ItemSerializer(chunk, context={'request': request}, many=True).data
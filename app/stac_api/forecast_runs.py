@@ -0,0 +1,70 @@
+'''Latest forecast runs of a collection
+
+The forecast collections (e.g. the MeteoSwiss ICON models) contain one item per run, variable,
+horizon and ensemble member. Their clients first look up the newest run and then query its items
+by forecast:reference_datetime, forecast:variable and forecast:horizon, which is answered by the
+item_fc_run_idx composite index.
+
+The distinct reference datetimes of a collection are read with a loose index scan on the same
+index: a recursive query jumps from one run to the previous one with a single index probe per
+run, therefore the cost only depends on the number of returned runs and not on the number of
+items per run.
+'''
+import logging
+
+from django.db import connection
+
+from stac_api.views.filters import get_expiry_cutoff
+
+logger = logging.getLogger(__name__)
+
+LATEST_RUNS_SQL = '''
+WITH RECURSIVE runs AS (
+    (
+        SELECT item.forecast_reference_datetime AS reference_datetime
+        FROM stac_api_item AS item
+        WHERE item.collection_id = %(collection_id)s
+            AND item.forecast_reference_datetime IS NOT NULL
+            AND (item.properties_expires IS NULL OR item.properties_expires >= %(cutoff)s)
+        ORDER BY item.forecast_reference_datetime DESC
+        LIMIT 1
+    )
+    UNION ALL
+    SELECT (
+        SELECT item.forecast_reference_datetime
+        FROM stac_api_item AS item
+        WHERE item.collection_id = %(collection_id)s
+            AND item.forecast_reference_datetime < runs.reference_datetime
+            AND (item.properties_expires IS NULL OR item.properties_expires >= %(cutoff)s)
+        ORDER BY item.forecast_reference_datetime DESC
+        LIMIT 1
+    )
+    FROM runs
+    WHERE runs.reference_datetime IS NOT NULL
+)
+SELECT reference_datetime FROM runs WHERE reference_datetime IS NOT NULL LIMIT %(limit)s
+'''
+
+
+def get_latest_forecast_runs(collection_id, limit=1):
+    '''Returns the latest forecast reference datetimes of the active items of a collection
+
+    Args:
+        collection_id: int
+            Primary key of the collection
+        limit: int
+            Maximum number of runs
+
+    Returns: list
+        Reference datetimes, the latest first
+    '''
+    with connection.cursor() as cursor:
+        cursor.execute(
+            LATEST_RUNS_SQL,
+            {
+                'collection_id': collection_id, 'cutoff': get_expiry_cutoff(), 'limit': limit
+            },
+        )
+        runs = [row[0] for row in cursor.fetchall()]
+    logger.debug('%d latest forecast runs of collection.id=%s', len(runs), collection_id)
+    return runs
@@ -0,0 +1,118 @@
+'''Spatial filter of the items by large geometries
+
+A geometry with tens of thousands of vertices (e.g. a canton or the country outline) given in the
+intersects parameter makes every candidate item run an expensive ST_Intersects against the whole
+geometry. Above INTERSECTS_SUBDIVIDE_THRESHOLD vertices, the geometry is therefore subdivided
+with ST_Subdivide into small pieces (at most INTERSECTS_SUBDIVIDE_MAX_VERTICES vertices each):
+the candidates are selected with the GiST index by the bounding box of the whole geometry, then
+matched against the bounding boxes of the pieces (&&) before the exact ST_Intersects on the small
+pieces only.
+
+The large geometries can additionally be simplified by INTERSECTS_SIMPLIFY_TOLERANCE (in degrees,
+disabled per default), the items at less than the tolerance from the boundary may then match
+differently.
+'''
+import logging
+
+from django.conf import settings
+from django.db.models import BooleanField
+from django.db.models import Expression
+from django.db.models import F
+from django.db.models import Q
+
+logger = logging.getLogger(__name__)
+
+
+class SubdividedIntersects(Expression):
+    '''Boolean expression, true when the geometry field intersects one of the pieces of the
+    geometry subdivided by ST_Subdivide
+
+    The pieces are computed once per query, PostgreSQL keeps the result of the function scan for
+    the rescans of the correlated subquery.
+    '''
+    conditional = True
+    output_field = BooleanField()
+    template = (
+        'EXISTS (SELECT 1 FROM ST_Subdivide(ST_GeomFromEWKB(%%s), %%s::integer) AS piece(geom) '
+        'WHERE %(field)s && piece.geom AND ST_Intersects(%(field)s, piece.geom))'
+    )
+
+    def __init__(self, field, geometry, max_vertices):
+        super().__init__()
+        self.geometry_field = F(field)
+        self.geometry = geometry
+        self.max_vertices = max_vertices
+
+    def get_source_expressions(self):
+        return [self.geometry_field]
+
+    def set_source_expressions(self, exprs):
+        (self.geometry_field,) = exprs
+
+    def as_sql(self, compiler, connection):  # pylint: disable=unused-argument
+        field_sql, field_params = compiler.compile(self.geometry_field)
+        params = [bytes(self.geometry.ewkb), self.max_vertices, *field_params, *field_params]
+        return self.template % {'field': field_sql}, params
+
+
+def simplify_geometry(geometry, tolerance=None):
+    '''Simplifies a large polygonal geometry by INTERSECTS_SIMPLIFY_TOLERANCE
+
+    The topology is preserved and the original geometry is kept when the simplification is not
+    valid or for the other geometry types.
+
+    Args:
+        geometry: GEOSGeometry
+        tolerance: float
+            Simplification tolerance in degrees, per default INTERSECTS_SIMPLIFY_TOLERANCE
+
+    Returns: GEOSGeometry
+    '''
+    if tolerance is None:
+        tolerance = settings.INTERSECTS_SIMPLIFY_TOLERANCE
+    if not tolerance or geometry.geom_type not in ['Polygon', 'MultiPolygon']:
+        return geometry
+    simplified = geometry.simplify(tolerance, preserve_topology=True)
+    if simplified.empty or not simplified.valid:
+        logger.warning(
+            'Geometry of %d vertices not simplified, the simplification is invalid',
+            geometry.num_coords
+        )
+        return geometry
+    simplified.srid = geometry.srid
+    logger.debug(
+        'Geometry simplified from %d to %d vertices', geometry.num_coords, simplified.num_coords
+    )
+    return simplified
+
+
+def intersects_condition(geometry, field='geometry', threshold=None, tolerance=None):
+    '''Returns the condition of the items intersecting a geometry
+
+    The geometries with more than INTERSECTS_SUBDIVIDE_THRESHOLD vertices are simplified and
+    subdivided, see the module documentation.
+
+    Args:
+        geometry: GEOSGeometry
+            Geometry in WGS84
+        field: string
+            Geometry field of the items
+        threshold: int
+            Number of vertices above which the geometry is subdivided, per default
+            INTERSECTS_SUBDIVIDE_THRESHOLD
+        tolerance: float
+            Simplification tolerance of the subdivided geometry, see simplify_geometry()
+
+    Returns: Q
+    '''
+    if threshold is None:
+        threshold = settings.INTERSECTS_SUBDIVIDE_THRESHOLD
+    if not threshold or geometry.num_coords <= threshold:
+        return Q(**{f'{field}__intersects': geometry})
+    if geometry.srid is None:
+        geometry = geometry.clone()
+        geometry.srid = 4326
+    geometry = simplify_geometry(geometry, tolerance)
+    return Q(**{f'{field}__bboverlaps': geometry.envelope}) & Q(
+        SubdividedIntersects(field, geometry, settings.INTERSECTS_SUBDIVIDE_MAX_VERTICES)
+    )
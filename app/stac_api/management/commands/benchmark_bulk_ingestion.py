@@ -0,0 +1,123 @@
+import itertools
+import time
+from datetime import UTC
+from datetime import datetime
+
+from django.db import transaction
+
+from stac_api.bulk_ingestion import ingest_items
+from stac_api.models.collection import Collection
+from stac_api.models.item import Asset
+from stac_api.models.item import Item
+from stac_api.serializers.item import ItemListSerializer
+from stac_api.utils import CustomBaseCommand
+from stac_api.utils import isoformat
+
+COLLECTION_NAME = 'test-benchmark-bulk-ingestion'
+ASSETS_HOST = 'https://data.geo.admin.ch'
+MAX_ITEMS_PER_REQUEST = 100
+
+
+def create_items_list(collection, features):
+    '''Creates the items like the items list POST endpoint, one request per 100 features'''
+    for chunk in itertools.batched(features, MAX_ITEMS_PER_REQUEST):
+        with transaction.atomic():
+            serializer = ItemListSerializer(
+                data={'features': list(chunk)},
+                context={
+                    'request': None, 'collection': collection, 'validate_href_reachability': False
+                }
+            )
+            serializer.is_valid(raise_exception=True)
+            serializer.save(collection=collection)
+
+
+def generate_features(count, reference_datetime):
+    for i in range(count):
+        yield {
+            'id': f'item-{i}',
+            'geometry': {
+                'type': 'Polygon',
+                'coordinates': [[[5.9, 45.8], [10.5, 45.8], [10.5, 47.8], [5.9, 47.8], [5.9, 45.8]]]
+            },
+            'properties': {
+                'datetime': isoformat(reference_datetime),
+                'forecast:reference_datetime': isoformat(reference_datetime),
+                'forecast:variable': f'variable-{i % 10}',
+                'forecast:horizon': f'PT{i // 10 % 61}H',
+            },
+            'links': [{
+                'rel': 'describedBy', 'href': f'{ASSETS_HOST}/describedby/item-{i}.json'
+            }],
+            'assets': {
+                f'item-{i}.grib2': {
+                    'type': 'application/x.grib2',
+                    'href': f'{ASSETS_HOST}/{COLLECTION_NAME}/item-{i}.grib2',
+                    'roles': ['data'],
+                }
+            },
+        }
+
+
+class Command(CustomBaseCommand):
+    help = """Bulk ingestion benchmark
+
+    Creates the same forecast items (with one link and one asset each) with the items list POST
+    endpoint implementation, 100 features per request, and with the bulk ingestion
+    (stac_api.bulk_ingestion), and compares the throughput in items per second. The bulk ingested
+    items are then republished with the bulk upsert.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--items', type=int, default=10000, help="Number of items")
+        parser.add_argument(
+            '--keep', action='store_true', help="Keep the benchmark collection and items"
+        )
+
+    def handle(self, *args, **options):
+        reference_datetime = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+        features = list(generate_features(options['items'], reference_datetime))
+        try:
+            collection = self.create_collection()
+            self.run('items list POST', lambda: create_items_list(collection, features))
+
+            collection = self.create_collection()
+            result = self.run('bulk ingestion', lambda: ingest_items(None, collection, features))
+            if result.errors_count:
+                self.print_error('Bulk ingestion errors: %s', result.errors)
+
+            result = self.run(
+                'bulk upsert of the unchanged items',
+                lambda: ingest_items(None, collection, features, upsert=True)
+            )
+            if result.unchanged != len(features):
+                self.print_error('%d items not unchanged', len(features) - result.unchanged)
+        finally:
+            if not options['keep']:
+                self.delete_collection()
+        self.print_success('Done')
+
+    def create_collection(self):
+        self.delete_collection()
+        return Collection.objects.create(
+            name=COLLECTION_NAME,
+            published=False,
+            allow_external_assets=True,
+            external_asset_whitelist=[ASSETS_HOST],
+        )
+
+    def delete_collection(self):
+        Asset.objects.filter(item__collection__name=COLLECTION_NAME).delete()
+        Item.objects.filter(collection__name=COLLECTION_NAME).delete()
+        Collection.objects.filter(name=COLLECTION_NAME).delete()
+
+    def run(self, name, func):
+        start = time.monotonic()
+        result = func()
+        duration = time.monotonic() - start
+        count = Item.objects.filter(collection__name=COLLECTION_NAME).count()
+        self.print_success(
+            '%s: %d items in %.1fs, %.0f items/s', name, count, duration, count / duration
+        )
+        return result
@@ -0,0 +1,106 @@
+import time
+
+from django.db.models import Max
+from django.db.models import Min
+from django.db.models import Q
+
+from stac_api.models.item import Item
+from stac_api.utils import CustomBaseCommand
+from stac_api.utils import isoformat
+
+
+def filter_by_datetime_range_or(queryset, start_datetime, end_datetime):
+    '''Datetime range filter using the datetime columns, as done before the datetime range
+
+    Used as reference for the benchmark.
+    '''
+    if start_datetime is None:
+        return queryset.filter(
+            Q(properties_datetime__lte=end_datetime) | Q(properties_end_datetime__lte=end_datetime)
+        )
+    if end_datetime is None:
+        return queryset.filter(
+            Q(properties_datetime__gte=start_datetime) |
+            Q(properties_start_datetime__gte=start_datetime)
+        )
+    return queryset.filter(
+        Q(properties_datetime__range=(start_datetime, end_datetime)) | (
+            Q(properties_start_datetime__gte=start_datetime) &
+            Q(properties_end_datetime__lte=end_datetime)
+        )
+    )
+
+
+class Command(CustomBaseCommand):
+    help = """Datetime filter benchmark
+
+    Compares the query plans and durations of the datetime query parameter filter using the
+    GiST indexed properties_datetime_range (ItemQuerySet.filter_by_datetime) with the previous
+    filter on the datetime columns (OR of B-tree indexed comparisons). Closed, open start and open
+    end ranges are tested on the items of the DB configured in the django settings, which should
+    contain a few million items (e.g. created with populate_testdb).
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--collection',
+            type=str,
+            default=None,
+            help="Only benchmark the items of this collection ID"
+        )
+        parser.add_argument(
+            '--fraction',
+            type=float,
+            default=0.01,
+            help="Fraction of the items datetime span covered by the query ranges"
+        )
+        parser.add_argument('--repeat', type=int, default=5, help="Number of runs per query")
+        parser.add_argument(
+            '--plans', action='store_true', help="Print the EXPLAIN ANALYZE output of the queries"
+        )
+
+    def handle(self, *args, **options):
+        queryset = Item.objects.all()
+        if options['collection']:
+            queryset = queryset.filter(collection__name=options['collection'])
+        span = queryset.aggregate(
+            start=Min('properties_datetime_range__startswith'),
+            end=Max('properties_datetime_range__endswith')
+        )
+        if span['start'] is None:
+            self.print_error('No items to benchmark')
+            return
+        middle = span['start'] + (span['end'] - span['start']) / 2
+        width = (span['end'] - span['start']) * options['fraction']
+        start, end = middle - width / 2, middle + width / 2
+        ranges = {
+            'closed': (start, end),
+            'open start': (None, span['start'] + width),
+            'open end': (span['end'] - width, None),
+        }
+
+        for name, (range_start, range_end) in ranges.items():
+            query = f'{isoformat(range_start) if range_start else ".."}/' \
+                f'{isoformat(range_end) if range_end else ".."}'
+            self.print_success('%s range %s:', name, query)
+            self.run('columns OR', filter_by_datetime_range_or(queryset, range_start, range_end))
+            self.run('datetime range', queryset.filter_by_datetime(query))
+        self.print_success('Done')
+
+    def run(self, name, queryset):
+        queryset = queryset.select_related(None).values('pk')
+        durations = []
+        for _ in range(self.options['repeat']):
+            start = time.monotonic()
+            count = queryset.count()
+            durations.append(time.monotonic() - start)
+        self.print_success(
+            '    %s: %d items, min %.2fms, max %.2fms',
+            name,
+            count,
+            min(durations) * 1000,
+            max(durations) * 1000
+        )
+        if self.options['plans']:
+            self.print_success(queryset.explain(analyze=True, buffers=True))
@@ -0,0 +1,133 @@
+import itertools
+import time
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from django.db import transaction
+
+from stac_api.forecast_runs import get_latest_forecast_runs
+from stac_api.models.collection import Collection
+from stac_api.models.item import Item
+from stac_api.utils import CustomBaseCommand
+
+COLLECTION_NAME = 'test-benchmark-forecast-runs'
+
+
+def get_latest_forecast_runs_distinct(collection_id, limit):
+    '''Latest runs with a DISTINCT over all the items of the collection, used as reference'''
+    queryset = Item.objects.filter(
+        collection_id=collection_id, forecast_reference_datetime__isnull=False
+    ).order_by('-forecast_reference_datetime')
+    runs = queryset.values_list('forecast_reference_datetime', flat=True).distinct()
+    return list(runs[:limit])
+
+
+class Command(CustomBaseCommand):
+    help = """Forecast runs benchmark
+
+    Creates a forecast collection with one item per run, variable, horizon and ensemble member
+    (per default 16 runs of 10 variables, 61 hourly horizons and 21 members, ~200k items, similar
+    to an ICON-CH2-EPS collection) and compares the latest runs lookup with the loose index scan
+    (stac_api.forecast_runs) to a DISTINCT over the items, and measures the forecast query shape
+    (run, variable and horizon) answered by the item_fc_run_idx index.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('--runs', type=int, default=16, help="Number of forecast runs")
+        parser.add_argument(
+            '--run-interval', type=int, default=6, help="Hours between two forecast runs"
+        )
+        parser.add_argument('--variables', type=int, default=10, help="Number of variables")
+        parser.add_argument('--horizons', type=int, default=61, help="Number of hourly horizons")
+        parser.add_argument('--members', type=int, default=21, help="Number of ensemble members")
+        parser.add_argument('--limit', type=int, default=4, help="Number of latest runs")
+        parser.add_argument('--repeat', type=int, default=5, help="Number of runs per query")
+        parser.add_argument(
+            '--keep', action='store_true', help="Keep the benchmark collection and items"
+        )
+        parser.add_argument(
+            '--plans', action='store_true', help="Print the EXPLAIN ANALYZE output of the queries"
+        )
+
+    def handle(self, *args, **options):
+        collection = self.create_collection()
+        try:
+            collection_id = collection.pk
+            limit = options['limit']
+            runs = get_latest_forecast_runs_distinct(collection_id, limit)
+            self.run(
+                'latest runs, DISTINCT',
+                lambda: get_latest_forecast_runs_distinct(collection_id, limit)
+            )
+            self.run(
+                'latest runs, loose index scan',
+                lambda: get_latest_forecast_runs(collection_id, limit)
+            )
+            if get_latest_forecast_runs(collection_id, limit) != runs:
+                self.print_error('The latest runs differ')
+
+            queryset = Item.objects.filter(
+                collection_id=collection_id,
+                forecast_reference_datetime=runs[0],
+                forecast_variable='variable-0',
+                forecast_horizon=timedelta(hours=12),
+            ).values('pk')
+            self.run('items of a run, variable and horizon', queryset.count)
+            if options['plans']:
+                self.print_success(queryset.explain(analyze=True, buffers=True))
+        finally:
+            if not options['keep']:
+                self.delete_collection()
+        self.print_success('Done')
+
+    def create_collection(self):
+        self.delete_collection()
+        options = self.options
+        collection = Collection.objects.create(name=COLLECTION_NAME, published=False)
+        latest = datetime.now(UTC).replace(minute=0, second=0, microsecond=0)
+        combinations = itertools.product(
+            range(options['runs']),
+            range(options['variables']),
+            range(options['horizons']),
+            range(options['members']),
+        )
+        items = (
+            Item(
+                collection=collection,
+                name=f'run-{run}-variable-{variable}-horizon-{horizon}-member-{member}',
+                properties_datetime=latest,
+                forecast_reference_datetime=latest - timedelta(hours=run * options['run_interval']),
+                forecast_variable=f'variable-{variable}',
+                forecast_horizon=timedelta(hours=horizon),
+                forecast_perturbed=member > 0,
+            ) for run, variable, horizon, member in combinations
+        )
+        start = time.monotonic()
+        count = 0
+        with transaction.atomic():
+            while batch := list(itertools.islice(items, 10000)):
+                Item.objects.bulk_create(batch)
+                count += len(batch)
+        self.print_success(
+            'Collection %s created with %d items in %.1fs',
+            COLLECTION_NAME,
+            count,
+            time.monotonic() - start,
+        )
+        return collection
+
+    def delete_collection(self):
+        Item.objects.filter(collection__name=COLLECTION_NAME).delete()
+        Collection.objects.filter(name=COLLECTION_NAME).delete()
+
+    def run(self, name, func):
+        durations = []
+        for _ in range(self.options['repeat']):
+            start = time.monotonic()
+            func()
+            durations.append(time.monotonic() - start)
+        self.print_success(
+            '%s: min %.2fms, max %.2fms', name, min(durations) * 1000, max(durations) * 1000
+        )
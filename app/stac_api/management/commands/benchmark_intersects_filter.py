@@ -0,0 +1,117 @@
+import json
+import math
+import time
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.contrib.gis.geos import Polygon
+
+from stac_api.intersects import intersects_condition
+from stac_api.models.item import Item
+from stac_api.utils import CustomBaseCommand
+
+
+def make_boundary(vertices):
+    '''Jagged polygon of the given number of vertices over Switzerland, used when no boundaries
+    file is given'''
+    coordinates = []
+    for i in range(vertices):
+        angle = 2 * math.pi * i / vertices
+        radius = 1 + 0.1 * math.sin(37 * angle) + 0.05 * math.sin(301 * angle)
+        coordinates.append(
+            (8.23 + 1.9 * radius * math.cos(angle), 46.8 + 0.9 * radius * math.sin(angle))
+        )
+    coordinates.append(coordinates[0])
+    return Polygon(coordinates, srid=4326)
+
+
+def read_boundaries(path):
+    '''Reads the geometries of a GeoJSON file (FeatureCollection, Feature or geometry)'''
+    with open(path, encoding='utf-8') as fd:
+        data = json.load(fd)
+    if data['type'] == 'FeatureCollection':
+        features = data['features']
+    elif data['type'] == 'Feature':
+        features = [data]
+    else:
+        features = [{'properties': {}, 'geometry': data}]
+    for i, feature in enumerate(features):
+        properties = feature.get('properties') or {}
+        name = properties.get('name') or properties.get('NAME') or f'{path}[{i}]'
+        yield name, GEOSGeometry(json.dumps(feature['geometry']))
+
+
+class Command(CustomBaseCommand):
+    help = """Intersects filter benchmark
+
+    Compares the durations of the intersects filter with the geometries subdivided by
+    ST_Subdivide (stac_api.intersects.intersects_condition) and with the plain ST_Intersects against the
+    whole geometries, on the items of the DB configured in the django settings (e.g. created with
+    dummy_data, whose items are spread over Switzerland).
+
+    The geometries are read from GeoJSON files in WGS84, e.g. the cantons and the country outline
+    of swissBOUNDARIES3D, or are generated with the given number of vertices.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--boundaries',
+            type=str,
+            nargs='+',
+            default=[],
+            help="GeoJSON files with the boundary polygons in WGS84"
+        )
+        parser.add_argument(
+            '--vertices',
+            type=int,
+            nargs='+',
+            default=[1000, 10000, 50000],
+            help="Number of vertices of the generated polygons, without boundaries files"
+        )
+        parser.add_argument(
+            '--simplify',
+            type=float,
+            default=0.0,
+            help="Simplification tolerance in degrees of the subdivided geometries"
+        )
+        parser.add_argument('--repeat', type=int, default=5, help="Number of runs per query")
+        parser.add_argument(
+            '--plans', action='store_true', help="Print the EXPLAIN ANALYZE output of the queries"
+        )
+
+    def handle(self, *args, **options):
+        for name, geometry in self.get_geometries():
+            self.print_success('%s (%d vertices):', name, geometry.num_coords)
+            self.run('whole geometry', Item.objects.filter(geometry__intersects=geometry))
+            self.run(
+                'subdivided',
+                Item.objects.filter(
+                    intersects_condition(geometry, threshold=1, tolerance=options['simplify'])
+                )
+            )
+        self.print_success('Done')
+
+    def get_geometries(self):
+        if self.options['boundaries']:
+            for path in self.options['boundaries']:
+                yield from read_boundaries(path)
+        else:
+            for vertices in self.options['vertices']:
+                yield f'{vertices} vertices', make_boundary(vertices)
+
+    def run(self, name, queryset):
+        queryset = queryset.values('pk')
+        durations = []
+        for _ in range(self.options['repeat']):
+            start = time.monotonic()
+            count = queryset.count()
+            durations.append(time.monotonic() - start)
+        self.print_success(
+            '    %s: %d items, min %.2fms, max %.2fms',
+            name,
+            count,
+            min(durations) * 1000,
+            max(durations) * 1000
+        )
+        if self.options['plans']:
+            self.print_success(queryset.explain(analyze=True, buffers=True))
@@ -0,0 +1,101 @@
+import json
+import time
+from datetime import UTC
+from datetime import datetime
+from statistics import mean
+
+from helpers.renderers import GeoJSONRenderer
+from helpers.renderers import OrjsonGeoJSONRenderer
+from helpers.renderers import OrjsonRenderer
+
+from django.conf import settings
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.test import APIRequestFactory
+
+from stac_api.models.item import Item
+from stac_api.serializers.item import ItemSerializer
+from stac_api.utils import CustomBaseCommand
+
+STAC_BASE_V = f'{settings.STAC_BASE}/v1'
+
+RENDERERS = [JSONRenderer, OrjsonRenderer, GeoJSONRenderer, OrjsonGeoJSONRenderer]
+
+
+class Command(CustomBaseCommand):
+    help = """JSON renderers benchmark
+
+    Compares the rendering time of the DRF JSON renderers with the orjson renderers (see the
+    JSON_RENDERER setting) on item pages serialized from the DB, like the items list endpoint.
+    The rendered pages are also checked to be equivalent.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--collection',
+            type=str,
+            default='perftest-collection-0',
+            help="Collection ID of the items to render"
+        )
+        parser.add_argument('--limit', type=int, default=100, help="Number of items per page")
+        parser.add_argument('--pages', type=int, default=10, help="Number of pages to render")
+        parser.add_argument(
+            '--repeat', type=int, default=10, help="Number of times each page is rendered"
+        )
+
+    def handle(self, *args, **options):
+        pages = self.get_pages()
+        self.print_success(
+            'Rendering %d pages of %d items %d times...',
+            len(pages),
+            self.options['limit'],
+            self.options['repeat']
+        )
+        expected = {}
+        for renderer_class in RENDERERS:
+            renderer = renderer_class()
+            durations = []
+            size = 0
+            for index, page in enumerate(pages):
+                for _ in range(self.options['repeat']):
+                    start = time.perf_counter()
+                    content = renderer.render(page)
+                    durations.append(time.perf_counter() - start)
+                size += len(content)
+                output = json.loads(content)
+                if expected.setdefault((renderer.format, index), output) != output:
+                    self.print_error(
+                        '%s output of page %d differs from the %s renderer',
+                        renderer_class.__name__,
+                        index,
+                        renderer.format
+                    )
+            self.print_success('%s:', renderer_class.__name__)
+            self.print_success('    min: %.2fms', min(durations) * 1000)
+            self.print_success('    max: %.2fms', max(durations) * 1000)
+            self.print_success('    average: %.2fms', mean(durations) * 1000)
+            self.print_success('    average page size: %dkB', size / len(pages) / 1024)
+        self.print_success('Done')
+
+    def get_pages(self):
+        '''Serialize item pages as done by the items list endpoint
+
+        Returns:
+            List of the serialized pages
+        '''
+        collection = self.options['collection']
+        context = {
+            'request': APIRequestFactory().get(f'{STAC_BASE_V}/collections/{collection}/items')
+        }
+        items = Item.objects.filter(collection__name=collection
+                                   ).prefetch_related('assets', 'links').order_by('name')
+        limit = self.options['limit']
+        return [{
+            'type': 'FeatureCollection',
+            'timeStamp': datetime.now(UTC),
+            'features':
+                ItemSerializer(items[page * limit:(page + 1) * limit], context=context,
+                               many=True).data,
+            'links': [],
+        } for page in range(self.options['pages'])]
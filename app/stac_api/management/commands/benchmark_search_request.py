@@ -0,0 +1,105 @@
+import json
+import math
+import time
+
+from django.contrib.gis.geos import GEOSGeometry
+
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from stac_api.models.item import Item
+from stac_api.search_request import SearchRequest
+from stac_api.utils import CustomBaseCommand
+from stac_api.validators import validate_geometry
+
+
+def parse_search_request_legacy(request):
+    '''Search request parsing as done before the SearchRequest, used as reference
+
+    The parameters were harmonized once by the validation and once by the queryset filtering,
+    the query and intersects parameters were converted from and to JSON at each step.
+    '''
+    for _ in range(2):
+        query_param = request.data.copy()
+        query_param['query'] = json.dumps(query_param['query'])
+        json.loads(query_param['query'])
+        geometry = GEOSGeometry(json.dumps(query_param['intersects']))
+    validate_geometry(geometry)
+    queryset = Item.objects.all()
+    queryset = queryset.filter_by_query(json.loads(query_param['query']))
+    return queryset.filter_by_intersects(json.dumps(query_param['intersects']))
+
+
+def parse_search_request(request):
+    return SearchRequest.from_request(request).filter_queryset(Item.objects.all())
+
+
+class Command(CustomBaseCommand):
+    help = """Search request parsing benchmark
+
+    Compares the CPU time spent to parse a POST search request with a large intersects polygon
+    into the filtered queryset, using the SearchRequest (parsed once) and the previous parsing
+    (parameters harmonized twice and JSON round trips). No DB query is made.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--vertices',
+            type=int,
+            nargs='+',
+            default=[100, 1000, 10000],
+            help="Number of vertices of the intersects polygons"
+        )
+        parser.add_argument('--repeat', type=int, default=50, help="Number of runs per request")
+
+    def handle(self, *args, **options):
+        for vertices in options['vertices']:
+            request = self.make_request(vertices)
+            legacy = self.run(parse_search_request_legacy, request)
+            current = self.run(parse_search_request, request)
+            self.print_success(
+                '%d vertices: previous %.3fms, search request %.3fms, saved %.3fms per request',
+                vertices,
+                legacy * 1000,
+                current * 1000,
+                (legacy - current) * 1000,
+            )
+        self.print_success('Done')
+
+    def make_request(self, vertices):
+        # circle around Bern
+        coordinates = [[
+            7.44 + 0.5 * math.cos(2 * math.pi * i / vertices),
+            46.95 + 0.3 * math.sin(2 * math.pi * i / vertices)
+        ] for i in range(vertices)]
+        coordinates.append(coordinates[0])
+        request = APIRequestFactory().post(
+            '/search',
+            {
+                'intersects': {
+                    'type': 'Polygon', 'coordinates': [coordinates]
+                },
+                'query': {
+                    'title': {
+                        'startsWith': 'a'
+                    }
+                },
+                'limit': 100
+            },
+            format='json'
+        )
+        # the body is parsed once by the DRF request, for both parsings
+        request = Request(request, parsers=[JSONParser()])
+        request.data  # pylint: disable=pointless-statement
+        return request
+
+    def run(self, func, request):
+        '''Returns the minimum CPU time of the function over the runs'''
+        durations = []
+        for _ in range(self.options['repeat']):
+            start = time.process_time()
+            func(request)
+            durations.append(time.process_time() - start)
+        return min(durations)
@@ -1,4 +1,5 @@
 import time
+from concurrent.futures import ThreadPoolExecutor
 
 from django.core.management.base import CommandParser
 from django.db import connection
@@ -17,6 +18,8 @@ def boolean_input(question, default=None):
 class Command(CustomBaseCommand):
     help = """Calculate the collection spacial and temporal extent for all collections that have
     'extent_out_of_sync' set to true. After update, 'extent_out_of_sync' will be set to False.
+    The extents are grown in place by the item triggers, only the changes that might shrink an
+    extent set 'extent_out_of_sync'.
     This command is thought to be scheduled as cron job.
     """
 
@@ -28,6 +31,13 @@ class Command(CustomBaseCommand):
         parser.add_argument(
             '-f', '--force', action='store_true', help='Run all without confirmation'
         )
+        parser.add_argument(
+            '-p',
+            '--parallel',
+            type=int,
+            default=1,
+            help='Number of parallel DB connections used to update the extents'
+        )
 
     def handle(self, *args, **options):
         self.print_success('running command to update collection extents')
@@ -49,46 +59,78 @@ class Command(CustomBaseCommand):
                 return
 
         start = time.monotonic()
-        with connection.cursor() as cursor:
-            for collection_id in collections:
-                cursor.execute(
-                    """
-                    -- Compute collection extent
-                    WITH collection_extent AS (
-                        SELECT
-                            item.collection_id,
-                            ST_SetSRID(ST_EXTENT(item.geometry),4326) as extent_geometry,
-                            MIN(LEAST(item.properties_datetime, item.properties_start_datetime))
-                                as extent_start_datetime,
-                            MAX(GREATEST(item.properties_datetime, item.properties_end_datetime))
-                                as extent_end_datetime
-                        FROM stac_api_item AS item
-                        WHERE item.collection_id = %s
-                          AND (
-                            item.properties_expires IS NULL OR
-                            item.properties_expires > NOW()
-                        ) GROUP BY item.collection_id
-                    UNION
-                        -- This covers the case that the last item of a collection is deleted.
-                        SELECT %s AS collection_id, NULL, NULL, NULL
-                    ORDER BY extent_geometry, extent_start_datetime, extent_end_datetime
-                    LIMIT 1
+        collections = list(collections)
+        parallel = max(1, min(options['parallel'], len(collections)))
+        if parallel > 1:
+            # Split the collections over parallel connections
+            with ThreadPoolExecutor(max_workers=parallel) as executor:
+                updated = sum(
+                    executor.map(
+                        self.update_extents_in_thread,
+                        [collections[i::parallel] for i in range(parallel)]
                     )
-                    -- Update related collection extent
-                    UPDATE stac_api_collection SET
-                        extent_out_of_sync = FALSE,
-                        extent_geometry = collection_extent.extent_geometry,
-                        extent_start_datetime = collection_extent.extent_start_datetime,
-                        extent_end_datetime = collection_extent.extent_end_datetime
-                    FROM collection_extent
-                    WHERE id = collection_extent.collection_id;
-                    """, [collection_id, collection_id]
-                )
-                self.print_success(
-                    f"collection.id={collection_id} extent updated.",
-                    extra={"collection": collection_id}
                 )
+        else:
+            updated = self.update_extents(collections)
         self.print_success(
-            f"successfully updated extent of {len(collections)} collections",
+            f"successfully updated extent of {updated} collections",
             extra={"duration": time.monotonic() - start}
         )
+
+    def update_extents_in_thread(self, collections):
+        try:
+            return self.update_extents(collections)
+        finally:
+            connection.close()
+
+    def update_extents(self, collections):
+        '''Recompute the extent of the given collections in one statement
+
+        Args:
+            collections: list
+                Collection ids
+
+        Returns:
+            Number of updated collections
+        '''
+        with connection.cursor() as cursor:
+            cursor.execute(
+                """
+                -- Compute collections extent, using the precomputed item bbox
+                WITH collection_extent AS (
+                    SELECT
+                        collection.id AS collection_id,
+                        ST_SetSRID(ST_MakeBox2D(
+                            ST_Point(MIN(item.bbox_xmin), MIN(item.bbox_ymin)),
+                            ST_Point(MAX(item.bbox_xmax), MAX(item.bbox_ymax))
+                        )::geometry, 4326) as extent_geometry,
+                        MIN(LEAST(item.properties_datetime, item.properties_start_datetime))
+                            as extent_start_datetime,
+                        MAX(GREATEST(item.properties_datetime, item.properties_end_datetime))
+                            as extent_end_datetime
+                    FROM stac_api_collection AS collection
+                    -- The left join covers the case that the last item of a collection is deleted
+                    LEFT JOIN stac_api_item AS item
+                        ON item.collection_id = collection.id
+                        AND (item.properties_expires IS NULL OR item.properties_expires > NOW())
+                    WHERE collection.id = ANY(%s)
+                    GROUP BY collection.id
+                )
+                -- Update related collections extent
+                UPDATE stac_api_collection SET
+                    extent_out_of_sync = FALSE,
+                    extent_geometry = collection_extent.extent_geometry,
+                    extent_start_datetime = collection_extent.extent_start_datetime,
+                    extent_end_datetime = collection_extent.extent_end_datetime
+                FROM collection_extent
+                WHERE id = collection_extent.collection_id
+                RETURNING id
+                """, [collections]
+            )
+            updated = [row[0] for row in cursor.fetchall()]
+        for collection_id in updated:
+            self.print_success(
+                f"collection.id={collection_id} extent updated.",
+                extra={"collection": collection_id}
+            )
+        return len(updated)
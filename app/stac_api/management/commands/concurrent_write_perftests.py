@@ -0,0 +1,149 @@
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from statistics import mean
+
+from django.core.management import call_command
+from django.db import connection
+from django.db import transaction
+from django.utils import timezone
+
+from stac_api.models.collection import Collection
+from stac_api.models.collection import CollectionDelta
+from stac_api.models.item import Item
+from stac_api.pgtriggers import DEFERRED_COLLECTION_UPDATES
+from stac_api.utils import CustomBaseCommand
+
+ITEM_PREFIX = 'perftest-concurrent-item'
+
+
+class Command(CustomBaseCommand):
+    help = """Run concurrent write performance tests
+
+    N parallel writers create, update and delete items of the same collection, each write in its
+    own transaction. The test is run with the direct collection updates and with the deferred
+    collection updates (see COLLECTION_UPDATES_DEFERRED) in order to compare the lock contention
+    on the collection row.
+
+    This command writes directly into the DB configured in the django settings.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--collection',
+            type=str,
+            default='perftest-collection-1',
+            help="Collection on which to run the tests."
+        )
+        parser.add_argument('--writers', type=int, default=8, help="Number of parallel writers")
+        parser.add_argument('-n', type=int, default=50, help="Number of items per writer")
+        parser.add_argument(
+            '--mode',
+            type=str,
+            choices=['direct', 'deferred', 'both'],
+            default='both',
+            help="Collection updates mode to test"
+        )
+
+    def handle(self, *args, **options):
+        collection = Collection.objects.get(name=options['collection'])
+        modes = ['direct', 'deferred'] if options['mode'] == 'both' else [options['mode']]
+        for mode in modes:
+            self.run(collection, mode)
+        self.print_success('Done')
+
+    def run(self, collection, mode):
+        self.print_success(
+            'Starting %s mode with %d writers of %d items...',
+            mode,
+            self.options['writers'],
+            self.options['n']
+        )
+        lock_waits = []
+        stop_sampling = threading.Event()
+        sampler = threading.Thread(target=self.sample_lock_waits, args=(lock_waits, stop_sampling))
+        sampler.start()
+        start = time.monotonic()
+        try:
+            with ThreadPoolExecutor(max_workers=self.options['writers']) as executor:
+                results = list(
+                    executor.map(
+                        lambda writer: self.write(collection, writer, mode == 'deferred'),
+                        range(self.options['writers'])
+                    )
+                )
+        finally:
+            stop_sampling.set()
+            sampler.join()
+        total_duration = time.monotonic() - start
+        durations = [duration for result in results for duration in result]
+
+        self.print_success('    writes: %d in %.3fs', len(durations), total_duration)
+        self.print_success('    throughput: %.1f writes/s', len(durations) / total_duration)
+        self.print_success('    min: %.2fms', min(durations) * 1000)
+        self.print_success('    max: %.2fms', max(durations) * 1000)
+        self.print_success('    average: %.2fms', mean(durations) * 1000)
+        self.print_success(
+            '    samples with lock waits: %d/%d',
+            sum(1 for waiting in lock_waits if waiting),
+            len(lock_waits)
+        )
+        self.print_success('    max sessions waiting: %d', max(lock_waits, default=0))
+        if mode == 'deferred':
+            self.print_success(
+                '    pending deltas: %d',
+                CollectionDelta.objects.filter(collection=collection).count()
+            )
+            start = time.monotonic()
+            call_command('consolidate_collection_deltas', debounce=0, max_delay=0, verbosity=0)
+            self.print_success('    consolidation: %.3fs', time.monotonic() - start)
+
+    def write(self, collection, writer, deferred):
+        '''Create, update and delete n items, each write in its own transaction
+
+        Returns:
+            List of the write durations
+        '''
+        durations = []
+        try:
+            with connection.cursor() as cursor:
+                cursor.execute(
+                    "SELECT set_config(%s, %s, false)",
+                    [DEFERRED_COLLECTION_UPDATES, 'on' if deferred else 'off']
+                )
+            for i in range(self.options['n']):
+                name = f'{ITEM_PREFIX}-{writer}-{i}'
+                start = time.monotonic()
+                with transaction.atomic():
+                    item = Item.objects.create(
+                        collection=collection, name=name, properties_datetime=timezone.now()
+                    )
+                durations.append(time.monotonic() - start)
+
+                start = time.monotonic()
+                with transaction.atomic():
+                    item.properties_title = f'{name} updated'
+                    item.properties_datetime = timezone.now()
+                    item.save()
+                durations.append(time.monotonic() - start)
+
+                start = time.monotonic()
+                with transaction.atomic():
+                    item.delete()
+                durations.append(time.monotonic() - start)
+        finally:
+            connection.close()
+        return durations
+
+    def sample_lock_waits(self, samples, stop):
+        try:
+            with connection.cursor() as cursor:
+                while not stop.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'"
+                    )
+                    samples.append(cursor.fetchone()[0])
+                    stop.wait(0.01)
+        finally:
+            connection.close()
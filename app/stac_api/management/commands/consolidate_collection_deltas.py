@@ -0,0 +1,111 @@
+import time
+
+from django.core.management.base import CommandParser
+from django.db import connection
+from django.db import transaction
+
+from stac_api.utils import CustomBaseCommand
+
+
+class Command(CustomBaseCommand):
+    help = """Fold the pending collection deltas into the collections.
+
+    When the deferred collection updates are enabled (COLLECTION_UPDATES_DEFERRED), the item
+    writes append their collection changes (etag/updated, total_data_size, permanent_items_count,
+    extent_out_of_sync) to the stac_api_collectiondelta table. This command consolidates them, a
+    collection is only consolidated once it had no new changes during --debounce seconds, or when
+    its oldest pending change is older than --max-delay seconds.
+
+    This command is thought to run continuously with --loop, or to be scheduled as cron job.
+    """
+
+    def add_arguments(self, parser: CommandParser) -> None:
+        super().add_arguments(parser)
+        parser.add_argument(
+            '--debounce',
+            type=float,
+            default=2,
+            help="Consolidate a collection only when it had no changes during this time in seconds"
+        )
+        parser.add_argument(
+            '--max-delay',
+            type=float,
+            default=30,
+            help="Maximum delay in seconds after which a collection is consolidated even if it "
+            "still receives changes"
+        )
+        parser.add_argument('--loop', action='store_true', help='Run continuously')
+        parser.add_argument(
+            '--interval',
+            type=float,
+            default=1,
+            help="Interval in seconds between two consolidations when running with --loop"
+        )
+
+    def handle(self, *args, **options):
+        self.print_success('running command to consolidate the collection deltas')
+        while True:
+            start = time.monotonic()
+            collections = self.consolidate()
+            if collections:
+                self.print_success(
+                    "%d collections consolidated in %.3fs",
+                    len(collections),
+                    time.monotonic() - start,
+                    extra={"collections": collections}
+                )
+            if not self.options['loop']:
+                break
+            time.sleep(self.options['interval'])
+
+    def consolidate(self):
+        '''Fold the deltas of the collections that are ready into the collections
+
+        Returns:
+            List of the consolidated collection ids
+        '''
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute(
+                """
+                WITH ready_collection AS (
+                    SELECT collection_id
+                    FROM stac_api_collectiondelta
+                    GROUP BY collection_id
+                    HAVING MAX(created) < now() - make_interval(secs => %(debounce)s)
+                        OR MIN(created) < now() - make_interval(secs => %(max_delay)s)
+                ), consumed_delta AS (
+                    DELETE FROM stac_api_collectiondelta AS delta
+                    USING ready_collection
+                    WHERE delta.collection_id = ready_collection.collection_id
+                    RETURNING
+                        delta.collection_id,
+                        delta.total_data_size,
+                        delta.permanent_items_count,
+                        delta.extent_out_of_sync
+                ), collection_delta AS (
+                    SELECT
+                        collection_id,
+                        SUM(total_data_size) AS total_data_size,
+                        SUM(permanent_items_count) AS permanent_items_count,
+                        bool_or(extent_out_of_sync) AS extent_out_of_sync
+                    FROM consumed_delta
+                    GROUP BY collection_id
+                )
+                UPDATE stac_api_collection AS collection SET
+                    updated = now(),
+                    etag = public.gen_random_uuid(),
+                    total_data_size =
+                        collection.total_data_size + collection_delta.total_data_size,
+                    permanent_items_count =
+                        collection.permanent_items_count + collection_delta.permanent_items_count,
+                    extent_out_of_sync =
+                        collection.extent_out_of_sync OR collection_delta.extent_out_of_sync
+                FROM collection_delta
+                WHERE collection.id = collection_delta.collection_id
+                RETURNING collection.id
+                """, {
+                    'debounce': self.options['debounce'],
+                    'max_delay': self.options['max_delay'],
+                }
+            )
+            return [row[0] for row in cursor.fetchall()]
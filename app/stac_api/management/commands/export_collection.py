@@ -0,0 +1,89 @@
+import sys
+from urllib.parse import urlparse
+
+from helpers.renderers import GeoJSONSeqRenderer
+from helpers.renderers import NDJSONRenderer
+
+from django.conf import settings
+from django.core.management.base import CommandError
+
+from rest_framework.test import APIRequestFactory
+
+from stac_api.collection_registry import get_collection
+from stac_api.export import get_collection_items
+from stac_api.export import iter_features
+from stac_api.utils import CustomBaseCommand
+
+STAC_BASE_V = f'{settings.STAC_BASE}/v1'
+
+RENDERERS = {renderer.format: renderer for renderer in [NDJSONRenderer, GeoJSONSeqRenderer]}
+
+
+class Command(CustomBaseCommand):
+    help = """Export all the items of a collection
+
+    The items are written as newline delimited json (or GeoJSON text sequence), one feature per
+    line, like the collection export endpoint. The items are read with a server-side cursor,
+    therefore the memory usage is constant whatever the size of the collection.
+    """
+
+    def add_arguments(self, parser):
+        super().add_arguments(parser)
+        parser.add_argument('collection', type=str, help="Collection ID to export")
+        parser.add_argument(
+            '--output', type=str, default='-', help="Output file, per default the stdout"
+        )
+        parser.add_argument(
+            '--format',
+            type=str,
+            choices=list(RENDERERS),
+            default=NDJSONRenderer.format,
+            help="Output format"
+        )
+        parser.add_argument('--bbox', type=str, default=None, help="Filter the items by bbox")
+        parser.add_argument(
+            '--datetime', type=str, default=None, help="Filter the items by datetime"
+        )
+        parser.add_argument(
+            '--chunk-size',
+            type=int,
+            default=settings.EXPORT_CHUNK_SIZE,
+            help="Number of items fetched and serialized at once"
+        )
+        parser.add_argument(
+            '--base-url',
+            type=str,
+            default='http://localhost',
+            help="Base URL of the links and asset hrefs, its host must be in ALLOWED_HOSTS"
+        )
+
+    def handle(self, *args, **options):
+        collection = options['collection']
+        if get_collection(collection) is None:
+            raise CommandError(f'The collection {collection} does not exist')
+
+        base_url = urlparse(options['base_url'])
+        request = APIRequestFactory().get(
+            f'/{STAC_BASE_V}/collections/{collection}/export',
+            secure=base_url.scheme == 'https',
+            HTTP_HOST=base_url.netloc
+        )
+        queryset = get_collection_items(
+            collection, bbox=options['bbox'], date_time=options['datetime']
+        )
+        lines = RENDERERS[options['format']]().render_lines(
+            iter_features(request, queryset, chunk_size=options['chunk_size'])
+        )
+
+        if options['output'] == '-':
+            # the summary is not printed as it would be mixed with the exported items
+            for line in lines:
+                sys.stdout.buffer.write(line)
+            return
+
+        count = 0
+        with open(options['output'], 'wb') as output:
+            for line in lines:
+                output.write(line)
+                count += 1
+        self.print_success('%d items of %s exported to %s', count, collection, options['output'])
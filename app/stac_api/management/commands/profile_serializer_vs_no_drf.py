@@ -35,6 +35,7 @@ class Command(CustomBaseCommand):
 
         self.print('Starting profiling')
         from stac_api.serializers.item import ItemSerializer
+        from stac_api.serializers.item_db import serialize_items
 
         def serialize(qs):
             return {
@@ -94,5 +95,14 @@ class Command(CustomBaseCommand):
         self.print(json.dumps(serialize(qs), indent=2))
         no_drf_time = timeit(stmt='serialize(qs)', number=self.options['repeat'], globals=locals())
 
+        request = context['request']
+        item_ids = list(qs.values_list('pk', flat=True))
+        db_time = timeit(
+            stmt="serialize_items(request, item_ids, asset_ordering='name')",
+            number=self.options['repeat'],
+            globals=locals()
+        )
+
         self.print_success('DRF time: %fms', serializer_time / self.options['repeat'] * 1000)
         self.print_success('NO DRF time: %fms', no_drf_time / self.options['repeat'] * 1000)
+        self.print_success('DB rendering time: %fms', db_time / self.options['repeat'] * 1000)
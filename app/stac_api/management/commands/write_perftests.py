@@ -1,9 +1,12 @@
+import threading
 import time
+from concurrent.futures import ThreadPoolExecutor
 from statistics import mean
 
 import requests
 
 from django.contrib.gis.geos import GEOSGeometry
+from django.db import connection
 
 from stac_api.utils import CustomBaseCommand
 from stac_api.validators import get_media_type
@@ -55,6 +58,11 @@ class Command(CustomBaseCommand):
     1. create n (items | assets)
     2. update n (items | assets)
     3. delete n (items | assets)
+
+    With the bulk-items object type, n bulk POST requests of --bulk-size items are sent by
+    --concurrency parallel clients. The time spent in the pgtrigger functions (requires
+    track_functions = 'pl' on the DB) and the number of sessions waiting on a lock are taken from
+    the DB configured in the django settings, which therefore must be the DB of the tested service.
     """
 
     def add_arguments(self, parser):
@@ -63,7 +71,7 @@ class Command(CustomBaseCommand):
         parser.add_argument(
             'object_type',
             type=str,
-            choices=['items', 'assets'],
+            choices=['items', 'assets', 'bulk-items'],
             help='Define which object type to create/update/deletes',
         )
 
@@ -81,6 +89,20 @@ class Command(CustomBaseCommand):
             '--url', type=str, default='http://localhost:8000', help="Url to run the test against"
         )
 
+        parser.add_argument(
+            '--bulk-size',
+            type=int,
+            default=100,
+            help="Number of items per bulk request, only valid for 'bulk-items' object_type."
+        )
+
+        parser.add_argument(
+            '--concurrency',
+            type=int,
+            default=1,
+            help="Number of parallel bulk requests, only valid for 'bulk-items' object_type."
+        )
+
         parser.add_argument('--key', type=str, help='Token used for authentication')
         parser.add_argument('--auth', type=str, help='Basic authentication in form user:pass')
 
@@ -102,6 +124,8 @@ class Command(CustomBaseCommand):
         try:
             if options['clean']:
                 self.clean()
+            elif options['object_type'] == 'bulk-items':
+                self.start_bulk()
             else:
                 self.start()
         except RuntimeError:
@@ -113,7 +137,10 @@ class Command(CustomBaseCommand):
         headers = self.get_headers()
         auth = self.get_auth()
         deleted = 0
-        for i in range(self.options['n']):
+        count = self.options['n']
+        if self.options['object_type'] == 'bulk-items':
+            count *= self.options['bulk_size']
+        for i in range(count):
             name = self.get_name(i)
             url = self.get_url(name)
             response = requests.delete(url, headers=headers, auth=auth)
@@ -176,6 +203,87 @@ class Command(CustomBaseCommand):
         self.print_success('    average: %.3fs', mean(delete_durations))
         self.print_success('Done')
 
+    def start_bulk(self):
+        self.print(
+            "Starting bulk write performance tests with %d requests of %d items "
+            "(concurrency %d)...",
+            self.options['n'],
+            self.options['bulk_size'],
+            self.options['concurrency']
+        )
+        trigger_stats_start = self.get_trigger_stats()
+        lock_waits = []
+        stop_sampling = threading.Event()
+        sampler = threading.Thread(target=self.sample_lock_waits, args=(lock_waits, stop_sampling))
+        sampler.start()
+        try:
+            with ThreadPoolExecutor(max_workers=self.options['concurrency']) as executor:
+                durations = list(executor.map(self.post_bulk, range(self.options['n'])))
+        finally:
+            stop_sampling.set()
+            sampler.join()
+        trigger_stats_end = self.get_trigger_stats()
+
+        self.print_success('BULK CREATES:')
+        self.print_success('    min: %.3fs', min(durations))
+        self.print_success('    max: %.3fs', max(durations))
+        self.print_success('    average: %.3fs', mean(durations))
+        self.print_success('TRIGGERS:')
+        if not trigger_stats_end:
+            self.print_warning('    no trigger statistics, is track_functions enabled ?')
+        for name, (calls, self_time) in sorted(trigger_stats_end.items()):
+            start_calls, start_self_time = trigger_stats_start.get(name, (0, 0))
+            if calls - start_calls:
+                self.print_success(
+                    '    %s: %d calls, %.3fms',
+                    name,
+                    calls - start_calls,
+                    self_time - start_self_time
+                )
+        self.print_success('LOCK WAITS:')
+        self.print_success(
+            '    samples with lock waits: %d/%d',
+            sum(1 for waiting in lock_waits if waiting),
+            len(lock_waits)
+        )
+        self.print_success('    max sessions waiting: %d', max(lock_waits, default=0))
+        self.print('Cleaning up...')
+        self.clean()
+        self.print_success('Done')
+
+    def post_bulk(self, i):
+        # pylint: disable=missing-timeout
+        base = f'{self.options["url"]}/api/stac/v1/collections/{self.options["collection"]}/items'
+        size = self.options['bulk_size']
+        data = {'features': [self.get_data_item(i * size + j) for j in range(size)]}
+        headers = {**self.get_headers(), 'Idempotency-Key': f'perftest-write-bulk-{i}'}
+        self.print('Bulk create: POST %s', base)
+        start = time.monotonic()
+        response = requests.post(base, json=data, headers=headers, auth=self.get_auth())
+        duration = time.monotonic() - start
+        self.check_response('POST', base, '', response, 201)
+        return duration
+
+    def get_trigger_stats(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT funcname, calls, self_time FROM pg_stat_user_functions "
+                "WHERE funcname LIKE %s", ['pgtrigger_%']
+            )
+            return {name: (calls, self_time) for name, calls, self_time in cursor.fetchall()}
+
+    def sample_lock_waits(self, samples, stop):
+        try:
+            with connection.cursor() as cursor:
+                while not stop.is_set():
+                    cursor.execute(
+                        "SELECT count(*) FROM pg_stat_activity WHERE wait_event_type = 'Lock'"
+                    )
+                    samples.append(cursor.fetchone()[0])
+                    stop.wait(0.01)
+        finally:
+            connection.close()
+
     def get_auth(self):
         if self.options.get('auth'):
             return (*self.options['auth'].split(':', maxsplit=1),)
@@ -201,13 +309,13 @@ class Command(CustomBaseCommand):
 
     def get_url(self, name):
         base = f'{self.options["url"]}/api/stac/v0.9/collections/{self.options["collection"]}/items'
-        if self.options['object_type'] == 'items':
+        if self.options['object_type'] in ['items', 'bulk-items']:
             return f'{base}/{name}'
         # else assets
         return f'{base}/{self.options["item"]}/assets/{name}'
 
     def get_name(self, i):
-        if self.options['object_type'] == 'items':
+        if self.options['object_type'] in ['items', 'bulk-items']:
             return f'perftest-write-item-{i}'
         return f'perftest-write-asset-{i}'
 
@@ -2,18 +2,80 @@ import logging
 
 from django.contrib.gis.db import models
 from django.contrib.gis.geos import GEOSGeometry
-from django.db.models import Q
+from django.db.backends.postgresql.psycopg_any import DateTimeTZRange
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 
+from stac_api.intersects import intersects_condition
 from stac_api.utils import fromisoformat
 from stac_api.utils import geometry_from_bbox
+from stac_api.utils import utc_aware
 from stac_api.validators import validate_geometry
 
 logger = logging.getLogger(__name__)
 
 
+def parse_datetime_query(date_time):
+    '''Parse the datetime query as specified in the api-spec.md.
+
+    Args:
+        date_time: string
+            Datetime as string (should be in isoformat)
+
+    Returns: tuple
+        (start, end) where start is a datetime or '..', and end is a datetime, '..' or None for
+        an exact datetime
+
+    Raises:
+        ValidationError: When the date_time string is not a valid isoformat or when the range
+        end is before its start
+    '''
+    start, _, end = date_time.partition('/')
+    if start == '':
+        start = '..'
+    try:
+        if start != '..':
+            start = fromisoformat(start)
+        if end and end != '..':
+            end = fromisoformat(end)
+    except ValueError as error:
+        logger.error(
+            'Invalid datetime query parameter "%s", must be isoformat; %s', date_time, error
+        )
+        raise serializers.ValidationError(
+            _('Invalid datetime query parameter, must be isoformat')
+        ) from None
+
+    if end == '':
+        end = None
+
+    if start == '..' and (end is None or end == '..'):
+        logger.error(
+            'Invalid datetime query parameter "%s"; '
+            'cannot start with open range when no end range is defined',
+            date_time
+        )
+        raise serializers.ValidationError(
+            _('Invalid datetime query parameter, '
+              'cannot start with open range when no end range is defined')
+        )
+
+    if start != '..' and end not in (None, '..') and _as_aware(end) < _as_aware(start):
+        logger.error(
+            'Invalid datetime query parameter "%s"; the range end is before its start', date_time
+        )
+        raise serializers.ValidationError(
+            _('Invalid datetime query parameter, the range end must not be before its start')
+        )
+    return start, end
+
+
+def _as_aware(date_time):
+    # Naive datetimes are stored as UTC, see settings.TIME_ZONE
+    return utc_aware(date_time) if date_time.tzinfo is None else date_time
+
+
 class ItemQuerySet(models.QuerySet):
 
     def filter_by_bbox(self, bbox):
@@ -25,7 +87,8 @@ class ItemQuerySet(models.QuerySet):
             queryset:
                 A django queryset (https://docs.djangoproject.com/en/3.0/ref/models/querysets/)
             bbox:
-                A string defining a spatial bbox (f.ex. 5.96, 45.82, 10.49, 47.81)
+                A string defining a spatial bbox (f.ex. 5.96, 45.82, 10.49, 47.81) or the already
+                validated bbox geometry
 
         Returns:
             The queryset with the added spatial filter
@@ -34,6 +97,8 @@ class ItemQuerySet(models.QuerySet):
             ValidationError: When the bbox does not contain 4 values. Or when the polygon build
             from the bbox string is invalid.
         '''
+        if isinstance(bbox, GEOSGeometry):
+            return self.filter(geometry__intersects=bbox)
         try:
             logger.debug('Query parameter bbox = %s', bbox)
             bbox_geometry = geometry_from_bbox(bbox)
@@ -60,12 +125,12 @@ class ItemQuerySet(models.QuerySet):
             queryset:
                  A django queryset (https://docs.djangoproject.com/en/3.0/ref/models/querysets/)
             date_time:
-                A string
+                A string or the tuple (start, end) returned by parse_datetime_query()
 
         Returns:
             The queryset filtered by date_time
         '''
-        start, end = self._parse_datetime_query(date_time)
+        start, end = parse_datetime_query(date_time) if isinstance(date_time, str) else date_time
         if end is not None:
             return self._filter_by_datetime_range(start, end)
         return self.filter(properties_datetime=start)
@@ -85,23 +150,14 @@ class ItemQuerySet(models.QuerySet):
         Returns:
             The queryset filtered by datetime range
         '''
-        if start_datetime == '..':
-            # open start range
-            return self.filter(
-                Q(properties_datetime__lte=end_datetime) |
-                Q(properties_end_datetime__lte=end_datetime)
-            )
-        if end_datetime == '..':
-            # open end range
-            return self.filter(
-                Q(properties_datetime__gte=start_datetime) |
-                Q(properties_start_datetime__gte=start_datetime)
-            )
-            # else fixed range
+        # The properties_datetime_range covers both the instant (datetime) and the interval
+        # (start_datetime/end_datetime) items, the range containment is answered by its GiST
+        # index. An open bound is an unbounded range side.
         return self.filter(
-            Q(properties_datetime__range=(start_datetime, end_datetime)) | (
-                Q(properties_start_datetime__gte=start_datetime) &
-                Q(properties_end_datetime__lte=end_datetime)
+            properties_datetime_range__contained_by=DateTimeTZRange(
+                None if start_datetime == '..' else start_datetime,
+                None if end_datetime == '..' else end_datetime,
+                '[]'
             )
         )
 
@@ -110,12 +166,13 @@ class ItemQuerySet(models.QuerySet):
 
         Args:
             date_time:
-                A string containing datetime like "2020-10-28T13:05:10Z"
+                A string containing datetime like "2020-10-28T13:05:10Z" or the tuple
+                (start, end) returned by parse_datetime_query()
 
         Returns:
             The queryset filtered by date_time
         '''
-        start, end = self._parse_datetime_query(date_time)
+        start, end = parse_datetime_query(date_time) if isinstance(date_time, str) else date_time
         if end is not None:
             return self._filter_by_forecast_reference_datetime_range(start, end)
         return self.filter(forecast_reference_datetime=start)
@@ -142,52 +199,6 @@ class ItemQuerySet(models.QuerySet):
             # else fixed range
         return self.filter(forecast_reference_datetime__range=(start_datetime, end_datetime))
 
-    def _parse_datetime_query(self, date_time):
-        '''Parse the datetime query as specified in the api-spec.md.
-
-        A helper function of filter_by_datetime
-
-        Args:
-            date_time: string
-                Datetime as string (should be in isoformat)
-
-        Returns:
-            queryset filtered by datetime
-
-        Raises:
-            ValidationError: When the date_time string is not a valid isoformat
-        '''
-        start, sep, end = date_time.partition('/')
-        if start == '':
-            start = '..'
-        try:
-            if start != '..':
-                start = fromisoformat(start)
-            if end and end != '..':
-                end = fromisoformat(end)
-        except ValueError as error:
-            logger.error(
-                'Invalid datetime query parameter "%s", must be isoformat; %s', date_time, error
-            )
-            raise serializers.ValidationError(
-                _('Invalid datetime query parameter, must be isoformat')
-            ) from None
-
-        if end == '':
-            end = None
-
-        if start == '..' and (end is None or end == '..'):
-            logger.error(
-                'Invalid datetime query parameter "%s"; '
-                'cannot start with open range when no end range is defined',
-                date_time
-            )
-            raise serializers.ValidationError(
-                _('Invalid datetime query parameter, '
-                  'cannot start with open range when no end range is defined')
-            )
-        return start, end
-
     def filter_by_item_name(self, item_names_array):
         '''Filter by item names parameter
 
@@ -217,7 +228,9 @@ class ItemQuerySet(models.QuerySet):
 
         Args:
             intersects: string
-                Is a geojson formatted string
+                Is a geojson formatted string or the already parsed geometry
+
+        The large geometries are simplified and subdivided, see stac_api.intersects.
 
         Returns:
             queryset filtered by intersects
@@ -225,8 +238,8 @@ class ItemQuerySet(models.QuerySet):
         Raises:
             ValueError or GDALException: When the Geojson is not a valid geometry
         '''
-        the_geom = GEOSGeometry(intersects)
-        return self.filter(geometry__intersects=the_geom)
+        the_geom = intersects if isinstance(intersects, GEOSGeometry) else GEOSGeometry(intersects)
+        return self.filter(intersects_condition(the_geom))
 
     def filter_by_forecast_horizon(self, duration):
         '''Filter by forecast horizon
@@ -285,6 +298,7 @@ class ItemQuerySet(models.QuerySet):
         Returns:
             queryset filtered by query
         '''
+        queryset = self
         for attribute in query:
             for operator in query[attribute]:
                 value = query[attribute][operator]  # get the values given by the operator
@@ -299,7 +313,20 @@ class ItemQuerySet(models.QuerySet):
                     query_filter = f"{prefix}{attribute}"
                 else:
                     query_filter = f"{prefix}{attribute}__{operator.lower()}"
-                return self.filter(**{query_filter: value})
+                queryset = queryset.filter(**{query_filter: value})
+        return queryset
+
+    def filter_by_cql2(self, cql2_filter):
+        '''Filter by the filter parameter (CQL2 filter extension)
+
+        Args:
+            cql2_filter: Cql2Filter
+                The parsed filter, see stac_api.cql2.parse_filter
+
+        Returns:
+            queryset filtered by the CQL2 filter
+        '''
+        return self.filter(cql2_filter.condition)
 
 
 class ItemManager(models.Manager):
@@ -0,0 +1,83 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:56
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0070_alter_asset_media_type_and_more'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='item',
+            name='bbox_xmax',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='bbox_xmin',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='bbox_ymax',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='bbox_ymin',
+            field=models.FloatField(blank=True, editable=False, null=True),
+        ),
+        # Fill the bbox of the existing items, the user triggers are disabled in order to not
+        # touch the items `updated` and `etag` fields (manually added).
+        migrations.RunSQL(
+            sql='''
+            ALTER TABLE stac_api_item DISABLE TRIGGER USER;
+            UPDATE stac_api_item SET
+                bbox_xmin = ST_XMin(geometry),
+                bbox_ymin = ST_YMin(geometry),
+                bbox_xmax = ST_XMax(geometry),
+                bbox_ymax = ST_YMax(geometry);
+            ALTER TABLE stac_api_item ENABLE TRIGGER USER;
+            ''',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_bbox_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    '\n        -- Update the precomputed bbox\n        NEW.bbox_xmin = ST_XMin(NEW.geometry);\n        NEW.bbox_ymin = ST_YMin(NEW.geometry);\n        NEW.bbox_xmax = ST_XMax(NEW.geometry);\n        NEW.bbox_ymax = ST_YMax(NEW.geometry);\n\n        RETURN NEW;\n        ',
+                    hash='52235874d0fd949019d8cd9cf9e100c7a3e530f3',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_bbox_trigger_1e882',
+                    table='stac_api_item',
+                    when='BEFORE'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_bbox_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    condition=
+                    'WHEN (NOT ST_EQUALS(OLD.geometry, NEW.geometry) OR\n                NEW.bbox_xmin IS NULL OR NEW.bbox_ymin IS NULL OR\n                NEW.bbox_xmax IS NULL OR NEW.bbox_ymax IS NULL)',
+                    func=
+                    '\n        -- Update the precomputed bbox\n        NEW.bbox_xmin = ST_XMin(NEW.geometry);\n        NEW.bbox_ymin = ST_YMin(NEW.geometry);\n        NEW.bbox_xmax = ST_XMax(NEW.geometry);\n        NEW.bbox_ymax = ST_YMax(NEW.geometry);\n\n        RETURN NEW;\n        ',
+                    hash='dcb24b1764b1f4753e4f850558ce406b64cf76fe',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_bbox_trigger_657b3',
+                    table='stac_api_item',
+                    when='BEFORE'
+                )
+            ),
+        ),
+    ]
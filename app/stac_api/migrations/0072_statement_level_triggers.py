@@ -0,0 +1,995 @@
+# Generated by Django 5.2.18 on 2026-10-16 19:59
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0071_item_bbox'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='add_item_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='update_item_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='del_item_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_dec_eo_gsd_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='del_eo_gsd_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_inc_eo_gsd_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='add_eo_gsd_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_dec_geoadmin_lang_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='del_geoadmin_lang_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_inc_geoadmin_lang_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='add_geoadmin_lang_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_dec_geoadmin_variant_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='del_geoadmin_variant_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_inc_geoadmin_variant_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='add_geoadmin_variant_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_dec_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='del_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='upd_inc_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='add_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='add_del_asset_item_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='asset',
+            name='update_asset_item_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='add_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='update_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='del_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='upd_dec_col_asset_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='del_col_asset_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='upd_inc_col_asset_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='add_col_asset_proj_epsg_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='add_del_col_asset_col_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionasset',
+            name='update_col_asset_col_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionlink',
+            name='add_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionlink',
+            name='update_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='collectionlink',
+            name='del_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_del_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_del_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='itemlink',
+            name='add_item_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='itemlink',
+            name='update_item_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='itemlink',
+            name='del_item_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='provider',
+            name='add_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='provider',
+            name='update_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='provider',
+            name='del_collection_child_trigger',
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related item\n    UPDATE stac_api_item SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.item_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table item auto fields of % rows updated due to child Asset updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='fc5cacda8cb88355be3724024b11977ece02a9ad',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_child_trigger_f5309',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related item\n    UPDATE stac_api_item SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.item_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table item auto fields of % rows updated due to child Asset updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='795fdd2256f84a855462da462c97b75d40b96977',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_child_trigger_15ed4',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related item\n    UPDATE stac_api_item SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.item_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table item auto fields of % rows updated due to child Asset updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='439cfab3d7d385f9a3c2aa7a7b2a80ca46551092',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_child_trigger_b403d',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_eo_gsd_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.eo_gsd AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.eo_gsd IS NOT NULL\n        GROUP BY item.collection_id, asset.eo_gsd\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_gsdcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_gsdcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_gsdcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_gsdcount.count + EXCLUDED.count;\n\n    RAISE INFO 'gsdcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='5afe876745ecbe1101119ea8c6d0a960bee4e771',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_eo_gsd_trigger_1edd9',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_eo_gsd_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.eo_gsd AS value,\n            SUM(asset.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.eo_gsd IS NOT NULL\n        GROUP BY item.collection_id, asset.eo_gsd\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_gsdcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_gsdcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_gsdcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_gsdcount.count + EXCLUDED.count;\n\n    RAISE INFO 'gsdcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='ad8a24d6e0c5dc571fbc6a0caf72e5703e64b067',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_eo_gsd_trigger_e7df7',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_eo_gsd_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.eo_gsd AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.eo_gsd IS NOT NULL\n        GROUP BY item.collection_id, asset.eo_gsd\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_gsdcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_gsdcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_gsdcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_gsdcount.count + EXCLUDED.count;\n\n    RAISE INFO 'gsdcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='60610f241ef5397475ba9aeade72d3fe7403981c',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_eo_gsd_trigger_ccfab',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_geoadmin_lang_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.geoadmin_lang AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.geoadmin_lang IS NOT NULL\n        GROUP BY item.collection_id, asset.geoadmin_lang\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_geoadminlangcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_geoadminlangcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_geoadminlangcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_geoadminlangcount.count + EXCLUDED.count;\n\n    RAISE INFO 'geoadminlangcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='dbee01743580a5cb56d2d3f5ac2f7ecdd6ebec48',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_geoadmin_lang_trigger_b3618',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_geoadmin_lang_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.geoadmin_lang AS value,\n            SUM(asset.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.geoadmin_lang IS NOT NULL\n        GROUP BY item.collection_id, asset.geoadmin_lang\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_geoadminlangcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_geoadminlangcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_geoadminlangcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_geoadminlangcount.count + EXCLUDED.count;\n\n    RAISE INFO 'geoadminlangcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='af98767febce8f444b4f35880bc1c48dd3aa8d3e',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_geoadmin_lang_trigger_b900d',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_geoadmin_lang_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.geoadmin_lang AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.geoadmin_lang IS NOT NULL\n        GROUP BY item.collection_id, asset.geoadmin_lang\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_geoadminlangcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_geoadminlangcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_geoadminlangcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_geoadminlangcount.count + EXCLUDED.count;\n\n    RAISE INFO 'geoadminlangcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='12b0358b115349c34cd703d1bcb16cacc12ed412',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_geoadmin_lang_trigger_ad861',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_geoadmin_variant_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.geoadmin_variant AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.geoadmin_variant IS NOT NULL\n        GROUP BY item.collection_id, asset.geoadmin_variant\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_geoadminvariantcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_geoadminvariantcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_geoadminvariantcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_geoadminvariantcount.count + EXCLUDED.count;\n\n    RAISE INFO 'geoadminvariantcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='5cc3ac46127bbb9e4f16a23e533cab89786e3b1d',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_geoadmin_variant_trigger_57810',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_geoadmin_variant_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.geoadmin_variant AS value,\n            SUM(asset.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.geoadmin_variant IS NOT NULL\n        GROUP BY item.collection_id, asset.geoadmin_variant\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_geoadminvariantcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_geoadminvariantcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_geoadminvariantcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_geoadminvariantcount.count + EXCLUDED.count;\n\n    RAISE INFO 'geoadminvariantcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='f108b95d334a21230f0aa8407a27ac4c64af4942',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_geoadmin_variant_trigger_49c20',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_geoadmin_variant_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.geoadmin_variant AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.geoadmin_variant IS NOT NULL\n        GROUP BY item.collection_id, asset.geoadmin_variant\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_geoadminvariantcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_geoadminvariantcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_geoadminvariantcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_geoadminvariantcount.count + EXCLUDED.count;\n\n    RAISE INFO 'geoadminvariantcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='df263d18f725ee6f0004bd23ee738026b05337c0',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_geoadmin_variant_trigger_154b3',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_proj_epsg_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.proj_epsg AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.proj_epsg IS NOT NULL\n        GROUP BY item.collection_id, asset.proj_epsg\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_projepsgcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_projepsgcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_projepsgcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_projepsgcount.count + EXCLUDED.count;\n\n    RAISE INFO 'projepsgcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='a7a61219cd2e27ffa39fd89d9f38af147f8e3a5d',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_proj_epsg_trigger_0dabc',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_proj_epsg_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.proj_epsg AS value,\n            SUM(asset.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.proj_epsg IS NOT NULL\n        GROUP BY item.collection_id, asset.proj_epsg\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_projepsgcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_projepsgcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_projepsgcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_projepsgcount.count + EXCLUDED.count;\n\n    RAISE INFO 'projepsgcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='7f37ac4d2ed61101943b319691ace5ef69a755a8',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_proj_epsg_trigger_561f2',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_proj_epsg_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            item.collection_id AS collection_id,\n            asset.proj_epsg AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS asset JOIN stac_api_item AS item ON item.id = asset.item_id\n        WHERE asset.proj_epsg IS NOT NULL\n        GROUP BY item.collection_id, asset.proj_epsg\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_projepsgcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_projepsgcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_projepsgcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_projepsgcount.count + EXCLUDED.count;\n\n    RAISE INFO 'projepsgcount counts updated, due to asset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='800874a1fc7640b39b01dce5f7ab33fb614e0f8c',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_proj_epsg_trigger_c1652',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_asset_item_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related item file_size variables\n    FOR parent IN\n        UPDATE stac_api_item AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.item_id AS id,\n                SUM(child.sign * COALESCE(child.file_size, 0)) AS size\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n            GROUP BY child.item_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'item.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'item.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='f9ca587f5be4931addce86258b782cefedfdd108',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_asset_item_file_size_trigger_a3b7f',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_asset_item_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related item file_size variables\n    FOR parent IN\n        UPDATE stac_api_item AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.item_id AS id,\n                SUM(child.sign * COALESCE(child.file_size, 0)) AS size\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n            GROUP BY child.item_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'item.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'item.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='9e906f6a3d116a0a4e5a7559c0c3f7408402c637',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_asset_item_file_size_trigger_316e8',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='asset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_asset_item_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related item file_size variables\n    FOR parent IN\n        UPDATE stac_api_item AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.item_id AS id,\n                SUM(child.sign * COALESCE(child.file_size, 0)) AS size\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n            GROUP BY child.item_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'item.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'item.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='a8395f88c5ff8a1fb9ad68cb6f5cb6acdb73a6bf',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_asset_item_file_size_trigger_3b6a5',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_asset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child CollectionAsset updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='9dc4032a08e93225bce8966f83d705c2688a122b',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_child_trigger_3fed0',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child CollectionAsset updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='b2200ab52c9992f6c01897b75f1587e4e4739315',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_child_trigger_ae85d',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child CollectionAsset updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='3f2a005f57632afcfd926d307f348457eba4bd26',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_child_trigger_5ecfc',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_col_asset_proj_epsg_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            asset.collection_id AS collection_id,\n            asset.proj_epsg AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS asset\n        WHERE asset.proj_epsg IS NOT NULL\n        GROUP BY asset.collection_id, asset.proj_epsg\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_projepsgcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_projepsgcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_projepsgcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_projepsgcount.count + EXCLUDED.count;\n\n    RAISE INFO 'projepsgcount counts updated, due to collectionasset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='9901481a8a861698f9e6ac10cb9638f1e698877e',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_col_asset_proj_epsg_trigger_e0d9a',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_col_asset_proj_epsg_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            asset.collection_id AS collection_id,\n            asset.proj_epsg AS value,\n            SUM(asset.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS asset\n        WHERE asset.proj_epsg IS NOT NULL\n        GROUP BY asset.collection_id, asset.proj_epsg\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_projepsgcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_projepsgcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_projepsgcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_projepsgcount.count + EXCLUDED.count;\n\n    RAISE INFO 'projepsgcount counts updated, due to collectionasset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='9d40669049625fb5bae1025641d045bf1ab6d4c2',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_col_asset_proj_epsg_trigger_0c7cd',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_col_asset_proj_epsg_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    WITH delta AS (\n        SELECT\n            asset.collection_id AS collection_id,\n            asset.proj_epsg AS value,\n            SUM(asset.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS asset\n        WHERE asset.proj_epsg IS NOT NULL\n        GROUP BY asset.collection_id, asset.proj_epsg\n        HAVING SUM(asset.sign) <> 0\n    ), deleted AS (\n        -- Remove entries when count reaches 0\n        DELETE FROM stac_api_projepsgcount AS counter\n        USING delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count <= 0\n    ), decreased AS (\n        UPDATE stac_api_projepsgcount AS counter\n        SET count = counter.count + delta.count\n        FROM delta\n        WHERE counter.collection_id = delta.collection_id\n            AND counter.value = delta.value\n            AND delta.count < 0\n            AND counter.count + delta.count > 0\n    )\n    INSERT INTO stac_api_projepsgcount (collection_id, value, count)\n    SELECT collection_id, value, count FROM delta WHERE count > 0\n    ON CONFLICT (collection_id, value)\n    DO UPDATE SET count = stac_api_projepsgcount.count + EXCLUDED.count;\n\n    RAISE INFO 'projepsgcount counts updated, due to collectionasset updates.';\n\n    RETURN NULL;\n    ",
+                    hash='ec6e08756a100abeb3b6f89a1a696979e27a0505',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_col_asset_proj_epsg_trigger_2caf1',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_col_asset_col_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.file_size, 0)) AS size\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='62a3844417e01a9ed27a490a7bb7df3f03732d0d',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_col_asset_col_file_size_trigger_4c9bb',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_col_asset_col_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.file_size, 0)) AS size\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='4526ced5080e3f80fed29e49fa90105e4af5eced',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_col_asset_col_file_size_trigger_1d5be',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionasset',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_col_asset_col_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.file_size, 0)) AS size\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='4f7e9a4262217aed812e445e7405e32cad534a3a',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_col_asset_col_file_size_trigger_bc8de',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_collectionasset',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionlink',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child CollectionLink updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='967468ff1e16ec5aabd4fa7157662fed68b947dc',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_child_trigger_80513',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_collectionlink',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionlink',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child CollectionLink updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='55c5b58f21b2ba2968062550cc66f1a5ed11837a',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_child_trigger_8dac2',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_collectionlink',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collectionlink',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child CollectionLink updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='c7867690f3fc6cf85bb86540b97bb9d3b0a56a21',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_child_trigger_6b23f',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_collectionlink',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='8b1b534b2366d332d3de9121daadd50b3c9f68a3',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_child_trigger_b1293',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='c1f2f4267ee8d9baa39ccf377a4d1a7d9fad2931',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_child_trigger_c0533',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='a42bd9655aeeb14ace4c488d83f591ba7df8b5a7',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_child_trigger_a4f01',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- Update related collections extent_out_of_sync\n    UPDATE stac_api_collection SET\n        extent_out_of_sync = TRUE\n    WHERE id IN (SELECT item.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item)\n        AND NOT extent_out_of_sync;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent_out_of_sync updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='27e7b865ad5dd9326dbf84912fad4cc45852ad82',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_extent_trigger_8572d',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- Update related collections extent_out_of_sync\n    UPDATE stac_api_collection SET\n        extent_out_of_sync = TRUE\n    WHERE id IN (SELECT item.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime)\n        ) AS item)\n        AND NOT extent_out_of_sync;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent_out_of_sync updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='20a60c0d63fb6632699143d0ecb9cd061ad78b73',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_extent_trigger_ba9d0',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- Update related collections extent_out_of_sync\n    UPDATE stac_api_collection SET\n        extent_out_of_sync = TRUE\n    WHERE id IN (SELECT item.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item)\n        AND NOT extent_out_of_sync;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent_out_of_sync updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='49e23fe4cd00ae479ad0700ebd51392d1f796a75',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_extent_trigger_9c6b7',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='11e6cca94e2cb6574af383a57112b240b423bcdd',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_file_size_trigger_d4d66',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='c6a96a60b29d0523f97b345519e5a9660e95994b',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_file_size_trigger_83572',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='9b530191e889b57eab0d6f6aa4f3d79c002347da',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_file_size_trigger_b8ec0',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='itemlink',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related item\n    UPDATE stac_api_item SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.item_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table item auto fields of % rows updated due to child ItemLink updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='a0e8ba35f6793944a4c76042c9b29c1f3e83a0bf',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_child_trigger_b0768',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_itemlink',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='itemlink',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related item\n    UPDATE stac_api_item SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.item_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table item auto fields of % rows updated due to child ItemLink updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='b04ca32bfafe2daddbc3d62a0558b0cf8bcbd2fa',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_child_trigger_9b246',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_itemlink',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='itemlink',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related item\n    UPDATE stac_api_item SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.item_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table item auto fields of % rows updated due to child ItemLink updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='e6866f04058699ef969a684772e9fd588440bfce',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_child_trigger_5fbee',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_itemlink',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='provider',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Provider updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='6c76f6c130774eac2bf3185d2e8e690fbbd54229',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_child_trigger_8557d',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_provider',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='provider',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Provider updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='d1db951de4b8231691c6bf1f486ec1c2aa5c2b58',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_child_trigger_56605',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_provider',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='provider',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Provider updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='4cd5d66dfdae11a2475527b951fc23b3ce55b074',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_child_trigger_76cd8',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_provider',
+                    when='AFTER'
+                )
+            ),
+        ),
+    ]
@@ -0,0 +1,238 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:01
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+import django.db.models.deletion
+import django.db.models.functions.datetime
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0072_statement_level_triggers'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CollectionDelta',
+            fields=[
+                ('id', models.BigAutoField(primary_key=True, serialize=False)),
+                ('total_data_size', models.BigIntegerField(db_default=0)),
+                ('extent_out_of_sync', models.BooleanField(db_default=False)),
+                (
+                    'created',
+                    models.DateTimeField(db_default=django.db.models.functions.datetime.Now())
+                ),
+            ],
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id)\n        SELECT DISTINCT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child;\n        RETURN NULL;\n    END IF;\n    \n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='9a948ee9f9c5ee7c2245952d1e6ef8ebbe1252c2',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_child_trigger_b1293',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id)\n        SELECT DISTINCT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child;\n        RETURN NULL;\n    END IF;\n    \n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='eda6d67b54646beb410bf7878d6d90f87bdf5e49',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_child_trigger_c0533',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id)\n        SELECT DISTINCT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child;\n        RETURN NULL;\n    END IF;\n    \n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='ca7608211a28ffc315924bbd0c62378dc4c37520',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_child_trigger_a4f01',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT DISTINCT item.collection_id, TRUE FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item;\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collections extent_out_of_sync\n    UPDATE stac_api_collection SET\n        extent_out_of_sync = TRUE\n    WHERE id IN (SELECT item.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item)\n        AND NOT extent_out_of_sync;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent_out_of_sync updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='f51e4ee22dabd3445fe501180e07eebe574b22dc',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_extent_trigger_8572d',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT DISTINCT item.collection_id, TRUE FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime)\n        ) AS item;\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collections extent_out_of_sync\n    UPDATE stac_api_collection SET\n        extent_out_of_sync = TRUE\n    WHERE id IN (SELECT item.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime)\n        ) AS item)\n        AND NOT extent_out_of_sync;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent_out_of_sync updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='c9cdc71a7e92c056c96107a37599bf5fecd75873',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_extent_trigger_ba9d0',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT DISTINCT item.collection_id, TRUE FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item;\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collections extent_out_of_sync\n    UPDATE stac_api_collection SET\n        extent_out_of_sync = TRUE\n    WHERE id IN (SELECT item.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item)\n        AND NOT extent_out_of_sync;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent_out_of_sync updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='f0e18a437b3c04efe4a5230c749b0881da164731',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_extent_trigger_9c6b7',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, total_data_size)\n        SELECT child.collection_id, SUM(child.sign * COALESCE(child.total_data_size, 0))\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n        GROUP BY child.collection_id\n        HAVING SUM(child.sign * COALESCE(child.total_data_size, 0)) <> 0;\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='43daff49109499722e5fbd198999ba77cfc2636f',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_file_size_trigger_d4d66',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, total_data_size)\n        SELECT child.collection_id, SUM(child.sign * COALESCE(child.total_data_size, 0))\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n        GROUP BY child.collection_id\n        HAVING SUM(child.sign * COALESCE(child.total_data_size, 0)) <> 0;\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='feddf44173d4229b4613b11a4e6f31fa9b06455f',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_file_size_trigger_83572',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, total_data_size)\n        SELECT child.collection_id, SUM(child.sign * COALESCE(child.total_data_size, 0))\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n        GROUP BY child.collection_id\n        HAVING SUM(child.sign * COALESCE(child.total_data_size, 0)) <> 0;\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='27f31094db6a64c281b292a25db51f7b4d59ca8a',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_file_size_trigger_b8ec0',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        migrations.AddField(
+            model_name='collectiondelta',
+            name='collection',
+            field=models.ForeignKey(
+                on_delete=django.db.models.deletion.CASCADE,
+                related_name='+',
+                to='stac_api.collection'
+            ),
+        ),
+    ]
@@ -0,0 +1,82 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:05
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0073_collectiondelta'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT DISTINCT item.collection_id, TRUE FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item;\n        RETURN NULL;\n    END IF;\n    \n    WITH changed AS (\n        SELECT\n            item.*,\n            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,\n            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,\n            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n    ), shrinking AS (\n        SELECT DISTINCT old_item.collection_id\n        FROM changed AS old_item\n        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id\n        LEFT JOIN changed AS new_item\n            ON new_item.sign = 1 AND new_item.id = old_item.id\n            AND new_item.collection_id = old_item.collection_id AND new_item.active\n        WHERE old_item.sign = -1 AND old_item.active\n            -- the new version of the item doesn't cover the old one\n            AND NOT COALESCE(\n                new_item.bbox_xmin <= old_item.bbox_xmin AND\n                new_item.bbox_ymin <= old_item.bbox_ymin AND\n                new_item.bbox_xmax >= old_item.bbox_xmax AND\n                new_item.bbox_ymax >= old_item.bbox_ymax AND\n                new_item.item_start <= old_item.item_start AND\n                new_item.item_end >= old_item.item_end,\n                FALSE\n            )\n            -- and the old version was not strictly inside the extent\n            AND NOT COALESCE(\n                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND\n                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND\n                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND\n                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND\n                old_item.item_start > collection.extent_start_datetime AND\n                old_item.item_end < collection.extent_end_datetime,\n                FALSE\n            )\n    ), growing AS (\n        SELECT\n            new_item.collection_id,\n            MIN(new_item.bbox_xmin) AS xmin,\n            MIN(new_item.bbox_ymin) AS ymin,\n            MAX(new_item.bbox_xmax) AS xmax,\n            MAX(new_item.bbox_ymax) AS ymax,\n            MIN(new_item.item_start) AS start_datetime,\n            MAX(new_item.item_end) AS end_datetime\n        FROM changed AS new_item\n        WHERE new_item.sign = 1 AND new_item.active\n        GROUP BY new_item.collection_id\n    ), change AS (\n        SELECT\n            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,\n            shrinking.collection_id IS NOT NULL AS shrink,\n            growing.xmin, growing.ymin, growing.xmax, growing.ymax,\n            growing.start_datetime, growing.end_datetime\n        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id\n    )\n    UPDATE stac_api_collection AS collection SET\n        extent_out_of_sync = change.shrink,\n        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry\n            ELSE ST_SetSRID(ST_MakeBox2D(\n                ST_Point(\n                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),\n                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)\n                ),\n                ST_Point(\n                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),\n                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)\n                )\n            )::geometry, 4326) END,\n        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime\n            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,\n        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime\n            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END\n    FROM change\n    WHERE collection.id = change.collection_id\n        -- out of sync extents are recomputed anyway\n        AND NOT collection.extent_out_of_sync\n        AND (\n            change.shrink OR\n            collection.extent_geometry IS NULL OR\n            change.xmin < ST_XMin(collection.extent_geometry) OR\n            change.ymin < ST_YMin(collection.extent_geometry) OR\n            change.xmax > ST_XMax(collection.extent_geometry) OR\n            change.ymax > ST_YMax(collection.extent_geometry) OR\n            change.start_datetime < collection.extent_start_datetime OR\n            change.end_datetime > collection.extent_end_datetime OR\n            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR\n            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)\n        );\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='8669c62716e36bee6c51716e9729e25c28b60392',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_extent_trigger_8572d',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT DISTINCT item.collection_id, TRUE FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        ) AS item;\n        RETURN NULL;\n    END IF;\n    \n    WITH changed AS (\n        SELECT\n            item.*,\n            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,\n            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,\n            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        ) AS item\n    ), shrinking AS (\n        SELECT DISTINCT old_item.collection_id\n        FROM changed AS old_item\n        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id\n        LEFT JOIN changed AS new_item\n            ON new_item.sign = 1 AND new_item.id = old_item.id\n            AND new_item.collection_id = old_item.collection_id AND new_item.active\n        WHERE old_item.sign = -1 AND old_item.active\n            -- the new version of the item doesn't cover the old one\n            AND NOT COALESCE(\n                new_item.bbox_xmin <= old_item.bbox_xmin AND\n                new_item.bbox_ymin <= old_item.bbox_ymin AND\n                new_item.bbox_xmax >= old_item.bbox_xmax AND\n                new_item.bbox_ymax >= old_item.bbox_ymax AND\n                new_item.item_start <= old_item.item_start AND\n                new_item.item_end >= old_item.item_end,\n                FALSE\n            )\n            -- and the old version was not strictly inside the extent\n            AND NOT COALESCE(\n                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND\n                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND\n                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND\n                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND\n                old_item.item_start > collection.extent_start_datetime AND\n                old_item.item_end < collection.extent_end_datetime,\n                FALSE\n            )\n    ), growing AS (\n        SELECT\n            new_item.collection_id,\n            MIN(new_item.bbox_xmin) AS xmin,\n            MIN(new_item.bbox_ymin) AS ymin,\n            MAX(new_item.bbox_xmax) AS xmax,\n            MAX(new_item.bbox_ymax) AS ymax,\n            MIN(new_item.item_start) AS start_datetime,\n            MAX(new_item.item_end) AS end_datetime\n        FROM changed AS new_item\n        WHERE new_item.sign = 1 AND new_item.active\n        GROUP BY new_item.collection_id\n    ), change AS (\n        SELECT\n            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,\n            shrinking.collection_id IS NOT NULL AS shrink,\n            growing.xmin, growing.ymin, growing.xmax, growing.ymax,\n            growing.start_datetime, growing.end_datetime\n        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id\n    )\n    UPDATE stac_api_collection AS collection SET\n        extent_out_of_sync = change.shrink,\n        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry\n            ELSE ST_SetSRID(ST_MakeBox2D(\n                ST_Point(\n                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),\n                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)\n                ),\n                ST_Point(\n                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),\n                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)\n                )\n            )::geometry, 4326) END,\n        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime\n            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,\n        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime\n            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END\n    FROM change\n    WHERE collection.id = change.collection_id\n        -- out of sync extents are recomputed anyway\n        AND NOT collection.extent_out_of_sync\n        AND (\n            change.shrink OR\n            collection.extent_geometry IS NULL OR\n            change.xmin < ST_XMin(collection.extent_geometry) OR\n            change.ymin < ST_YMin(collection.extent_geometry) OR\n            change.xmax > ST_XMax(collection.extent_geometry) OR\n            change.ymax > ST_YMax(collection.extent_geometry) OR\n            change.start_datetime < collection.extent_start_datetime OR\n            change.end_datetime > collection.extent_end_datetime OR\n            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR\n            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)\n        );\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='d3dae48216a267f94dabe4d78ec35cf4276cfd58',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_extent_trigger_ba9d0',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT DISTINCT item.collection_id, TRUE FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item;\n        RETURN NULL;\n    END IF;\n    \n    WITH changed AS (\n        SELECT\n            item.*,\n            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,\n            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,\n            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n    ), shrinking AS (\n        SELECT DISTINCT old_item.collection_id\n        FROM changed AS old_item\n        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id\n        LEFT JOIN changed AS new_item\n            ON new_item.sign = 1 AND new_item.id = old_item.id\n            AND new_item.collection_id = old_item.collection_id AND new_item.active\n        WHERE old_item.sign = -1 AND old_item.active\n            -- the new version of the item doesn't cover the old one\n            AND NOT COALESCE(\n                new_item.bbox_xmin <= old_item.bbox_xmin AND\n                new_item.bbox_ymin <= old_item.bbox_ymin AND\n                new_item.bbox_xmax >= old_item.bbox_xmax AND\n                new_item.bbox_ymax >= old_item.bbox_ymax AND\n                new_item.item_start <= old_item.item_start AND\n                new_item.item_end >= old_item.item_end,\n                FALSE\n            )\n            -- and the old version was not strictly inside the extent\n            AND NOT COALESCE(\n                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND\n                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND\n                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND\n                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND\n                old_item.item_start > collection.extent_start_datetime AND\n                old_item.item_end < collection.extent_end_datetime,\n                FALSE\n            )\n    ), growing AS (\n        SELECT\n            new_item.collection_id,\n            MIN(new_item.bbox_xmin) AS xmin,\n            MIN(new_item.bbox_ymin) AS ymin,\n            MAX(new_item.bbox_xmax) AS xmax,\n            MAX(new_item.bbox_ymax) AS ymax,\n            MIN(new_item.item_start) AS start_datetime,\n            MAX(new_item.item_end) AS end_datetime\n        FROM changed AS new_item\n        WHERE new_item.sign = 1 AND new_item.active\n        GROUP BY new_item.collection_id\n    ), change AS (\n        SELECT\n            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,\n            shrinking.collection_id IS NOT NULL AS shrink,\n            growing.xmin, growing.ymin, growing.xmax, growing.ymax,\n            growing.start_datetime, growing.end_datetime\n        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id\n    )\n    UPDATE stac_api_collection AS collection SET\n        extent_out_of_sync = change.shrink,\n        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry\n            ELSE ST_SetSRID(ST_MakeBox2D(\n                ST_Point(\n                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),\n                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)\n                ),\n                ST_Point(\n                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),\n                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)\n                )\n            )::geometry, 4326) END,\n        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime\n            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,\n        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime\n            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END\n    FROM change\n    WHERE collection.id = change.collection_id\n        -- out of sync extents are recomputed anyway\n        AND NOT collection.extent_out_of_sync\n        AND (\n            change.shrink OR\n            collection.extent_geometry IS NULL OR\n            change.xmin < ST_XMin(collection.extent_geometry) OR\n            change.ymin < ST_YMin(collection.extent_geometry) OR\n            change.xmax > ST_XMax(collection.extent_geometry) OR\n            change.ymax > ST_YMax(collection.extent_geometry) OR\n            change.start_datetime < collection.extent_start_datetime OR\n            change.end_datetime > collection.extent_end_datetime OR\n            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR\n            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)\n        );\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='63cfda909f20cfbfb031037cd24f50fdc4c7676e',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_extent_trigger_9c6b7',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+    ]
@@ -0,0 +1,118 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:08
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0074_incremental_collection_extent'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_response_cache_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the response cache of the changed collections\n    PERFORM pg_notify('stac_api_response_cache', json_build_object(\n        'collection', changed.collection_name,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.name AS collection_name FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS collection) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='0c8948f807158a4b46fe5ccafcaadfc3503ecfea',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_response_cache_trigger_a2edf',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_response_cache_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the response cache of the changed collections\n    PERFORM pg_notify('stac_api_response_cache', json_build_object(\n        'collection', changed.collection_name,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.name AS collection_name FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS collection) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='cba789e3addc7b344be24bc347fe1601acd80c97',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_response_cache_trigger_3abc9',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_response_cache_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the response cache of the changed collections\n    PERFORM pg_notify('stac_api_response_cache', json_build_object(\n        'collection', changed.collection_name,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.name AS collection_name FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS collection) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='2ab1bfe1a803ccb4cafb2825fd5e6fcde8d04df8',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_response_cache_trigger_8aec6',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_response_cache_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the response cache of the changed collections\n    PERFORM pg_notify('stac_api_response_cache', json_build_object(\n        'collection', changed.collection_name,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.name AS collection_name\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n            JOIN stac_api_collection AS collection ON collection.id = item.collection_id) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='c6a64323173c328e4c14ea20ffc83779a44076c7',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_response_cache_trigger_fe56d',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_response_cache_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the response cache of the changed collections\n    PERFORM pg_notify('stac_api_response_cache', json_build_object(\n        'collection', changed.collection_name,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.name AS collection_name\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS item\n            JOIN stac_api_collection AS collection ON collection.id = item.collection_id) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='90185bff52065e688c67f817a4ced70443b8e990',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_response_cache_trigger_719f1',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_response_cache_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the response cache of the changed collections\n    PERFORM pg_notify('stac_api_response_cache', json_build_object(\n        'collection', changed.collection_name,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.name AS collection_name\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n            JOIN stac_api_collection AS collection ON collection.id = item.collection_id) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='996806f71ac68eef0f5847c0aeb3de55cff8da31',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_response_cache_trigger_1c874',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+    ]
@@ -0,0 +1,67 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:14
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0075_response_cache_notify_triggers'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_registry_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the collection registry of the changed collections\n    PERFORM pg_notify('stac_api_collection_registry', json_build_object(\n        'id', changed.id,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS collection) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='2df9d23078e2ad2982993aed40a324f442601282',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_registry_trigger_5b1e7',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_registry_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the collection registry of the changed collections\n    PERFORM pg_notify('stac_api_collection_registry', json_build_object(\n        'id', changed.id,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE ((old_row.id, old_row.name, old_row.published, old_row.cache_control_header, old_row.allow_external_assets, old_row.external_asset_whitelist) IS DISTINCT FROM (new_row.id, new_row.name, new_row.published, new_row.cache_control_header, new_row.allow_external_assets, new_row.external_asset_whitelist))\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE ((old_row.id, old_row.name, old_row.published, old_row.cache_control_header, old_row.allow_external_assets, old_row.external_asset_whitelist) IS DISTINCT FROM (new_row.id, new_row.name, new_row.published, new_row.cache_control_header, new_row.allow_external_assets, new_row.external_asset_whitelist))\n        ) AS collection) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='80d43807eee92805582344bba2e3fdf6eb08ab39',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_registry_trigger_6887f',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_registry_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    "\n    -- notify the collection registry of the changed collections\n    PERFORM pg_notify('stac_api_collection_registry', json_build_object(\n        'id', changed.id,\n        'timestamp', extract(epoch FROM clock_timestamp())\n    )::text)\n    FROM (SELECT DISTINCT collection.id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS collection) AS changed;\n\n    RETURN NULL;\n    ",
+                    hash='626019a168b2e4091c465ba867b996c314602ee5',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_registry_trigger_6f554',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+    ]
@@ -0,0 +1,45 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:19
+
+import django.contrib.postgres.fields.ranges
+import django.contrib.postgres.indexes
+import django.db.models.functions.comparison
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0076_collection_registry_notify_triggers'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='item',
+            name='item_dttme_start_end_dttm_idx',
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='properties_datetime_range',
+            field=models.GeneratedField(
+                db_persist=True,
+                expression=models.Func(
+                    django.db.models.functions.comparison.Coalesce(
+                        'properties_start_datetime', 'properties_datetime'
+                    ),
+                    django.db.models.functions.comparison.Coalesce(
+                        'properties_end_datetime', 'properties_datetime'
+                    ),
+                    models.Value('[]'),
+                    function='tstzrange'
+                ),
+                output_field=django.contrib.postgres.fields.ranges.DateTimeRangeField()
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=django.contrib.postgres.indexes.GistIndex(
+                fields=['properties_datetime_range'], name='item_datetime_range_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,65 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:22
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0077_item_datetime_range'),
+    ]
+
+    operations = [
+        migrations.RemoveIndex(
+            model_name='item',
+            name='item_name_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='item_created_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='item_updated_idx',
+        ),
+        migrations.RemoveIndex(
+            model_name='item',
+            name='item_fc_reference_datetime_idx',
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['name', 'id'], name='item_name_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                models.F('properties_datetime_range__startswith'),
+                models.F('id'),
+                name='item_dt_start_id_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                models.F('collection'),
+                models.F('properties_datetime_range__startswith'),
+                models.F('id'),
+                name='item_coll_dt_start_id_idx'
+            ),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['created', 'id'], name='item_created_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(fields=['updated', 'id'], name='item_updated_id_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                fields=['forecast_reference_datetime', 'id'], name='item_fc_reference_dt_id_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,34 @@
+from django.db import migrations
+
+CONFORMANCE_SORT = [
+    'https://api.stacspec.org/v1.0.0/item-search#sort',
+    'https://api.stacspec.org/v1.0.0/ogcapi-features#sort',
+]
+
+
+def update_conformance(apps, schema_editor):
+    # Add sort conformance
+    LandingPage = apps.get_model("stac_api", "LandingPage")
+    lp = LandingPage.objects.get(version='v1')
+    lp.conformsTo = lp.conformsTo + [
+        conformance for conformance in CONFORMANCE_SORT if conformance not in lp.conformsTo
+    ]
+    lp.save()
+
+
+def reverse_update_conformance(apps, schema_editor):
+    # Remove sort conformance
+    LandingPage = apps.get_model("stac_api", "LandingPage")
+    lp = LandingPage.objects.get(version='v1')
+    lp.conformsTo = [
+        conformance for conformance in lp.conformsTo if conformance not in CONFORMANCE_SORT
+    ]
+    lp.save()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stac_api", "0078_item_sortby_indexes"),
+    ]
+
+    operations = [migrations.RunPython(update_conformance, reverse_update_conformance)]
@@ -0,0 +1,98 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:24
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0079_update_conformance_sort'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='collection',
+            name='permanent_items_count',
+            field=models.BigIntegerField(default=0, editable=False),
+        ),
+        migrations.AddField(
+            model_name='collectiondelta',
+            name='permanent_items_count',
+            field=models.BigIntegerField(db_default=0),
+        ),
+        migrations.RunSQL(
+            sql='''
+            UPDATE stac_api_collection AS collection SET permanent_items_count = (
+                SELECT COUNT(*) FROM stac_api_item AS item
+                WHERE item.collection_id = collection.id AND item.properties_expires IS NULL
+            );
+            ''',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                condition=models.Q(('properties_expires__isnull', False)),
+                fields=['collection', 'properties_expires'],
+                name='item_coll_expires_idx'
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_items_count_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, permanent_items_count)\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0;\n        RETURN NULL;\n    END IF;\n    \n    -- Update the collections items count\n    UPDATE stac_api_collection AS collection SET\n        permanent_items_count = collection.permanent_items_count + delta.count\n    FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n    ) AS delta\n    WHERE collection.id = delta.collection_id;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections items count updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='827683319006ca969a6cb4e24de63d7aea72d111',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_items_count_trigger_6e641',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_items_count_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, permanent_items_count)\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        ) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0;\n        RETURN NULL;\n    END IF;\n    \n    -- Update the collections items count\n    UPDATE stac_api_collection AS collection SET\n        permanent_items_count = collection.permanent_items_count + delta.count\n    FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        ) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n    ) AS delta\n    WHERE collection.id = delta.collection_id;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections items count updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='24d2cc94fd22518df7e8400f288bbf426665cddb',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_items_count_trigger_9fc33',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_items_count_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, permanent_items_count)\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0;\n        RETURN NULL;\n    END IF;\n    \n    -- Update the collections items count\n    UPDATE stac_api_collection AS collection SET\n        permanent_items_count = collection.permanent_items_count + delta.count\n    FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n    ) AS delta\n    WHERE collection.id = delta.collection_id;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections items count updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='fc0ac80fad695626d7e4266a02661f1ee3c036f1',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_items_count_trigger_85561',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+    ]
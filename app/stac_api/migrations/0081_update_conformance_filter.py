@@ -0,0 +1,39 @@
+from django.db import migrations
+
+CONFORMANCE_FILTER = [
+    'https://api.stacspec.org/v1.0.0-rc.2/item-search#filter',
+    'http://www.opengis.net/spec/ogcapi-features-3/1.0/conf/filter',
+    'http://www.opengis.net/spec/ogcapi-features-3/1.0/conf/features-filter',
+    'http://www.opengis.net/spec/cql2/1.0/conf/cql2-text',
+    'http://www.opengis.net/spec/cql2/1.0/conf/cql2-json',
+    'http://www.opengis.net/spec/cql2/1.0/conf/basic-cql2',
+    'http://www.opengis.net/spec/cql2/1.0/conf/basic-spatial-functions',
+]
+
+
+def update_conformance(apps, schema_editor):
+    # Add filter conformance
+    LandingPage = apps.get_model("stac_api", "LandingPage")
+    lp = LandingPage.objects.get(version='v1')
+    lp.conformsTo = lp.conformsTo + [
+        conformance for conformance in CONFORMANCE_FILTER if conformance not in lp.conformsTo
+    ]
+    lp.save()
+
+
+def reverse_update_conformance(apps, schema_editor):
+    # Remove filter conformance
+    LandingPage = apps.get_model("stac_api", "LandingPage")
+    lp = LandingPage.objects.get(version='v1')
+    lp.conformsTo = [
+        conformance for conformance in lp.conformsTo if conformance not in CONFORMANCE_FILTER
+    ]
+    lp.save()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stac_api", "0080_collection_permanent_items_count"),
+    ]
+
+    operations = [migrations.RunPython(update_conformance, reverse_update_conformance)]
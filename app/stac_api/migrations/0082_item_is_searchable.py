@@ -0,0 +1,111 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:36
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0081_update_conformance_filter'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_auto_variables_trigger',
+        ),
+        migrations.AddField(
+            model_name='item',
+            name='is_searchable',
+            field=models.BooleanField(default=True, editable=False),
+        ),
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                condition=models.Q(('is_searchable', True)),
+                fields=['id', 'properties_expires'],
+                name='item_searchable_id_idx'
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='collection',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_searchable_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    condition='WHEN (OLD.published IS DISTINCT FROM NEW.published)',
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    -- Synchronize the items with the published flag\n    PERFORM set_config('stac_api.searchable_sync', 'on', true);\n    UPDATE stac_api_item SET is_searchable = NEW.published\n    WHERE collection_id = NEW.id AND is_searchable IS DISTINCT FROM NEW.published;\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    PERFORM set_config('stac_api.searchable_sync', 'off', true);\n\n    RAISE INFO '% items of collection.id=% synchronized with the published flag',\n        updated_count, NEW.id;\n\n    RETURN NULL;\n    ",
+                    hash='12fa45cc747eee15585d684eefd6710f9cf7ce10',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_searchable_trigger_fca3d',
+                    table='stac_api_collection',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_auto_variables_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    condition=
+                    "WHEN (OLD.* IS DISTINCT FROM NEW.* AND\n            current_setting('stac_api.searchable_sync', true) IS DISTINCT FROM 'on')",
+                    func=
+                    "\n    -- update auto variables\n    NEW.etag = gen_random_uuid();\n    NEW.updated = now();\n\n    RAISE INFO 'Updated auto fields of %.id=% due to table updates.', TG_TABLE_NAME, NEW.id;\n\n    RETURN NEW;\n    ",
+                    hash='7496d9d71818b199927df3a9b4cd365ccfa2c471',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_auto_variables_trigger_ba1f6',
+                    table='stac_api_item',
+                    when='BEFORE'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_searchable_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    func=
+                    '\n        -- Copy the published flag of the collection\n        NEW.is_searchable = (\n            SELECT collection.published FROM stac_api_collection AS collection\n            WHERE collection.id = NEW.collection_id\n        );\n\n        RETURN NEW;\n        ',
+                    hash='da5b1eca47b488250223dcddd14b81047d68427a',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_searchable_trigger_78afb',
+                    table='stac_api_item',
+                    when='BEFORE'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_searchable_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    condition=
+                    'WHEN (OLD.is_searchable IS DISTINCT FROM NEW.is_searchable OR\n                OLD.collection_id IS DISTINCT FROM NEW.collection_id)',
+                    func=
+                    '\n        -- Copy the published flag of the collection\n        NEW.is_searchable = (\n            SELECT collection.published FROM stac_api_collection AS collection\n            WHERE collection.id = NEW.collection_id\n        );\n\n        RETURN NEW;\n        ',
+                    hash='4a104eb1797aff1a81f61ceb60cd879bd12ed3c4',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_searchable_trigger_689c0',
+                    table='stac_api_item',
+                    when='BEFORE'
+                )
+            ),
+        ),
+        # the existing items are not changed by the initialization of the flag
+        migrations.RunSQL(
+            sql='''
+            SELECT set_config('stac_api.searchable_sync', 'on', true);
+            UPDATE stac_api_item AS item SET is_searchable = FALSE
+            FROM stac_api_collection AS collection
+            WHERE collection.id = item.collection_id AND NOT collection.published;
+            SELECT set_config('stac_api.searchable_sync', 'off', true);
+            ''',
+            reverse_sql=migrations.RunSQL.noop
+        ),
+    ]
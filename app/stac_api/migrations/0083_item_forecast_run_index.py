@@ -0,0 +1,28 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:38
+
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0082_item_is_searchable'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='item',
+            index=models.Index(
+                condition=models.Q(('forecast_reference_datetime__isnull', False)),
+                fields=[
+                    'collection',
+                    'forecast_reference_datetime',
+                    'forecast_variable',
+                    'forecast_horizon'
+                ],
+                include=('properties_expires',),
+                name='item_fc_run_idx'
+            ),
+        ),
+    ]
@@ -0,0 +1,33 @@
+from django.db import migrations
+
+CONFORMANCE_AGGREGATION = [
+    'https://api.stacspec.org/v0.3.0/aggregation',
+]
+
+
+def update_conformance(apps, schema_editor):
+    # Add aggregation conformance
+    LandingPage = apps.get_model("stac_api", "LandingPage")
+    lp = LandingPage.objects.get(version='v1')
+    lp.conformsTo = lp.conformsTo + [
+        conformance for conformance in CONFORMANCE_AGGREGATION if conformance not in lp.conformsTo
+    ]
+    lp.save()
+
+
+def reverse_update_conformance(apps, schema_editor):
+    # Remove aggregation conformance
+    LandingPage = apps.get_model("stac_api", "LandingPage")
+    lp = LandingPage.objects.get(version='v1')
+    lp.conformsTo = [
+        conformance for conformance in lp.conformsTo if conformance not in CONFORMANCE_AGGREGATION
+    ]
+    lp.save()
+
+
+class Migration(migrations.Migration):
+    dependencies = [
+        ("stac_api", "0083_item_forecast_run_index"),
+    ]
+
+    operations = [migrations.RunPython(update_conformance, reverse_update_conformance)]
@@ -0,0 +1,31 @@
+# Generated by Django 5.2.18 on 2026-10-16 20:54
+
+import django.db.models.deletion
+from django.db import migrations
+from django.db import models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0084_update_conformance_aggregation'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='AssetContentHash',
+            fields=[
+                ('asset', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='stac_api.asset')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('etag', models.CharField(max_length=56)),
+            ],
+        ),
+        migrations.CreateModel(
+            name='ItemContentHash',
+            fields=[
+                ('item', models.OneToOneField(on_delete=django.db.models.deletion.CASCADE, primary_key=True, related_name='+', serialize=False, to='stac_api.item')),
+                ('content_hash', models.CharField(max_length=64)),
+                ('etag', models.CharField(max_length=56)),
+            ],
+        ),
+    ]
@@ -0,0 +1,280 @@
+# Generated by Django 5.2.18 on 2026-10-16 23:10
+
+import pgtrigger.compiler
+import pgtrigger.migrations
+
+from django.db import migrations
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('stac_api', '0085_content_hashes'),
+    ]
+
+    operations = [
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_collection_child_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_item_collection_extent_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_item_collection_file_size_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='add_item_collection_items_count_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='update_item_collection_items_count_trigger',
+        ),
+        pgtrigger.migrations.RemoveTrigger(
+            model_name='item',
+            name='del_item_collection_items_count_trigger',
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id)\n        SELECT delta.* FROM (SELECT DISTINCT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='8aebbffe4c724adaf8c380ba77f65c29329a50f0',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_collection_child_trigger_b1293',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id)\n        SELECT delta.* FROM (SELECT DISTINCT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='b716ceb00bcefd54d1202809fdd4db33bb0245cb',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_collection_child_trigger_c0533',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_collection_child_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id)\n        SELECT delta.* FROM (SELECT DISTINCT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- update related collection\n    UPDATE stac_api_collection SET\n        updated = now(),\n        etag = public.gen_random_uuid()\n    WHERE id IN (SELECT child.collection_id FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child);\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO 'Parent table collection auto fields of % rows updated due to child Item updates.',\n        updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='de6cc334008cf8bbb831af112cd7f8923c4744e7',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_collection_child_trigger_a4f01',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT delta.* FROM (SELECT DISTINCT item.collection_id, TRUE FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    WITH changed AS (\n        SELECT\n            item.*,\n            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,\n            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,\n            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n    ), shrinking AS (\n        SELECT DISTINCT old_item.collection_id\n        FROM changed AS old_item\n        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id\n        LEFT JOIN changed AS new_item\n            ON new_item.sign = 1 AND new_item.id = old_item.id\n            AND new_item.collection_id = old_item.collection_id AND new_item.active\n        WHERE old_item.sign = -1 AND old_item.active\n            -- the new version of the item doesn't cover the old one\n            AND NOT COALESCE(\n                new_item.bbox_xmin <= old_item.bbox_xmin AND\n                new_item.bbox_ymin <= old_item.bbox_ymin AND\n                new_item.bbox_xmax >= old_item.bbox_xmax AND\n                new_item.bbox_ymax >= old_item.bbox_ymax AND\n                new_item.item_start <= old_item.item_start AND\n                new_item.item_end >= old_item.item_end,\n                FALSE\n            )\n            -- and the old version was not strictly inside the extent\n            AND NOT COALESCE(\n                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND\n                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND\n                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND\n                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND\n                old_item.item_start > collection.extent_start_datetime AND\n                old_item.item_end < collection.extent_end_datetime,\n                FALSE\n            )\n    ), growing AS (\n        SELECT\n            new_item.collection_id,\n            MIN(new_item.bbox_xmin) AS xmin,\n            MIN(new_item.bbox_ymin) AS ymin,\n            MAX(new_item.bbox_xmax) AS xmax,\n            MAX(new_item.bbox_ymax) AS ymax,\n            MIN(new_item.item_start) AS start_datetime,\n            MAX(new_item.item_end) AS end_datetime\n        FROM changed AS new_item\n        WHERE new_item.sign = 1 AND new_item.active\n        GROUP BY new_item.collection_id\n    ), change AS (\n        SELECT\n            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,\n            shrinking.collection_id IS NOT NULL AS shrink,\n            growing.xmin, growing.ymin, growing.xmax, growing.ymax,\n            growing.start_datetime, growing.end_datetime\n        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id\n    )\n    UPDATE stac_api_collection AS collection SET\n        extent_out_of_sync = change.shrink,\n        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry\n            ELSE ST_SetSRID(ST_MakeBox2D(\n                ST_Point(\n                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),\n                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)\n                ),\n                ST_Point(\n                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),\n                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)\n                )\n            )::geometry, 4326) END,\n        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime\n            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,\n        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime\n            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END\n    FROM change\n    WHERE collection.id = change.collection_id\n        -- out of sync extents are recomputed anyway\n        AND NOT collection.extent_out_of_sync\n        AND (\n            change.shrink OR\n            collection.extent_geometry IS NULL OR\n            change.xmin < ST_XMin(collection.extent_geometry) OR\n            change.ymin < ST_YMin(collection.extent_geometry) OR\n            change.xmax > ST_XMax(collection.extent_geometry) OR\n            change.ymax > ST_YMax(collection.extent_geometry) OR\n            change.start_datetime < collection.extent_start_datetime OR\n            change.end_datetime > collection.extent_end_datetime OR\n            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR\n            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)\n        );\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='a4f080fe0bbdaf61a228739a858bd6c1fdd4782d',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_extent_trigger_8572d',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT delta.* FROM (SELECT DISTINCT item.collection_id, TRUE FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        ) AS item\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    WITH changed AS (\n        SELECT\n            item.*,\n            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,\n            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,\n            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR\n                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR\n                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR\n                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR\n                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires)\n        ) AS item\n    ), shrinking AS (\n        SELECT DISTINCT old_item.collection_id\n        FROM changed AS old_item\n        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id\n        LEFT JOIN changed AS new_item\n            ON new_item.sign = 1 AND new_item.id = old_item.id\n            AND new_item.collection_id = old_item.collection_id AND new_item.active\n        WHERE old_item.sign = -1 AND old_item.active\n            -- the new version of the item doesn't cover the old one\n            AND NOT COALESCE(\n                new_item.bbox_xmin <= old_item.bbox_xmin AND\n                new_item.bbox_ymin <= old_item.bbox_ymin AND\n                new_item.bbox_xmax >= old_item.bbox_xmax AND\n                new_item.bbox_ymax >= old_item.bbox_ymax AND\n                new_item.item_start <= old_item.item_start AND\n                new_item.item_end >= old_item.item_end,\n                FALSE\n            )\n            -- and the old version was not strictly inside the extent\n            AND NOT COALESCE(\n                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND\n                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND\n                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND\n                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND\n                old_item.item_start > collection.extent_start_datetime AND\n                old_item.item_end < collection.extent_end_datetime,\n                FALSE\n            )\n    ), growing AS (\n        SELECT\n            new_item.collection_id,\n            MIN(new_item.bbox_xmin) AS xmin,\n            MIN(new_item.bbox_ymin) AS ymin,\n            MAX(new_item.bbox_xmax) AS xmax,\n            MAX(new_item.bbox_ymax) AS ymax,\n            MIN(new_item.item_start) AS start_datetime,\n            MAX(new_item.item_end) AS end_datetime\n        FROM changed AS new_item\n        WHERE new_item.sign = 1 AND new_item.active\n        GROUP BY new_item.collection_id\n    ), change AS (\n        SELECT\n            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,\n            shrinking.collection_id IS NOT NULL AS shrink,\n            growing.xmin, growing.ymin, growing.xmax, growing.ymax,\n            growing.start_datetime, growing.end_datetime\n        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id\n    )\n    UPDATE stac_api_collection AS collection SET\n        extent_out_of_sync = change.shrink,\n        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry\n            ELSE ST_SetSRID(ST_MakeBox2D(\n                ST_Point(\n                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),\n                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)\n                ),\n                ST_Point(\n                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),\n                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)\n                )\n            )::geometry, 4326) END,\n        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime\n            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,\n        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime\n            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END\n    FROM change\n    WHERE collection.id = change.collection_id\n        -- out of sync extents are recomputed anyway\n        AND NOT collection.extent_out_of_sync\n        AND (\n            change.shrink OR\n            collection.extent_geometry IS NULL OR\n            change.xmin < ST_XMin(collection.extent_geometry) OR\n            change.ymin < ST_YMin(collection.extent_geometry) OR\n            change.xmax > ST_XMax(collection.extent_geometry) OR\n            change.ymax > ST_YMax(collection.extent_geometry) OR\n            change.start_datetime < collection.extent_start_datetime OR\n            change.end_datetime > collection.extent_end_datetime OR\n            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR\n            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)\n        );\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='9766ef41558f51ef835a65031aab7fc0ce934055',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_extent_trigger_ba9d0',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_extent_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, extent_out_of_sync)\n        SELECT delta.* FROM (SELECT DISTINCT item.collection_id, TRUE FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    WITH changed AS (\n        SELECT\n            item.*,\n            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,\n            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,\n            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n    ), shrinking AS (\n        SELECT DISTINCT old_item.collection_id\n        FROM changed AS old_item\n        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id\n        LEFT JOIN changed AS new_item\n            ON new_item.sign = 1 AND new_item.id = old_item.id\n            AND new_item.collection_id = old_item.collection_id AND new_item.active\n        WHERE old_item.sign = -1 AND old_item.active\n            -- the new version of the item doesn't cover the old one\n            AND NOT COALESCE(\n                new_item.bbox_xmin <= old_item.bbox_xmin AND\n                new_item.bbox_ymin <= old_item.bbox_ymin AND\n                new_item.bbox_xmax >= old_item.bbox_xmax AND\n                new_item.bbox_ymax >= old_item.bbox_ymax AND\n                new_item.item_start <= old_item.item_start AND\n                new_item.item_end >= old_item.item_end,\n                FALSE\n            )\n            -- and the old version was not strictly inside the extent\n            AND NOT COALESCE(\n                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND\n                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND\n                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND\n                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND\n                old_item.item_start > collection.extent_start_datetime AND\n                old_item.item_end < collection.extent_end_datetime,\n                FALSE\n            )\n    ), growing AS (\n        SELECT\n            new_item.collection_id,\n            MIN(new_item.bbox_xmin) AS xmin,\n            MIN(new_item.bbox_ymin) AS ymin,\n            MAX(new_item.bbox_xmax) AS xmax,\n            MAX(new_item.bbox_ymax) AS ymax,\n            MIN(new_item.item_start) AS start_datetime,\n            MAX(new_item.item_end) AS end_datetime\n        FROM changed AS new_item\n        WHERE new_item.sign = 1 AND new_item.active\n        GROUP BY new_item.collection_id\n    ), change AS (\n        SELECT\n            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,\n            shrinking.collection_id IS NOT NULL AS shrink,\n            growing.xmin, growing.ymin, growing.xmax, growing.ymax,\n            growing.start_datetime, growing.end_datetime\n        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id\n    )\n    UPDATE stac_api_collection AS collection SET\n        extent_out_of_sync = change.shrink,\n        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry\n            ELSE ST_SetSRID(ST_MakeBox2D(\n                ST_Point(\n                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),\n                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)\n                ),\n                ST_Point(\n                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),\n                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)\n                )\n            )::geometry, 4326) END,\n        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime\n            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,\n        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime\n            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END\n    FROM change\n    WHERE collection.id = change.collection_id\n        -- out of sync extents are recomputed anyway\n        AND NOT collection.extent_out_of_sync\n        AND (\n            change.shrink OR\n            collection.extent_geometry IS NULL OR\n            change.xmin < ST_XMin(collection.extent_geometry) OR\n            change.ymin < ST_YMin(collection.extent_geometry) OR\n            change.xmax > ST_XMax(collection.extent_geometry) OR\n            change.ymax > ST_YMax(collection.extent_geometry) OR\n            change.start_datetime < collection.extent_start_datetime OR\n            change.end_datetime > collection.extent_end_datetime OR\n            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR\n            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)\n        );\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections extent updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='d11d39b1096320bf59e9967afeb2269e028c7500',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_extent_trigger_9c6b7',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, total_data_size)\n        SELECT delta.* FROM (\n            SELECT child.collection_id, SUM(child.sign * COALESCE(child.total_data_size, 0))\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n            GROUP BY child.collection_id\n            HAVING SUM(child.sign * COALESCE(child.total_data_size, 0)) <> 0\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='222f6d4b6572c3f1148048fe8d4fac6decad01d5',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_file_size_trigger_d4d66',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, total_data_size)\n        SELECT delta.* FROM (\n            SELECT child.collection_id, SUM(child.sign * COALESCE(child.total_data_size, 0))\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n            GROUP BY child.collection_id\n            HAVING SUM(child.sign * COALESCE(child.total_data_size, 0)) <> 0\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row IS DISTINCT FROM new_row)\n        ) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='add9d66ef5d8c7f4fca5397c52761053ae2c1afd',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_file_size_trigger_83572',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_file_size_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE parent RECORD;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, total_data_size)\n        SELECT delta.* FROM (\n            SELECT child.collection_id, SUM(child.sign * COALESCE(child.total_data_size, 0))\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n            GROUP BY child.collection_id\n            HAVING SUM(child.sign * COALESCE(child.total_data_size, 0)) <> 0\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- Update related collection file_size variables\n    FOR parent IN\n        UPDATE stac_api_collection AS parent_table SET\n            total_data_size = parent_table.total_data_size + delta.size\n        FROM (\n            SELECT\n                child.collection_id AS id,\n                SUM(child.sign * COALESCE(child.total_data_size, 0)) AS size\n            FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS child\n            GROUP BY child.collection_id\n        ) AS delta\n        WHERE parent_table.id = delta.id AND delta.size <> 0\n        RETURNING parent_table.id, parent_table.total_data_size\n    LOOP\n        IF parent.total_data_size < 0\n            THEN RAISE WARNING 'collection.id=% total_data_size has negative value %',\n            parent.id, parent.total_data_size;\n        END IF;\n\n        RAISE INFO 'collection.id=% total_data_size updated, due to child updates.', parent.id;\n    END LOOP;\n\n    RETURN NULL;\n    ",
+                    hash='77d57bcbbaff1270e65ce7cde738764a8b4a9554',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_file_size_trigger_b8ec0',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='add_item_collection_items_count_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, permanent_items_count)\n        SELECT delta.* FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- Update the collections items count\n    UPDATE stac_api_collection AS collection SET\n        permanent_items_count = collection.permanent_items_count + delta.count\n    FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT new_row.*, 1 AS sign FROM new_rows AS new_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n    ) AS delta\n    WHERE collection.id = delta.collection_id;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections items count updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='9c8a1f080a7a49cd33ac49fafa9cae95afeecbda',
+                    level='STATEMENT',
+                    operation='INSERT',
+                    pgid='pgtrigger_add_item_collection_items_count_trigger_6e641',
+                    referencing='REFERENCING NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='update_item_collection_items_count_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, permanent_items_count)\n        SELECT delta.* FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        ) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- Update the collections items count\n    UPDATE stac_api_collection AS collection SET\n        permanent_items_count = collection.permanent_items_count + delta.count\n    FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (\n            SELECT new_row.*, 1 AS sign\n            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        UNION ALL\n            SELECT old_row.*, -1 AS sign\n            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id\n            WHERE (old_row.collection_id IS DISTINCT FROM new_row.collection_id OR\n                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL))\n        ) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n    ) AS delta\n    WHERE collection.id = delta.collection_id;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections items count updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='2f01692d8636a254f084711a9d9358dafc75c0c8',
+                    level='STATEMENT',
+                    operation='UPDATE',
+                    pgid='pgtrigger_update_item_collection_items_count_trigger_9fc33',
+                    referencing='REFERENCING OLD TABLE AS old_rows  NEW TABLE AS new_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+        pgtrigger.migrations.AddTrigger(
+            model_name='item',
+            trigger=pgtrigger.compiler.Trigger(
+                name='del_item_collection_items_count_trigger',
+                sql=pgtrigger.compiler.UpsertTriggerSql(
+                    declare='DECLARE updated_count INTEGER;',
+                    func=
+                    "\n    IF current_setting('stac_api.deferred_collection_updates', true) = 'on' THEN\n        INSERT INTO stac_api_collectiondelta (collection_id, permanent_items_count)\n        SELECT delta.* FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n        ) AS delta\n        WHERE EXISTS (\n            SELECT 1 FROM stac_api_collection AS collection\n            WHERE collection.id = delta.collection_id\n        );\n        RETURN NULL;\n    END IF;\n    \n    -- Update the collections items count\n    UPDATE stac_api_collection AS collection SET\n        permanent_items_count = collection.permanent_items_count + delta.count\n    FROM (\n        SELECT item.collection_id, SUM(item.sign) AS count\n        FROM (SELECT old_row.*, -1 AS sign FROM old_rows AS old_row) AS item\n        WHERE item.properties_expires IS NULL\n        GROUP BY item.collection_id\n        HAVING SUM(item.sign) <> 0\n    ) AS delta\n    WHERE collection.id = delta.collection_id;\n\n    GET DIAGNOSTICS updated_count = ROW_COUNT;\n    RAISE INFO '% collections items count updated, due to item updates.', updated_count;\n\n    RETURN NULL;\n    ",
+                    hash='b07b7d3f669d6894d1cb6e88297f7a8044058afb',
+                    level='STATEMENT',
+                    operation='DELETE',
+                    pgid='pgtrigger_del_item_collection_items_count_trigger_85561',
+                    referencing='REFERENCING OLD TABLE AS old_rows ',
+                    table='stac_api_item',
+                    when='AFTER'
+                )
+            ),
+        ),
+    ]
@@ -4,6 +4,7 @@ from django.contrib.gis.db import models
 from django.contrib.postgres.fields import ArrayField
 from django.core.serializers.json import DjangoJSONEncoder
 from django.db.models import Q
+from django.db.models.functions import Now
 from django.utils.translation import gettext_lazy as _
 
 from stac_api.models.general import SEARCH_TEXT_HELP_ITEM
@@ -85,6 +86,10 @@ class Collection(models.Model):
 
     total_data_size = models.BigIntegerField(default=0, null=True, blank=True)
 
+    # NOTE: number of items without expiry date, this field is automatically updated by
+    # stac_api.pgtriggers. The expiring items are not included as they expire without any write.
+    permanent_items_count = models.BigIntegerField(default=0, editable=False)
+
     allow_external_assets = models.BooleanField(
         default=False,
         help_text=_('Whether this collection can have assets that are hosted externally')
@@ -267,3 +272,25 @@ class ProjEPSGCount(CountBase):
         )
 
     value = models.IntegerField(null=True, blank=True)
+
+
+class CollectionDelta(models.Model):
+    '''Pending changes of a collection.
+
+    When the deferred collection updates are enabled (settings.COLLECTION_UPDATES_DEFERRED), the
+    item triggers append the collection changes to this table instead of updating the collection
+    row, so that concurrent writers of a collection don't wait on the collection row lock. The
+    consolidate_collection_deltas command then folds the deltas into the collections.
+    '''
+
+    id = models.BigAutoField(primary_key=True)
+    collection = models.ForeignKey(
+        Collection,
+        related_name='+',
+        on_delete=models.CASCADE,
+    )
+    # NOTE: the rows are inserted by stac_api.pgtriggers, therefore the defaults are DB defaults
+    total_data_size = models.BigIntegerField(db_default=0)
+    permanent_items_count = models.BigIntegerField(db_default=0)
+    extent_out_of_sync = models.BooleanField(db_default=False)
+    created = models.DateTimeField(db_default=Now())
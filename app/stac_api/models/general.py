@@ -113,13 +113,15 @@ class Link(models.Model):
     def __str__(self):
         return f'{self.rel}: {self.href}'
 
-    def save(self, *args, **kwargs) -> None:
+    def full_clean(self, *args, **kwargs) -> None:
         """Validate the hreflang"""
-        self.full_clean()
+        super().full_clean(*args, **kwargs)
 
         if self.hreflang is not None and self.hreflang != '' and not tags.check(self.hreflang):
             raise ValidationError(_(", ".join([v.message for v in tags.tag(self.hreflang).errors])))
 
+    def save(self, *args, **kwargs) -> None:
+        self.full_clean()
         super().save(*args, **kwargs)
 
 
@@ -445,6 +447,8 @@ class BaseAssetUpload(models.Model):
         validators=[MinValueValidator(1), MaxValueValidator(100)], null=False, blank=False
     )  # S3 doesn't support more that 10'000 parts
     md5_parts = models.JSONField(encoder=DjangoJSONEncoder, editable=False)
+    # DEPRECATED: the urls are presigned on demand and not stored anymore, this column is kept
+    # until all the uploads with stored urls have ended and is then dropped by a later migration.
     urls = models.JSONField(default=list, encoder=DjangoJSONEncoder, blank=True)
     created = models.DateTimeField(auto_now_add=True)
     ended = models.DateTimeField(blank=True, null=True, default=None)
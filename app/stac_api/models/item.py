@@ -1,7 +1,13 @@
 import logging
 
 from django.contrib.gis.db import models
+from django.contrib.postgres.fields import DateTimeRangeField
+from django.contrib.postgres.indexes import GistIndex
+from django.db.models import F
+from django.db.models import Func
 from django.db.models import Q
+from django.db.models import Value
+from django.db.models.functions import Coalesce
 from django.utils.translation import gettext_lazy as _
 
 from stac_api.managers import ItemManager
@@ -66,31 +72,63 @@ class Item(models.Model):
     class Meta:
         unique_together = (('collection', 'name'),)
         indexes = [
-            models.Index(fields=['name'], name='item_name_idx'),
+            # The sort keys of the sortby extension are paired with the id which breaks the ties
+            # of the keyset pagination, see pagination.CursorPagination
+            models.Index(fields=['name', 'id'], name='item_name_id_idx'),
+            models.Index(
+                F('properties_datetime_range__startswith'), F('id'), name='item_dt_start_id_idx'
+            ),
+            models.Index(
+                F('collection'),
+                F('properties_datetime_range__startswith'),
+                F('id'),
+                name='item_coll_dt_start_id_idx'
+            ),
             # the following 3 indices are used e.g. in collection_temporal_extent
             models.Index(fields=['properties_datetime'], name='item_datetime_idx'),
             models.Index(fields=['properties_start_datetime'], name='item_start_datetime_idx'),
             models.Index(fields=['properties_end_datetime'], name='item_end_datetime_idx'),
             # created, updated, and title are "queryable" in the search endpoint
             # see: views.py:322 and 323
-            models.Index(fields=['created'], name='item_created_idx'),
-            models.Index(fields=['updated'], name='item_updated_idx'),
+            models.Index(fields=['created', 'id'], name='item_created_id_idx'),
+            models.Index(fields=['updated', 'id'], name='item_updated_id_idx'),
             models.Index(fields=['properties_title'], name='item_title_idx'),
             # forecast properties are "queryable" in the search endpoint
             models.Index(
-                fields=['forecast_reference_datetime'], name='item_fc_reference_datetime_idx'
+                fields=['forecast_reference_datetime', 'id'], name='item_fc_reference_dt_id_idx'
+            ),
+            # query shape of the forecast collections, the runs are listed with a loose index
+            # scan on the collection and reference datetime, see stac_api.forecast_runs
+            models.Index(
+                fields=[
+                    'collection',
+                    'forecast_reference_datetime',
+                    'forecast_variable',
+                    'forecast_horizon',
+                ],
+                include=['properties_expires'],
+                condition=Q(forecast_reference_datetime__isnull=False),
+                name='item_fc_run_idx'
             ),
             models.Index(fields=['forecast_horizon'], name='item_fc_horizon_idx'),
             models.Index(fields=['forecast_duration'], name='item_fc_duration_idx'),
             models.Index(fields=['forecast_variable'], name='item_fc_variable_idx'),
             models.Index(fields=['forecast_perturbed'], name='item_fc_perturbed_idx'),
-            # combination of datetime and start_ and end_datetimes are used in
-            # managers.py:110 and following
+            # the datetime query parameter is answered by a containment of the datetime range,
+            # see ItemQuerySet.filter_by_datetime
+            GistIndex(fields=['properties_datetime_range'], name='item_datetime_range_idx'),
+            # prefilter of the search endpoint (published collections and not expired items) in
+            # the default id ordering, answered by an index only scan
             models.Index(
-                fields=[
-                    'properties_datetime', 'properties_start_datetime', 'properties_end_datetime'
-                ],
-                name='item_dttme_start_end_dttm_idx'
+                fields=['id', 'properties_expires'],
+                condition=Q(is_searchable=True),
+                name='item_searchable_id_idx'
+            ),
+            # the expiring items are counted on demand, see stac_api.number_matched
+            models.Index(
+                fields=['collection', 'properties_expires'],
+                condition=Q(properties_expires__isnull=False),
+                name='item_coll_expires_idx'
             ),
         ]
         triggers = generates_item_triggers()
@@ -102,6 +140,15 @@ class Item(models.Model):
     geometry = models.GeometryField(
         null=False, blank=False, default=BBOX_CH, srid=4326, validators=[validate_geometry]
     )
+    # NOTE: copy of the collection published flag, it is automatically updated by
+    # stac_api.pgtriggers and used by the search endpoint instead of a join on the collections.
+    is_searchable = models.BooleanField(default=True, editable=False)
+    # NOTE: the bbox fields are automatically updated by stac_api.pgtriggers, they are also set
+    # in save() in order to have an up to date instance after a save.
+    bbox_xmin = models.FloatField(null=True, blank=True, editable=False)
+    bbox_ymin = models.FloatField(null=True, blank=True, editable=False)
+    bbox_xmax = models.FloatField(null=True, blank=True, editable=False)
+    bbox_ymax = models.FloatField(null=True, blank=True, editable=False)
     created = models.DateTimeField(auto_now_add=True)
     # NOTE: the updated field is automatically updated by stac_api.pgtriggers, we use auto_now_add
     # only for the initial value.
@@ -123,6 +170,18 @@ class Item(models.Model):
         null=True,
         help_text="Enter date in <i>yyyy-mm-dd</i> format, and time in UTC <i>hh:mm:ss</i> format"
     )
+    # Range covering both the instant (datetime) and the interval (start_datetime/end_datetime)
+    # items, the bounds are inclusive.
+    properties_datetime_range = models.GeneratedField(
+        expression=Func(
+            Coalesce('properties_start_datetime', 'properties_datetime'),
+            Coalesce('properties_end_datetime', 'properties_datetime'),
+            Value('[]'),
+            function='tstzrange'
+        ),
+        output_field=DateTimeRangeField(),
+        db_persist=True
+    )
     properties_expires = models.DateTimeField(
         blank=True,
         null=True,
@@ -212,6 +271,19 @@ class Item(models.Model):
         )
         validate_expires(self.properties_expires)
 
+    def save(self, *args, **kwargs):
+        if self.geometry is not None:
+            self.bbox_xmin, self.bbox_ymin, self.bbox_xmax, self.bbox_ymax = self.geometry.extent
+        super().save(*args, **kwargs)
+
+    @property
+    def bbox(self):
+        '''Item bbox as tuple (xmin, ymin, xmax, ymax)'''
+        if self.bbox_xmin is None:
+            # Item not yet saved
+            return self.geometry.extent
+        return (self.bbox_xmin, self.bbox_ymin, self.bbox_xmax, self.bbox_ymax)
+
 
 class ItemLink(Link):
     item = models.ForeignKey(
@@ -273,6 +345,28 @@ class Asset(AssetBase):
         return get_asset_path(self.item, self.name)
 
 
+class ItemContentHash(models.Model):
+    '''Content hash of the last upsert of an item and its etag after this upsert
+
+    See stac_api.content_hash
+    '''
+    item = models.OneToOneField(Item, primary_key=True, related_name='+', on_delete=models.CASCADE)
+    content_hash = models.CharField(max_length=64)
+    etag = models.CharField(max_length=56)
+
+
+class AssetContentHash(models.Model):
+    '''Content hash of the last upsert of an asset and its etag after this upsert
+
+    See stac_api.content_hash
+    '''
+    asset = models.OneToOneField(
+        Asset, primary_key=True, related_name='+', on_delete=models.CASCADE
+    )
+    content_hash = models.CharField(max_length=64)
+    etag = models.CharField(max_length=56)
+
+
 class AssetUpload(BaseAssetUpload):
 
     class Meta:
@@ -0,0 +1,180 @@
+'''Number of items matched by the item listings (context extension)
+
+An exact COUNT of the search results is as expensive as reading all of them, therefore
+numberMatched is computed with the cheapest of the following strategies:
+
+- "collection": an unfiltered listing of the items of a collection is counted from the
+  permanent_items_count of the collection, kept up to date by the item triggers (see
+  stac_api.pgtriggers.items_count_triggers), plus its pending collection deltas when the
+  collection updates are deferred, plus the not yet expired items that are counted with the
+  item_coll_expires_idx partial index.
+- "exact": the matching items are counted up to NUMBER_MATCHED_EXACT_THRESHOLD, which bounds the
+  cost of the count.
+- "estimate": above the threshold, the row estimate of the PostgreSQL planner
+  (EXPLAIN (FORMAT JSON)) is returned.
+
+All the queries share a time budget of NUMBER_MATCHED_TIME_BUDGET milliseconds, enforced by a
+statement timeout. When the budget is exhausted numberMatched is omitted.
+'''
+import json
+import logging
+import time
+from collections import namedtuple
+from contextlib import contextmanager
+
+from prometheus_client import Counter
+from psycopg.errors import QueryCanceled
+
+from django.conf import settings
+from django.db import OperationalError
+from django.db import connection
+from django.db import transaction
+from django.db.models import F
+from django.db.models import Func
+from django.db.models import OuterRef
+from django.db.models import Subquery
+from django.db.models import Sum
+from django.db.models.functions import Coalesce
+
+from stac_api.models.collection import Collection
+from stac_api.models.collection import CollectionDelta
+from stac_api.models.item import Item
+from stac_api.views.filters import get_expiry_cutoff
+
+logger = logging.getLogger(__name__)
+
+NumberMatched = namedtuple('NumberMatched', ['matched', 'strategy'])
+
+STRATEGIES = Counter(
+    'stac_api_number_matched',
+    'Strategies used to compute numberMatched, "timeout" when the time budget was exhausted',
+    ['strategy']
+)
+
+
+class TimeBudgetExceeded(Exception):
+    pass
+
+
+@contextmanager
+def statement_timeout(deadline):
+    '''Run the queries of the block with a statement timeout up to the deadline
+
+    Args:
+        deadline: float
+            time.monotonic() deadline
+
+    Raises:
+        TimeBudgetExceeded: if the deadline is reached
+    '''
+    timeout = int((deadline - time.monotonic()) * 1000)
+    if timeout <= 0:
+        raise TimeBudgetExceeded()
+    try:
+        with transaction.atomic(), connection.cursor() as cursor:
+            cursor.execute("SELECT current_setting('statement_timeout')")
+            previous = cursor.fetchone()[0]
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [f'{timeout}ms'])
+            yield
+            # the setting would otherwise last until the end of an outer transaction
+            cursor.execute("SELECT set_config('statement_timeout', %s, true)", [previous])
+    except OperationalError as error:
+        if isinstance(error.__cause__, QueryCanceled):
+            raise TimeBudgetExceeded() from error
+        raise
+
+
+def count_collection_items(collection_name):
+    '''Returns the number of active items of a collection
+
+    Args:
+        collection_name: string
+            Name of the collection
+
+    Returns: int
+        Number of items, None if the collection doesn't exist
+    '''
+    expiring_items = Item.objects.filter(
+        collection=OuterRef('pk'), properties_expires__gte=get_expiry_cutoff()
+    ).order_by().annotate(count=Func(F('pk'), function='COUNT')).values('count')
+    # the item changes not yet consolidated, see settings.COLLECTION_UPDATES_DEFERRED
+    pending_items = CollectionDelta.objects.filter(
+        collection=OuterRef('pk')
+    ).order_by().values('collection').annotate(count=Sum('permanent_items_count')).values('count')
+    return Collection.objects.filter(name=collection_name).annotate(
+        items_count=F('permanent_items_count') + Coalesce(Subquery(pending_items), 0) +
+        Coalesce(Subquery(expiring_items), 0)
+    ).values_list('items_count', flat=True).first()
+
+
+def estimate_count(queryset):
+    '''Returns the number of rows of the queryset estimated by the PostgreSQL planner'''
+    plan = json.loads(queryset.order_by().explain(format='json'))
+    return int(plan[0]['Plan']['Plan Rows'])
+
+
+def get_number_matched(queryset, collection_name=None):
+    '''Returns the number of items matched by a listing
+
+    Args:
+        queryset: ItemQuerySet
+            Filtered items of the listing, without pagination
+        collection_name: string
+            Name of the collection of an unfiltered items listing, enables the "collection"
+            strategy
+
+    Returns: NumberMatched
+        Named tuple (matched, strategy), None when the time budget was exhausted
+    '''
+    deadline = time.monotonic() + settings.NUMBER_MATCHED_TIME_BUDGET / 1000
+    threshold = settings.NUMBER_MATCHED_EXACT_THRESHOLD
+    queryset = queryset.select_related(None).prefetch_related(None).order_by()
+    try:
+        if collection_name is not None:
+            with statement_timeout(deadline):
+                result = NumberMatched(count_collection_items(collection_name) or 0, 'collection')
+        else:
+            with statement_timeout(deadline):
+                count = queryset.values('pk')[:threshold + 1].count()
+            if count <= threshold:
+                result = NumberMatched(count, 'exact')
+            else:
+                with statement_timeout(deadline):
+                    # there are at least threshold + 1 items whatever the estimate
+                    result = NumberMatched(max(estimate_count(queryset), count), 'estimate')
+    except TimeBudgetExceeded:
+        logger.warning(
+            'numberMatched not computed within the time budget of %dms',
+            settings.NUMBER_MATCHED_TIME_BUDGET
+        )
+        STRATEGIES.labels(strategy='timeout').inc()
+        return None
+    STRATEGIES.labels(strategy=result.strategy).inc()
+    return result
+
+
+def add_number_matched(data, queryset, limit, collection_name=None):
+    '''Adds numberMatched, numberReturned and the context to the data of an items listing
+
+    Nothing is added when the NUMBER_MATCHED_ENABLED setting is off.
+
+    Args:
+        data: dict
+            FeatureCollection of the listing
+        queryset: ItemQuerySet
+            Filtered items of the listing, without pagination
+        limit: int
+            Page size of the listing
+        collection_name: string
+            Name of the collection of an unfiltered items listing, see get_number_matched()
+    '''
+    if not settings.NUMBER_MATCHED_ENABLED:
+        return
+    data['numberReturned'] = len(data['features'])
+    data['context'] = {'returned': data['numberReturned'], 'limit': limit}
+    number_matched = get_number_matched(queryset, collection_name=collection_name)
+    if number_matched is not None:
+        data['numberMatched'] = number_matched.matched
+        data['context'].update(
+            matched=number_matched.matched, matched_strategy=number_matched.strategy
+        )
@@ -1,12 +1,20 @@
+import json
 import logging
+from collections import namedtuple
+from datetime import datetime
 from urllib import parse
 
 from django.conf import settings
+from django.core.exceptions import ValidationError
 from django.core.handlers.wsgi import WSGIRequest
+from django.db.models import F
+from django.db.models import Q
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import pagination
 from rest_framework import serializers
+from rest_framework.exceptions import NotFound
+from rest_framework.pagination import Cursor
 from rest_framework.request import Request
 from rest_framework.response import Response
 from rest_framework.utils.urls import remove_query_param
@@ -17,6 +25,19 @@ from stac_api.utils import remove_query_params
 
 logger = logging.getLogger(__name__)
 
+SortbyField = namedtuple('SortbyField', ['expression', 'nullable'])
+Sortby = namedtuple('Sortby', ['field', 'descending'])
+
+# Sortable fields of the sortby extension with their item sort expression. The ties are broken by
+# the pk and each sort expression is backed by a (sort expression, id) index.
+SORTBY_FIELDS = {
+    'datetime': SortbyField('properties_datetime_range__startswith', nullable=False),
+    'created': SortbyField('created', nullable=False),
+    'updated': SortbyField('updated', nullable=False),
+    'id': SortbyField('name', nullable=False),
+    'forecast:reference_datetime': SortbyField('forecast_reference_datetime', nullable=True),
+}
+
 
 def update_links_with_pagination(data, previous_url, next_url):
     '''Update the links dictionary with the previous and next link if needed
@@ -99,6 +120,51 @@ def validate_page_size(size_string, max_page_size, log_extra=None):
     return page_size
 
 
+def parse_sortby(sortby):
+    '''Parse the sortby parameter of the sortby extension
+
+    Only one sort field is supported, the pagination uses it as keyset together with the pk.
+
+    Args:
+        sortby: string | list
+            Either the GET syntax, e.g. "-datetime" ("+" or no prefix for ascending), or the POST
+            syntax, e.g. [{"field": "properties.datetime", "direction": "desc"}]
+
+    Returns: Sortby
+        Named tuple with the SortbyField and the direction
+
+    Raises:
+        ValidationError: if sortby is invalid
+    '''
+    if isinstance(sortby, str):
+        # a "+" prefix is decoded as a space in the URL query
+        sortby = [{
+            'field': field.strip().lstrip('+-'),
+            'direction': 'desc' if field.strip().startswith('-') else 'asc'
+        } for field in sortby.split(',')]
+    if not isinstance(sortby, list) or not all(isinstance(field, dict) for field in sortby):
+        logger.error('Invalid sortby parameter %s', sortby)
+        raise serializers.ValidationError(_('Invalid sortby parameter'))
+    if len(sortby) != 1:
+        logger.error('Invalid sortby parameter %s: only one sort field is supported', sortby)
+        raise serializers.ValidationError(
+            _('Invalid sortby parameter, only one sort field is supported')
+        )
+    field = str(sortby[0].get('field', '')).removeprefix('properties.')
+    direction = sortby[0].get('direction', 'asc')
+    if field not in SORTBY_FIELDS:
+        logger.error('Invalid sortby field %s', field)
+        raise serializers.ValidationError(
+            _('Invalid sortby field %s, must be one of %s') % (field, ', '.join(SORTBY_FIELDS))
+        )
+    if direction not in ['asc', 'desc']:
+        logger.error('Invalid sortby direction %s', direction)
+        raise serializers.ValidationError(
+            _('Invalid sortby direction %s, must be asc or desc') % (direction)
+        )
+    return Sortby(SORTBY_FIELDS[field], descending=direction == 'desc')
+
+
 def validate_offset(offset_string, log_extra=None):
     '''Parse and validate offset
 
@@ -138,10 +204,94 @@ def validate_offset(offset_string, log_extra=None):
 
 class CursorPagination(pagination.CursorPagination):
     '''Default pagination for all endpoints
+
+    When the view returns a sort order with get_sortby() (sortby extension), the pages are
+    selected with a keyset over (sort key, pk) instead of the DRF position and offset. The keyset
+    condition and the ordering match the (sort expression, id) indexes, therefore every page costs
+    the same whatever its depth.
     '''
     ordering = 'id'
     page_size_query_param = 'limit'
     max_page_size = settings.REST_FRAMEWORK['PAGE_SIZE_LIMIT']
+    sortby = None
+
+    def paginate_queryset(self, queryset, request, view=None):
+        self.sortby = view.get_sortby() if hasattr(view, 'get_sortby') else None
+        if self.sortby is None:
+            return super().paginate_queryset(queryset, request, view)
+        return self.paginate_queryset_by_keyset(queryset, request)
+
+    def paginate_queryset_by_keyset(self, queryset, request):
+        '''Paginate the queryset with a keyset over (sort key, pk)'''
+        # pylint: disable=attribute-defined-outside-init
+        self.request = request
+        self.page_size = self.get_page_size(request)
+        self.base_url = request.build_absolute_uri()
+        self.cursor = self.decode_cursor(request)
+        reverse = self.cursor is not None and self.cursor.reverse
+
+        # The previous pages are read in the opposite direction and then reversed
+        descending = self.sortby.descending != reverse
+        queryset = queryset.annotate(sortby_key=F(self.sortby.field.expression))
+        if self.cursor is not None:
+            queryset = queryset.filter(self.get_keyset_filter(queryset, descending))
+        ordering = ['-sortby_key', '-pk'] if descending else ['sortby_key', 'pk']
+        results = list(queryset.order_by(*ordering)[:self.page_size + 1])
+
+        has_more = len(results) > self.page_size
+        self.page = results[:self.page_size]
+        if reverse:
+            self.page.reverse()
+            self.has_next, self.has_previous = True, has_more
+        else:
+            self.has_next, self.has_previous = has_more, self.cursor is not None
+        return self.page
+
+    def get_keyset_filter(self, queryset, descending):
+        '''Returns the filter selecting the rows after the cursor position
+
+        PostgreSQL sorts the NULL values last in ascending order and first in descending order.
+        '''
+        output_field = queryset.query.annotations['sortby_key'].output_field
+        try:
+            value, pk = json.loads(self.cursor.position)
+            value = None if value is None else output_field.to_python(value)
+            pk = int(pk)
+        except (TypeError, ValueError, ValidationError):
+            raise NotFound(self.invalid_cursor_message) from None
+
+        if descending:
+            if value is None:
+                return Q(sortby_key__isnull=True, pk__lt=pk) | Q(sortby_key__isnull=False)
+            return Q(sortby_key__lte=value) & (Q(sortby_key__lt=value) | Q(pk__lt=pk))
+        if value is None:
+            return Q(sortby_key__isnull=True, pk__gt=pk)
+        condition = Q(sortby_key__gte=value) & (Q(sortby_key__gt=value) | Q(pk__gt=pk))
+        if self.sortby.field.nullable:
+            condition |= Q(sortby_key__isnull=True)
+        return condition
+
+    def encode_keyset_cursor(self, instance, reverse):
+        value = instance.sortby_key
+        if isinstance(value, datetime):
+            value = value.isoformat()
+        return self.encode_cursor(
+            Cursor(offset=0, reverse=reverse, position=json.dumps([value, instance.pk]))
+        )
+
+    def get_next_link(self):
+        if self.sortby is None:
+            return super().get_next_link()
+        if not self.has_next or not self.page:
+            return None
+        return self.encode_keyset_cursor(self.page[-1], reverse=False)
+
+    def get_previous_link(self):
+        if self.sortby is None:
+            return super().get_previous_link()
+        if not self.has_previous or not self.page:
+            return None
+        return self.encode_keyset_cursor(self.page[0], reverse=True)
 
     def get_ordering(self, request, queryset, view):
         '''Get the ordering for the pagination.
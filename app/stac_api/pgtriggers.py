@@ -2,8 +2,28 @@ from enum import Enum
 
 import pgtrigger
 
-
-def auto_variables_triggers(name):
+# DB setting enabling the deferred collection updates, see deferrable_collection_update()
+DEFERRED_COLLECTION_UPDATES = 'stac_api.deferred_collection_updates'
+
+# LISTEN/NOTIFY channel used to invalidate the response cache, see response_cache_triggers()
+RESPONSE_CACHE_CHANNEL = 'stac_api_response_cache'
+# Notification channel of the collection registry (see stac_api.collection_registry)
+COLLECTION_REGISTRY_CHANNEL = 'stac_api_collection_registry'
+# DB setting set while the item is_searchable flags are synchronized with their collection,
+# see collection_searchable_triggers()
+SEARCHABLE_SYNC = 'stac_api.searchable_sync'
+# Collection fields held by the collection registry
+COLLECTION_REGISTRY_FIELDS = (
+    'id',
+    'name',
+    'published',
+    'cache_control_header',
+    'allow_external_assets',
+    'external_asset_whitelist',
+)
+
+
+def auto_variables_triggers(name, update_condition='OLD.* IS DISTINCT FROM NEW.*'):
     '''Triggers used by various tables to update the `etag` and `updated` fields.'''
     auto_variables_func = '''
     -- update auto variables
@@ -25,192 +45,459 @@ def auto_variables_triggers(name):
             name=f"update_{name}_auto_variables_trigger",
             operation=pgtrigger.Update,
             when=pgtrigger.Before,
-            condition=pgtrigger.Condition('OLD.* IS DISTINCT FROM NEW.*'),
+            condition=pgtrigger.Condition(update_condition),
             func=auto_variables_func
         )
     ]
 
 
-def child_triggers(parent_name, child_name):
-    '''Triggers used by various tables to update the `updated` and `etag` fields
-    of the parent table when a child gets inserted, updated or deleted.
+def statement_triggers(name, func, declare=None, update_condition=None):
+    '''Generates the statement level triggers (insert, update and delete) of a trigger function
 
-    Returns: tuple
-        Tuple of Trigger
-    '''
-    child_update_func = """
-    -- update related {parent_name}
-    UPDATE stac_api_{parent_name} SET
-        updated = now(),
-        etag = public.gen_random_uuid()
-    WHERE id = {child_obj}.{parent_name}_id;
+    Statement level triggers are fired once per statement and not once per row, therefore a
+    bulk write (e.g. Item.objects.bulk_create) updates each parent only once. The rows of the
+    statement are available through the transition tables, and as PostgreSQL doesn't support
+    transition tables on triggers with several operations, one trigger per operation is
+    generated.
 
-    RAISE INFO 'Parent table {parent_name}.id=% auto fields updated due to child {child_name}.id=% updates.',
-        {child_obj}.{parent_name}_id, {child_obj}.id;
+    Args:
+        name: string
+            Base name of the triggers: `add_<name>_trigger`, `update_<name>_trigger` and
+            `del_<name>_trigger`
+        func: string
+            Trigger function. The `{rows}` placeholder is replaced by a subquery returning the
+            rows of the statement with an additional `sign` column set to 1 for the new rows and
+            -1 for the old rows. On update both the old and the new rows are returned.
+        declare: list
+            Variables of the trigger function
+        update_condition: string
+            SQL condition on `old_row` and `new_row` to select the updated rows that are relevant
+            for the trigger. By default only the rows that have changed are selected.
 
-    RETURN {child_obj};
-    """
+    Returns:
+        List of triggers
+    '''
+    if update_condition is None:
+        update_condition = 'old_row IS DISTINCT FROM new_row'
+    inserted_rows = '(SELECT new_row.*, 1 AS sign FROM new_rows AS new_row)'
+    deleted_rows = '(SELECT old_row.*, -1 AS sign FROM old_rows AS old_row)'
+    updated_rows = f'''(
+            SELECT new_row.*, 1 AS sign
+            FROM new_rows AS new_row JOIN old_rows AS old_row ON old_row.id = new_row.id
+            WHERE ({update_condition})
+        UNION ALL
+            SELECT old_row.*, -1 AS sign
+            FROM old_rows AS old_row JOIN new_rows AS new_row ON new_row.id = old_row.id
+            WHERE ({update_condition})
+        )'''
     return [
         pgtrigger.Trigger(
-            name=f"add_{parent_name}_child_trigger",
+            name=f'add_{name}_trigger',
             operation=pgtrigger.Insert,
             when=pgtrigger.After,
-            func=child_update_func.format(
-                parent_name=parent_name, child_obj="NEW", child_name=child_name
-            )
+            level=pgtrigger.Statement,
+            referencing=pgtrigger.Referencing(new='new_rows'),
+            declare=declare,
+            func=func.format(rows=inserted_rows)
         ),
         pgtrigger.Trigger(
-            name=f"update_{parent_name}_child_trigger",
+            name=f'update_{name}_trigger',
             operation=pgtrigger.Update,
             when=pgtrigger.After,
-            condition=pgtrigger.Condition('OLD.* IS DISTINCT FROM NEW.*'),
-            func=child_update_func.format(
-                parent_name=parent_name, child_obj="NEW", child_name=child_name
-            )
+            level=pgtrigger.Statement,
+            referencing=pgtrigger.Referencing(old='old_rows', new='new_rows'),
+            declare=declare,
+            func=func.format(rows=updated_rows)
         ),
         pgtrigger.Trigger(
-            name=f"del_{parent_name}_child_trigger",
+            name=f'del_{name}_trigger',
             operation=pgtrigger.Delete,
             when=pgtrigger.After,
-            func=child_update_func.format(
-                parent_name=parent_name, child_obj="OLD", child_name=child_name
-            )
-        )
+            level=pgtrigger.Statement,
+            referencing=pgtrigger.Referencing(old='old_rows'),
+            declare=declare,
+            func=func.format(rows=deleted_rows)
+        ),
     ]
 
 
-def asset_counter_trigger(count_table, value_field):
-    '''Triggers for the asset table to adjust the 4 counter tables for the asset summaries.
+def deferrable_collection_update(func, delta_columns, delta_sql):
+    '''Adds the deferred collection updates mode to a trigger function
+
+    When the `stac_api.deferred_collection_updates` DB setting is `on` (see
+    settings.COLLECTION_UPDATES_DEFERRED), the collection changes are appended to the
+    stac_api_collectiondelta table instead of updating the collection row. Concurrent writers of
+    the same collection therefore don't wait on the collection row lock, the deltas are then
+    folded into the collections by the consolidate_collection_deltas command.
+
+    The changes of the collections already deleted in the same transaction are dropped, their
+    deltas would otherwise violate the collection foreign key on commit.
 
     Args:
-         count_table: the table name to be updated (without prefix stac_api_)
-         value_field: summary field name on the asset
+        func: string
+            Trigger function updating directly the collection
+        delta_columns: string
+            Columns of stac_api_collectiondelta set by delta_sql, starting with collection_id
+        delta_sql: string
+            SQL query selecting the changes, its first column must be the collection_id
 
     Returns:
-        List of triggers
+        The trigger function
     '''
+    return f"""
+    IF current_setting('{DEFERRED_COLLECTION_UPDATES}', true) = 'on' THEN
+        INSERT INTO stac_api_collectiondelta ({delta_columns})
+        SELECT delta.* FROM ({delta_sql}
+        ) AS delta
+        WHERE EXISTS (
+            SELECT 1 FROM stac_api_collection AS collection
+            WHERE collection.id = delta.collection_id
+        );
+        RETURN NULL;
+    END IF;
+    {func}"""
 
-    class DecreaseCounterTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [('asset_instance', 'stac_api_asset%ROWTYPE'), ('related_collection_id', 'INT')]
-        func = f'''
-        asset_instance = OLD;
 
-        related_collection_id = (
-            SELECT collection_id FROM stac_api_item
-            WHERE id = asset_instance.item_id
-        );
+def child_triggers(parent_name, child_name, deferrable=False):
+    '''Triggers used by various tables to update the `updated` and `etag` fields
+    of the parent table when a child gets inserted, updated or deleted.
+
+    The triggers are statement level triggers, each parent is updated only once per statement.
+
+    Args:
+        parent_name: string
+            Parent table name (without prefix stac_api_)
+        child_name: string
+            Child model name
+        deferrable: bool
+            Support the deferred collection updates mode, only valid for collection parents.
+
+    Returns: tuple
+        Tuple of Trigger
+    '''
+    child_update_func = f"""
+    -- update related {parent_name}
+    UPDATE stac_api_{parent_name} SET
+        updated = now(),
+        etag = public.gen_random_uuid()
+    WHERE id IN (SELECT child.{parent_name}_id FROM {{rows}} AS child);
 
-        -- Remove entry when count will reach 0
-        DELETE FROM stac_api_{count_table}
-        WHERE collection_id = related_collection_id
-            AND value = asset_instance.{value_field}
-            AND count = 1;
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RAISE INFO 'Parent table {parent_name} auto fields of % rows updated due to child {child_name} updates.',
+        updated_count;
 
-        IF NOT FOUND THEN
-        UPDATE stac_api_{count_table}
-        SET count = count-1
-        WHERE collection_id = related_collection_id
-            AND value = asset_instance.{value_field};
+    RETURN NULL;
+    """
+    if deferrable:
+        child_update_func = deferrable_collection_update(
+            child_update_func,
+            'collection_id',
+            'SELECT DISTINCT child.collection_id FROM {rows} AS child'
+        )
+    return statement_triggers(
+        f'{parent_name}_child', child_update_func, declare=[('updated_count', 'INTEGER')]
+    )
 
-        RAISE INFO
-            '{count_table} (collection_id, value) (% %) count updated, due to asset.name=% update.',
-            related_collection_id, asset_instance.{value_field}, asset_instance.name;
 
-        RETURN asset_instance;
+def response_cache_triggers(name, collection_names_sql):
+    '''Triggers notifying the changed collections to the response cache
+
+    Each statement sends one notification per changed collection on the RESPONSE_CACHE_CHANNEL,
+    with the collection name and the change timestamp as JSON payload. The notifications are only
+    delivered when the transaction commits (see stac_api.response_cache).
+
+    Args:
+        name: string
+            Base name of the triggers
+        collection_names_sql: string
+            SQL query returning the `collection_name` of the rows in `{rows}`
+
+    Returns: tuple
+        Tuple of Trigger
+    '''
+    notify_func = f"""
+    -- notify the response cache of the changed collections
+    PERFORM pg_notify('{RESPONSE_CACHE_CHANNEL}', json_build_object(
+        'collection', changed.collection_name,
+        'timestamp', extract(epoch FROM clock_timestamp())
+    )::text)
+    FROM ({collection_names_sql}) AS changed;
+
+    RETURN NULL;
+    """
+    return statement_triggers(f'{name}_response_cache', notify_func)
+
+
+def collection_registry_triggers():
+    '''Triggers notifying the changed collections to the collection registry
+
+    Each statement sends one notification per inserted, deleted or changed collection on the
+    COLLECTION_REGISTRY_CHANNEL, with the collection id and the change timestamp as JSON payload.
+    Only the changes of the COLLECTION_REGISTRY_FIELDS are notified, not the frequent updates of
+    the etag, extent and summaries.
+
+    Returns: tuple
+        Tuple of Trigger
+    '''
+    notify_func = f"""
+    -- notify the collection registry of the changed collections
+    PERFORM pg_notify('{COLLECTION_REGISTRY_CHANNEL}', json_build_object(
+        'id', changed.id,
+        'timestamp', extract(epoch FROM clock_timestamp())
+    )::text)
+    FROM (SELECT DISTINCT collection.id FROM {{rows}} AS collection) AS changed;
+
+    RETURN NULL;
+    """
+    old_fields = ', '.join(f'old_row.{field}' for field in COLLECTION_REGISTRY_FIELDS)
+    new_fields = ', '.join(f'new_row.{field}' for field in COLLECTION_REGISTRY_FIELDS)
+    return statement_triggers(
+        'collection_registry',
+        notify_func,
+        update_condition=f'({old_fields}) IS DISTINCT FROM ({new_fields})'
+    )
+
+
+def file_size_triggers(name, parent_name, size_field, deferrable=False):
+    '''Triggers to update the `total_data_size` of the parent table when children get inserted,
+    updated or deleted.
+
+    The size differences are summed per parent, each parent is updated only once per statement.
+
+    Args:
+        name: string
+            Base name of the triggers
+        parent_name: string
+            Parent table name (without prefix stac_api_)
+        size_field: string
+            Size field name on the child
+        deferrable: bool
+            Support the deferred collection updates mode, only valid for collection parents.
+
+    Returns:
+        List of triggers
+    '''
+    file_size_func = f"""
+    -- Update related {parent_name} file_size variables
+    FOR parent IN
+        UPDATE stac_api_{parent_name} AS parent_table SET
+            total_data_size = parent_table.total_data_size + delta.size
+        FROM (
+            SELECT
+                child.{parent_name}_id AS id,
+                SUM(child.sign * COALESCE(child.{size_field}, 0)) AS size
+            FROM {{rows}} AS child
+            GROUP BY child.{parent_name}_id
+        ) AS delta
+        WHERE parent_table.id = delta.id AND delta.size <> 0
+        RETURNING parent_table.id, parent_table.total_data_size
+    LOOP
+        IF parent.total_data_size < 0
+            THEN RAISE WARNING '{parent_name}.id=% total_data_size has negative value %',
+            parent.id, parent.total_data_size;
         END IF;
 
-        RAISE INFO
-            '{count_table} (collection_id, value) (% %) deleted, due to asset.name=% update.',
-            related_collection_id, asset_instance.{value_field}, asset_instance.name;
+        RAISE INFO '{parent_name}.id=% total_data_size updated, due to child updates.', parent.id;
+    END LOOP;
 
-        RETURN asset_instance;
-        '''
+    RETURN NULL;
+    """
+    if deferrable:
+        file_size_func = deferrable_collection_update(
+            file_size_func,
+            'collection_id, total_data_size',
+            f'''
+            SELECT child.collection_id, SUM(child.sign * COALESCE(child.{size_field}, 0))
+            FROM {{rows}} AS child
+            GROUP BY child.collection_id
+            HAVING SUM(child.sign * COALESCE(child.{size_field}, 0)) <> 0'''
+        )
+    return statement_triggers(name, file_size_func, declare=[('parent', 'RECORD')])
 
-    class IncreaseCounterTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [('asset_instance', 'stac_api_asset%ROWTYPE'), ('related_collection_id', 'INT')]
-        func = f'''
-        asset_instance = NEW;
 
-        related_collection_id = (
-            SELECT collection_id FROM stac_api_item
-            WHERE id = asset_instance.item_id
-        );
+def items_count_triggers():
+    '''Triggers to update the `permanent_items_count` of the collections when items without
+    expiry date get inserted, updated or deleted.
 
-        INSERT INTO stac_api_{count_table} (collection_id, value, count)
-        VALUES (related_collection_id, asset_instance.{value_field}, 1)
-        ON CONFLICT (collection_id, value)
-        DO UPDATE SET count = stac_api_{count_table}.count+1;
+    The differences are summed per collection, each collection is updated only once per statement.
 
-        RAISE INFO
-            '{count_table} (collection_id, value) (% %) count updated, due to asset.name=% update.',
-            related_collection_id, asset_instance.{value_field}, asset_instance.name;
+    Returns:
+        List of triggers
+    '''
+    delta_sql = '''
+        SELECT item.collection_id, SUM(item.sign) AS count
+        FROM {rows} AS item
+        WHERE item.properties_expires IS NULL
+        GROUP BY item.collection_id
+        HAVING SUM(item.sign) <> 0'''
+    items_count_func = f"""
+    -- Update the collections items count
+    UPDATE stac_api_collection AS collection SET
+        permanent_items_count = collection.permanent_items_count + delta.count
+    FROM ({delta_sql}
+    ) AS delta
+    WHERE collection.id = delta.collection_id;
+
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RAISE INFO '% collections items count updated, due to item updates.', updated_count;
+
+    RETURN NULL;
+    """
+    items_count_func = deferrable_collection_update(
+        items_count_func, 'collection_id, permanent_items_count', delta_sql
+    )
+    return statement_triggers(
+        'item_collection_items_count',
+        items_count_func,
+        declare=[('updated_count', 'INTEGER')],
+        update_condition='''old_row.collection_id IS DISTINCT FROM new_row.collection_id OR
+                (old_row.properties_expires IS NULL) <> (new_row.properties_expires IS NULL)'''
+    )
+
+
+def item_searchable_triggers():
+    '''Triggers copying the `published` flag of the collection to the `is_searchable` flag of
+    the items on insert and on collection change, see collection_searchable_triggers()
+
+    Returns:
+        List of triggers
+    '''
 
-        RETURN asset_instance;
+    class ItemSearchableTrigger(pgtrigger.Trigger):
+        when = pgtrigger.Before
+        func = '''
+        -- Copy the published flag of the collection
+        NEW.is_searchable = (
+            SELECT collection.published FROM stac_api_collection AS collection
+            WHERE collection.id = NEW.collection_id
+        );
+
+        RETURN NEW;
         '''
 
     return [
-        DecreaseCounterTrigger(
-            name=f'upd_dec_{value_field}_trigger',
+        ItemSearchableTrigger(name='add_item_searchable_trigger', operation=pgtrigger.Insert),
+        # also corrects a stale flag written by an item save()
+        ItemSearchableTrigger(
+            name='update_item_searchable_trigger',
             operation=pgtrigger.Update,
-            condition=pgtrigger.
-            Condition(f'''OLD.{value_field} IS DISTINCT FROM NEW.{value_field}''')
-        ),
-        DecreaseCounterTrigger(
-            name=f'del_{value_field}_trigger',
-            operation=pgtrigger.Delete,
+            condition=pgtrigger.Condition(
+                '''OLD.is_searchable IS DISTINCT FROM NEW.is_searchable OR
+                OLD.collection_id IS DISTINCT FROM NEW.collection_id'''
+            )
         ),
-        IncreaseCounterTrigger(
-            name=f'upd_inc_{value_field}_trigger',
+    ]
+
+
+def collection_searchable_triggers():
+    '''Triggers updating the `is_searchable` flag of the items when the `published` flag of
+    their collection changes
+
+    The search filters the items on their own flag instead of joining the collections. This
+    synchronization is not a change of the items, their `etag` and `updated` fields are kept
+    (see SEARCHABLE_SYNC).
+
+    Returns:
+        List of triggers
+    '''
+    collection_published_func = f'''
+    -- Synchronize the items with the published flag
+    PERFORM set_config('{SEARCHABLE_SYNC}', 'on', true);
+    UPDATE stac_api_item SET is_searchable = NEW.published
+    WHERE collection_id = NEW.id AND is_searchable IS DISTINCT FROM NEW.published;
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    PERFORM set_config('{SEARCHABLE_SYNC}', 'off', true);
+
+    RAISE INFO '% items of collection.id=% synchronized with the published flag',
+        updated_count, NEW.id;
+
+    RETURN NULL;
+    '''
+    return [
+        pgtrigger.Trigger(
+            name='update_collection_searchable_trigger',
             operation=pgtrigger.Update,
-            condition=pgtrigger.
-            Condition(f'''OLD.{value_field} IS DISTINCT FROM NEW.{value_field}''')
-        ),
-        IncreaseCounterTrigger(
-            name=f'add_{value_field}_trigger',
-            operation=pgtrigger.Insert,
+            when=pgtrigger.After,
+            condition=pgtrigger.Condition('OLD.published IS DISTINCT FROM NEW.published'),
+            declare=[('updated_count', 'INTEGER')],
+            func=collection_published_func
         ),
     ]
 
 
+def asset_counter_trigger(count_table, value_field, asset_table='asset'):
+    '''Triggers for the asset tables to adjust the 4 counter tables for the asset summaries.
+
+    The counter differences are summed per collection and value, each counter is updated only
+    once per statement.
+
+    Args:
+         count_table: the table name to be updated (without prefix stac_api_)
+         value_field: summary field name on the asset
+         asset_table: either 'asset' or 'collectionasset'
+
+    Returns:
+        List of triggers
+    '''
+    if asset_table == 'collectionasset':
+        name = f'col_asset_{value_field}'
+        collection_source = '{rows} AS asset'
+        collection_id = 'asset.collection_id'
+    else:
+        name = value_field
+        collection_source = '{rows} AS asset JOIN stac_api_item AS item ON item.id = asset.item_id'
+        collection_id = 'item.collection_id'
+
+    counter_func = f"""
+    WITH delta AS (
+        SELECT
+            {collection_id} AS collection_id,
+            asset.{value_field} AS value,
+            SUM(asset.sign) AS count
+        FROM {collection_source}
+        WHERE asset.{value_field} IS NOT NULL
+        GROUP BY {collection_id}, asset.{value_field}
+        HAVING SUM(asset.sign) <> 0
+    ), deleted AS (
+        -- Remove entries when count reaches 0
+        DELETE FROM stac_api_{count_table} AS counter
+        USING delta
+        WHERE counter.collection_id = delta.collection_id
+            AND counter.value = delta.value
+            AND delta.count < 0
+            AND counter.count + delta.count <= 0
+    ), decreased AS (
+        UPDATE stac_api_{count_table} AS counter
+        SET count = counter.count + delta.count
+        FROM delta
+        WHERE counter.collection_id = delta.collection_id
+            AND counter.value = delta.value
+            AND delta.count < 0
+            AND counter.count + delta.count > 0
+    )
+    INSERT INTO stac_api_{count_table} (collection_id, value, count)
+    SELECT collection_id, value, count FROM delta WHERE count > 0
+    ON CONFLICT (collection_id, value)
+    DO UPDATE SET count = stac_api_{count_table}.count + EXCLUDED.count;
+
+    RAISE INFO '{count_table} counts updated, due to {asset_table} updates.';
+
+    RETURN NULL;
+    """
+    return statement_triggers(name, counter_func)
+
+
 def generates_asset_triggers():
     '''Generates Asset triggers
 
     Those triggers act on `insert`, `update` and `delete` Asset event and do the followings:
       - Update the `updated` and `etag` fields of the assets and their parents
       - Update the parent collection summaries (via counter tables).
+      - Update the parent item total data size.
 
     Returns: tuple
         tuple for all needed triggers
     '''
-
-    class ItemFileSizeTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [
-            ('asset_instance', 'stac_api_asset%ROWTYPE'),
-            ('updated_total_data_size', 'NUMERIC'),
-        ]
-        func = '''
-        asset_instance = COALESCE(NEW, OLD);
-
-        -- Update related item file_size variables
-        UPDATE stac_api_item SET
-            total_data_size = total_data_size + COALESCE(NEW.file_size, 0) - COALESCE(OLD.file_size, 0)
-        WHERE id = asset_instance.item_id
-        RETURNING total_data_size INTO updated_total_data_size;
-
-        IF updated_total_data_size < 0
-            THEN RAISE WARNING 'item.id=% total_data_size has negative value %',
-            asset_instance.item_id, updated_total_data_size;
-        END IF;
-
-        RAISE INFO 'item.id=% total_data_size updated, due to asset.name=% updates.',
-            asset_instance.item_id, asset_instance.name;
-
-        RETURN asset_instance;
-        '''
-
     return [
         *auto_variables_triggers('asset'),
         *child_triggers('item', 'Asset'),
@@ -218,15 +505,7 @@ def generates_asset_triggers():
         *asset_counter_trigger('geoadminlangcount', 'geoadmin_lang'),
         *asset_counter_trigger('geoadminvariantcount', 'geoadmin_variant'),
         *asset_counter_trigger('projepsgcount', 'proj_epsg'),
-        ItemFileSizeTrigger(
-            name='add_del_asset_item_file_size_trigger',
-            operation=pgtrigger.Insert | pgtrigger.Delete,
-        ),
-        ItemFileSizeTrigger(
-            name='update_asset_item_file_size_trigger',
-            operation=pgtrigger.Update,
-            condition=pgtrigger.Condition('OLD.file_size IS DISTINCT FROM NEW.file_size'),
-        )
+        *file_size_triggers('asset_item_file_size', 'item', 'file_size'),
     ]
 
 
@@ -235,122 +514,15 @@ def generates_collection_asset_triggers():
     Triggers act on `insert`, `update` and `delete` collection asset event and do the following:
       - Update the `updated` and `etag` fields of the assets and their parents
       - Update the parent collection summaries.
+      - Update the parent collection total data size.
     Returns: tuple
         tuple for all needed triggers
     '''
-
-    class CollectionFileSizeTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [
-            ('asset_instance', 'stac_api_collectionasset%ROWTYPE'),
-            ('updated_total_data_size', 'NUMERIC'),
-        ]
-        func = '''
-        asset_instance = COALESCE(NEW, OLD);
-
-        -- Update related collection file_size variables
-        UPDATE stac_api_collection SET
-            total_data_size = total_data_size + COALESCE(NEW.file_size, 0) - COALESCE(OLD.file_size, 0)
-        WHERE id = asset_instance.collection_id
-        RETURNING total_data_size INTO updated_total_data_size;
-
-        IF updated_total_data_size < 0
-            THEN RAISE WARNING 'item.id=% total_data_size has negative value %',
-            asset_instance.collection_id, updated_total_data_size;
-        END IF;
-
-        RAISE INFO 'collection.id=% total_data_size updated, due to item.name=% updates.',
-            asset_instance.collection_id, asset_instance.name;
-
-        RETURN asset_instance;
-        '''
-
-    class DecreaseCounterTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [('asset_instance', 'stac_api_collectionasset%ROWTYPE'),
-                   ('related_collection_id', 'INT')]
-        func = '''
-        asset_instance = OLD;
-
-        related_collection_id = asset_instance.collection_id;
-
-        -- Remove entry when count will reach 0
-        DELETE FROM stac_api_projepsgcount
-        WHERE collection_id = related_collection_id
-            AND value = asset_instance.proj_epsg
-            AND count = 1;
-
-        IF NOT FOUND THEN
-        UPDATE stac_api_projepsgcount
-        SET count = count-1
-        WHERE collection_id = related_collection_id
-            AND value = asset_instance.proj_epsg;
-
-        RAISE INFO
-            'stac_api_projepsgcount (collection_id, value) (% %) count updated, due to asset.name=% update.',
-            related_collection_id, asset_instance.proj_epsg, asset_instance.name;
-
-        RETURN asset_instance;
-        END IF;
-
-        RAISE INFO
-            'stac_api_projepsgcount (collection_id, value) (% %) deleted, due to asset.name=% update.',
-            related_collection_id, asset_instance.proj_epsg, asset_instance.name;
-
-        RETURN asset_instance;
-        '''
-
-    class IncreaseCounterTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [('asset_instance', 'stac_api_collectionasset%ROWTYPE'),
-                   ('related_collection_id', 'INT')]
-        func = '''
-        asset_instance = NEW;
-
-        related_collection_id = asset_instance.collection_id;
-
-        INSERT INTO stac_api_projepsgcount (collection_id, value, count)
-        VALUES (related_collection_id, asset_instance.proj_epsg, 1)
-        ON CONFLICT (collection_id, value)
-        DO UPDATE SET count = stac_api_projepsgcount.count+1;
-
-        RAISE INFO
-            'projepsgcount (collection_id, value) (% %) count updated, due to asset.name=% update.',
-            related_collection_id, asset_instance.proj_epsg, asset_instance.name;
-
-        RETURN asset_instance;
-        '''
-
     return [
         *auto_variables_triggers('col_asset'),
         *child_triggers('collection', "CollectionAsset"),
-        DecreaseCounterTrigger(
-            name='upd_dec_col_asset_proj_epsg_trigger',
-            operation=pgtrigger.Update,
-            condition=pgtrigger.Condition('''OLD.proj_epsg IS DISTINCT FROM NEW.proj_epsg''')
-        ),
-        DecreaseCounterTrigger(
-            name='del_col_asset_proj_epsg_trigger',
-            operation=pgtrigger.Delete,
-        ),
-        IncreaseCounterTrigger(
-            name='upd_inc_col_asset_proj_epsg_trigger',
-            operation=pgtrigger.Update,
-            condition=pgtrigger.Condition('''OLD.proj_epsg IS DISTINCT FROM NEW.proj_epsg''')
-        ),
-        IncreaseCounterTrigger(
-            name='add_col_asset_proj_epsg_trigger',
-            operation=pgtrigger.Insert,
-        ),
-        CollectionFileSizeTrigger(
-            name='add_del_col_asset_col_file_size_trigger',
-            operation=pgtrigger.Insert | pgtrigger.Delete,
-        ),
-        CollectionFileSizeTrigger(
-            name='update_col_asset_col_file_size_trigger',
-            operation=pgtrigger.Update,
-            condition=pgtrigger.Condition('OLD.* IS DISTINCT FROM NEW.*'),
-        )
+        *asset_counter_trigger('projepsgcount', 'proj_epsg', asset_table='collectionasset'),
+        *file_size_triggers('col_asset_col_file_size', 'collection', 'file_size'),
     ]
 
 
@@ -358,84 +530,174 @@ def generates_item_triggers():
     '''Generates Item triggers
 
     Those triggers update the `updated` and `etag` fields of the items and their parents on
-    update, insert or delete. It also update the collection extent.
+    update, insert or delete. It also update the item bbox, the collection extent (incrementally
+    or by flagging it out of sync), the collection total data size and items count, copy the
+    collection `published` flag to `is_searchable`, and notify the response cache of the
+    changes.
 
     Returns: tuple
         tuple for all needed triggers
     '''
 
-    class CollectionExtentTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [
-            ('item_instance', 'stac_api_item%ROWTYPE'),
-            ('collection_extent', 'RECORD'),
-        ]
+    class ItemBboxTrigger(pgtrigger.Trigger):
+        when = pgtrigger.Before
         func = '''
-        item_instance = COALESCE(NEW, OLD);
+        -- Update the precomputed bbox
+        NEW.bbox_xmin = ST_XMin(NEW.geometry);
+        NEW.bbox_ymin = ST_YMin(NEW.geometry);
+        NEW.bbox_xmax = ST_XMax(NEW.geometry);
+        NEW.bbox_ymax = ST_YMax(NEW.geometry);
 
-        -- Update related collection extent_out_of_sync
-        UPDATE stac_api_collection SET
-            extent_out_of_sync = TRUE
-        WHERE id = item_instance.collection_id;
-
-        RAISE INFO 'collection.id=% extent_out_of_sync updated, due to item.name=% updates.', item_instance.collection_id, item_instance.name;
-
-        RETURN item_instance;
+        RETURN NEW;
         '''
 
-    class CollectionFileSizeTrigger(pgtrigger.Trigger):
-        when = pgtrigger.After
-        declare = [
-            ('item_instance', 'stac_api_item%ROWTYPE'),
-            ('updated_total_data_size', 'NUMERIC'),
-        ]
-        func = '''
-        item_instance = COALESCE(NEW, OLD);
-
-        -- Update related collection file_size variables
-        UPDATE stac_api_collection SET
-            total_data_size = total_data_size + COALESCE(NEW.total_data_size, 0) - COALESCE(OLD.total_data_size, 0)
-        WHERE id = item_instance.collection_id
-        RETURNING total_data_size INTO updated_total_data_size;
-
-        IF updated_total_data_size < 0
-            THEN RAISE WARNING 'item.id=% total_data_size has negative value %',
-            item_instance.collection_id, updated_total_data_size;
-        END IF;
+    # The collection extent is grown in place by new or updated items. The changes that might
+    # shrink it (delete, expiry, geometry or datetime shrink of an item on the extent boundary)
+    # only mark the extent as out of sync, it is then recomputed by the calculate_extent command.
+    collection_extent_func = '''
+    WITH changed AS (
+        SELECT
+            item.*,
+            LEAST(item.properties_datetime, item.properties_start_datetime) AS item_start,
+            GREATEST(item.properties_datetime, item.properties_end_datetime) AS item_end,
+            (item.properties_expires IS NULL OR item.properties_expires > now()) AS active
+        FROM {rows} AS item
+    ), shrinking AS (
+        SELECT DISTINCT old_item.collection_id
+        FROM changed AS old_item
+        JOIN stac_api_collection AS collection ON collection.id = old_item.collection_id
+        LEFT JOIN changed AS new_item
+            ON new_item.sign = 1 AND new_item.id = old_item.id
+            AND new_item.collection_id = old_item.collection_id AND new_item.active
+        WHERE old_item.sign = -1 AND old_item.active
+            -- the new version of the item doesn't cover the old one
+            AND NOT COALESCE(
+                new_item.bbox_xmin <= old_item.bbox_xmin AND
+                new_item.bbox_ymin <= old_item.bbox_ymin AND
+                new_item.bbox_xmax >= old_item.bbox_xmax AND
+                new_item.bbox_ymax >= old_item.bbox_ymax AND
+                new_item.item_start <= old_item.item_start AND
+                new_item.item_end >= old_item.item_end,
+                FALSE
+            )
+            -- and the old version was not strictly inside the extent
+            AND NOT COALESCE(
+                old_item.bbox_xmin > ST_XMin(collection.extent_geometry) AND
+                old_item.bbox_ymin > ST_YMin(collection.extent_geometry) AND
+                old_item.bbox_xmax < ST_XMax(collection.extent_geometry) AND
+                old_item.bbox_ymax < ST_YMax(collection.extent_geometry) AND
+                old_item.item_start > collection.extent_start_datetime AND
+                old_item.item_end < collection.extent_end_datetime,
+                FALSE
+            )
+    ), growing AS (
+        SELECT
+            new_item.collection_id,
+            MIN(new_item.bbox_xmin) AS xmin,
+            MIN(new_item.bbox_ymin) AS ymin,
+            MAX(new_item.bbox_xmax) AS xmax,
+            MAX(new_item.bbox_ymax) AS ymax,
+            MIN(new_item.item_start) AS start_datetime,
+            MAX(new_item.item_end) AS end_datetime
+        FROM changed AS new_item
+        WHERE new_item.sign = 1 AND new_item.active
+        GROUP BY new_item.collection_id
+    ), change AS (
+        SELECT
+            COALESCE(growing.collection_id, shrinking.collection_id) AS collection_id,
+            shrinking.collection_id IS NOT NULL AS shrink,
+            growing.xmin, growing.ymin, growing.xmax, growing.ymax,
+            growing.start_datetime, growing.end_datetime
+        FROM growing FULL JOIN shrinking ON shrinking.collection_id = growing.collection_id
+    )
+    UPDATE stac_api_collection AS collection SET
+        extent_out_of_sync = change.shrink,
+        extent_geometry = CASE WHEN change.shrink THEN collection.extent_geometry
+            ELSE ST_SetSRID(ST_MakeBox2D(
+                ST_Point(
+                    LEAST(ST_XMin(collection.extent_geometry), change.xmin),
+                    LEAST(ST_YMin(collection.extent_geometry), change.ymin)
+                ),
+                ST_Point(
+                    GREATEST(ST_XMax(collection.extent_geometry), change.xmax),
+                    GREATEST(ST_YMax(collection.extent_geometry), change.ymax)
+                )
+            )::geometry, 4326) END,
+        extent_start_datetime = CASE WHEN change.shrink THEN collection.extent_start_datetime
+            ELSE LEAST(collection.extent_start_datetime, change.start_datetime) END,
+        extent_end_datetime = CASE WHEN change.shrink THEN collection.extent_end_datetime
+            ELSE GREATEST(collection.extent_end_datetime, change.end_datetime) END
+    FROM change
+    WHERE collection.id = change.collection_id
+        -- out of sync extents are recomputed anyway
+        AND NOT collection.extent_out_of_sync
+        AND (
+            change.shrink OR
+            collection.extent_geometry IS NULL OR
+            change.xmin < ST_XMin(collection.extent_geometry) OR
+            change.ymin < ST_YMin(collection.extent_geometry) OR
+            change.xmax > ST_XMax(collection.extent_geometry) OR
+            change.ymax > ST_YMax(collection.extent_geometry) OR
+            change.start_datetime < collection.extent_start_datetime OR
+            change.end_datetime > collection.extent_end_datetime OR
+            (collection.extent_start_datetime IS NULL AND change.start_datetime IS NOT NULL) OR
+            (collection.extent_end_datetime IS NULL AND change.end_datetime IS NOT NULL)
+        );
 
-        RAISE INFO 'collection.id=% total_data_size updated, due to item.name=% updates.',
-            item_instance.collection_id, item_instance.name;
+    GET DIAGNOSTICS updated_count = ROW_COUNT;
+    RAISE INFO '% collections extent updated, due to item updates.', updated_count;
 
-        RETURN item_instance;
-        '''
+    RETURN NULL;
+    '''
+    collection_extent_func = deferrable_collection_update(
+        collection_extent_func,
+        'collection_id, extent_out_of_sync',
+        'SELECT DISTINCT item.collection_id, TRUE FROM {rows} AS item'
+    )
 
     return [
-        *auto_variables_triggers('item'),
-        *child_triggers('collection', 'Item'),
-        CollectionExtentTrigger(
-            name='update_item_collection_extent_trigger',
+        *auto_variables_triggers(
+            'item',
+            update_condition=f"""OLD.* IS DISTINCT FROM NEW.* AND
+            current_setting('{SEARCHABLE_SYNC}', true) IS DISTINCT FROM 'on'"""
+        ),
+        *item_searchable_triggers(),
+        *child_triggers('collection', 'Item', deferrable=True),
+        ItemBboxTrigger(
+            name='add_item_bbox_trigger',
+            operation=pgtrigger.Insert,
+        ),
+        ItemBboxTrigger(
+            name='update_item_bbox_trigger',
             operation=pgtrigger.Update,
             condition=pgtrigger.Condition(
                 '''NOT ST_EQUALS(OLD.geometry, NEW.geometry) OR
-                OLD.properties_start_datetime IS DISTINCT FROM NEW.properties_start_datetime OR
-                OLD.properties_end_datetime IS DISTINCT FROM NEW.properties_end_datetime OR
-                OLD.properties_datetime IS DISTINCT FROM NEW.properties_datetime'''
+                NEW.bbox_xmin IS NULL OR NEW.bbox_ymin IS NULL OR
+                NEW.bbox_xmax IS NULL OR NEW.bbox_ymax IS NULL'''
             )
         ),
-        CollectionExtentTrigger(
-            name='add_del_item_collection_extent_trigger',
-            operation=pgtrigger.Delete | pgtrigger.Insert
+        *statement_triggers(
+            'item_collection_extent',
+            collection_extent_func,
+            declare=[('updated_count', 'INTEGER')],
+            update_condition='''NOT ST_EQUALS(old_row.geometry, new_row.geometry) OR
+                old_row.collection_id IS DISTINCT FROM new_row.collection_id OR
+                old_row.properties_start_datetime IS DISTINCT FROM new_row.properties_start_datetime OR
+                old_row.properties_end_datetime IS DISTINCT FROM new_row.properties_end_datetime OR
+                old_row.properties_datetime IS DISTINCT FROM new_row.properties_datetime OR
+                old_row.properties_expires IS DISTINCT FROM new_row.properties_expires'''
         ),
-        CollectionFileSizeTrigger(
-            name='add_del_item_collection_file_size_trigger',
-            operation=pgtrigger.Insert | pgtrigger.Delete,
+        *file_size_triggers(
+            'item_collection_file_size', 'collection', 'total_data_size', deferrable=True
+        ),
+        *items_count_triggers(),
+        # The asset and link changes are notified through the item updates of their triggers
+        *response_cache_triggers(
+            'item',
+            '''SELECT DISTINCT collection.name AS collection_name
+            FROM {rows} AS item
+            JOIN stac_api_collection AS collection ON collection.id = item.collection_id'''
         ),
-        CollectionFileSizeTrigger(
-            name='update_item_collection_file_size_trigger',
-            operation=pgtrigger.Update,
-            condition=pgtrigger.
-            Condition('OLD.total_data_size IS DISTINCT FROM NEW.total_data_size'),
-        )
     ]
 
 
@@ -443,7 +705,8 @@ def generates_collection_triggers():
     '''Generates Collection triggers
 
     Those triggers update the `updated` and `etag` fields of the collections on
-    update or insert.
+    update or insert, notify the response cache and the collection registry of the changes and
+    synchronize the `is_searchable` flag of the items with the `published` flag.
 
     Returns: tuple
         tuple for all needed triggers
@@ -451,6 +714,12 @@ def generates_collection_triggers():
 
     return [
         *auto_variables_triggers('collection'),
+        *response_cache_triggers(
+            'collection',
+            'SELECT DISTINCT collection.name AS collection_name FROM {rows} AS collection'
+        ),
+        *collection_registry_triggers(),
+        *collection_searchable_triggers(),
     ]
 
 
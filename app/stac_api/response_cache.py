@@ -0,0 +1,180 @@
+'''Response cache of the collection, item and asset GET endpoints
+
+The GET responses are stored in the `response` cache (see settings.CACHES), per default a local
+memory cache per worker, but any shared django cache backend (e.g. redis) can be configured with
+RESPONSE_CACHE_URL. The entries are keyed by the canonical URL, the API version, the Accept
+header and the items expiry cut-off and are versioned by a generation per collection.
+
+The pgtriggers notify every change of a collection or of its items, assets and links on the
+RESPONSE_CACHE_CHANNEL. Each worker listens to this channel (see stac_api.db_notifications) and
+replaces the generation of the changed collections, which invalidates all their cached responses
+at once. With a shared cache backend the generations are shared as well, so the invalidation of
+any worker applies to all of them.
+
+The cache is only used while the listener is connected, and all generations are replaced on
+(re)connection as the notifications sent in the meantime are lost.
+'''
+import hashlib
+import json
+import logging
+import time
+import uuid
+from urllib.parse import urlencode
+
+from prometheus_client import Counter
+from prometheus_client import Histogram
+
+from django.conf import settings
+from django.core.cache import caches
+from django.http import HttpResponse
+from django.utils.cache import get_conditional_response
+
+from stac_api.db_notifications import listener
+from stac_api.pgtriggers import RESPONSE_CACHE_CHANNEL
+from stac_api.utils import get_api_version
+from stac_api.views.filters import get_expiry_cutoff
+
+logger = logging.getLogger(__name__)
+
+CACHE_ALIAS = 'response'
+KEY_PREFIX = 'stac-api-response'
+
+LOOKUPS = Counter(
+    'stac_api_response_cache_lookups',
+    'Response cache lookups, the hit ratio is given by the hit/miss results', ['view', 'result']
+)
+INVALIDATIONS = Counter(
+    'stac_api_response_cache_invalidations', 'Collection invalidations of the response cache'
+)
+INVALIDATION_LATENCY = Histogram(
+    'stac_api_response_cache_invalidation_latency_seconds',
+    'Delay between a DB change and the invalidation of the related cached responses',
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+)
+
+
+def _generation_key(collection_name=None):
+    if collection_name is None:
+        return f'{KEY_PREFIX}:generation'
+    return f'{KEY_PREFIX}:generation:{collection_name}'
+
+
+def _get_generations(cache, keys):
+    generations = cache.get_many(keys)
+    for key in keys:
+        if key not in generations:
+            cache.add(key, uuid.uuid4().hex, timeout=None)
+            generations[key] = cache.get(key)
+    return [generations[key] for key in keys]
+
+
+def invalidate(collection_name=None):
+    '''Invalidate the cached responses of a collection
+
+    Args:
+        collection_name: string
+            Name of the collection, when None all the cached responses are invalidated
+    '''
+    caches[CACHE_ALIAS].set(_generation_key(collection_name), uuid.uuid4().hex, timeout=None)
+
+
+def on_notify(payload):
+    '''Invalidate the cached responses of a changed collection
+
+    Args:
+        payload: string
+            JSON notification payload with the collection name and the change timestamp
+    '''
+    try:
+        change = json.loads(payload)
+        invalidate(change['collection'])
+    except (ValueError, KeyError) as error:
+        logger.error('Invalid response cache notification %s: %s', payload, error)
+        invalidate()
+        return
+    INVALIDATIONS.inc()
+    INVALIDATION_LATENCY.observe(max(0, time.time() - change['timestamp']))
+
+
+# The changes done while not listening have not been notified, therefore everything is
+# invalidated on (re)connection.
+listener.subscribe(RESPONSE_CACHE_CHANNEL, on_notify, on_connect=invalidate)
+
+
+def is_enabled():
+    '''Returns True if the response cache can be used
+
+    The cache is only usable while its invalidation listener is connected.
+    '''
+    if not settings.RESPONSE_CACHE_ENABLED:
+        return False
+    listener.start()
+    return listener.connected.is_set()
+
+
+def get_cache_key(request, collection_name):
+    '''Returns the cache key of a request
+
+    Args:
+        request: HttpRequest
+            request to cache
+        collection_name: string
+            Name of the collection of the requested resource
+
+    Returns: string
+        Cache key including the current generations of the collection and the expiry cut-off
+    '''
+    cache = caches[CACHE_ALIAS]
+    generations = _get_generations(cache, [_generation_key(), _generation_key(collection_name)])
+    canonical_url = request.build_absolute_uri(request.path)
+    if request.GET:
+        canonical_url += '?' + urlencode(sorted(request.GET.lists()), doseq=True)
+    # the expired items are hidden from the responses from the expiry cut-off on
+    digest = hashlib.sha256(
+        '\n'.join([
+            get_api_version(request).name,
+            canonical_url,
+            request.headers.get('Accept', ''),
+            get_expiry_cutoff().isoformat(),
+        ]).encode()
+    ).hexdigest()
+    return f'{KEY_PREFIX}:{":".join(generations)}:{digest}'
+
+
+def get_response(request, key, view_name):
+    '''Returns the cached response of a request or None if not cached
+
+    The conditional GET requests are answered from the cached ETag.
+    '''
+    entry = caches[CACHE_ALIAS].get(key)
+    if entry is None:
+        LOOKUPS.labels(view=view_name, result='miss').inc()
+        return None
+    LOOKUPS.labels(view=view_name, result='hit').inc()
+    status, content, headers = entry
+    response = HttpResponse(content, status=status)
+    for header, value in headers:
+        response.headers[header] = value
+    return get_conditional_response(request, etag=response.headers.get('ETag'), response=response)
+
+
+def store_response(key, response):
+    '''Store a successful response once rendered'''
+    if response.status_code != 200 or response.cookies:
+        return
+
+    def store(rendered_response):
+        caches[CACHE_ALIAS].set(
+            key,
+            (
+                rendered_response.status_code,
+                rendered_response.content,
+                list(rendered_response.headers.items())
+            ),
+            settings.RESPONSE_CACHE_SECONDS
+        )
+
+    if getattr(response, 'is_rendered', True):
+        store(response)
+    else:
+        response.add_post_render_callback(store)
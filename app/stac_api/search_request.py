@@ -0,0 +1,164 @@
+'''Parsed parameters of the search endpoint
+
+The GET and POST search requests are harmonized, validated and parsed once into an immutable
+SearchRequest, which is then used to filter the items and to paginate them. The parameters are
+therefore decoded only once (e.g. the intersects GeoJSON is converted once to a geometry).
+
+The SearchRequest has a canonical form, independent of the request method, of the order of the
+lists and of the JSON formatting, on which caches and query plans can be keyed.
+'''
+import hashlib
+import json
+from collections import namedtuple
+from functools import cached_property
+
+from stac_api.utils import isoformat
+from stac_api.validators_serializer import ValidateSearchRequest
+
+SEARCH_REQUEST_FIELDS = [
+    'ids',
+    'collections',
+    'bbox',
+    'datetime',
+    'query',
+    'intersects',
+    'forecast_reference_datetime',
+    'forecast_horizon',
+    'forecast_duration',
+    'forecast_variable',
+    'forecast_perturbed',
+    'filter',
+    'sortby',
+    'limit',
+    'cursor',
+]
+
+
+def _canonical_geometry(geometry):
+    if geometry is None:
+        return None
+    return geometry.normalize(clone=True).hexewkb.decode()
+
+
+def _canonical_datetime_query(date_time):
+    if date_time is None:
+        return None
+    return [value if value in (None, '..') else isoformat(value) for value in date_time]
+
+
+SearchRequestTuple = namedtuple(
+    'SearchRequestTuple', SEARCH_REQUEST_FIELDS, defaults=[None] * len(SEARCH_REQUEST_FIELDS)
+)
+
+
+class SearchRequest(SearchRequestTuple):
+    '''Parsed and validated parameters of a search request
+
+    Attributes:
+        ids, collections: tuple
+            List of item and collection names
+        bbox, intersects: GEOSGeometry
+            Spatial filters
+        datetime, forecast_reference_datetime: tuple
+            (start, end) as returned by stac_api.managers.parse_datetime_query
+        query: dict
+            Parsed query filter
+        filter: Cql2Filter
+            Parsed CQL2 filter, see stac_api.cql2.parse_filter
+        forecast_horizon, forecast_duration, forecast_variable, forecast_perturbed:
+            Forecast filters (only with POST)
+        sortby: Sortby
+            Sort order, see stac_api.pagination.parse_sortby
+        limit, cursor:
+            Pagination parameters
+    '''
+
+    @classmethod
+    def from_request(cls, request, extra_parameters=()):
+        '''Builds the SearchRequest of a GET or POST search request
+
+        Args:
+            request: Request
+                The search request
+            extra_parameters: list
+                Names of the POST parameters accepted in addition to the search ones
+
+        Raises:
+            serializers.ValidationError: if the request is invalid
+        '''
+        return cls(**ValidateSearchRequest(extra_parameters).validate(request))
+
+    def filter_queryset(self, queryset):
+        '''Filters the items by the search parameters
+
+        If ids are given, the other filters are ignored.
+
+        Args:
+            queryset: ItemQuerySet
+
+        Returns: ItemQuerySet
+            The filtered queryset
+        '''
+        if self.ids is not None:
+            return queryset.filter_by_item_name(self.ids)
+        if self.bbox is not None:
+            queryset = queryset.filter_by_bbox(self.bbox)
+        if self.datetime is not None:
+            queryset = queryset.filter_by_datetime(self.datetime)
+        if self.collections is not None:
+            queryset = queryset.filter_by_collections(self.collections)
+        if self.query is not None:
+            queryset = queryset.filter_by_query(self.query)
+        if self.intersects is not None:
+            queryset = queryset.filter_by_intersects(self.intersects)
+        if self.filter is not None:
+            queryset = queryset.filter_by_cql2(self.filter)
+        if self.forecast_reference_datetime is not None:
+            queryset = queryset.filter_by_forecast_reference_datetime(
+                self.forecast_reference_datetime
+            )
+        if self.forecast_horizon is not None:
+            queryset = queryset.filter_by_forecast_horizon(self.forecast_horizon)
+        if self.forecast_duration is not None:
+            queryset = queryset.filter_by_forecast_duration(self.forecast_duration)
+        if self.forecast_variable is not None:
+            queryset = queryset.filter_by_forecast_variable(self.forecast_variable)
+        if self.forecast_perturbed is not None:
+            queryset = queryset.filter_by_forecast_perturbed(self.forecast_perturbed)
+        return queryset
+
+    @cached_property
+    def canonical(self):
+        '''Canonical JSON form of the filters and of the sort order
+
+        The pagination parameters (limit and cursor) are not part of the canonical form, it
+        therefore identifies the whole result set of the search.
+        '''
+        if self.ids is not None:
+            # the other filters are ignored
+            filters = {'ids': sorted(set(self.ids))}
+        else:
+            filters = {
+                'collections':
+                    sorted(set(self.collections)) if self.collections is not None else None,
+                'bbox': _canonical_geometry(self.bbox),
+                'datetime': _canonical_datetime_query(self.datetime),
+                'query': self.query,
+                'intersects': _canonical_geometry(self.intersects),
+                'filter': self.filter.expression if self.filter is not None else None,
+                'forecast:reference_datetime':
+                    _canonical_datetime_query(self.forecast_reference_datetime),
+                'forecast:horizon': self.forecast_horizon,
+                'forecast:duration': self.forecast_duration,
+                'forecast:variable': self.forecast_variable,
+                'forecast:perturbed': self.forecast_perturbed,
+            }
+        if self.sortby is not None:
+            filters['sortby'] = [self.sortby.field.expression, self.sortby.descending]
+        filters = {key: value for key, value in filters.items() if value is not None}
+        return json.dumps(filters, sort_keys=True, separators=(',', ':'), default=str)
+
+    @cached_property
+    def canonical_hash(self):
+        '''SHA256 hex digest of the canonical form'''
+        return hashlib.sha256(self.canonical.encode()).hexdigest()
@@ -14,6 +14,7 @@ from stac_api.serializers.utils import HrefField
 from stac_api.serializers.utils import NonNullModelSerializer
 from stac_api.serializers.utils import UpsertModelSerializerMixin
 from stac_api.serializers.utils import get_relation_links
+from stac_api.serializers.utils import sync_related_objects
 from stac_api.serializers.utils import update_or_create_links
 from stac_api.serializers.utils import validate_href_field
 from stac_api.utils import get_stac_version
@@ -305,38 +306,19 @@ class CollectionSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
         }
 
     def _update_or_create_providers(self, collection, providers_data):
-        provider_ids = []
-        for provider_data in providers_data:
-            provider, created = Provider.objects.get_or_create(
-                collection=collection,
-                name=provider_data["name"],
-                defaults={
-                    'description': provider_data.get('description', None),
-                    'roles': provider_data.get('roles', None),
-                    'url': provider_data.get('url', None)
-                }
-            )
-            logger.debug(
-                '%s provider %s',
-                'created' if created else 'updated',
-                provider.name,
-                extra={"provider": provider_data}
-            )
-            provider_ids.append(provider.id)
-            # the duplicate here is necessary to update the values in
-            # case the object already exists
-            provider.description = provider_data.get('description', provider.description)
-            provider.roles = provider_data.get('roles', provider.roles)
-            provider.url = provider_data.get('url', provider.url)
-            provider.full_clean()
-            provider.save()
-
-        # Delete providers that were not mentioned in the payload anymore
-        deleted = Provider.objects.filter(collection=collection).exclude(id__in=provider_ids
-                                                                        ).delete()
+        created, updated, deleted = sync_related_objects(
+            Provider,
+            collection,
+            'collection',
+            'name',
+            ['description', 'roles', 'url'],
+            providers_data,
+        )
         logger.info(
-            "deleted %d stale providers for collection %s",
-            deleted[0],
+            "created %d, updated %d and deleted %d stale providers for collection %s",
+            len(created),
+            len(updated),
+            len(deleted),
             collection.name,
             extra={"collection": collection.name}
         )
@@ -120,6 +120,18 @@ class LandingPageSerializer(serializers.ModelSerializer):
                 ("type", "application/json"),
                 ("title", "Search across feature collections"),
             ]),
+            OrderedDict([
+                ("href", get_url(request, 'queryables')),
+                ("rel", "http://www.opengis.net/def/rel/ogc/1.0/queryables"),
+                ("type", "application/schema+json"),
+                ("title", "Queryables of the filter parameter"),
+            ]),
+            OrderedDict([
+                ("href", get_url(request, 'aggregate')),
+                ("rel", "aggregate"),
+                ("type", "application/json"),
+                ("title", "Aggregations of the items matching a search"),
+            ]),
             OrderedDict([
                 ("href", get_browser_url(request, 'browser-catalog')),
                 ("rel", "alternate"),
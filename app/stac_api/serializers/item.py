@@ -34,19 +34,6 @@ from stac_api.validators_serializer import validate_uniqueness_and_create
 logger = logging.getLogger(__name__)
 
 
-class BboxSerializer(gis_serializers.GeoFeatureModelSerializer):
-
-    class Meta:
-        model = Item
-        geo_field = "geometry"
-        auto_bbox = True
-        fields = ['geometry']
-
-    def to_representation(self, instance):
-        python_native = super().to_representation(instance)
-        return python_native['bbox']
-
-
 class ItemLinkSerializer(NonNullModelSerializer):
 
     class Meta:
@@ -207,6 +194,7 @@ class AssetBaseSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
     # helper variable to provide the collection for upsert validation
     # see views.AssetDetail.perform_upsert
     collection = None
+    skip_unchanged = True
 
     def create(self, validated_data):
         asset = validate_uniqueness_and_create(Asset, validated_data)
@@ -225,8 +213,9 @@ class AssetBaseSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
         Returns: tuple
             Asset instance and True if created otherwise false
         """
-        data = validated_data
-        data['file_size'] = -1 if validated_data['is_external'] else 0
+        if self.instance is None or self.instance.is_external != validated_data['is_external']:
+            # the size of an uploaded file is kept, it is only known after the upload
+            validated_data['file_size'] = -1 if validated_data['is_external'] else 0
         asset, created = Asset.objects.update_or_create(**look_up, defaults=validated_data)
         return asset, created
 
@@ -360,11 +349,14 @@ class ItemSerializer(NonNullModelSerializer, UpsertModelSerializerMixin):
     # read only fields
     type = serializers.SerializerMethodField()
     collection = serializers.SlugRelatedField(slug_field='name', read_only=True)
-    bbox = BboxSerializer(source='*', read_only=True)
+    # the bbox is precomputed in DB (see stac_api.pgtriggers)
+    bbox = serializers.ReadOnlyField()
     assets = AssetsForItemSerializer(many=True, required=False)
     stac_extensions = serializers.SerializerMethodField()
     stac_version = serializers.SerializerMethodField()
 
+    skip_unchanged = True
+
     def get_type(self, obj):
         return 'Feature'
 
@@ -0,0 +1,227 @@
+'''Render item features directly in PostgreSQL
+
+The DRF ItemSerializer builds every feature in python (nested ItemsPropertiesSerializer,
+AssetsForItemSerializer, ...) which is the most expensive part of the items list and search
+endpoints. The functions of this module build the same STAC representation with
+json_build_object/json_agg in a single query (assets and links are aggregated with LATERAL joins),
+python only adds the request dependent auto links.
+
+The output must be identical to the ItemSerializer output (key order included), therefore any
+change in the ItemSerializer, ItemsPropertiesSerializer or AssetsForItemSerializer representation
+must be reflected here as well.
+'''
+import json
+import logging
+from datetime import timedelta
+
+from django.db import connection
+from django.utils.duration import duration_iso_string
+
+from stac_api.serializers.utils import get_relation_links
+from stac_api.utils import get_asset_href_prefix
+from stac_api.utils import get_stac_version
+from stac_api.utils import is_api_version_1
+
+logger = logging.getLogger(__name__)
+
+FORECAST_COLLECTION_PREFIX = 'ch.meteoschweiz.ogd-forecasting-icon'
+TIMESTAMPS_EXTENSION = "https://stac-extensions.github.io/timestamps/v1.1.0/schema.json"
+FORECAST_EXTENSION = "https://stac-extensions.github.io/forecast/v0.2.0/schema.json"
+
+# Precision used by ST_AsGeoJSON, this match the 15 significant digits of the GDAL GeoJSON export
+# used by the rest_framework_gis GeometryField.
+GEOJSON_MAX_DECIMAL_DIGITS = 15
+
+# Allowed asset orderings, ItemsList orders the nested assets by name while SearchList uses the
+# default model ordering (id).
+ASSET_ORDERINGS = {'name': 'asset.name', 'id': 'asset.id'}
+
+
+def _isoformat_sql(column):
+    '''SQL expression that renders a timestamptz like stac_api.utils.isoformat()
+
+    Microseconds are only added when not 0, like datetime.isoformat() does.
+    '''
+    return f'''(
+        to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS') ||
+        CASE WHEN to_char({column}, 'US') = '000000' THEN ''
+             ELSE to_char({column}, '.US') END ||
+        'Z'
+    )'''
+
+
+def _duration_sql(column):
+    '''SQL expression of an interval in microseconds, converted to ISO 8601 in python'''
+    return f"(extract(epoch FROM {column}) * 1000000)::bigint"
+
+
+def _asset_object_sql(api_v1):
+    '''Returns the json_build_object() SQL for a nested asset
+
+    The key order follows AssetsForItemSerializer.get_fields() which moves the renamed fields at
+    the end of the representation.
+    '''
+    fields = [
+        ("'title'", 'asset.title'),
+        ("'type'", 'asset.media_type'),
+        (
+            "'href'",
+            '''CASE
+                WHEN asset.is_external THEN asset.file
+                WHEN NULLIF(asset.file, '') IS NULL THEN NULL
+                ELSE %(href_prefix)s || asset.file
+            END'''
+        ),
+        ("'description'", 'asset.description'),
+    ]
+    if api_v1:
+        fields += [
+            ("'roles'", "to_json(NULLIF(asset.roles, '{}'))"),
+            ("'created'", _isoformat_sql('asset.created')),
+            ("'updated'", _isoformat_sql('asset.updated')),
+            ("'gsd'", 'asset.eo_gsd'),
+            ("'proj:epsg'", 'asset.proj_epsg'),
+            ("'geoadmin:variant'", 'asset.geoadmin_variant'),
+            ("'geoadmin:lang'", 'asset.geoadmin_lang'),
+            ("'file:checksum'", 'asset.checksum_multihash'),
+        ]
+    else:
+        fields += [
+            ("'created'", _isoformat_sql('asset.created')),
+            ("'updated'", _isoformat_sql('asset.updated')),
+            ("'proj:epsg'", 'asset.proj_epsg'),
+            ("'geoadmin:variant'", 'asset.geoadmin_variant'),
+            ("'geoadmin:lang'", 'asset.geoadmin_lang'),
+            ("'checksum:multihash'", 'asset.checksum_multihash'),
+            ("'eo:gsd'", 'asset.eo_gsd'),
+        ]
+    return 'json_build_object(' + ', '.join(f'{key}, {value}' for key, value in fields) + ')'
+
+
+def _features_sql(api_v1, asset_ordering):
+    return f'''
+    SELECT item.id, json_strip_nulls(json_build_object(
+        'id', item.name,
+        'collection', collection.name,
+        'type', 'Feature',
+        'stac_version', %(stac_version)s,
+        'geometry', ST_AsGeoJSON(item.geometry, {GEOJSON_MAX_DECIMAL_DIGITS})::json,
+        'bbox', json_build_array(item.bbox_xmin, item.bbox_ymin, item.bbox_xmax, item.bbox_ymax),
+        'properties', json_build_object(
+            'datetime', {_isoformat_sql('item.properties_datetime')},
+            'start_datetime', {_isoformat_sql('item.properties_start_datetime')},
+            'end_datetime', {_isoformat_sql('item.properties_end_datetime')},
+            'title', item.properties_title,
+            'created', {_isoformat_sql('item.created')},
+            'updated', {_isoformat_sql('item.updated')},
+            'expires', {_isoformat_sql('item.properties_expires')},
+            'forecast:reference_datetime', {_isoformat_sql('item.forecast_reference_datetime')},
+            'forecast:horizon', {_duration_sql('item.forecast_horizon')},
+            'forecast:duration', {_duration_sql('item.forecast_duration')},
+            'forecast:variable', item.forecast_variable,
+            'forecast:perturbed', item.forecast_perturbed
+        ),
+        'stac_extensions', CASE
+            WHEN starts_with(collection.name, %(forecast_prefix)s)
+                THEN json_build_array(%(timestamps_extension)s, %(forecast_extension)s)
+            ELSE json_build_array(%(timestamps_extension)s)
+        END,
+        'links', COALESCE(links.links, '[]'::json),
+        'assets', COALESCE(assets.assets, '{{}}'::json)
+    ))::text AS feature
+    FROM stac_api_item AS item
+    JOIN stac_api_collection AS collection ON collection.id = item.collection_id
+    LEFT JOIN LATERAL (
+        SELECT json_agg(json_build_object(
+            'href', link.href,
+            'rel', link.rel,
+            'title', link.title,
+            'type', link.link_type,
+            'hreflang', link.hreflang
+        ) ORDER BY link.id) AS links
+        FROM stac_api_itemlink AS link
+        WHERE link.item_id = item.id
+    ) AS links ON TRUE
+    LEFT JOIN LATERAL (
+        SELECT json_object_agg(
+            asset.name, {_asset_object_sql(api_v1)} ORDER BY {ASSET_ORDERINGS[asset_ordering]}
+        ) AS assets
+        FROM stac_api_asset AS asset
+        WHERE asset.item_id = item.id
+    ) AS assets ON TRUE
+    WHERE item.id = ANY(%(ids)s)
+    '''
+
+
+def _to_float(value):
+    if isinstance(value, list):
+        return [_to_float(val) for val in value]
+    return float(value)
+
+
+def _geometry_to_float(geometry):
+    if 'geometries' in geometry:
+        for sub_geometry in geometry['geometries']:
+            _geometry_to_float(sub_geometry)
+    else:
+        geometry['coordinates'] = _to_float(geometry['coordinates'])
+
+
+def _finalize_feature(request, feature, api_v1):
+    '''Python part of the feature rendering
+
+    Add the auto links and converts the values that postgres renders differently than python.
+    Numbers that have no decimals are rendered by postgres as integer while the ItemSerializer
+    renders python float (e.g. 6 vs 6.0).
+    '''
+    _geometry_to_float(feature['geometry'])
+    feature['bbox'] = _to_float(feature['bbox'])
+    properties = feature['properties']
+    for key in ['forecast:horizon', 'forecast:duration']:
+        if key in properties:
+            properties[key] = duration_iso_string(timedelta(microseconds=properties[key]))
+    gsd_key = 'gsd' if api_v1 else 'eo:gsd'
+    for asset in feature['assets'].values():
+        if gsd_key in asset:
+            asset[gsd_key] = float(asset[gsd_key])
+    feature['links'][:0] = get_relation_links(
+        request, 'item-detail', [feature['collection'], feature['id']]
+    )
+    return feature
+
+
+def serialize_items(request, item_ids, asset_ordering='name'):
+    '''Serialize items in DB
+
+    Args:
+        request: HttpRequest
+            request object, used for the auto links, the assets href and the api version
+        item_ids: list
+            primary keys of the items to serialize, the features are returned in the same order
+        asset_ordering: string
+            ordering of the nested assets, either 'name' or 'id'
+
+    Returns: list
+        List of features, identical to ItemSerializer(..., many=True).data
+    '''
+    if not item_ids:
+        return []
+    api_v1 = is_api_version_1(request)
+    with connection.cursor() as cursor:
+        cursor.execute(
+            _features_sql(api_v1, asset_ordering),
+            {
+                'ids': list(item_ids),
+                'stac_version': get_stac_version(request),
+                'href_prefix': get_asset_href_prefix(request),
+                'forecast_prefix': FORECAST_COLLECTION_PREFIX,
+                'timestamps_extension': TIMESTAMPS_EXTENSION,
+                'forecast_extension': FORECAST_EXTENSION,
+            }
+        )
+        features = dict(cursor.fetchall())
+    return [
+        _finalize_feature(request, json.loads(features[item_id]), api_v1)
+        for item_id in item_ids
+        if item_id in features
+    ]
@@ -92,6 +92,7 @@ class AssetUploadSerializer(NonNullModelSerializer):
     # Read only fields
     upload_id = serializers.CharField(read_only=True)
     created = serializers.DateTimeField(read_only=True)
+    # presigned on demand, the urls are not stored (see views.upload.PresignedUrlsMixin)
     urls = serializers.JSONField(read_only=True)
     completed = serializers.SerializerMethodField()
     aborted = serializers.SerializerMethodField()
@@ -194,6 +195,7 @@ class CollectionAssetUploadSerializer(NonNullModelSerializer):
     # Read only fields
     upload_id = serializers.CharField(read_only=True)
     created = serializers.DateTimeField(read_only=True)
+    # presigned on demand, the urls are not stored (see views.upload.PresignedUrlsMixin)
     urls = serializers.JSONField(read_only=True)
     completed = serializers.SerializerMethodField()
     aborted = serializers.SerializerMethodField()
@@ -4,6 +4,7 @@ from typing import Dict
 from typing import List
 
 from django.core.exceptions import ValidationError as CoreValidationError
+from django.db.models import Model
 from django.utils.dateparse import parse_duration
 from django.utils.duration import duration_iso_string
 from django.utils.translation import gettext_lazy as _
@@ -11,6 +12,9 @@ from django.utils.translation import gettext_lazy as _
 from rest_framework import serializers
 from rest_framework.utils.serializer_helpers import ReturnDict
 
+from stac_api.content_hash import get_content_hash
+from stac_api.content_hash import is_unchanged
+from stac_api.content_hash import save_content_hash
 from stac_api.models.collection import Collection
 from stac_api.models.general import Link
 from stac_api.models.item import Item
@@ -24,6 +28,77 @@ from stac_api.validators import validate_href_url
 logger = logging.getLogger(__name__)
 
 
+def sync_related_objects(
+    model: type[Model],
+    instance: type[Item] | type[Collection],
+    instance_type: str,
+    key: str,
+    fields: List[str],
+    objects_data: List[Dict]
+):
+    '''Synchronize the related objects (links or providers) of a model instance
+
+    The existing objects are loaded once and compared by key with the payload, then the new objects
+    are created with a bulk_create, the changed ones are updated with a bulk_update and the ones
+    not in the payload anymore are deleted with a single delete. Nothing is written when nothing
+    changed, so that the child triggers don't update the etag of the instance.
+
+    Args:
+        model: related model class (link model or Provider)
+        instance: model instance owning the related objects
+        instance_type: (str) name of the foreign key to the instance ('collection' or 'item')
+        key: (str) field identifying an object of the instance ('rel' or 'name')
+        fields: list of the other fields of the objects, the fields missing in the payload of an
+            existing object are kept
+        objects_data: list of objects dictionary
+
+    Returns: tuple
+        (created, updated, deleted) lists of objects
+    '''
+    existing = {}
+    deleted = []
+    for obj in model.objects.filter(**{instance_type: instance}):
+        if getattr(obj, key) in existing:
+            # duplicated keys are only possible without unique constraint (collection links)
+            deleted.append(obj)
+        else:
+            existing[getattr(obj, key)] = obj
+    created = []
+    updated = []
+    for value, data in {data[key]: data for data in objects_data}.items():
+        obj = existing.pop(value, None)
+        if obj is None:
+            obj = model(**{instance_type: instance, key: value}, **{f: data.get(f) for f in fields})
+            created.append(obj)
+        elif changed := [f for f in fields if f in data and data[f] != getattr(obj, f)]:
+            for field in changed:
+                setattr(obj, field, data[field])
+            updated.append(obj)
+        else:
+            continue
+        # the foreign key and the uniqueness are given by the instance and the key
+        obj.full_clean(exclude=[instance_type], validate_unique=False, validate_constraints=False)
+    deleted.extend(existing.values())
+
+    if deleted:
+        model.objects.filter(pk__in=[obj.pk for obj in deleted]).delete()
+    if updated:
+        model.objects.bulk_update(updated, fields)
+    if created:
+        model.objects.bulk_create(created)
+    logger.debug(
+        '%d %s created, %d updated and %d deleted for %s %s',
+        len(created),
+        model.__name__,
+        len(updated),
+        len(deleted),
+        instance_type,
+        instance.name,
+        extra={instance_type: instance.name}
+    )
+    return created, updated, deleted
+
+
 def update_or_create_links(
     model: type[Link],
     instance: type[Item] | type[Collection],
@@ -33,48 +108,26 @@ def update_or_create_links(
     '''Update or create links for a model
 
     Update the given links list within a model instance or create them when they don't exists yet.
+    The links not in the list are deleted, see sync_related_objects().
     Args:
         model: model class on which to update/create links (Collection or Item)
         instance: model instance on which to update/create links
         instance_type: (str) instance type name string to use for filtering ('collection' or 'item')
         links_data: list of links dictionary to add/update
     '''
-    links_ids = []
-    for link_data in links_data:
-        link: Link
-        created: bool
-        link, created = model.objects.get_or_create(
-            **{instance_type: instance},
-            rel=link_data["rel"],
-            defaults={
-                'href': link_data.get('href', None),
-                'link_type': link_data.get('link_type', None),
-                'title': link_data.get('title', None),
-                'hreflang': link_data.get('hreflang', None)
-            }
-        )
-        logger.debug(
-            '%s link %s',
-            'created' if created else 'updated',
-            link.href,
-            extra={
-                instance_type: instance.name, "link": link_data
-            }
-        )
-        links_ids.append(link.pk)
-        # the duplicate here is necessary to update the values in
-        # case the object already exists
-        link.link_type = link_data.get('link_type', link.link_type)
-        link.title = link_data.get('title', link.title)
-        link.href = link_data.get('href', link.rel)
-        link.full_clean()
-        link.save()
-
-    # Delete link that were not mentioned in the payload anymore
-    deleted = model.objects.filter(**{instance_type: instance},).exclude(id__in=links_ids).delete()
+    created, updated, deleted = sync_related_objects(
+        model,
+        instance,
+        instance_type,
+        'rel',
+        ['href', 'link_type', 'title', 'hreflang'],
+        links_data
+    )
     logger.info(
-        "deleted %d stale links for %s %s",
-        deleted[0],
+        "created %d, updated %d and deleted %d stale links for %s %s",
+        len(created),
+        len(updated),
+        len(deleted),
         instance_type,
         instance.name,
         extra={instance_type: instance}
@@ -227,7 +280,11 @@ def get_relation_links(request, view, view_args=()):
 
 class UpsertModelSerializerMixin:
     """Add support for Upsert in serializer
+
+    When skip_unchanged is set, the upsert of an existing instance with the same content as its
+    last upsert is skipped, see stac_api.content_hash.
     """
+    skip_unchanged = False
 
     def upsert(self, look_up, **kwargs):
         """
@@ -242,7 +299,15 @@ class UpsertModelSerializerMixin:
                 as kwargs.
         """
         validated_data = {**self.validated_data, **kwargs}
+        if not self.skip_unchanged:
+            self.instance, created = self.update_or_create(look_up, validated_data)
+            return self.instance, created
+
+        content_hash = get_content_hash(validated_data)
+        if self.instance is not None and is_unchanged(self.instance, content_hash):
+            return self.instance, False
         self.instance, created = self.update_or_create(look_up, validated_data)
+        save_content_hash(self.instance, content_hash)
         return self.instance, created
 
     def update_or_create(self, look_up, validated_data):
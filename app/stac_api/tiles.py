@@ -0,0 +1,130 @@
+'''Vector tiles (MVT) of the item footprints
+
+The map viewers draw the item footprints from vector tiles instead of GeoJSON pages of the search
+endpoint. The tiles are produced in the DB with ST_AsMVTGeom/ST_AsMVT directly from the item
+geometries, without serializing the items. The features only have a few attributes (id,
+collection, datetimes, title and the forecast run and variable).
+
+The items are selected with the GiST index by the bounding box of the tile (including its
+buffer), at most TILES_MAX_FEATURES per tile. The footprints are simplified by
+TILES_SIMPLIFY_TOLERANCE tile pixels, which depends on the zoom level, before being clipped and
+quantized to the TILES_EXTENT grid of the tile.
+'''
+import logging
+import math
+
+from django.conf import settings
+from django.contrib.gis.geos import Polygon
+from django.db import connection
+
+logger = logging.getLogger(__name__)
+
+LAYER_NAME = 'items'
+MVT_MEDIA_TYPE = 'application/vnd.mapbox-vector-tile'
+MAX_ZOOM = 24
+
+# Half of the width of the Web Mercator (EPSG:3857) square in meters
+MERCATOR_HALF_WIDTH = 20037508.342789244
+
+ISO_FORMAT = '''to_char(%s AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS"Z"')'''
+
+TILE_SQL = f'''
+SELECT ST_AsMVT(features, %s, %s, 'geom')
+FROM (
+    SELECT
+        ST_AsMVTGeom(
+            ST_Simplify(ST_Transform(item.geometry, 3857), %s, true),
+            ST_TileEnvelope(%s, %s, %s), %s, %s, true
+        ) AS geom,
+        item.name AS id,
+        collection.name AS collection,
+        {ISO_FORMAT % 'item.properties_datetime'} AS datetime,
+        {ISO_FORMAT % 'item.properties_start_datetime'} AS start_datetime,
+        {ISO_FORMAT % 'item.properties_end_datetime'} AS end_datetime,
+        item.properties_title AS title,
+        {ISO_FORMAT % 'item.forecast_reference_datetime'} AS "forecast:reference_datetime",
+        item.forecast_variable AS "forecast:variable"
+    FROM stac_api_item AS item
+    JOIN stac_api_collection AS collection ON collection.id = item.collection_id
+    WHERE item.id IN ({{items}})
+) AS features
+WHERE features.geom IS NOT NULL
+'''
+
+
+def is_valid_tile(z, x, y):
+    '''Returns true if the tile exists in the Web Mercator tile matrix set'''
+    return 0 <= z <= MAX_ZOOM and 0 <= x < 2**z and 0 <= y < 2**z
+
+
+def _mercator_to_wgs84(x, y):
+    lon = x / MERCATOR_HALF_WIDTH * 180
+    lat = math.degrees(math.atan(math.sinh(y / MERCATOR_HALF_WIDTH * math.pi)))
+    return lon, lat
+
+
+def get_tile_bounds(z, x, y, buffer=0):
+    '''Returns the bounding box in WGS84 of a tile
+
+    Args:
+        z, x, y: int
+            Zoom level, column and row of the tile
+        buffer: int
+            Buffer around the tile in tile pixels (TILES_EXTENT per tile)
+
+    Returns: Polygon
+    '''
+    size = 2 * MERCATOR_HALF_WIDTH / 2**z
+    margin = size * buffer / settings.TILES_EXTENT
+    xmin = -MERCATOR_HALF_WIDTH + x * size - margin
+    ymax = MERCATOR_HALF_WIDTH - y * size + margin
+    xmax = xmin + size + 2 * margin
+    ymin = ymax - size - 2 * margin
+    clip = MERCATOR_HALF_WIDTH
+    bounds = Polygon.from_bbox((
+        *_mercator_to_wgs84(max(xmin, -clip), max(ymin, -clip)),
+        *_mercator_to_wgs84(min(xmax, clip), min(ymax, clip)),
+    ))
+    bounds.srid = 4326
+    return bounds
+
+
+def get_simplify_tolerance(z):
+    '''Returns the simplification tolerance in meters (EPSG:3857) at a zoom level'''
+    pixel_size = 2 * MERCATOR_HALF_WIDTH / 2**z / settings.TILES_EXTENT
+    return pixel_size * settings.TILES_SIMPLIFY_TOLERANCE
+
+
+def get_tile(queryset, z, x, y):
+    '''Returns the vector tile of the item footprints
+
+    Args:
+        queryset: ItemQuerySet
+            Filtered items, the items intersecting the tile are selected from them
+        z, x, y: int
+            Zoom level, column and row of the tile, see is_valid_tile()
+
+    Returns: bytes
+        The MVT tile with the items layer, empty without items
+    '''
+    queryset = queryset.select_related(None).prefetch_related(None).order_by().filter(
+        geometry__bboverlaps=get_tile_bounds(z, x, y, settings.TILES_BUFFER)
+    ).values('pk')[:settings.TILES_MAX_FEATURES]
+    items_sql, items_params = queryset.query.sql_with_params()
+    params = [
+        LAYER_NAME,
+        settings.TILES_EXTENT,
+        get_simplify_tolerance(z),
+        z,
+        x,
+        y,
+        settings.TILES_EXTENT,
+        settings.TILES_BUFFER,
+        *items_params,
+    ]
+    with connection.cursor() as cursor:
+        cursor.execute(TILE_SQL.format(items=items_sql), params)
+        tile = cursor.fetchone()[0]
+    tile = bytes(tile) if tile is not None else b''
+    logger.debug('Tile %d/%d/%d of %d bytes', z, x, y, len(tile))
+    return tile
@@ -8,30 +8,41 @@ from stac_api.views.collection import CollectionAssetDetail
 from stac_api.views.collection import CollectionAssetsList
 from stac_api.views.collection import CollectionDetail
 from stac_api.views.collection import CollectionList
+from stac_api.views.general import AggregateList
 from stac_api.views.general import ConformancePageDetail
 from stac_api.views.general import LandingPageDetail
+from stac_api.views.general import QueryablesDetail
 from stac_api.views.general import SearchList
+from stac_api.views.general import TilesDetail
 from stac_api.views.general import recalculate_extent
 from stac_api.views.item import AssetDetail
 from stac_api.views.item import AssetsList
+from stac_api.views.item import CollectionAggregate
+from stac_api.views.item import ForecastRunsList
 from stac_api.views.item import ItemDetail
+from stac_api.views.item import ItemsBulk
+from stac_api.views.item import ItemsExport
 from stac_api.views.item import ItemsList
+from stac_api.views.item import ItemsTile
 from stac_api.views.upload import AssetUploadAbort
 from stac_api.views.upload import AssetUploadComplete
 from stac_api.views.upload import AssetUploadDetail
 from stac_api.views.upload import AssetUploadPartsList
 from stac_api.views.upload import AssetUploadsList
+from stac_api.views.upload import AssetUploadUrlsList
 from stac_api.views.upload import CollectionAssetUploadAbort
 from stac_api.views.upload import CollectionAssetUploadComplete
 from stac_api.views.upload import CollectionAssetUploadDetail
 from stac_api.views.upload import CollectionAssetUploadPartsList
 from stac_api.views.upload import CollectionAssetUploadsList
+from stac_api.views.upload import CollectionAssetUploadUrlsList
 
 # HEALTHCHECK_ENDPOINT = settings.HEALTHCHECK_ENDPOINT
 
 asset_upload_urls = [
     path("<upload_id>", AssetUploadDetail.as_view(), name='asset-upload-detail'),
     path("<upload_id>/parts", AssetUploadPartsList.as_view(), name='asset-upload-parts-list'),
+    path("<upload_id>/urls", AssetUploadUrlsList.as_view(), name='asset-upload-urls-list'),
     path("<upload_id>/complete", AssetUploadComplete.as_view(), name='asset-upload-complete'),
     path("<upload_id>/abort", AssetUploadAbort.as_view(), name='asset-upload-abort')
 ]
@@ -57,6 +68,11 @@ collection_asset_upload_urls = [
         CollectionAssetUploadPartsList.as_view(),
         name='collection-asset-upload-parts-list'
     ),
+    path(
+        "<upload_id>/urls",
+        CollectionAssetUploadUrlsList.as_view(),
+        name='collection-asset-upload-urls-list'
+    ),
     path(
         "<upload_id>/complete",
         CollectionAssetUploadComplete.as_view(),
@@ -82,6 +98,16 @@ collection_asset_urls = [
 collection_urls = [
     path("<collection_name>", CollectionDetail.as_view(), name='collection-detail'),
     path("<collection_name>/items", ItemsList.as_view(), name='items-list'),
+    path("<collection_name>/export", ItemsExport.as_view(), name='items-export'),
+    path("<collection_name>/bulk-items", ItemsBulk.as_view(), name='items-bulk'),
+    path("<collection_name>/queryables", QueryablesDetail.as_view(), name='collection-queryables'),
+    path("<collection_name>/forecast-runs", ForecastRunsList.as_view(), name='forecast-runs-list'),
+    path("<collection_name>/aggregate", CollectionAggregate.as_view(), name='collection-aggregate'),
+    path(
+        "<collection_name>/tiles/<int:z>/<int:x>/<int:y>.mvt",
+        ItemsTile.as_view(),
+        name='items-tile'
+    ),
     path("<collection_name>/items/", include(item_urls)),
     path("<collection_name>/assets", CollectionAssetsList.as_view(), name='collection-assets-list'),
     path("<collection_name>/assets/", include(collection_asset_urls))
@@ -97,6 +123,9 @@ urlpatterns = [
             path("", LandingPageDetail.as_view(), name='landing-page'),
             path("conformance", ConformancePageDetail.as_view(), name='conformance'),
             path("search", SearchList.as_view(), name='search-list'),
+            path("queryables", QueryablesDetail.as_view(), name='queryables'),
+            path("aggregate", AggregateList.as_view(), name='aggregate'),
+            path("tiles/<int:z>/<int:x>/<int:y>.mvt", TilesDetail.as_view(), name='tiles'),
             path("collections", CollectionList.as_view(), name='collections-list'),
             path("collections/", include(collection_urls)),
             path("update-extent", recalculate_extent)
@@ -110,6 +139,9 @@ urlpatterns = [
             path("", LandingPageDetail.as_view(), name='landing-page'),
             path("conformance", ConformancePageDetail.as_view(), name='conformance'),
             path("search", SearchList.as_view(), name='search-list'),
+            path("queryables", QueryablesDetail.as_view(), name='queryables'),
+            path("aggregate", AggregateList.as_view(), name='aggregate'),
+            path("tiles/<int:z>/<int:x>/<int:y>.mvt", TilesDetail.as_view(), name='tiles'),
             path("collections", CollectionList.as_view(), name='collections-list'),
             path("collections/", include(collection_urls)),
             path("update-extent", recalculate_extent)
@@ -230,6 +230,24 @@ def build_asset_href(request, path):
     return request.build_absolute_uri(f'/{path}')
 
 
+def get_asset_href_prefix(request):
+    '''Returns the prefix that build_asset_href() prepends to the asset path
+
+    This is used when building the asset href outside of python, e.g. in SQL.
+
+    Args:
+        request: HttpRequest
+            Request
+
+    Returns:
+        Asset href prefix, including the trailing slash
+    '''
+    if settings.AWS_SETTINGS['legacy']['S3_CUSTOM_DOMAIN']:
+        custom_domain = settings.AWS_SETTINGS['legacy']['S3_CUSTOM_DOMAIN'].strip(" / ")
+        return f"{request.scheme}://{custom_domain}/"
+    return request.build_absolute_uri('/')
+
+
 def get_sha256_multihash(content):
     '''Get the sha2-256 multihash of the bytes content
 
@@ -291,6 +309,9 @@ def parse_multihash(multihash_string):
 def harmonize_post_get_for_search(request):
     '''Harmonizes the request of GET and POST for the search endpoint
 
+    The query and intersects parameters are kept as they are (JSON string with GET, parsed JSON
+    with POST), they are parsed once by the ValidateSearchRequest.
+
     Args:
         request: QueryDict
 
@@ -301,8 +322,6 @@ def harmonize_post_get_for_search(request):
         query_param = request.data.copy()
         if 'bbox' in query_param:
             query_param['bbox'] = json.dumps(query_param['bbox']).strip('[]')  # to string
-        if 'query' in query_param:
-            query_param['query'] = json.dumps(query_param['query'])  # to string
 
     # GET
     else:
@@ -311,8 +330,6 @@ def harmonize_post_get_for_search(request):
             query_param['ids'] = query_param['ids'].split(',')  # to array
         if 'collections' in query_param:
             query_param['collections'] = query_param['collections'].split(',')  # to array
-        if 'intersects' in query_param:
-            query_param['intersects'] = json.loads(query_param['intersects'])
 
         # Forecast properties can only be filtered with method POST.
         # Decision was made as `:` need to be url encoded and (at least for now) we do not need to
@@ -9,6 +9,9 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 
+from stac_api.cql2 import parse_filter_parameters
+from stac_api.managers import parse_datetime_query
+from stac_api.pagination import parse_sortby
 from stac_api.utils import fromisoformat
 from stac_api.utils import geometry_from_bbox
 from stac_api.utils import harmonize_post_get_for_search
@@ -61,8 +64,10 @@ class ValidateSearchRequest:
     when raising a serializers.ValidationError.
     '''
 
-    def __init__(self):
+    def __init__(self, extra_parameters=()):
         self.errors = {}  # a list with all the validation errors
+        # parameters accepted in addition to the search ones (POST), e.g. the aggregation ones
+        self.extra_parameters = extra_parameters
         self.max_len_array = 2000
         self.max_times_same_query_attribute = 20
         self.max_query_attributes = 50
@@ -73,17 +78,20 @@ class ValidateSearchRequest:
         self.queriable_str_fields = ['title']
 
     def validate(self, request):
-        '''Validates the request of the search endpoint
+        '''Validates and parses the request of the search endpoint
 
         This function validates the request of the search endpoint. As a simplification the
-        requests of GET and POST are harmonized. Then the search params are validated. This
-        function gathers as much validation information as possible. If there is one error
-        or several, finally it raises one error with a complete validation feedback.
+        requests of GET and POST are harmonized. Then the search params are validated and
+        parsed. This function gathers as much validation information as possible. If there is one
+        error or several, finally it raises one error with a complete validation feedback.
 
         Args:
             request (RequestDict)
                 The Request (POST or GET)
 
+        Returns: dict
+            The parsed search parameters, see stac_api.search_request.SearchRequest
+
         Raises:
             serializers.ValidationError(code, details)
         '''
@@ -93,24 +101,43 @@ class ValidateSearchRequest:
         if request.method == "POST":
             self.validate_query_parameters_post_search(query_param)
 
+        parsed = {
+            'forecast_horizon': query_param.get('forecast:horizon'),
+            'forecast_duration': query_param.get('forecast:duration'),
+            'forecast_variable': query_param.get('forecast:variable'),
+            'forecast_perturbed': query_param.get('forecast:perturbed'),
+            'limit': query_param.get('limit'),
+            'cursor': query_param.get('cursor'),
+        }
         if 'bbox' in query_param:
-            self.validate_bbox(query_param['bbox'])
+            parsed['bbox'] = self.validate_bbox(query_param['bbox'])
         if 'datetime' in query_param:
-            self.validate_date_time(query_param['datetime'])
+            parsed['datetime'] = self.validate_date_time(query_param['datetime'])
         if 'ids' in query_param:
             self.validate_array_of_strings(query_param['ids'], 'ids')
+            parsed['ids'] = tuple(query_param['ids'])
         if 'collections' in query_param:
             self.validate_array_of_strings(query_param['collections'], 'collections')
+            parsed['collections'] = tuple(query_param['collections'])
         if 'query' in query_param:
-            self.validate_query(query_param['query'])
-        if 'intersects' in query_param:  # only in POST
-            self.validate_intersects(json.dumps(query_param['intersects']))
+            parsed['query'] = self.validate_query(query_param['query'])
+        if 'intersects' in query_param:
+            parsed['intersects'] = self.validate_intersects(query_param['intersects'])
+        if 'sortby' in query_param:
+            parsed['sortby'] = self.validate_sortby(query_param['sortby'])
+        if 'filter' in query_param:
+            parsed['filter'] = self.validate_filter(query_param)
+        if 'forecast:reference_datetime' in query_param:  # only in POST
+            parsed['forecast_reference_datetime'] = self.validate_date_time(
+                query_param['forecast:reference_datetime'], 'forecast:reference_datetime'
+            )
 
         # Raise ERROR with a list of parsed errors
         if self.errors:
             for key, value in self.errors.items():
                 logger.error('%s: %s', key, value)
             raise serializers.ValidationError(self.errors)
+        return parsed
 
     def validate_query(self, query):
         '''Validates the query parameter
@@ -119,20 +146,27 @@ class ValidateSearchRequest:
         an information is being added to the dict self.errors
 
         Args:
-            query: string
-                The query parameter to be validated.
+            query: string | dict
+                The query parameter to be validated, as JSON string (GET) or parsed (POST).
+
+        Returns: dict
+            The parsed query
         '''
         # summing up the fields based of different types
         queriable_fields = self.queriable_date_fields + self.queriable_str_fields
 
         # validate json
-        try:
-            query_dict = json.loads(query)
-        except json.JSONDecodeError as error:
-            message = f"The application could not decode the query parameter" \
-                      f"Please check the syntax ({error})." \
-                      f"{query}"
-            raise serializers.ValidationError(_(message)) from None
+        query_dict = query
+        if isinstance(query, str):
+            try:
+                query_dict = json.loads(query)
+            except json.JSONDecodeError as error:
+                message = f"The application could not decode the query parameter" \
+                          f"Please check the syntax ({error})." \
+                          f"{query}"
+                raise serializers.ValidationError(_(message)) from None
+        if not isinstance(query_dict, dict):
+            raise serializers.ValidationError(_(f"The query parameter must be an object: {query}"))
 
         self._query_validate_length_of_query(query_dict)
         for attribute in query_dict:
@@ -143,6 +177,7 @@ class ValidateSearchRequest:
 
             # validate operators
             self._query_validate_operators(query_dict, attribute)
+        return query_dict
 
     def _query_validate_length_of_query(self, query_dict):
         '''Test the maximal number of attributes in the query parameter
@@ -240,7 +275,7 @@ class ValidateSearchRequest:
             if message != '':
                 self.errors[f"query-attributes-{attribute}"] = _(message)
 
-    def validate_date_time(self, date_time):
+    def validate_date_time(self, date_time, key='datetime'):
         '''
         Validate the datetime query as specified in the api-spec.md.
         If there is an error, a corresponding entry will be added to the self.errors dict
@@ -248,29 +283,17 @@ class ValidateSearchRequest:
         Args:
             date_time: string
                 The datetime to get validated
+            key: string
+                The key that has to be added to the error dict.
+
+        Returns: tuple
+            The parsed (start, end), see stac_api.managers.parse_datetime_query
         '''
-        start, sep, end = date_time.partition('/')
-        if start == '':
-            start = '..'
-        message = None
         try:
-            if start != '..':
-                start = fromisoformat(start)
-            if end and end != '..':
-                end = fromisoformat(end)
-        except ValueError as error:
-            message = "Invalid datetime query parameter, must be isoformat. "
-            self.errors['datetime'] = _(message)
-
-        if end == '':
-            end = None
-
-        if start == '..' and (end is None or end == '..'):
-            message = f"{message} Invalid datetime query parameter, " \
-                f"cannot start with open range when no end range is defined"
-
-        if message:
-            self.errors['datetime'] = _(message)
+            return parse_datetime_query(date_time)
+        except serializers.ValidationError as error:
+            self.errors[key] = error.detail
+        return None
 
     def validate_array_of_strings(self, array_of_strings, key):
         '''
@@ -321,32 +344,78 @@ class ValidateSearchRequest:
             bbox: string
                 The bbox is a string that has to be composed of 4 comma-seperated
                 float values. F. ex.: 5.96,45.82,10.49,47.81
+
+        Returns: Geometry
+            The bbox geometry
         '''
         try:
-            validate_geometry(geometry_from_bbox(bbox))
-
+            bbox_geometry = geometry_from_bbox(bbox)
+            validate_geometry(bbox_geometry)
         except (ValueError, serializers.ValidationError, IndexError, GDALException) as error:
             message = f"Invalid bbox query parameter: " \
                       f"f.ex. bbox=5.96,45.82,10.49,47.81, {bbox} ({error})"
             self.errors['bbox'] = _(message)
+            return None
+        return bbox_geometry
 
-    def validate_intersects(self, geojson):
+    def validate_intersects(self, intersects):
         '''Validates the geojson in the intersects parameter.
 
         To test, if the string is valid, a geometry is being build out of it. If it is not
         possible, the dict self.errors is being widened with the corresponding information.
 
         Args:
-            geojson: string
-                The geojson string to be validated
+            intersects: string | dict
+                The geojson to be validated, as string (GET) or parsed (POST)
+
+        Returns: Geometry
+            The intersects geometry
         '''
+        geojson = intersects if isinstance(intersects, str) else json.dumps(intersects)
         try:
+            # GEOSGeometry would also accept WKT or WKB strings
+            if not geojson.lstrip().startswith('{'):
+                raise ValueError('The intersects geometry must be a GeoJSON object')
             intersects_geometry = GEOSGeometry(geojson)
             validate_geometry(intersects_geometry)
         except (ValueError, serializers.ValidationError, GDALException) as error:
             message = f"Invalid query: " \
                 f"Could not transform {geojson} to a geometry; {error}"
             self.errors['intersects'] = _(message)
+            return None
+        return intersects_geometry
+
+    def validate_sortby(self, sortby):
+        '''Validates the sortby parameter, see parse_sortby()
+
+        Args:
+            sortby: string | list
+                The sortby parameter to be validated
+
+        Returns: Sortby
+            The parsed sortby
+        '''
+        try:
+            return parse_sortby(sortby)
+        except serializers.ValidationError as error:
+            self.errors['sortby'] = error.detail
+        return None
+
+    def validate_filter(self, query_param):
+        '''Validates the filter parameter, see stac_api.cql2.parse_filter_parameters()
+
+        Args:
+            query_param: dict
+                Copy of the harmonized QueryDict
+
+        Returns: Cql2Filter
+            The parsed filter
+        '''
+        try:
+            return parse_filter_parameters(query_param)
+        except serializers.ValidationError as error:
+            self.errors['filter'] = error.detail
+        return None
 
     def validate_query_parameters_post_search(self, query_param):
         '''Validates the query parameters for POST requests on the search endpoint.
@@ -366,11 +435,16 @@ class ValidateSearchRequest:
             "limit",
             "cursor",
             "query",
+            "sortby",
+            "filter",
+            "filter-lang",
+            "filter-crs",
             "forecast:reference_datetime",
             "forecast:horizon",
             "forecast:duration",
             "forecast:variable",
-            "forecast:perturbed"
+            "forecast:perturbed",
+            *self.extra_parameters,
         ]
         wrong_query_parameters = set(query_param.keys()).difference(set(accepted_query_parameters))
         if wrong_query_parameters:
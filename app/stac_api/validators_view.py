@@ -5,10 +5,11 @@ from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 
-from stac_api.models.collection import Collection
+from stac_api.collection_registry import get_collection
 from stac_api.models.collection import CollectionAsset
 from stac_api.models.item import Asset
 from stac_api.models.item import Item
+from stac_api.tiles import is_valid_tile
 from stac_api.views.filters import create_is_active_filter
 
 logger = logging.getLogger(__name__)
@@ -24,11 +25,26 @@ def validate_collection(kwargs):
     Raises:
         Http404: when the collection doesn't exists
     '''
-    if not Collection.objects.filter(name=kwargs['collection_name']).exists():
+    if get_collection(kwargs['collection_name']) is None:
         logger.error("The collection %s does not exist", kwargs['collection_name'])
         raise Http404(f"The collection {kwargs['collection_name']} does not exist")
 
 
+def validate_tile(kwargs):
+    '''Validate that the tile given in request kwargs exists in the Web Mercator tile matrix set
+
+    Args:
+        kwargs: dict
+            request kwargs dictionary
+
+    Raises:
+        Http404: when the tile doesn't exists
+    '''
+    if not is_valid_tile(kwargs['z'], kwargs['x'], kwargs['y']):
+        logger.error("The tile %s/%s/%s does not exist", kwargs['z'], kwargs['x'], kwargs['y'])
+        raise Http404(f"The tile {kwargs['z']}/{kwargs['x']}/{kwargs['y']} does not exist")
+
+
 def validate_item(kwargs):
     '''Validate that the item given in request kwargs exists and is not expired
 
@@ -1,12 +1,14 @@
 import logging
 
 from django.conf import settings
+from django.http import Http404
 
 from rest_framework import generics
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
 from rest_framework_condition import etag
 
+from stac_api.collection_registry import get_collection
 from stac_api.models.collection import Collection
 from stac_api.models.collection import CollectionAsset
 from stac_api.serializers.collection import CollectionAssetSerializer
@@ -17,6 +19,7 @@ from stac_api.validators_view import validate_collection
 from stac_api.validators_view import validate_renaming
 from stac_api.views.general import get_etag
 from stac_api.views.mixins import DestroyModelMixin
+from stac_api.views.mixins import ResponseCacheMixin
 from stac_api.views.mixins import RetrieveModelWithCacheMixin
 from stac_api.views.mixins import UpdateInsertModelMixin
 from stac_api.views.mixins import patch_collection_cache_control_header
@@ -104,7 +107,11 @@ class CollectionList(generics.GenericAPIView):
 
 
 class CollectionDetail(
-    generics.GenericAPIView, RetrieveModelWithCacheMixin, UpdateInsertModelMixin, DestroyModelMixin
+    ResponseCacheMixin,
+    generics.GenericAPIView,
+    RetrieveModelWithCacheMixin,
+    UpdateInsertModelMixin,
+    DestroyModelMixin
 ):
     # this name must match the name in urls.py and is used by the DestroyModelMixin
     name = 'collection-detail'
@@ -112,8 +119,9 @@ class CollectionDetail(
     lookup_url_kwarg = "collection_name"
     lookup_field = "name"
     queryset = Collection.objects.all().prefetch_related('providers', 'links')
+    collection_lookup = None
+    retrieve_prefetches = ('providers', 'links', 'assets')
 
-    @etag(get_collection_etag)
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
@@ -198,14 +206,18 @@ class CollectionAssetDetail(
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
         kwargs.setdefault('context', self.get_serializer_context())
-        collection = get_object_or_404(Collection, name=self.kwargs['collection_name'])
         serializer = serializer_class(*args, **kwargs)
 
         # for the validation the serializer needs to know the collection of the
         # asset. In case of inserting, the asset doesn't exist and thus the collection
         # can't be read from the instance, which is why we pass the collection manually
         # here.
-        serializer.collection = collection
+        if serializer.instance is not None:
+            serializer.collection = serializer.instance.collection
+        else:
+            serializer.collection = get_collection(self.kwargs['collection_name'])
+            if serializer.collection is None:
+                raise Http404(f"The collection {self.kwargs['collection_name']} does not exist")
         return serializer
 
     def _get_file_path(self, serializer, collection, asset_name):
@@ -251,7 +263,6 @@ class CollectionAssetDetail(
         file, is_external = self._get_file_path(serializer, collection, self.kwargs['asset_name'])
         return serializer.upsert(lookup, collection=collection, file=file, is_external=is_external)
 
-    @etag(get_collection_asset_etag)
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
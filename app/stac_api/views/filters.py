@@ -1,9 +1,35 @@
+from datetime import UTC
+from datetime import datetime
+
+from django.conf import settings
 from django.db.models import Q
 from django.utils import timezone
 
 
+def get_expiry_cutoff():
+    """
+    Returns the current time rounded down to ITEMS_EXPIRY_GRANULARITY seconds.
+
+    The cut-off is therefore identical for all the requests within the granularity, the expired
+    items remain visible at most ITEMS_EXPIRY_GRANULARITY seconds.
+    """
+    now = timezone.now()
+    granularity = settings.ITEMS_EXPIRY_GRANULARITY
+    if granularity <= 1:
+        return now
+    return datetime.fromtimestamp(now.timestamp() // granularity * granularity, UTC)
+
+
 def create_is_active_filter():
     """
     Create a filter to check if the item is not expired.
     """
-    return Q(properties_expires__gte=timezone.now()) | Q(properties_expires=None)
+    return Q(properties_expires__gte=get_expiry_cutoff()) | Q(properties_expires=None)
+
+
+def create_is_searchable_filter():
+    """
+    Create a filter to check if the item is listed by the search endpoint: not expired and part
+    of a published collection.
+    """
+    return Q(is_searchable=True) & create_is_active_filter()
@@ -1,10 +1,13 @@
-import json
 import logging
+from collections import OrderedDict
 from datetime import UTC
 from datetime import datetime
+from functools import cached_property
+
+from helpers.renderers import MVTRenderer
 
 from django.conf import settings
-from django.db.models import Q
+from django.http import HttpResponse
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import generics
@@ -15,27 +18,46 @@ from rest_framework.decorators import permission_classes
 from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 
+from stac_api.aggregation import AGGREGATION_PARAMETERS
+from stac_api.aggregation import aggregate
+from stac_api.aggregation import parse_aggregation_parameters
+from stac_api.cql2 import get_queryables_schema
 from stac_api.models.general import LandingPage
 from stac_api.models.item import Item
+from stac_api.number_matched import add_number_matched
 from stac_api.pagination import GetPostCursorPagination
+from stac_api.search_request import SearchRequest
 from stac_api.serializers.general import ConformancePageSerializer
 from stac_api.serializers.general import LandingPageSerializer
 from stac_api.serializers.item import ItemSerializer
+from stac_api.serializers.item_db import serialize_items
 from stac_api.serializers.utils import get_relation_links
+from stac_api.tiles import get_tile
 from stac_api.utils import call_calculate_extent
-from stac_api.utils import harmonize_post_get_for_search
+from stac_api.utils import get_url
 from stac_api.utils import is_api_version_1
-from stac_api.validators_serializer import ValidateSearchRequest
-from stac_api.views.filters import create_is_active_filter
+from stac_api.validators_view import validate_collection
+from stac_api.validators_view import validate_tile
+from stac_api.views.filters import create_is_searchable_filter
+from stac_api.views.mixins import JSONErrorResponseMixin
 from stac_api.views.mixins import patch_collections_aggregate_cache_control_header
 
 logger = logging.getLogger(__name__)
 
 
 def get_etag(queryset):
-    if queryset.exists():
-        return list(queryset.only('etag').values('etag').first().values())[0]
-    return None
+    return queryset.values_list('etag', flat=True).first()
+
+
+def get_searchable_items(search_request):
+    '''Returns the searchable items filtered by the parameters of a search request
+
+    Args:
+        search_request: SearchRequest
+
+    Returns: ItemQuerySet
+    '''
+    return search_request.filter_queryset(Item.objects.filter(create_is_searchable_filter()))
 
 
 class LandingPageDetail(generics.RetrieveAPIView):
@@ -70,43 +92,15 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
     # we must use the pk as ordering attribute, otherwise the cursor pagination will not work
     ordering = ['pk']
 
-    # pylint: disable=too-many-branches
-    def get_queryset(self):
-        queryset = Item.objects.filter(Q(collection__published=True) & create_is_active_filter()
-                                      ).prefetch_related('assets', 'links')
-
-        # harmonize GET and POST query
-        query_param = harmonize_post_get_for_search(self.request)
+    @cached_property
+    def search_request(self):
+        return SearchRequest.from_request(self.request)
 
-        # build queryset
+    def get_sortby(self):
+        return self.search_request.sortby
 
-        # if ids, then the other params will be ignored
-        if 'ids' in query_param:
-            queryset = queryset.filter_by_item_name(query_param['ids'])
-        else:
-            if 'bbox' in query_param:
-                queryset = queryset.filter_by_bbox(query_param['bbox'])
-            if 'datetime' in query_param:
-                queryset = queryset.filter_by_datetime(query_param['datetime'])
-            if 'collections' in query_param:
-                queryset = queryset.filter_by_collections(query_param['collections'])
-            if 'query' in query_param:
-                dict_query = json.loads(query_param['query'])
-                queryset = queryset.filter_by_query(dict_query)
-            if 'intersects' in query_param:
-                queryset = queryset.filter_by_intersects(json.dumps(query_param['intersects']))
-            if 'forecast:reference_datetime' in query_param:
-                queryset = queryset.filter_by_forecast_reference_datetime(
-                    query_param['forecast:reference_datetime']
-                )
-            if 'forecast:horizon' in query_param:
-                queryset = queryset.filter_by_forecast_horizon(query_param['forecast:horizon'])
-            if 'forecast:duration' in query_param:
-                queryset = queryset.filter_by_forecast_duration(query_param['forecast:duration'])
-            if 'forecast:variable' in query_param:
-                queryset = queryset.filter_by_forecast_variable(query_param['forecast:variable'])
-            if 'forecast:perturbed' in query_param:
-                queryset = queryset.filter_by_forecast_perturbed(query_param['forecast:perturbed'])
+    def get_queryset(self):
+        queryset = get_searchable_items(self.search_request).prefetch_related('assets', 'links')
 
         if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
             logger.debug(
@@ -118,24 +112,26 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
         return queryset
 
     def list(self, request, *args, **kwargs):
-
-        validate_search_request = ValidateSearchRequest()
-        validate_search_request.validate(request)  # validate the search request
         queryset = self.filter_queryset(self.get_queryset())
+        if settings.ITEMS_DB_RENDERING:
+            # The features are rendered in DB, the pagination only needs the ordering fields
+            queryset = queryset.select_related(None).prefetch_related(None).only('pk')
 
         page = self.paginate_queryset(queryset)
 
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
+        items = page if page is not None else queryset
+        if settings.ITEMS_DB_RENDERING:
+            features = serialize_items(request, [item.pk for item in items], asset_ordering='id')
         else:
-            serializer = self.get_serializer(queryset, many=True)
+            features = self.get_serializer(items, many=True).data
 
         data = {
             'type': 'FeatureCollection',
             'timeStamp': datetime.now(UTC),
-            'features': serializer.data,
+            'features': features,
             'links': get_relation_links(request, self.name)
         }
+        add_number_matched(data, queryset, self.paginator.page_size)
 
         if page is not None:
             response = self.paginator.get_paginated_response(data, request)
@@ -153,6 +149,83 @@ class SearchList(generics.GenericAPIView, mixins.ListModelMixin):
         return response
 
 
+class AggregateList(generics.GenericAPIView):
+    '''Aggregations of the items matching a search (aggregation extension)
+
+    The search parameters filter the items like the search endpoint, the aggregations,
+    datetime_frequency_interval and centroid_geohash_grid_frequency_precision parameters select the
+    aggregations, see stac_api.aggregation.
+    '''
+    name = 'aggregate'  # this name must match the name in urls.py
+    permission_classes = [AllowAny]
+
+    def aggregate(self, request):
+        if request.method == 'POST':
+            params = request.data
+        else:
+            params = request.query_params
+        aggregation_request = parse_aggregation_parameters(params)
+        queryset = get_searchable_items(
+            SearchRequest.from_request(request, extra_parameters=AGGREGATION_PARAMETERS)
+        )
+        return Response({
+            'type': 'AggregationCollection',
+            'aggregations': aggregate(queryset, aggregation_request),
+            'links': [
+                OrderedDict([
+                    ('rel', 'self'),
+                    ('href', request.build_absolute_uri()),
+                ]),
+                OrderedDict([
+                    ('rel', 'root'),
+                    ('href', get_url(request, 'landing-page')),
+                ]),
+            ]
+        })
+
+    def get(self, request, *args, **kwargs):
+        response = self.aggregate(request)
+        patch_collections_aggregate_cache_control_header(response)
+        return response
+
+    def post(self, request, *args, **kwargs):
+        return self.aggregate(request)
+
+
+class TilesDetail(JSONErrorResponseMixin, generics.GenericAPIView):
+    '''Vector tile (MVT) of the footprints of the items matching a search
+
+    The search parameters (e.g. collections and datetime) filter the items like the search
+    endpoint, see stac_api.tiles.
+    '''
+    name = 'tiles'  # this name must match the name in urls.py
+    permission_classes = [AllowAny]
+    renderer_classes = [MVTRenderer]
+
+    def get(self, request, *args, **kwargs):
+        validate_tile(kwargs)
+        queryset = get_searchable_items(SearchRequest.from_request(request))
+        tile = get_tile(queryset, kwargs['z'], kwargs['x'], kwargs['y'])
+        response = HttpResponse(tile, content_type=MVTRenderer.media_type)
+        patch_collections_aggregate_cache_control_header(response)
+        return response
+
+
+class QueryablesDetail(generics.GenericAPIView):
+    '''JSON schema of the properties usable in the filter parameter (CQL2 filter extension)
+
+    The queryables are the same for all collections, the collection queryables endpoint only
+    validates that the collection exists.
+    '''
+    name = 'queryables'  # this name must match the name in urls.py
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        if 'collection_name' in kwargs:
+            validate_collection(kwargs)
+        return Response(get_queryables_schema(request.build_absolute_uri()))
+
+
 @api_view(['POST'])
 @permission_classes((permissions.AllowAny,))
 def recalculate_extent(request):
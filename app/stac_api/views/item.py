@@ -1,33 +1,65 @@
 import logging
+from collections import OrderedDict
 from datetime import UTC
 from datetime import datetime
+from io import BytesIO
+
+from helpers.renderers import GeoJSONSeqRenderer
+from helpers.renderers import MVTRenderer
+from helpers.renderers import NDJSONRenderer
 
 from django.conf import settings
 from django.db import IntegrityError
 from django.db.models import Prefetch
 from django.db.models import Q
-from django.db.models import Subquery
+from django.http import Http404
+from django.http import HttpResponse
+from django.http import StreamingHttpResponse
 from django.utils import timezone
+from django.utils.cache import get_conditional_response
+from django.utils.http import quote_etag
 
 from rest_framework import generics
 from rest_framework import status
 from rest_framework.generics import get_object_or_404
+from rest_framework.permissions import AllowAny
 from rest_framework.response import Response
 from rest_framework_condition import etag
 
+from stac_api.aggregation import COLLECTION_AGGREGATIONS
+from stac_api.aggregation import aggregate
+from stac_api.aggregation import parse_aggregation_parameters
+from stac_api.bulk_ingestion import ingest_items
+from stac_api.bulk_ingestion import iter_feature_collection_features
+from stac_api.bulk_ingestion import iter_ndjson_features
+from stac_api.collection_registry import get_collection
+from stac_api.collection_registry import get_collection_id
+from stac_api.cql2 import parse_filter_parameters
+from stac_api.export import get_collection_items
+from stac_api.export import iter_features
+from stac_api.forecast_runs import get_latest_forecast_runs
 from stac_api.models.collection import Collection
 from stac_api.models.item import Asset
 from stac_api.models.item import Item
+from stac_api.number_matched import add_number_matched
+from stac_api.pagination import parse_sortby
+from stac_api.pagination import validate_page_size
 from stac_api.serializers.item import AssetSerializer
 from stac_api.serializers.item import ItemListSerializer
 from stac_api.serializers.item import ItemSerializer
+from stac_api.serializers.item_db import serialize_items
 from stac_api.serializers.utils import get_relation_links
+from stac_api.tiles import get_tile
 from stac_api.utils import get_asset_path
+from stac_api.utils import get_url
+from stac_api.utils import isoformat
 from stac_api.validators_view import validate_collection
 from stac_api.validators_view import validate_item
 from stac_api.validators_view import validate_renaming
+from stac_api.validators_view import validate_tile
 from stac_api.views import mixins
 from stac_api.views.filters import create_is_active_filter
+from stac_api.views.filters import get_expiry_cutoff
 from stac_api.views.general import get_etag
 
 logger = logging.getLogger(__name__)
@@ -86,29 +118,23 @@ def get_asset_etag(request, *args, **kwargs):
     return tag
 
 
-class ItemsList(generics.GenericAPIView):
+class ItemsList(mixins.ResponseCacheMixin, generics.GenericAPIView):
     serializer_class = ItemSerializer
     ordering = ['name']
     name = 'items-list'  # this name must match the name in urls.py
 
+    def get_sortby(self):
+        sortby = self.request.query_params.get('sortby', None)
+        return parse_sortby(sortby) if sortby else None
+
     def get_queryset(self):
         # filter based on the url
-        queryset = Item.objects.filter(
-            create_is_active_filter(),
-            # Using a subquery to get the collection id and then filter on the id greatly improves
-            # the performance over filtering by 'collection__name'.
-            collection__id=Subquery(
-                Collection.objects.filter(name=self.kwargs['collection_name']).values('id')
-            )
+        queryset = get_collection_items(
+            self.kwargs['collection_name'],
+            bbox=self.request.query_params.get('bbox', None),
+            date_time=self.request.query_params.get('datetime', None),
+            cql2_filter=parse_filter_parameters(self.request.query_params)
         ).prefetch_related(Prefetch('assets', queryset=Asset.objects.order_by('name')), 'links')
-        bbox = self.request.query_params.get('bbox', None)
-        date_time = self.request.query_params.get('datetime', None)
-
-        if bbox:
-            queryset = queryset.filter_by_bbox(bbox)
-
-        if date_time:
-            queryset = queryset.filter_by_datetime(date_time)
 
         if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
             logger.debug(
@@ -122,18 +148,32 @@ class ItemsList(generics.GenericAPIView):
     def list(self, request, *args, **kwargs):
         validate_collection(self.kwargs)
         queryset = self.filter_queryset(self.get_queryset())
+        if settings.ITEMS_DB_RENDERING:
+            # The features are rendered in DB, the pagination only needs the ordering fields
+            queryset = queryset.select_related(None).prefetch_related(None).only('pk', 'name')
         page = self.paginate_queryset(queryset)
-        if page is not None:
-            serializer = self.get_serializer(page, many=True)
+        items = page if page is not None else queryset
+        if settings.ITEMS_DB_RENDERING:
+            features = serialize_items(request, [item.pk for item in items], asset_ordering='name')
         else:
-            serializer = self.get_serializer(queryset, many=True)
+            features = self.get_serializer(items, many=True).data
 
         data = {
             'type': 'FeatureCollection',
             'timeStamp': datetime.now(UTC),
-            'features': serializer.data,
+            'features': features,
             'links': get_relation_links(request, self.name, [self.kwargs['collection_name']])
         }
+        # the unfiltered listings are counted from the cached collection items count
+        is_filtered = any(
+            request.query_params.get(param) for param in ['bbox', 'datetime', 'filter']
+        )
+        add_number_matched(
+            data,
+            queryset,
+            self.paginator.page_size,
+            collection_name=None if is_filtered else self.kwargs['collection_name']
+        )
 
         if page is not None:
             response = self.get_paginated_response(data)
@@ -187,7 +227,189 @@ class ItemsList(generics.GenericAPIView):
             return Response(data=message, exception=True, status=code)
 
 
+class ItemsBulk(generics.GenericAPIView):
+    '''Bulk ingestion of the items of a collection
+
+    The body is a newline delimited json (Content-Type application/x-ndjson or
+    application/geo+json-seq) of any size, or a FeatureCollection. The features are validated like
+    the items list POST endpoint and created all at once, see stac_api.bulk_ingestion.
+
+    A PUT creates or updates the items (upsert), their links and assets are replaced by the ones of
+    the features. A feature can have the etag of its item as if_match member. The items created by
+    a PUT require the add permission in addition to the change permission.
+    '''
+    name = 'items-bulk'  # this name must match the name in urls.py
+    queryset = Item.objects.all()  # for the model permissions of the writes
+    stream_media_types = ['application/x-ndjson', 'application/geo+json-seq']
+
+    def get_features(self, request):
+        stream = request.stream or BytesIO()
+        if request.content_type.split(';')[0].strip() in self.stream_media_types:
+            return iter_ndjson_features(stream)
+        return iter_feature_collection_features(stream)
+
+    def get_error_response(self, result):
+        code = status.HTTP_400_BAD_REQUEST
+        message = {
+            "code": code,
+            "description": f"{result.errors_count} invalid features, no item written",
+            "errors": result.errors,
+        }
+        return Response(data=message, status=code)
+
+    def post(self, request, *args, **kwargs):
+        validate_collection(kwargs)
+        collection = Collection.objects.get(name=kwargs['collection_name'])
+        result = ingest_items(request, collection, self.get_features(request))
+        if result.errors_count:
+            return self.get_error_response(result)
+        return Response({"created": result.created}, status=status.HTTP_201_CREATED)
+
+    def put(self, request, *args, **kwargs):
+        validate_collection(kwargs)
+        collection = Collection.objects.get(name=kwargs['collection_name'])
+        result = ingest_items(request, collection, self.get_features(request), upsert=True)
+        if result.errors_count:
+            return self.get_error_response(result)
+        return Response({
+            "created": result.created,
+            "updated": result.updated,
+            "unchanged": result.unchanged,
+            "items": result.items,
+        })
+
+
+class ForecastRunsList(generics.GenericAPIView):
+    '''Latest forecast runs of a collection
+
+    Returns the distinct forecast:reference_datetime of the active items of the collection, the
+    latest first. The limit query parameter gives the number of runs (1 per default), see
+    stac_api.forecast_runs.
+    '''
+    name = 'forecast-runs-list'  # this name must match the name in urls.py
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        validate_collection(kwargs)
+        limit = validate_page_size(
+            request.query_params.get('limit', '1'), settings.REST_FRAMEWORK['PAGE_SIZE_LIMIT']
+        )
+        runs = get_latest_forecast_runs(get_collection_id(kwargs['collection_name']), limit)
+        response = Response({
+            'forecast:reference_datetime': [isoformat(run) for run in runs],
+            'links': [
+                OrderedDict([
+                    ('rel', 'self'),
+                    ('href', request.build_absolute_uri()),
+                ]),
+                OrderedDict([
+                    ('rel', 'collection'),
+                    ('href', get_url(request, 'collection-detail', [kwargs['collection_name']])),
+                ]),
+            ]
+        })
+        mixins.patch_collection_cache_control_header(response, kwargs['collection_name'])
+        return response
+
+
+class CollectionAggregate(generics.GenericAPIView):
+    '''Aggregations of the items of a collection (aggregation extension)
+
+    The bbox, datetime and filter query parameters filter the items like the items list endpoint,
+    see stac_api.aggregation for the aggregation parameters.
+    '''
+    name = 'collection-aggregate'  # this name must match the name in urls.py
+    permission_classes = [AllowAny]
+
+    def get(self, request, *args, **kwargs):
+        validate_collection(kwargs)
+        aggregation_request = parse_aggregation_parameters(
+            request.query_params, available=COLLECTION_AGGREGATIONS
+        )
+        queryset = get_collection_items(
+            kwargs['collection_name'],
+            bbox=request.query_params.get('bbox', None),
+            date_time=request.query_params.get('datetime', None),
+            cql2_filter=parse_filter_parameters(request.query_params)
+        )
+        response = Response({
+            'type': 'AggregationCollection',
+            'aggregations': aggregate(queryset, aggregation_request),
+            'links': [
+                OrderedDict([
+                    ('rel', 'self'),
+                    ('href', request.build_absolute_uri()),
+                ]),
+                OrderedDict([
+                    ('rel', 'collection'),
+                    ('href', get_url(request, 'collection-detail', [kwargs['collection_name']])),
+                ]),
+            ]
+        })
+        mixins.patch_collection_cache_control_header(response, kwargs['collection_name'])
+        return response
+
+
+class ItemsTile(mixins.JSONErrorResponseMixin, generics.GenericAPIView):
+    '''Vector tile (MVT) of the footprints of the items of a collection
+
+    The datetime query parameter filters the items like the items list endpoint, see
+    stac_api.tiles. The ETag of the tiles is the collection ETag, which changes with its items,
+    combined with the expiry cut-off, which changes when the expired items are hidden.
+    '''
+    name = 'items-tile'  # this name must match the name in urls.py
+    permission_classes = [AllowAny]
+    renderer_classes = [MVTRenderer]
+
+    def get(self, request, *args, **kwargs):
+        validate_collection(kwargs)
+        validate_tile(kwargs)
+        collection_tag = get_etag(Collection.objects.filter(name=kwargs['collection_name']))
+        tag = quote_etag(f'{collection_tag}-{int(get_expiry_cutoff().timestamp())}')
+        # pylint: disable=protected-access
+        response = get_conditional_response(request._request, etag=tag)
+        if response is None:
+            queryset = get_collection_items(
+                kwargs['collection_name'], date_time=request.query_params.get('datetime', None)
+            )
+            tile = get_tile(queryset, kwargs['z'], kwargs['x'], kwargs['y'])
+            response = HttpResponse(tile, content_type=MVTRenderer.media_type)
+        response.headers.setdefault('ETag', tag)
+        mixins.patch_collection_cache_control_header(response, kwargs['collection_name'])
+        return response
+
+
+class ItemsExport(mixins.JSONErrorResponseMixin, generics.GenericAPIView):
+    '''Streaming export of all the items of a collection
+
+    The items are streamed as newline delimited json (or as GeoJSON text sequence with
+    format=geojson-seq), one feature per line, in constant memory. The bbox, datetime and filter
+    query parameters filter the items like the items list endpoint.
+    '''
+    name = 'items-export'  # this name must match the name in urls.py
+    renderer_classes = [NDJSONRenderer, GeoJSONSeqRenderer]
+
+    def get_queryset(self):
+        return get_collection_items(
+            self.kwargs['collection_name'],
+            bbox=self.request.query_params.get('bbox', None),
+            date_time=self.request.query_params.get('datetime', None),
+            cql2_filter=parse_filter_parameters(self.request.query_params)
+        )
+
+    def get(self, request, *args, **kwargs):
+        validate_collection(self.kwargs)
+        features = iter_features(request, self.get_queryset())
+        response = StreamingHttpResponse(
+            request.accepted_renderer.render_lines(features),
+            content_type=request.accepted_renderer.media_type
+        )
+        mixins.patch_collection_cache_control_header(response, self.kwargs['collection_name'])
+        return response
+
+
 class ItemDetail(
+    mixins.ResponseCacheMixin,
     generics.GenericAPIView,
     mixins.RetrieveModelWithCacheMixin,
     mixins.UpdateInsertModelMixin,
@@ -198,17 +420,16 @@ class ItemDetail(
     serializer_class = ItemSerializer
     lookup_url_kwarg = "item_name"
     lookup_field = "name"
+    retrieve_prefetches = (Prefetch('assets', queryset=Asset.objects.order_by('name')), 'links')
 
     def get_queryset(self):
         # filter based on the url
         queryset = Item.objects.filter(
             create_is_active_filter(),
-            # Using a subquery to get the collection id and then filter on the id greatly improves
-            # the performance over filtering by 'collection__name'.
-            collection__id=Subquery(
-                Collection.objects.filter(name=self.kwargs['collection_name']).values('id')
-            )
-        ).prefetch_related(Prefetch('assets', queryset=Asset.objects.order_by('name')), 'links')
+            # Using the collection id greatly improves the performance over filtering by
+            # 'collection__name', an unknown collection has no id and therefore no items.
+            collection__id=get_collection_id(self.kwargs['collection_name'])
+        ).prefetch_related(*self.retrieve_prefetches)
 
         if settings.DEBUG_ENABLE_DB_EXPLAIN_ANALYZE:
             logger.debug(
@@ -246,7 +467,6 @@ class ItemDetail(
         lookup['collection__name'] = collection.name
         return serializer.upsert(lookup, collection=collection)
 
-    @etag(get_item_etag)
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
@@ -266,7 +486,7 @@ class ItemDetail(
         return self.destroy(request, *args, **kwargs)
 
 
-class AssetsList(generics.GenericAPIView):
+class AssetsList(mixins.ResponseCacheMixin, generics.GenericAPIView):
     name = 'assets-list'  # this name must match the name in urls.py
     serializer_class = AssetSerializer
     pagination_class = None
@@ -299,6 +519,7 @@ class AssetsList(generics.GenericAPIView):
 
 
 class AssetDetail(
+    mixins.ResponseCacheMixin,
     generics.GenericAPIView,
     mixins.RetrieveModelWithCacheMixin,
     mixins.UpdateInsertModelMixin,
@@ -309,6 +530,7 @@ class AssetDetail(
     serializer_class = AssetSerializer
     lookup_url_kwarg = "asset_name"
     lookup_field = "name"
+    collection_lookup = 'item__collection'
 
     def get_queryset(self):
         # filter based on the url
@@ -321,16 +543,24 @@ class AssetDetail(
     def get_serializer(self, *args, **kwargs):
         serializer_class = self.get_serializer_class()
         kwargs.setdefault('context', self.get_serializer_context())
-        item = get_object_or_404(
-            Item, collection__name=self.kwargs['collection_name'], name=self.kwargs['item_name']
-        )
         serializer = serializer_class(*args, **kwargs)
 
         # for the validation the serializer needs to know the collection of the
         # item. In case of upserting, the asset doesn't exist and thus the collection
         # can't be read from the instance, which is why we pass the collection manually
         # here.
-        serializer.collection = item.collection
+        if serializer.instance is not None:
+            serializer.collection = serializer.instance.item.collection
+        else:
+            serializer.collection = get_collection(self.kwargs['collection_name'])
+            if serializer.collection is None:
+                raise Http404(f"The collection {self.kwargs['collection_name']} does not exist")
+            # the asset can only be upserted in an existing item
+            get_object_or_404(
+                Item.objects.only('id'),
+                collection__id=serializer.collection.id,
+                name=self.kwargs['item_name']
+            )
         return serializer
 
     def _get_file_path(self, serializer, item, asset_name):
@@ -391,7 +621,6 @@ class AssetDetail(
         file, is_external = self._get_file_path(serializer, item, self.kwargs['asset_name'])
         return serializer.upsert(lookup, item=item, file=file, is_external=is_external)
 
-    @etag(get_asset_etag)
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
@@ -1,18 +1,26 @@
 import logging
+from operator import attrgetter
 
 from django.conf import settings
 from django.db import transaction
+from django.db.models import prefetch_related_objects
 from django.db.models.deletion import ProtectedError
 from django.http import Http404
 from django.utils.cache import add_never_cache_headers
+from django.utils.cache import get_conditional_response
 from django.utils.cache import patch_cache_control
 from django.utils.cache import patch_response_headers
+from django.utils.http import quote_etag
 from django.utils.translation import gettext_lazy as _
 
 from rest_framework import serializers
 from rest_framework import status
+from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
+from rest_framework.settings import api_settings
 
+from stac_api import response_cache
+from stac_api.collection_registry import get_collection
 from stac_api.models.collection import Collection
 from stac_api.serializers.utils import get_parent_link
 from stac_api.utils import get_link
@@ -184,26 +192,110 @@ class DestroyModelMixin:
             ) from None
 
 
-class RetrieveModelWithCacheMixin:
-    '''Retrieve model instance and set cache settings based on collection cache_control_header field
+class ConditionalRetrieveModelMixin:
+    '''Retrieve model instance with conditional request support
+
+    The instance and its etag are fetched by a single query (see get_retrieve_queryset()) and the
+    conditional request (If-None-Match/If-Match) is decided from this row, before fetching the
+    relations of the instance (see retrieve_prefetches). This replaces the @etag decorator on the
+    GET method, which needs its own queries to get the etag.
     '''
+    # relations of the instance, only fetched when the instance is serialized
+    retrieve_prefetches = ()
+
+    def get_retrieve_queryset(self):
+        return self.get_queryset().prefetch_related(None)
 
     def retrieve(self, request, *args, **kwargs):
-        instance = self.get_object()
-        serializer = self.get_serializer(instance)
-        response = Response(serializer.data)
+        # Same lookup as get_object() but on the retrieve queryset
+        queryset = self.filter_queryset(self.get_retrieve_queryset())
+        lookup_url_kwarg = self.lookup_url_kwarg or self.lookup_field
+        instance = get_object_or_404(queryset, **{self.lookup_field: self.kwargs[lookup_url_kwarg]})
+        self.check_object_permissions(request, instance)
+
+        etag = quote_etag(instance.etag)
+        # pylint: disable=protected-access
+        response = get_conditional_response(request._request, etag=etag)
+        if response is None:
+            prefetch_related_objects([instance], *self.retrieve_prefetches)
+            serializer = self.get_serializer(instance)
+            response = Response(serializer.data)
+        response.headers.setdefault('ETag', etag)
+        self.finalize_retrieve_response(response, instance)
+        return response
+
+    def finalize_retrieve_response(self, response, instance):
+        pass
+
+
+class RetrieveModelWithCacheMixin(ConditionalRetrieveModelMixin):
+    '''Retrieve model instance and set cache settings based on collection cache_control_header field
+
+    The collection is fetched together with the instance.
+    '''
+    # lookup of the instance collection, None when the instance is the collection
+    collection_lookup = 'collection'
+
+    def get_retrieve_queryset(self):
+        queryset = super().get_retrieve_queryset()
+        if self.collection_lookup:
+            queryset = queryset.select_related(self.collection_lookup)
+        return queryset
+
+    def finalize_retrieve_response(self, response, instance):
+        collection = instance
+        if self.collection_lookup:
+            collection = attrgetter(self.collection_lookup.replace('__', '.'))(instance)
+        patch_cache_control_header(response, collection.cache_control_header)
 
-        patch_collection_cache_control_header(response, self.kwargs['collection_name'])
+
+class ResponseCacheMixin:
+    '''Serve the GET requests from the response cache, see stac_api.response_cache
+
+    This mixin must be the first base class of the view, and the view must have a
+    `collection_name` url kwarg.
+    '''
+
+    def dispatch(self, request, *args, **kwargs):
+        if request.method != 'GET' or not response_cache.is_enabled():
+            return super().dispatch(request, *args, **kwargs)
+        key = response_cache.get_cache_key(request, kwargs['collection_name'])
+        response = response_cache.get_response(request, key, self.name)
+        if response is None:
+            response = super().dispatch(request, *args, **kwargs)
+            response_cache.store_response(key, response)
         return response
 
 
+class JSONErrorResponseMixin:
+    '''Render the error responses as json like the other endpoints
+
+    Used by the views with non json renderers (e.g. streaming export, vector tiles), which return
+    their successful responses already rendered.
+    '''
+
+    def finalize_response(self, request, response, *args, **kwargs):
+        if isinstance(response, Response):
+            renderer = api_settings.DEFAULT_RENDERER_CLASSES[0]()
+            request.accepted_renderer = renderer
+            request.accepted_media_type = renderer.media_type
+        return super().finalize_response(request, response, *args, **kwargs)
+
+
 def patch_collection_cache_control_header(response, collection_name):
     '''Patch the Cache-Control header of the response based on the related collection
     cache_control_header field.
     '''
-    cache_control_header = Collection.objects.values('cache_control_header').get(
-        name=collection_name
-    )['cache_control_header']
+    collection = get_collection(collection_name)
+    if collection is None:
+        raise Collection.DoesNotExist(f'The collection {collection_name} does not exist')
+    patch_cache_control_header(response, collection.cache_control_header)
+
+
+def patch_cache_control_header(response, cache_control_header):
+    '''Patch the Cache-Control header of the response with a collection cache_control_header
+    field value.
+    '''
     if cache_control_header:
         patch_cache_control(response, **parse_cache_control_header(cache_control_header))
     # Else do nothing, the default cache settings will be set later on
@@ -3,6 +3,7 @@ from datetime import UTC
 from datetime import datetime
 from operator import itemgetter
 
+from django.conf import settings
 from django.db import IntegrityError
 from django.db import transaction
 from django.utils.translation import gettext_lazy as _
@@ -13,7 +14,6 @@ from rest_framework import serializers
 from rest_framework.exceptions import APIException
 from rest_framework.generics import get_object_or_404
 from rest_framework.response import Response
-from rest_framework_condition import etag
 
 from stac_api.exceptions import UploadInProgressError
 from stac_api.exceptions import UploadNotInProgressError
@@ -32,7 +32,7 @@ from stac_api.utils import get_collection_asset_path
 from stac_api.utils import select_s3_bucket
 from stac_api.validators_view import validate_asset
 from stac_api.validators_view import validate_collection_asset
-from stac_api.views.general import get_etag
+from stac_api.views.mixins import ConditionalRetrieveModelMixin
 from stac_api.views.mixins import CreateModelMixin
 from stac_api.views.mixins import DestroyModelMixin
 from stac_api.views.mixins import UpdateInsertModelMixin
@@ -40,35 +40,6 @@ from stac_api.views.mixins import UpdateInsertModelMixin
 logger = logging.getLogger(__name__)
 
 
-def get_asset_upload_etag(request, *args, **kwargs):
-    '''Get the ETag for an asset upload object
-
-    The ETag is an UUID4 computed on each object changes
-    '''
-    return get_etag(
-        AssetUpload.objects.filter(
-            asset__item__collection__name=kwargs['collection_name'],
-            asset__item__name=kwargs['item_name'],
-            asset__name=kwargs['asset_name'],
-            upload_id=kwargs['upload_id']
-        )
-    )
-
-
-def get_collection_asset_upload_etag(request, *args, **kwargs):
-    '''Get the ETag for a collection asset upload object
-
-    The ETag is an UUID4 computed on each object changes
-    '''
-    return get_etag(
-        CollectionAssetUpload.objects.filter(
-            asset__collection__name=kwargs['collection_name'],
-            asset__name=kwargs['asset_name'],
-            upload_id=kwargs['upload_id']
-        )
-    )
-
-
 class SharedAssetUploadBase(generics.GenericAPIView):
     """SharedAssetUploadBase provides a base view for asset uploads and collection asset uploads.
     """
@@ -96,10 +67,10 @@ class SharedAssetUploadBase(generics.GenericAPIView):
             return get_collection_asset_path(asset.collection, asset.name)
         return get_asset_path(asset.item, asset.name)
 
-    def _save_asset_upload(self, executor, serializer, key, asset, upload_id, urls):
+    def _save_asset_upload(self, executor, serializer, key, asset, upload_id):
         try:
             with transaction.atomic():
-                serializer.save(asset=asset, upload_id=upload_id, urls=urls)
+                serializer.save(asset=asset, upload_id=upload_id)
         except IntegrityError as error:
             logger.error(
                 'Failed to create asset upload multipart: %s', error, extra=self.log_extra(asset)
@@ -119,22 +90,45 @@ class SharedAssetUploadBase(generics.GenericAPIView):
             asset.get_collection().cache_control_header,
             validated_data['content_encoding']
         )
-        urls = []
-        sorted_md5_parts = sorted(validated_data['md5_parts'], key=itemgetter('part_number'))
-
         try:
-            for part in sorted_md5_parts:
-                urls.append(
-                    executor.create_presigned_url(
-                        key, asset, part['part_number'], upload_id, part['md5']
-                    )
-                )
-
-            self._save_asset_upload(executor, serializer, key, asset, upload_id, urls)
+            urls = self.create_presigned_urls(
+                executor,
+                asset,
+                upload_id,
+                validated_data['md5_parts'],
+                0,
+                settings.UPLOAD_PRESIGNED_URLS_ON_CREATE
+            )
+            self._save_asset_upload(executor, serializer, key, asset, upload_id)
+            # The urls are only returned and not stored, the urls of the other parts and the
+            # refreshed urls are presigned on demand by the upload urls endpoint.
+            serializer.instance.urls = urls
         except APIException as err:
             executor.abort_multipart_upload(key, asset, upload_id)
             raise
 
+    def create_presigned_urls(self, executor, asset, upload_id, md5_parts, offset, limit):
+        """Presigns the upload urls of the parts offset + 1 to offset + limit"""
+        key = self.get_path(asset)
+        sorted_md5_parts = sorted(md5_parts, key=itemgetter('part_number'))
+        return [
+            executor.create_presigned_url(key, asset, part['part_number'], upload_id, part['md5'])
+            for part in sorted_md5_parts[offset:offset + limit]
+        ]
+
+    def list_presigned_urls(self, executor, asset_upload, asset, limit, offset):
+        """Presigns a page of the upload urls of the parts of an upload in progress
+
+        Returns: tuple
+            (urls, has_next)
+        """
+        if asset_upload.status != BaseAssetUpload.Status.IN_PROGRESS:
+            raise UploadNotInProgressError()
+        urls = self.create_presigned_urls(
+            executor, asset, asset_upload.upload_id, asset_upload.md5_parts, offset, limit
+        )
+        return urls, offset + limit < asset_upload.number_parts
+
     def complete_multipart_upload(self, executor, validated_data, asset_upload, asset):
         key = self.get_path(asset)
         parts = validated_data.get('parts', None)
@@ -170,6 +164,34 @@ class SharedAssetUploadBase(generics.GenericAPIView):
         return executor.list_upload_parts(key, asset, asset_upload.upload_id, limit, offset)
 
 
+class PresignedUrlsMixin:
+    """Presigns the urls of the uploads in progress returned by GET
+
+    The urls are not stored, the first UPLOAD_PRESIGNED_URLS_ON_CREATE urls are presigned on
+    demand like on the creation of the upload. The ended uploads have no urls.
+    """
+
+    def get_serializer(self, *args, **kwargs):
+        if args and 'data' not in kwargs:
+            self.presign_urls(args[0] if kwargs.get('many', False) else [args[0]])
+        return super().get_serializer(*args, **kwargs)
+
+    def presign_urls(self, asset_uploads):
+        for asset_upload in asset_uploads:
+            asset_upload.urls = []
+            if asset_upload.status == BaseAssetUpload.Status.IN_PROGRESS:
+                asset = asset_upload.asset
+                executor = MultipartUpload(select_s3_bucket(asset.get_collection().name))
+                asset_upload.urls = self.create_presigned_urls(
+                    executor,
+                    asset,
+                    asset_upload.upload_id,
+                    asset_upload.md5_parts,
+                    0,
+                    settings.UPLOAD_PRESIGNED_URLS_ON_CREATE
+                )
+
+
 class AssetUploadBase(SharedAssetUploadBase):
     """AssetUploadBase is the base for all asset (not collection asset) upload views.
     """
@@ -191,7 +213,9 @@ class AssetUploadBase(SharedAssetUploadBase):
         )
 
 
-class AssetUploadsList(AssetUploadBase, mixins.ListModelMixin, CreateModelMixin):
+class AssetUploadsList(
+    PresignedUrlsMixin, AssetUploadBase, mixins.ListModelMixin, CreateModelMixin
+):
 
     class ExternalDisallowedException(Exception):
         pass
@@ -236,9 +260,10 @@ class AssetUploadsList(AssetUploadBase, mixins.ListModelMixin, CreateModelMixin)
         return queryset
 
 
-class AssetUploadDetail(AssetUploadBase, mixins.RetrieveModelMixin, DestroyModelMixin):
+class AssetUploadDetail(
+    PresignedUrlsMixin, AssetUploadBase, ConditionalRetrieveModelMixin, DestroyModelMixin
+):
 
-    @etag(get_asset_upload_etag)
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
@@ -308,6 +333,29 @@ class AssetUploadPartsList(AssetUploadBase):
         return self.paginator.get_paginated_response(data, has_next)
 
 
+class AssetUploadUrlsList(AssetUploadBase):
+    """Presigned urls of the parts of an upload in progress
+
+    The urls are presigned on demand for a page of parts (limit and offset), to get the urls not
+    returned by the upload creation or to refresh the expired ones.
+    """
+    pagination_class = ExtApiPagination
+
+    def get(self, request, *args, **kwargs):
+        asset_upload = self.get_object()
+        limit, offset = self.paginator.get_pagination_config(request)
+
+        collection = asset_upload.asset.item.collection
+        s3_bucket = select_s3_bucket(collection.name)
+
+        executor = MultipartUpload(s3_bucket)
+
+        urls, has_next = self.list_presigned_urls(
+            executor, asset_upload, asset_upload.asset, limit, offset
+        )
+        return self.paginator.get_paginated_response({'urls': urls}, has_next)
+
+
 class CollectionAssetUploadBase(SharedAssetUploadBase):
     """CollectionAssetUploadBase is the base for all collection asset upload views.
     """
@@ -328,7 +376,7 @@ class CollectionAssetUploadBase(SharedAssetUploadBase):
 
 
 class CollectionAssetUploadsList(
-    CollectionAssetUploadBase, mixins.ListModelMixin, CreateModelMixin
+    PresignedUrlsMixin, CollectionAssetUploadBase, mixins.ListModelMixin, CreateModelMixin
 ):
 
     class ExternalDisallowedException(Exception):
@@ -375,10 +423,12 @@ class CollectionAssetUploadsList(
 
 
 class CollectionAssetUploadDetail(
-    CollectionAssetUploadBase, mixins.RetrieveModelMixin, DestroyModelMixin
+    PresignedUrlsMixin,
+    CollectionAssetUploadBase,
+    ConditionalRetrieveModelMixin,
+    DestroyModelMixin,
 ):
 
-    @etag(get_collection_asset_upload_etag)
     def get(self, request, *args, **kwargs):
         return self.retrieve(request, *args, **kwargs)
 
@@ -446,3 +496,26 @@ class CollectionAssetUploadPartsList(CollectionAssetUploadBase):
 
     def get_paginated_response(self, data, has_next):  # pylint: disable=arguments-differ
         return self.paginator.get_paginated_response(data, has_next)
+
+
+class CollectionAssetUploadUrlsList(CollectionAssetUploadBase):
+    """Presigned urls of the parts of an upload in progress
+
+    The urls are presigned on demand for a page of parts (limit and offset), to get the urls not
+    returned by the upload creation or to refresh the expired ones.
+    """
+    pagination_class = ExtApiPagination
+
+    def get(self, request, *args, **kwargs):
+        asset_upload = self.get_object()
+        limit, offset = self.paginator.get_pagination_config(request)
+
+        collection = asset_upload.asset.collection
+        s3_bucket = select_s3_bucket(collection.name)
+
+        executor = MultipartUpload(s3_bucket)
+
+        urls, has_next = self.list_presigned_urls(
+            executor, asset_upload, asset_upload.asset, limit, offset
+        )
+        return self.paginator.get_paginated_response({'urls': urls}, has_next)
@@ -233,6 +233,13 @@ class AssetUploadCreateEndpointTestCase(AssetUploadBaseTest):
 
         self.check_urls_response(json_data['urls'], number_parts)
 
+        # The urls of the upload in progress are also returned by GET
+        response = self.client.get(self.get_get_multipart_uploads_path())
+        self.assertStatusCode(200, response)
+        upload = response.json()['uploads'][0]
+        self.check_created_response(upload)
+        self.check_urls_response(upload['urls'], number_parts)
+
         response = self.client.post(
             self.get_abort_multipart_upload_path(json_data['upload_id']),
             data={},
@@ -0,0 +1,130 @@
+import logging
+
+from django.test import Client
+from django.test import override_settings
+
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.tests_10.utils import reverse_version
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+class AggregationEndpointTestCase(MockS3PerClassMixin, StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.factory.create_item_samples(
+            ['item-1', 'item-2', 'item-switzerland-west', 'item-switzerland-east'],
+            cls.collection,
+            db_create=True,
+        )
+        cls.forecast_collection = cls.factory.create_collection_sample().model
+        cls.factory.create_item_samples(
+            [f'item-forecast-{i}' for i in range(1, 6)],
+            cls.forecast_collection,
+            db_create=True,
+        )
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+
+    def get_aggregations(self, response):
+        self.assertStatusCode(200, response)
+        data = response.json()
+        self.assertEqual(data['type'], 'AggregationCollection')
+        return {aggregation['name']: aggregation for aggregation in data['aggregations']}
+
+    def get_frequencies(self, aggregation):
+        self.assertEqual(aggregation['data_type'], 'frequency_distribution')
+        return {bucket['key']: bucket['frequency'] for bucket in aggregation['buckets']}
+
+    def test_aggregate_get(self):
+        response = self.client.get(
+            reverse_version('aggregate'),
+            {
+                'collections': f'{self.collection.name},{self.forecast_collection.name}',
+                'aggregations': 'total_count,collection_frequency,datetime_frequency',
+                'datetime_frequency_interval': 'day',
+            }
+        )
+        aggregations = self.get_aggregations(response)
+        self.assertEqual(aggregations['total_count']['value'], 9)
+        self.assertEqual(
+            self.get_frequencies(aggregations['collection_frequency']), {
+                self.collection.name: 4, self.forecast_collection.name: 5
+            }
+        )
+        self.assertEqual(
+            self.get_frequencies(aggregations['datetime_frequency']), {'2020-10-28T00:00:00Z': 9}
+        )
+
+    def test_aggregate_post(self):
+        response = self.client.post(
+            reverse_version('aggregate'),
+            data={
+                'collections': [self.forecast_collection.name],
+                'forecast:reference_datetime': '2025-02-01T00:00:00Z/..',
+                'aggregations': ['forecast_variable_frequency', 'centroid_geohash_grid_frequency'],
+                'centroid_geohash_grid_frequency_precision': 2,
+            },
+            content_type="application/json"
+        )
+        aggregations = self.get_aggregations(response)
+        self.assertEqual(
+            self.get_frequencies(aggregations['forecast_variable_frequency']), {
+                'T': 2, 'air_temperature': 2
+            }
+        )
+        frequencies = self.get_frequencies(aggregations['centroid_geohash_grid_frequency'])
+        self.assertEqual(sum(frequencies.values()), 4)
+        self.assertTrue(all(len(key) == 2 for key in frequencies))
+
+    def test_collection_aggregate(self):
+        path = reverse_version('collection-aggregate', args=[self.collection.name])
+        response = self.client.get(path, {'filter': "id IN ('item-1', 'item-2')"})
+        aggregations = self.get_aggregations(response)
+        self.assertEqual(aggregations['total_count']['value'], 2)
+        self.assertEqual(
+            self.get_frequencies(aggregations['datetime_frequency']), {'2020-10-01T00:00:00Z': 2}
+        )
+
+        response = self.client.get(path, {'aggregations': 'collection_frequency'})
+        self.assertStatusCode(400, response)
+
+        response = self.client.get(reverse_version('collection-aggregate', args=['unknown']))
+        self.assertStatusCode(404, response)
+
+    def test_aggregate_invalid(self):
+        path = reverse_version('aggregate')
+        for params in [
+            {
+                'aggregations': 'unknown_frequency'
+            },
+            {
+                'datetime_frequency_interval': 'week'
+            },
+            {
+                'centroid_geohash_grid_frequency_precision': '13'
+            },
+        ]:
+            with self.subTest(params=params):
+                self.assertStatusCode(400, self.client.get(path, params))
+
+    def test_search_post_aggregations(self):
+        # the aggregation parameters are only accepted by the aggregate endpoints
+        response = self.client.post(
+            reverse_version('search-list'), {'aggregations': ['total_count']},
+            content_type='application/json'
+        )
+        self.assertStatusCode(400, response)
+
+    @override_settings(AGGREGATION_MAX_BUCKETS=1)
+    def test_aggregate_too_many_buckets(self):
+        response = self.client.get(
+            reverse_version('aggregate'), {'aggregations': 'collection_frequency'}
+        )
+        self.assertStatusCode(400, response)
@@ -9,6 +9,8 @@ from json import loads
 from pprint import pformat
 from unittest.mock import patch
 
+from prometheus_client import REGISTRY
+
 from django.contrib.auth import get_user_model
 from django.test import Client
 from django.test import override_settings
@@ -568,6 +570,43 @@ class AssetsUpdateEndpointTestCase(MockS3PerTestMixin, StacBaseTestCase):
         self.assertStatusCode(200, response)
         self.check_stac_asset(changed_asset.json, json_data, collection_name, item_name)
 
+    def test_asset_endpoint_put_unchanged(self):
+        collection_name = self.collection['name']
+        item_name = self.item['name']
+        asset_name = self.asset['name']
+        Asset.objects.filter(pk=self.asset.model.pk).update(file_size=1234)
+        changed_asset = self.factory.create_asset_sample(
+            item=self.item.model,
+            name=asset_name,
+            sample='asset-1-updated',
+            media_type=self.asset['media_type'],
+            checksum_multihash=self.asset['checksum_multihash'],
+            create_asset_file=False
+        )
+
+        path = f'/{STAC_BASE_V}/collections/{collection_name}/items/{item_name}/assets/{asset_name}'
+        response = self.client.put(
+            path, data=changed_asset.get_json('put'), content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        asset = Asset.objects.get(pk=self.asset.model.pk)
+        # the size of the uploaded file is kept
+        self.assertEqual(asset.file_size, 1234)
+        skipped = REGISTRY.get_sample_value(
+            'stac_api_skipped_writes_total', {'model': 'Asset'}
+        ) or 0
+
+        response = self.client.put(
+            path, data=changed_asset.get_json('put'), content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        self.check_stac_asset(changed_asset.json, response.json(), collection_name, item_name)
+        self.assertEqual(
+            REGISTRY.get_sample_value('stac_api_skipped_writes_total', {'model': 'Asset'}),
+            skipped + 1
+        )
+        self.assertEqual(Asset.objects.get(pk=asset.pk).etag, asset.etag)
+
     def test_asset_endpoint_put_extra_payload(self):
         collection_name = self.collection['name']
         item_name = self.item['name']
@@ -104,6 +104,16 @@ class CollectionAssetUploadBaseTest(S3TestMixin, MockS3PerTestMixin, StacBaseTes
             ]
         )
 
+    def get_list_urls_path(self, upload_id, collection=None, asset=None):
+        return reverse_version(
+            'collection-asset-upload-urls-list',
+            args=[
+                collection.name if collection else self.collection.name,
+                asset.name if asset else self.asset.name,
+                upload_id
+            ]
+        )
+
     def get_list_parts_path(self, upload_id, collection=None, asset=None):
         return reverse_version(
             'collection-asset-upload-parts-list',
@@ -139,10 +149,10 @@ class CollectionAssetUploadBaseTest(S3TestMixin, MockS3PerTestMixin, StacBaseTes
             parts.append({'etag': response['ETag'], 'part_number': part})
         return parts
 
-    def check_urls_response(self, urls, number_parts):
+    def check_urls_response(self, urls, number_parts, first_part=1):
         now = datetime.now(UTC)
         self.assertEqual(len(urls), number_parts)
-        for i, url in enumerate(urls):
+        for i, url in enumerate(urls, start=first_part - 1):
             self.assertListEqual(
                 list(url.keys()), ['url', 'part', 'expires'], msg='Url dictionary keys missing'
             )
@@ -1337,6 +1347,65 @@ class CollectionAssetUploadListPartsEndpointTestCase(CollectionAssetUploadBaseTe
         self.assertEqual(size, self.asset.file_size)
 
 
+@override_settings(FEATURE_AUTH_ENABLE_APIGW=True, UPLOAD_PRESIGNED_URLS_ON_CREATE=2)
+class CollectionAssetUploadListUrlsEndpointTestCase(CollectionAssetUploadBaseTest):
+
+    def test_asset_upload_list_urls(self):
+        number_parts = 5
+        size = 5 * MB * number_parts
+        file_like, checksum_multihash = get_file_like_object(size)
+        offset = size // number_parts
+        md5_parts = create_md5_parts(number_parts, offset, file_like)
+        response = self.client.post(
+            self.get_create_multipart_upload_path(),
+            data={
+                'number_parts': number_parts,
+                'file:checksum': checksum_multihash,
+                'md5_parts': md5_parts
+            },
+            content_type="application/json"
+        )
+        self.assertStatusCode(201, response)
+        json_data = response.json()
+        upload_id = json_data['upload_id']
+        # Only the urls of the first parts are returned on creation
+        self.check_urls_response(json_data['urls'], 2)
+
+        # The urls of the next parts are presigned on demand
+        response = self.client.get(self.get_list_urls_path(upload_id), {'limit': 2, 'offset': 2})
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.check_urls_response(json_data['urls'], 2, first_part=3)
+        self.assertIn('next', [link['rel'] for link in json_data['links']])
+
+        response = self.client.get(self.get_list_urls_path(upload_id), {'limit': 2, 'offset': 4})
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.check_urls_response(json_data['urls'], 1, first_part=5)
+        self.assertNotIn('next', [link['rel'] for link in json_data['links']])
+
+        # The GET of the upload presigns the urls of the first parts like its creation
+        response = self.client.get(self.get_get_multipart_uploads_path())
+        self.assertStatusCode(200, response)
+        self.check_urls_response(response.json()['uploads'][0]['urls'], 2)
+        response = self.client.get(f'{self.get_get_multipart_uploads_path()}/{upload_id}')
+        self.assertStatusCode(200, response)
+        self.check_urls_response(response.json()['urls'], 2)
+
+        # The urls are not stored
+        self.assertEqual(self.get_asset_upload_queryset().get(upload_id=upload_id).urls, [])
+
+        response = self.client.post(self.get_abort_multipart_upload_path(upload_id))
+        self.assertStatusCode(200, response)
+
+        # No urls once the upload has ended
+        response = self.client.get(self.get_get_multipart_uploads_path())
+        self.assertStatusCode(200, response)
+        self.assertNotIn('urls', response.json()['uploads'][0])
+        response = self.client.get(self.get_list_urls_path(upload_id))
+        self.assertStatusCode(409, response)
+
+
 class CollectionAssetUploadDisabledAuthenticationEndpointTestCase(CollectionAssetUploadBaseTest):
 
     def setUp(self):  # pylint: disable=invalid-name
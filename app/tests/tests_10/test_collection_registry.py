@@ -0,0 +1,86 @@
+import logging
+import time
+
+from prometheus_client import REGISTRY
+
+from django.test import Client
+from django.test import override_settings
+
+from stac_api import db_notifications
+from stac_api.collection_registry import get_collection
+from stac_api.collection_registry import registry
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTransactionTestCase
+from tests.tests_10.data_factory import Factory
+
+logger = logging.getLogger(__name__)
+
+
+# The notifications are only sent on commit, therefore a TransactionTestCase is needed
+@override_settings(COLLECTION_REGISTRY_ENABLED=True)
+class CollectionRegistryTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        registry.clear()
+        db_notifications.listener.start()
+        self.assertTrue(db_notifications.listener.connected.wait(5), msg='Listener not connected')
+
+    def tearDown(self):
+        # the listener connection would prevent the test DB deletion
+        db_notifications.listener.stop()
+        super().tearDown()
+
+    def get_lookups(self, result):
+        return REGISTRY.get_sample_value(
+            'stac_api_collection_registry_lookups_total', {'result': result}
+        ) or 0
+
+    def wait_for(self, condition):
+        # the changes are notified asynchronously
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            if condition():
+                return
+            time.sleep(0.05)
+        self.fail('Change not applied to the collection registry')
+
+    def test_collection_registry_lookup(self):
+        self.assertEqual(get_collection(self.collection.name).id, self.collection.id)
+        hits = self.get_lookups('hit')
+        with self.assertNumQueries(0):
+            collection = get_collection(self.collection.name)
+        self.assertEqual(collection.id, self.collection.id)
+        self.assertEqual(collection.cache_control_header, self.collection.cache_control_header)
+        self.assertEqual(self.get_lookups('hit'), hits + 1)
+
+        # unknown collections are looked up in the DB
+        self.assertIsNone(get_collection('unknown-collection'))
+
+    def test_collection_registry_refresh(self):
+        self.assertIsNone(get_collection(self.collection.name).cache_control_header)
+
+        self.collection.cache_control_header = 'max-age=8'
+        self.collection.save()
+        self.wait_for(
+            lambda: get_collection(self.collection.name).cache_control_header == 'max-age=8'
+        )
+        response = self.client.get(f'/{STAC_BASE_V}/collections/{self.collection.name}/items')
+        self.assertStatusCode(200, response)
+        self.assertIn('max-age=8', response['Cache-Control'])
+
+        name = self.collection.name
+        self.collection.delete()
+        self.wait_for(lambda: get_collection(name) is None)
+
+    def test_collection_registry_new_collection(self):
+        get_collection(self.collection.name)
+        collection = self.factory.create_collection_sample(db_create=True).model
+        # a new collection is found before its notification is received
+        self.assertEqual(get_collection(collection.name).id, collection.id)
+        response = self.client.get(f'/{STAC_BASE_V}/collections/{collection.name}/items')
+        self.assertStatusCode(200, response)
@@ -847,3 +847,70 @@ class CollectionsModelTemporalExtentTestCase(StacBaseTransactionTestCase):
             "Updating temporal extent (extent_end_datetime) based on mixed "
             "items failed."
         )
+
+
+class CollectionsIncrementalExtentTestCase(StacBaseTransactionTestCase):
+    '''
+    Testing the incremental update of the collection extent done by the item triggers
+    '''
+
+    def setUp(self):
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(
+            self.collection,
+            name='base-item',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((0 0, 0 45, 45 45, 45 0, 0 0))'),
+            properties_datetime=utc_aware(datetime(2020, 1, 1)),
+            db_create=True
+        ).model
+        self.collection.refresh_from_db()
+
+    def test_extent_grows_in_place(self):
+        self.assertFalse(self.collection.extent_out_of_sync)
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 45, 45))
+        self.factory.create_item_sample(
+            self.collection,
+            name='growing-item',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((40 40, 40 50, 50 50, 50 40, 40 40))'),
+            properties_datetime=utc_aware(datetime(2021, 1, 1)),
+            db_create=True
+        )
+        self.collection.refresh_from_db()
+        self.assertFalse(self.collection.extent_out_of_sync)
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 50, 50))
+        self.assertEqual(self.collection.extent_start_datetime, utc_aware(datetime(2020, 1, 1)))
+        self.assertEqual(self.collection.extent_end_datetime, utc_aware(datetime(2021, 1, 1)))
+
+    def test_inner_item_change_keeps_extent_in_sync(self):
+        inner_item = self.factory.create_item_sample(
+            self.collection,
+            name='inner-item',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((1 1, 1 40, 40 40, 40 1, 1 1))'),
+            properties_datetime=utc_aware(datetime(2020, 1, 1)),
+            db_create=True
+        ).model
+        inner_item.geometry = GEOSGeometry('SRID=4326;POLYGON ((2 2, 2 30, 30 30, 30 2, 2 2))')
+        inner_item.save()
+        self.collection.refresh_from_db()
+        self.assertFalse(self.collection.extent_out_of_sync)
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 45, 45))
+
+    def test_shrinking_marks_extent_out_of_sync(self):
+        self.factory.create_item_sample(
+            self.collection,
+            name='inner-item',
+            geometry=GEOSGeometry('SRID=4326;POLYGON ((1 1, 1 40, 40 40, 40 1, 1 1))'),
+            properties_datetime=utc_aware(datetime(2020, 1, 1)),
+            db_create=True
+        )
+        self.item.delete()
+        self.collection.refresh_from_db()
+        self.assertTrue(self.collection.extent_out_of_sync)
+        # the extent is not shrunk until recomputed
+        self.assertEqual(self.collection.extent_geometry.extent, (0, 0, 45, 45))
+
+        calculate_extent()
+        self.collection.refresh_from_db()
+        self.assertFalse(self.collection.extent_out_of_sync)
+        self.assertEqual(self.collection.extent_geometry.extent, (1, 1, 40, 40))
@@ -0,0 +1,192 @@
+import logging
+
+from django.test import Client
+from django.test import TestCase
+from django.test import override_settings
+
+from rest_framework import serializers
+
+from stac_api.cql2 import QUERYABLES
+from stac_api.cql2 import parse_filter
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.tests_10.utils import reverse_version
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+class Cql2ParserTestCase(TestCase):
+
+    def test_cql2_text(self):
+        cql2_filter = parse_filter("title = 'My ''item''' AND NOT forecast:variable IN ('T', 'P')")
+        self.assertEqual(
+            cql2_filter.expression,
+            {
+                'op': 'and',
+                'args': [
+                    {
+                        'op': '=', 'args': [{
+                            'property': 'title'
+                        }, "My 'item'"]
+                    },
+                    {
+                        'op': 'not',
+                        'args': [{
+                            'op': 'in', 'args': [{
+                                'property': 'forecast:variable'
+                            }, ['T', 'P']]
+                        }]
+                    },
+                ]
+            }
+        )
+        self.assertEqual(
+            parse_filter("S_INTERSECTS(geometry, POINT(7.4 46.9))").expression,
+            {
+                'op': 's_intersects',
+                'args': [{
+                    'property': 'geometry'
+                }, {
+                    'type': 'Point', 'coordinates': [7.4, 46.9]
+                }]
+            }
+        )
+
+    def test_cql2_text_json_equivalence(self):
+        text = parse_filter(
+            "datetime >= TIMESTAMP('2020-10-28T13:05:10Z') OR updated IS NULL", 'cql2-text'
+        )
+        json_filter = parse_filter({
+            'op': 'or',
+            'args': [
+                {
+                    'op': '>=',
+                    'args': [{
+                        'property': 'datetime'
+                    }, {
+                        'timestamp': '2020-10-28T13:05:10Z'
+                    }]
+                },
+                {
+                    'op': 'isNull', 'args': [{
+                        'property': 'updated'
+                    }]
+                },
+            ]
+        })
+        self.assertEqual(text.expression, json_filter.expression)
+        self.assertEqual(str(text.condition), str(json_filter.condition))
+
+    def test_cql2_invalid(self):
+        for value, lang in [
+            ("title = ", None),
+            ("title == 'a'", None),
+            ("unknown = 'a'", None),
+            ("forecast:perturbed = 'yes'", None),
+            ("datetime > TIMESTAMP('yesterday')", None),
+            ("t_intersects(datetime, INTERVAL('2021-02-01', '2021-01-01'))", None),
+            ('{"op": "like", "args": [{"property": "title"}, "a%"]}', 'cql2-json'),
+            ('{"op": "=", "args": [{"property": "title"}]}', 'cql2-json'),
+            ('not json', 'cql2-json'),
+            ("title = 'a'", 'cql2-xml'),
+        ]:
+            with self.subTest(value=value), self.assertRaises(serializers.ValidationError):
+                parse_filter(value, lang)
+
+    @override_settings(CQL2_MAX_LENGTH=40, CQL2_MAX_NODES=10, CQL2_MAX_DEPTH=3)
+    def test_cql2_complexity_limits(self):
+        parse_filter("id IN ('a', 'b') AND title = 'c'")
+        with self.assertRaises(serializers.ValidationError):
+            parse_filter(f"title = '{'a' * 40}'")
+        with self.assertRaises(serializers.ValidationError):
+            parse_filter(' OR '.join(f"id = 'item-{i}'" for i in range(5)))
+        with self.assertRaises(serializers.ValidationError):
+            parse_filter("NOT (NOT (NOT (title = 'a')))")
+
+
+class Cql2FilterEndpointTestCase(MockS3PerClassMixin, StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.factory.create_item_samples(
+            ['item-1', 'item-2', 'item-switzerland-west', 'item-switzerland-east'],
+            cls.collection,
+            db_create=True,
+        )
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+
+    def assertFilter(self, response, expected):
+        self.assertStatusCode(200, response)
+        self.assertEqual(
+            sorted(feature['id'] for feature in response.json()['features']), sorted(expected)
+        )
+
+    def test_search_filter_get(self):
+        path = f'/{STAC_BASE_V}/search'
+        response = self.client.get(path, {'filter': "title = 'My item 1'"})
+        self.assertFilter(response, ['item-1'])
+
+        # the items without title do not match
+        response = self.client.get(
+            path,
+            {
+                'filter': '{"op": "<>", "args": [{"property": "title"}, "My item 1"]}',
+                'filter-lang': 'cql2-json'
+            }
+        )
+        self.assertFilter(response, ['item-2'])
+
+        response = self.client.get(path, {'filter': "S_INTERSECTS(geometry, POINT(9.5 46.5))"})
+        self.assertFilter(response, ['item-switzerland-east'])
+
+    def test_search_filter_post(self):
+        path = f'/{STAC_BASE_V}/search'
+        query = {
+            'filter': {
+                'op': 't_intersects',
+                'args': [{
+                    'property': 'datetime'
+                }, {
+                    'interval': ['2020-10-28T13:30:00Z', '2020-10-28T13:40:00Z']
+                }]
+            },
+            'filter-lang': 'cql2-json',
+        }
+        response = self.client.post(path, data=query, content_type="application/json")
+        self.assertFilter(response, ['item-2'])
+
+        query['filter-crs'] = 'http://www.opengis.net/def/crs/EPSG/0/2056'
+        response = self.client.post(path, data=query, content_type="application/json")
+        self.assertStatusCode(400, response)
+
+    def test_search_filter_invalid(self):
+        response = self.client.get(f'/{STAC_BASE_V}/search', {'filter': "title LIKE 'My%'"})
+        self.assertStatusCode(400, response)
+
+    def test_items_filter(self):
+        path = f'/{STAC_BASE_V}/collections/{self.collection.name}/items'
+        response = self.client.get(path, {'filter': "id IN ('item-1', 'item-switzerland-west')"})
+        self.assertFilter(response, ['item-1', 'item-switzerland-west'])
+
+        response = self.client.get(path, {'filter': "forecast:horizon = 'tomorrow'"})
+        self.assertStatusCode(400, response)
+
+    def test_queryables(self):
+        for path in [
+            reverse_version('queryables'),
+            reverse_version('collection-queryables', args=[self.collection.name])
+        ]:
+            with self.subTest(path=path):
+                response = self.client.get(path)
+                self.assertStatusCode(200, response)
+                self.assertEqual(list(response.json()['properties']), list(QUERYABLES))
+
+        response = self.client.get(reverse_version('collection-queryables', args=['unknown']))
+        self.assertStatusCode(404, response)
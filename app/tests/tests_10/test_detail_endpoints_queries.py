@@ -0,0 +1,100 @@
+import logging
+
+from django.test import Client
+
+from stac_api.models.collection import CollectionAssetUpload
+from stac_api.models.item import AssetUpload
+from stac_api.utils import get_sha256_multihash
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+class DetailEndpointsQueriesTestCase(MockS3PerClassMixin, StacBaseTestCase):
+    '''Lock in the number of queries of the detail endpoints GET
+
+    The object, its etag and its collection cache_control_header are fetched by a single query,
+    the relations are then only fetched when the object is serialized.
+    '''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample(db_create=True).model
+        cls.item = cls.factory.create_item_sample(cls.collection, db_create=True).model
+        cls.asset = cls.factory.create_asset_sample(cls.item, db_create=True).model
+        cls.collection_asset = cls.factory.create_collection_asset_sample(
+            cls.collection, db_create=True
+        ).model
+        cls.asset_upload = AssetUpload.objects.create(
+            asset=cls.asset,
+            upload_id='upload-1',
+            status=AssetUpload.Status.COMPLETED,
+            checksum_multihash=get_sha256_multihash(b'upload-1'),
+            number_parts=1,
+            md5_parts=[]
+        )
+        cls.collection_asset_upload = CollectionAssetUpload.objects.create(
+            asset=cls.collection_asset,
+            upload_id='upload-1',
+            status=CollectionAssetUpload.Status.COMPLETED,
+            checksum_multihash=get_sha256_multihash(b'upload-1'),
+            number_parts=1,
+            md5_parts=[]
+        )
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+
+    def assertQueries(self, path, queries):  # pylint: disable=invalid-name
+        with self.assertNumQueries(queries):
+            response = self.client.get(path)
+        self.assertStatusCode(200, response)
+        self.assertIn('ETag', response)
+
+        # The conditional request is decided from the first query
+        with self.assertNumQueries(1):
+            response = self.client.get(path, headers={'If-None-Match': response['ETag']})
+        self.assertStatusCode(304, response)
+
+    def test_collection_detail_queries(self):
+        # collection, providers, links and assets
+        self.assertQueries(f'/{STAC_BASE_V}/collections/{self.collection.name}', 4)
+
+    def test_item_detail_queries(self):
+        # item with its collection, assets and links
+        self.assertQueries(
+            f'/{STAC_BASE_V}/collections/{self.collection.name}/items/{self.item.name}', 3
+        )
+
+    def test_asset_detail_queries(self):
+        self.assertQueries(
+            f'/{STAC_BASE_V}/collections/{self.collection.name}/items/{self.item.name}'
+            f'/assets/{self.asset.name}',
+            1
+        )
+
+    def test_collection_asset_detail_queries(self):
+        self.assertQueries(
+            f'/{STAC_BASE_V}/collections/{self.collection.name}'
+            f'/assets/{self.collection_asset.name}',
+            1
+        )
+
+    def test_asset_upload_detail_queries(self):
+        self.assertQueries(
+            f'/{STAC_BASE_V}/collections/{self.collection.name}/items/{self.item.name}'
+            f'/assets/{self.asset.name}/uploads/{self.asset_upload.upload_id}',
+            1
+        )
+
+    def test_collection_asset_upload_detail_queries(self):
+        self.assertQueries(
+            f'/{STAC_BASE_V}/collections/{self.collection.name}/assets/{self.collection_asset.name}'
+            f'/uploads/{self.collection_asset_upload.upload_id}',
+            1
+        )
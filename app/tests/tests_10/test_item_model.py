@@ -34,6 +34,26 @@ class ItemsModelTestCase(TestCase):
         item.save()
         self.assertEqual('item-1', item.name)
 
+    def test_item_datetime_range(self):
+        now = datetime.now(UTC)
+        item = Item.objects.create(
+            collection=self.collection, name='item-1', properties_datetime=now
+        )
+        item.refresh_from_db()
+        self.assertEqual(item.properties_datetime_range.lower, now)
+        self.assertEqual(item.properties_datetime_range.upper, now)
+        self.assertTrue(item.properties_datetime_range.lower_inc)
+        self.assertTrue(item.properties_datetime_range.upper_inc)
+
+        item.properties_datetime = None
+        item.properties_start_datetime = now - timedelta(days=1)
+        item.properties_end_datetime = now
+        item.save()
+        item.refresh_from_db()
+        self.assertEqual(item.properties_datetime_range.lower, now - timedelta(days=1))
+        self.assertEqual(item.properties_datetime_range.upper, now)
+        self.assertTrue(item.properties_datetime_range.upper_inc)
+
     def test_item_create_model_invalid_datetime(self):
         with self.assertRaises(ValidationError, msg="no datetime is invalid"):
             item = Item(collection=self.collection, name='item-1')
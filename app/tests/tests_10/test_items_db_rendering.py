@@ -0,0 +1,80 @@
+import json
+import logging
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import Client
+from django.test import override_settings
+from django.utils import timezone
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+class ItemsDbRenderingTestCase(MockS3PerClassMixin, StacBaseTestCase):
+    '''Check that the features rendered in DB are identical to the ItemSerializer ones'''
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.items = cls.factory.create_item_samples(
+            ['item-1', 'item-2', 'item-switzerland'],
+            cls.collection,
+            name=['item-1', 'item-2', 'item-3'],
+            db_create=True,
+        )
+        cls.factory.create_item_sample(
+            cls.collection,
+            name='item-4',
+            sample='item-forecast-1',
+            db_create=True,
+            properties_expires=timezone.now() + timedelta(hours=1),
+        )
+        cls.factory.create_asset_samples(
+            3,
+            cls.items[0].model,
+            name=['asset-1.tiff', 'asset-0.tiff', 'asset-2.tiff'],
+            db_create=True
+        )
+        cls.factory.create_asset_sample(cls.items[1].model, db_create=True)
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+        self.maxDiff = None  # pylint: disable=invalid-name
+
+    def get_features(self, path, db_rendering):
+        with override_settings(ITEMS_DB_RENDERING=db_rendering):
+            response = self.client.get(path)
+        self.assertStatusCode(200, response)
+        return response.json()['features']
+
+    def assertSameFeatures(self, path):  # pylint: disable=invalid-name
+        expected = self.get_features(path, db_rendering=False)
+        features = self.get_features(path, db_rendering=True)
+        self.assertEqual(len(features), len(expected))
+        # compare the json strings in order to also check the keys ordering
+        for feature, expected_feature in zip(features, expected):
+            self.assertEqual(
+                json.dumps(feature, indent=2),
+                json.dumps(expected_feature, indent=2),
+                msg=f'DB rendered feature {feature["id"]} differs'
+            )
+
+    def test_items_db_rendering(self):
+        self.assertSameFeatures(f'/{STAC_BASE_V}/collections/{self.collection.name}/items')
+
+    def test_items_db_rendering_pagination(self):
+        self.assertSameFeatures(f'/{STAC_BASE_V}/collections/{self.collection.name}/items?limit=2')
+
+    def test_items_db_rendering_expired(self):
+        with patch.object(timezone, "now", return_value=timezone.now() + timedelta(hours=2)):
+            self.assertSameFeatures(f'/{STAC_BASE_V}/collections/{self.collection.name}/items')
+
+    def test_search_db_rendering(self):
+        self.assertSameFeatures(f'/{STAC_BASE_V}/search')
+        self.assertSameFeatures(f'/{STAC_BASE_V}/search?ids=item-1,item-4')
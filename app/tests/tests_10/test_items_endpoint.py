@@ -1,4 +1,5 @@
 # pylint: disable=too-many-lines
+import json
 import logging
 from base64 import b64encode
 from datetime import UTC
@@ -7,8 +8,11 @@ from datetime import timedelta
 from typing import cast
 from unittest.mock import patch
 
+from prometheus_client import REGISTRY
+
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.contrib.auth.models import Permission
 from django.test import Client
 from django.test import override_settings
 from django.urls import reverse
@@ -295,6 +299,13 @@ class ItemsDatetimeQueryEndpointTestCase(StacBaseTestCase):
         )
         self.assertStatusCode(400, response)
 
+        # end before start
+        response = self.client.get(
+            f"/{STAC_BASE_V}/collections/{self.collection.name}/items"
+            f"?datetime={isoformat(self.now)}/{isoformat(self.yesterday)}&limit=100"
+        )
+        self.assertStatusCode(400, response)
+
         # invalid start and end
         response = self.client.get(
             f"/{STAC_BASE_V}/collections/{self.collection.name}/items"
@@ -582,6 +593,45 @@ class ItemsUpdateEndpointTestCase(StacBaseTestCase):
         self.assertStatusCode(200, response)
         self.check_stac_item(sample.json, json_data, self.collection["name"])
 
+    def get_skipped_writes(self):
+        return REGISTRY.get_sample_value('stac_api_skipped_writes_total', {'model': 'Item'}) or 0
+
+    def test_item_endpoint_put_unchanged(self):
+        sample = self.factory.create_item_sample(
+            self.collection.model, sample='item-2', name=self.item['name']
+        )
+        path = f'/{STAC_BASE_V}/collections/{self.collection["name"]}/items/{self.item["name"]}'
+        response = self.client.put(
+            path, data=sample.get_json('put'), content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        item = Item.objects.get(collection=self.collection.model, name=self.item['name'])
+        skipped = self.get_skipped_writes()
+
+        # the identical write is skipped
+        response = self.client.put(
+            path, data=sample.get_json('put'), content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        self.check_stac_item(sample.json, response.json(), self.collection["name"])
+        self.assertEqual(self.get_skipped_writes(), skipped + 1)
+        unchanged = Item.objects.get(pk=item.pk)
+        self.assertEqual((unchanged.etag, unchanged.updated), (item.etag, item.updated))
+
+        # the content hash doesn't apply anymore after another write
+        response = self.client.patch(
+            path, data={"properties": {
+                "title": "patched title"
+            }}, content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        response = self.client.put(
+            path, data=sample.get_json('put'), content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        self.assertEqual(self.get_skipped_writes(), skipped + 1)
+        self.check_stac_item(sample.json, response.json(), self.collection["name"])
+
     def test_item_endpoint_put_extra_payload(self):
         sample = self.factory.create_item_sample(
             self.collection.model, sample='item-2', name=self.item['name'], extra_payload='invalid'
@@ -1404,6 +1454,39 @@ class ItemsLinksEndpointTestCase(StacBaseTestCase):
         assert link is not None
         self.assertEqual(link.hreflang, 'de')
 
+    def test_update_item_links_unchanged(self):
+        data = self.item_data.get_json('put')
+        data['links'] = [{
+            'rel': 'more-info', 'href': 'http://www.meteoschweiz.ch/', 'title': 'More info'
+        }, {
+            'rel': 'describedBy', 'href': 'http://www.meteoschweiz.ch/describedby'
+        }]
+        path = f'/{STAC_BASE_V}/collections/{self.collection.name}/items/{self.item.name}'
+        response = self.client.put(path, data=data, content_type="application/json")
+        self.assertStatusCode(200, response)
+        links = ItemLink.objects.filter(item__collection=self.collection, item__name=self.item.name)
+        expected = list(links.values_list('pk', 'rel', 'title'))
+        etag = Item.objects.get(collection=self.collection, name=self.item.name).etag
+
+        # the links of an unchanged item are not written again
+        response = self.client.put(path, data=data, content_type="application/json")
+        self.assertStatusCode(200, response)
+        self.assertEqual(list(links.values_list('pk', 'rel', 'title')), expected)
+        self.assertEqual(
+            Item.objects.get(collection=self.collection, name=self.item.name).etag, etag
+        )
+
+        data['links'] = [dict(data['links'][0], title='New title')]
+        response = self.client.put(path, data=data, content_type="application/json")
+        self.assertStatusCode(200, response)
+        self.assertEqual(
+            list(links.values_list('pk', 'rel', 'title')),
+            [(expected[0][0], 'more-info', 'New title')]
+        )
+        self.assertNotEqual(
+            Item.objects.get(collection=self.collection, name=self.item.name).etag, etag
+        )
+
     def test_read_item_with_hreflang(self):
         item_data: SampleData = self.factory.create_item_sample(
             sample='item-hreflang-links', db_create=False, collection=self.collection
@@ -1441,3 +1524,198 @@ class ItemsLinksEndpointTestCase(StacBaseTestCase):
         description = content['description'][0]
         self.assertIn('Unknown code', description)
         self.assertIn('Missing language', description)
+
+
+@override_settings(FEATURE_AUTH_ENABLE_APIGW=True)
+class ItemsBulkIngestionEndpointTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample(db_create=True)
+        self.collection.model.allow_external_assets = True
+        self.collection.model.external_asset_whitelist = [settings.EXTERNAL_TEST_ASSET_URL]
+        self.collection.model.save()
+        self.path = reverse_version('items-bulk', args=[self.collection['name']])
+
+        self.features = [{
+            "id": f"item-{i}",
+            "assets": {
+                f"asset-{i}.txt": {
+                    "type": "text/plain",
+                    "href": settings.EXTERNAL_TEST_ASSET_URL,
+                    "roles": ["myrole"],
+                    "proj:epsg": 2056,
+                }
+            },
+            "links": [{
+                'href': f'https://www.example.com/described-by-{i}',
+                'rel': 'describedBy',
+            }],
+            "geometry": {
+                "type": "Point", "coordinates": [7.0 + i / 10, 46.5]
+            },
+            "properties": {
+                "datetime": "2018-02-12T23:20:50Z",
+                "forecast:horizon": f"PT{i}H",
+            },
+        } for i in range(1, 6)]
+        self.client = Client(headers=get_auth_headers())
+
+    def post_ndjson(self, features):
+        return self.client.post(
+            self.path,
+            data=''.join(f'{json.dumps(feature)}\n' for feature in features),
+            content_type="application/x-ndjson",
+        )
+
+    def test_bulk_ingestion_ndjson(self):
+        response = self.post_ndjson(self.features)
+        self.assertStatusCode(201, response)
+        self.assertEqual(response.json(), {'created': 5})
+
+        items = Item.objects.filter(collection=self.collection.model).order_by('name')
+        self.assertEqual([item.name for item in items], [f'item-{i}' for i in range(1, 6)])
+        item = items.get(name='item-3')
+        self.assertEqual(item.forecast_horizon, timedelta(hours=3))
+        self.assertEqual(item.bbox, (7.3, 46.5, 7.3, 46.5))
+        asset = item.assets.get()
+        self.assertEqual(asset.name, 'asset-3.txt')
+        self.assertTrue(asset.is_external)
+        self.assertEqual(asset.proj_epsg, 2056)
+        self.assertEqual(
+            list(item.links.values_list('rel', 'href')),
+            [('describedBy', 'https://www.example.com/described-by-3')]
+        )
+
+        response = self.client.get(
+            reverse_version('item-detail', args=[self.collection['name'], 'item-3'])
+        )
+        self.assertStatusCode(200, response)
+
+    def test_bulk_ingestion_feature_collection(self):
+        response = self.client.post(
+            self.path,
+            data={
+                'type': 'FeatureCollection', 'features': self.features
+            },
+            content_type="application/json",
+        )
+        self.assertStatusCode(201, response)
+        self.assertEqual(response.json(), {'created': 5})
+
+    def test_bulk_ingestion_invalid_features(self):
+        self.features[1]['geometry'] = {"type": "Point"}
+        self.features[3]['id'] = self.features[0]['id']
+        response = self.client.post(
+            self.path,
+            data=json.dumps(self.features[0]) + '\n{"id": \n' + json.dumps(self.features[1]),
+            content_type="application/x-ndjson",
+        )
+        self.assertStatusCode(400, response)
+        self.assertEqual([error['index'] for error in response.json()['errors']], [1, 2])
+
+        response = self.post_ndjson(self.features)
+        self.assertStatusCode(400, response)
+        errors = [(error['index'], error['id']) for error in response.json()['errors']]
+        self.assertEqual(errors, [(1, 'item-2'), (3, 'item-1')])
+        self.assertFalse(Item.objects.filter(collection=self.collection.model).exists())
+
+    def test_bulk_ingestion_existing_item(self):
+        self.factory.create_item_sample(self.collection.model, sample='item-1', db_create=True)
+        response = self.post_ndjson(self.features)
+        self.assertStatusCode(400, response)
+        errors = [(error['index'], error['id']) for error in response.json()['errors']]
+        self.assertEqual(errors, [(0, 'item-1')])
+        self.assertEqual(Item.objects.filter(collection=self.collection.model).count(), 1)
+
+    def put_ndjson(self, features):
+        return self.client.put(
+            self.path,
+            data=''.join(f'{json.dumps(feature)}\n' for feature in features),
+            content_type="application/x-ndjson",
+        )
+
+    def test_bulk_upsert(self):
+        response = self.put_ndjson(self.features[:3])
+        self.assertStatusCode(200, response)
+        self.assertEqual([item['status'] for item in response.json()['items']], ['created'] * 3)
+        etags = dict(
+            Item.objects.filter(collection=self.collection.model).values_list('name', 'etag')
+        )
+
+        response = self.put_ndjson(self.features)
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.assertEqual((json_data['created'], json_data['unchanged']), (2, 3))
+        self.assertEqual([(item['index'], item['id'], item['status']) for item in json_data['items']
+                         ],
+                         [(0, 'item-1', 'unchanged'), (1, 'item-2', 'unchanged'),
+                          (2, 'item-3', 'unchanged'), (3, 'item-4', 'created'),
+                          (4, 'item-5', 'created')])
+        for name, etag in etags.items():
+            self.assertEqual(Item.objects.get(name=name).etag, etag, msg=f'{name} etag changed')
+
+        self.features[0]['properties']['title'] = 'new title'
+        self.features[1]['links'] = []
+        self.features[2]['assets']['asset-3.txt']['proj:epsg'] = 4326
+        response = self.put_ndjson(self.features)
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        statuses = [item['status'] for item in json_data['items']]
+        self.assertEqual(statuses, ['updated'] * 3 + ['unchanged'] * 2)
+        self.assertEqual(Item.objects.get(name='item-1').properties_title, 'new title')
+        self.assertFalse(ItemLink.objects.filter(item__name='item-2').exists())
+        self.assertEqual(Item.objects.get(name='item-3').assets.get().proj_epsg, 4326)
+        for name, etag in etags.items():
+            self.assertNotEqual(Item.objects.get(name=name).etag, etag, msg=f'{name} etag')
+
+    def test_bulk_upsert_if_match(self):
+        self.assertStatusCode(201, self.post_ndjson(self.features[:2]))
+        etag = Item.objects.get(name='item-1').etag
+        self.features[0]['if_match'] = 'wrong-etag'
+        self.features[1]['if_match'] = etag
+        self.features[2]['if_match'] = etag
+        self.features[0]['properties']['title'] = 'new title'
+        response = self.put_ndjson(self.features)
+        self.assertStatusCode(400, response)
+        errors = [(error['index'], error['id']) for error in response.json()['errors']]
+        self.assertEqual(errors, [(0, 'item-1'), (1, 'item-2'), (2, 'item-3')])
+        self.assertEqual(Item.objects.filter(collection=self.collection.model).count(), 2)
+        self.assertIsNone(Item.objects.get(name='item-1').properties_title)
+
+        self.features[0]['if_match'] = f'"{etag}"'
+        response = self.put_ndjson(self.features[:1])
+        self.assertStatusCode(200, response)
+        self.assertEqual(response.json()['updated'], 1)
+        self.assertEqual(Item.objects.get(name='item-1').properties_title, 'new title')
+
+    @override_settings(FEATURE_AUTH_RESTRICT_V1=False)
+    def test_bulk_upsert_permissions(self):
+        self.assertStatusCode(201, self.post_ndjson(self.features[:2]))
+        user = get_user_model().objects.create_user('editor', 'editor@example.com', 'password')
+        user.user_permissions.add(
+            Permission.objects.get(content_type__app_label='stac_api', codename='change_item')
+        )
+        self.client = Client()
+        self.client.force_login(user)
+
+        # the existing items can be updated with the change permission
+        self.features[0]['properties']['title'] = 'new title'
+        response = self.put_ndjson(self.features[:2])
+        self.assertStatusCode(200, response)
+        self.assertEqual(response.json()['updated'], 1)
+
+        # but the creation of items requires the add permission
+        self.features[1]['properties']['title'] = 'new title'
+        response = self.put_ndjson(self.features)
+        self.assertStatusCode(403, response)
+        self.assertEqual(Item.objects.filter(collection=self.collection.model).count(), 2)
+        self.assertIsNone(Item.objects.get(name='item-2').properties_title)
+
+    def test_bulk_ingestion_unknown_collection(self):
+        response = self.client.post(
+            reverse_version('items-bulk', args=['unknown']),
+            data='',
+            content_type="application/x-ndjson",
+        )
+        self.assertStatusCode(404, response)
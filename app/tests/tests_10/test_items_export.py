@@ -0,0 +1,79 @@
+import json
+import logging
+
+from django.test import Client
+from django.test import override_settings
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+class ItemsExportEndpointTestCase(MockS3PerClassMixin, StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.items = cls.factory.create_item_samples(
+            3, cls.collection, name=['item-1', 'item-2', 'item-3'], db_create=True
+        )
+        cls.factory.create_asset_samples(2, cls.items[0].model, db_create=True)
+
+    def setUp(self):
+        self.client = Client()
+        self.path = f'/{STAC_BASE_V}/collections/{self.collection.name}/export'
+
+    def get_features(self, response, record_separator=''):
+        content = b''.join(response.streaming_content).decode()
+        lines = content.splitlines()
+        for line in lines:
+            self.assertTrue(line.startswith(record_separator), msg=f'Invalid line {line}')
+        return [json.loads(line[len(record_separator):]) for line in lines]
+
+    def test_items_export(self):
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertTrue(response.streaming)
+        self.assertEqual(response['Content-Type'], 'application/x-ndjson')
+        features = self.get_features(response)
+
+        response = self.client.get(f'{self.path[:-len("export")]}items')
+        self.assertStatusCode(200, response)
+        self.assertCountEqual(features, response.json()['features'])
+
+    @override_settings(EXPORT_CHUNK_SIZE=2)
+    def test_items_export_chunks(self):
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        features = self.get_features(response)
+        self.assertEqual([feature['id'] for feature in features],
+                         [item.model.name for item in self.items])
+
+    @override_settings(ITEMS_DB_RENDERING=True)
+    def test_items_export_db_rendering(self):
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertEqual(len(self.get_features(response)), 3)
+
+    def test_items_export_geojson_seq(self):
+        response = self.client.get(self.path, {'format': 'geojson-seq'})
+        self.assertStatusCode(200, response)
+        self.assertEqual(response['Content-Type'], 'application/geo+json-seq')
+        self.assertEqual(len(self.get_features(response, record_separator='\x1e')), 3)
+
+    def test_items_export_filters(self):
+        response = self.client.get(self.path, {'bbox': '0,0,0.1,0.1'})
+        self.assertStatusCode(200, response)
+        self.assertEqual(self.get_features(response), [])
+
+        response = self.client.get(self.path, {'datetime': '../1900-01-01T00:00:00Z'})
+        self.assertStatusCode(200, response)
+        self.assertEqual(self.get_features(response), [])
+
+    def test_items_export_unknown_collection(self):
+        response = self.client.get(f'/{STAC_BASE_V}/collections/unknown-collection/export')
+        self.assertStatusCode(404, response)
@@ -0,0 +1,114 @@
+import logging
+from datetime import timedelta
+
+from django.db import connection
+from django.test import Client
+from django.test import override_settings
+from django.utils import timezone
+
+from stac_api import pgtriggers
+from stac_api.models.item import Item
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+@override_settings(NUMBER_MATCHED_ENABLED=True)
+class NumberMatchedTestCase(MockS3PerClassMixin, StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.items = cls.factory.create_item_samples(
+            ['item-1', 'item-2', 'item-switzerland'],
+            cls.collection,
+            name=['item-1', 'item-2', 'item-3'],
+            db_create=True,
+        )
+        cls.factory.create_item_samples(
+            2,
+            cls.collection,
+            name=['item-expiring', 'item-expired'],
+            db_create=True,
+            properties_expires=timezone.now() + timedelta(hours=1),
+        )
+        Item.objects.filter(name='item-expired'
+                           ).update(properties_expires=timezone.now() - timedelta(hours=1))
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+        self.path = f'/{STAC_BASE_V}/collections/{self.collection.name}/items'
+
+    def assertNumberMatched(self, response, matched, strategy, returned=None):
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.assertEqual(json_data['numberMatched'], matched)
+        self.assertEqual(json_data['numberReturned'], returned or matched)
+        self.assertEqual(json_data['context']['matched'], matched)
+        self.assertEqual(json_data['context']['matched_strategy'], strategy)
+
+    def test_permanent_items_count(self):
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.permanent_items_count, 3)
+
+        Item.objects.filter(name='item-1').update(properties_expires=timezone.now())
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.permanent_items_count, 2)
+
+        Item.objects.filter(name__in=['item-1', 'item-2']).delete()
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.permanent_items_count, 1)
+
+    def test_number_matched_collection(self):
+        response = self.client.get(self.path, {'limit': 2})
+        self.assertNumberMatched(response, 4, 'collection', returned=2)
+        self.assertEqual(response.json()['context']['limit'], 2)
+
+    def test_number_matched_collection_deferred(self):
+        with connection.cursor() as cursor:
+            # transaction local, reset with the rollback of the test
+            cursor.execute(
+                "SELECT set_config(%s, 'on', true)", [pgtriggers.DEFERRED_COLLECTION_UPDATES]
+            )
+        Item.objects.filter(name='item-1').delete()
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.permanent_items_count, 3)
+
+        response = self.client.get(self.path)
+        self.assertNumberMatched(response, 3, 'collection')
+
+    def test_number_matched_exact(self):
+        response = self.client.get(self.path, {'bbox': '5.96,45.82,10.49,47.81'})
+        self.assertNumberMatched(response, len(response.json()['features']), 'exact')
+
+        response = self.client.get(f'/{STAC_BASE_V}/search')
+        self.assertNumberMatched(response, 4, 'exact')
+
+    @override_settings(NUMBER_MATCHED_EXACT_THRESHOLD=2)
+    def test_number_matched_estimate(self):
+        response = self.client.get(f'/{STAC_BASE_V}/search', {'limit': 1})
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.assertEqual(json_data['context']['matched_strategy'], 'estimate')
+        self.assertGreaterEqual(json_data['numberMatched'], 3)
+
+    @override_settings(NUMBER_MATCHED_TIME_BUDGET=0)
+    def test_number_matched_time_budget(self):
+        response = self.client.get(f'/{STAC_BASE_V}/search')
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        self.assertEqual(json_data['numberReturned'], 4)
+        self.assertNotIn('numberMatched', json_data)
+        self.assertNotIn('matched', json_data['context'])
+
+    @override_settings(NUMBER_MATCHED_ENABLED=False)
+    def test_number_matched_disabled(self):
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertNotIn('numberMatched', response.json())
+        self.assertNotIn('context', response.json())
@@ -1,4 +1,18 @@
 import logging
+from datetime import datetime
+
+from django.contrib.gis.geos import GEOSGeometry
+from django.core.management import call_command
+from django.db import connection
+from django.db import transaction
+
+from stac_api import pgtriggers
+from stac_api.models.collection import Collection
+from stac_api.models.collection import CollectionDelta
+from stac_api.models.collection import GSDCount
+from stac_api.models.item import Asset
+from stac_api.models.item import Item
+from stac_api.utils import utc_aware
 
 from tests.tests_10.base_test import StacBaseTransactionTestCase
 from tests.tests_10.data_factory import Factory
@@ -66,3 +80,167 @@ class PgTriggersFileSizeTestCase(MockS3PerTestMixin, StacBaseTransactionTestCase
 
         self.assertEqual(self.collection.total_data_size, 2 * file_size)
         self.assertEqual(self.item.total_data_size, 1 * file_size)
+
+
+class PgTriggersItemBboxTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(collection=self.collection).model
+
+    def test_pgtrigger_item_bbox(self):
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.bbox, self.item.geometry.extent)
+
+        # update the geometry without the model save in order to only test the trigger
+        geometry = GEOSGeometry('SRID=4326;POLYGON((6 46, 6 47, 8 47, 8 46, 6 46))')
+        Item.objects.filter(pk=self.item.pk).update(geometry=geometry)
+        self.item.refresh_from_db()
+        self.assertEqual(self.item.bbox, (6.0, 46.0, 8.0, 47.0))
+
+
+class PgTriggersItemSearchableTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(collection=self.collection).model
+
+    def test_pgtrigger_item_searchable(self):
+        self.item.refresh_from_db()
+        self.assertTrue(self.item.is_searchable)
+        etag = self.item.etag
+
+        self.collection.published = False
+        self.collection.save()
+        self.item.refresh_from_db()
+        self.assertFalse(self.item.is_searchable)
+        # the synchronization is not a change of the item
+        self.assertEqual(self.item.etag, etag)
+
+        # a new item copies the flag, a stale flag is corrected
+        item = self.factory.create_item_sample(collection=self.collection).model
+        item.refresh_from_db()
+        self.assertFalse(item.is_searchable)
+        Item.objects.filter(pk=item.pk).update(is_searchable=True)
+        item.refresh_from_db()
+        self.assertFalse(item.is_searchable)
+
+        self.collection.published = True
+        self.collection.save()
+        self.assertEqual(Item.objects.filter(is_searchable=True).count(), 2)
+
+
+class PgTriggersBulkWriteTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+
+    def test_pgtrigger_bulk_write(self):
+        items = Item.objects.bulk_create([
+            Item(
+                collection=self.collection,
+                name=f'item-{i}',
+                geometry=GEOSGeometry(f'SRID=4326;POINT({6 + i / 10} 46)'),
+                properties_datetime=utc_aware(datetime(2020, 1, 1 + i)),
+            ) for i in range(5)
+        ])
+        Asset.objects.bulk_create([
+            Asset(
+                item=item,
+                name=f'asset-{i}-{j}.txt',
+                media_type='text/plain',
+                is_external=True,
+                file=f'https://example.com/asset-{i}-{j}.txt',
+                file_size=10,
+                eo_gsd=float(j),
+                proj_epsg=2056,
+            ) for i, item in enumerate(items) for j in range(3)
+        ])
+        self.collection.refresh_from_db()
+        # the extent of the collection is grown in place
+        self.assertFalse(self.collection.extent_out_of_sync)
+        self.assertEqual(self.collection.extent_geometry.extent, (6.0, 46.0, 6.4, 46.0))
+        self.assertEqual(self.collection.extent_start_datetime, utc_aware(datetime(2020, 1, 1)))
+        self.assertEqual(self.collection.extent_end_datetime, utc_aware(datetime(2020, 1, 5)))
+        self.assertEqual(self.collection.total_data_size, 5 * 3 * 10)
+        self.assertCountEqual(self.collection.summaries_eo_gsd, [0.0, 1.0, 2.0])
+        self.assertCountEqual(self.collection.summaries_proj_epsg, [2056])
+        for item in Item.objects.filter(collection=self.collection):
+            self.assertEqual(item.total_data_size, 3 * 10)
+        self.assertEqual(GSDCount.objects.get(collection=self.collection, value=1.0).count, 5)
+
+        # bulk update: one gsd value disappears
+        Asset.objects.filter(item__collection=self.collection, eo_gsd=2.0).update(eo_gsd=1.0)
+        self.collection.refresh_from_db()
+        self.assertCountEqual(self.collection.summaries_eo_gsd, [0.0, 1.0])
+        self.assertEqual(GSDCount.objects.get(collection=self.collection, value=1.0).count, 10)
+
+        # bulk delete
+        Asset.objects.filter(item__collection=self.collection).delete()
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.total_data_size, 0)
+        self.assertEqual(self.collection.summaries_eo_gsd, [])
+        self.assertEqual(self.collection.summaries_proj_epsg, [])
+        self.assertFalse(GSDCount.objects.filter(collection=self.collection).exists())
+
+
+class PgTriggersDeferredCollectionUpdatesTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample(db_create=True).model
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config(%s, 'on', false)", [pgtriggers.DEFERRED_COLLECTION_UPDATES]
+            )
+
+    def tearDown(self):
+        with connection.cursor() as cursor:
+            cursor.execute(
+                "SELECT set_config(%s, 'off', false)", [pgtriggers.DEFERRED_COLLECTION_UPDATES]
+            )
+        super().tearDown()
+
+    def test_pgtrigger_deferred_collection_updates(self):
+        etag = self.collection.etag
+        item = self.factory.create_item_sample(collection=self.collection, db_create=True).model
+        Item.objects.filter(pk=item.pk).update(total_data_size=10)
+
+        # The collection is not updated, its changes are pending in the delta table
+        self.collection.refresh_from_db()
+        self.assertEqual(self.collection.etag, etag)
+        self.assertEqual(self.collection.total_data_size, 0)
+        self.assertFalse(self.collection.extent_out_of_sync)
+        self.assertTrue(CollectionDelta.objects.filter(collection=self.collection).exists())
+
+        # Not consolidated yet due to the debounce
+        call_command('consolidate_collection_deltas', debounce=60, max_delay=60, verbosity=0)
+        self.assertTrue(CollectionDelta.objects.filter(collection=self.collection).exists())
+
+        call_command('consolidate_collection_deltas', debounce=0, max_delay=0, verbosity=0)
+        self.assertFalse(CollectionDelta.objects.filter(collection=self.collection).exists())
+        self.collection.refresh_from_db()
+        self.assertNotEqual(self.collection.etag, etag)
+        self.assertEqual(self.collection.total_data_size, 10)
+        self.assertTrue(self.collection.extent_out_of_sync)
+
+    def test_pgtrigger_deferred_collection_delete(self):
+        self.factory.create_item_samples(2, self.collection, db_create=True)
+        self.assertTrue(CollectionDelta.objects.filter(collection=self.collection).exists())
+
+        # The deltas of the deleted items must not outlive their collection, otherwise the
+        # collection foreign key fails on commit
+        with transaction.atomic():
+            Item.objects.filter(collection=self.collection).delete()
+            Collection.objects.filter(pk=self.collection.pk).delete()
+
+        self.assertFalse(Collection.objects.filter(pk=self.collection.pk).exists())
+        self.assertFalse(CollectionDelta.objects.exists())
+        call_command('consolidate_collection_deltas', debounce=0, max_delay=0, verbosity=0)
@@ -1,5 +1,19 @@
+import json
+from datetime import UTC
+from datetime import datetime
+from datetime import timedelta
+
+from helpers.renderers import GeoJSONRenderer
+from helpers.renderers import OrjsonGeoJSONRenderer
+from helpers.renderers import OrjsonRenderer
+
 from django.test import Client
 from django.test import TestCase
+from django.utils.translation import gettext_lazy as _
+
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils.serializer_helpers import ReturnDict
+from rest_framework.utils.serializer_helpers import ReturnList
 
 from tests.tests_10.base_test import STAC_BASE_V
 
@@ -38,3 +52,44 @@ class RendererTestCase(TestCase):
         self.assertEqual(response.status_code, 200)
         self.assertEqual(response['Content-Type'], 'application/geo+json')
         self.assertEqual(response.json()['type'], 'FeatureCollection')
+
+
+class OrjsonRendererTestCase(TestCase):
+
+    def test_orjson_renderer_output(self):
+        item = {'id': 'item-1', 'created': datetime(2024, 1, 2, tzinfo=UTC)}
+        page = {
+            'type': 'FeatureCollection',
+            'timeStamp': datetime(2024, 1, 2, 3, 4, 5, 678000, tzinfo=UTC),
+            'description': _('Lazy description'),
+            'features': ReturnList([item], serializer=None),
+        }
+        data = ReturnDict(page, serializer=None)
+        for renderer, orjson_renderer in [
+            (JSONRenderer(), OrjsonRenderer()),
+            (GeoJSONRenderer(), OrjsonGeoJSONRenderer()),
+        ]:
+            self.assertEqual(orjson_renderer.media_type, renderer.media_type)
+            self.assertEqual(orjson_renderer.format, renderer.format)
+            self.assertEqual(orjson_renderer.render(data), renderer.render(data))
+            self.assertEqual(orjson_renderer.render(None), renderer.render(None))
+
+    def test_orjson_renderer_types(self):
+        content = json.loads(
+            OrjsonRenderer().render({
+                'datetime': datetime(2024, 1, 2, 3, 4, 5, tzinfo=UTC),
+                'duration': timedelta(days=3, hours=6),
+                'lazy': _('Lazy string'),
+            })
+        )
+        self.assertEqual(
+            content, {
+                'datetime': '2024-01-02T03:04:05Z',
+                'duration': 'P3DT06H00M00S',
+                'lazy': 'Lazy string',
+            }
+        )
+
+    def test_orjson_renderer_indent(self):
+        content = OrjsonRenderer().render({'id': 1}, 'application/json; indent=4')
+        self.assertEqual(content, b'{\n  "id": 1\n}')
@@ -0,0 +1,94 @@
+import logging
+import time
+from datetime import timedelta
+from unittest.mock import patch
+
+from prometheus_client import REGISTRY
+
+from django.core.cache import caches
+from django.test import Client
+from django.test import override_settings
+
+from stac_api import db_notifications
+from stac_api import response_cache
+from stac_api.views.filters import get_expiry_cutoff
+
+from tests.tests_10.base_test import STAC_BASE_V
+from tests.tests_10.base_test import StacBaseTransactionTestCase
+from tests.tests_10.data_factory import Factory
+
+logger = logging.getLogger(__name__)
+
+
+# The invalidation notifications are only sent on commit, therefore a TransactionTestCase is needed
+@override_settings(RESPONSE_CACHE_ENABLED=True)
+class ResponseCacheTestCase(StacBaseTransactionTestCase):
+
+    def setUp(self):
+        super().setUp()
+        self.client = Client()
+        self.factory = Factory()
+        self.collection = self.factory.create_collection_sample().model
+        self.item = self.factory.create_item_sample(self.collection, db_create=True).model
+        self.path = f'/{STAC_BASE_V}/collections/{self.collection.name}/items/{self.item.name}'
+        caches[response_cache.CACHE_ALIAS].clear()
+        db_notifications.listener.start()
+        self.assertTrue(db_notifications.listener.connected.wait(5), msg='Listener not connected')
+
+    def tearDown(self):
+        # the listener connection would prevent the test DB deletion
+        db_notifications.listener.stop()
+        super().tearDown()
+
+    def get_lookups(self, result):
+        return REGISTRY.get_sample_value(
+            'stac_api_response_cache_lookups_total', {
+                'view': 'item-detail', 'result': result
+            }
+        ) or 0
+
+    def test_response_cache(self):
+        hits = self.get_lookups('hit')
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertEqual(self.get_lookups('hit'), hits)
+
+        cached_response = self.client.get(self.path)
+        self.assertStatusCode(200, cached_response)
+        self.assertEqual(self.get_lookups('hit'), hits + 1)
+        self.assertEqual(cached_response.json(), response.json())
+        self.assertEqual(cached_response['ETag'], response['ETag'])
+
+        # the conditional requests are answered from the cache
+        response = self.client.get(self.path, headers={'If-None-Match': response['ETag']})
+        self.assertStatusCode(304, response)
+        self.assertEqual(self.get_lookups('hit'), hits + 2)
+
+    def test_response_cache_invalidation(self):
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+
+        self.item.properties_title = 'New title'
+        self.item.save()
+
+        # the change is notified asynchronously
+        deadline = time.monotonic() + 5
+        while time.monotonic() < deadline:
+            response = self.client.get(self.path)
+            self.assertStatusCode(200, response)
+            if response.json()['properties'].get('title') == 'New title':
+                break
+            time.sleep(0.05)
+        self.assertEqual(response.json()['properties'].get('title'), 'New title')
+
+    def test_response_cache_expiry_cutoff(self):
+        hits = self.get_lookups('hit')
+        response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+
+        # the cached responses are not served anymore once the expiry cut-off changed
+        cutoff = get_expiry_cutoff() + timedelta(hours=1)
+        with patch('stac_api.response_cache.get_expiry_cutoff', return_value=cutoff):
+            response = self.client.get(self.path)
+        self.assertStatusCode(200, response)
+        self.assertEqual(self.get_lookups('hit'), hits)
@@ -1,5 +1,6 @@
 import json
 import logging
+import math
 from datetime import UTC
 from datetime import datetime
 from datetime import timedelta
@@ -10,6 +11,7 @@ from django.test import Client
 from django.test import override_settings
 from django.utils import timezone
 
+from stac_api.models.item import Item
 from stac_api.utils import fromisoformat
 from stac_api.utils import get_link
 from stac_api.utils import isoformat
@@ -169,6 +171,99 @@ class SearchEndpointPaginationTestCase(StacBaseTestCase):
         )
 
 
+class SearchEndpointSortbyTestCase(StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.items = cls.factory.create_item_samples(
+            ['item-1', 'item-2', 'item-3', 'item-4', 'item-5', 'item-6', 'item-7'],
+            cls.collection,
+            db_create=True,
+        )
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+        self.path = f'/{STAC_BASE_V}/search'
+
+    def get_all_pages(self, query):
+        pages = []
+        response = self.client.get(self.path, query)
+        while True:
+            self.assertStatusCode(200, response)
+            json_data = response.json()
+            pages.append([feature['id'] for feature in json_data['features']])
+            next_link = get_link(json_data['links'], 'next')
+            if next_link is None:
+                return pages, json_data
+            response = self.client.get(next_link['href'])
+
+    def test_get_sortby(self):
+        names = sorted(item['name'] for item in self.items)
+        pages, _ = self.get_all_pages({'sortby': 'id', 'limit': 3})
+        self.assertEqual(pages, [names[:3], names[3:6], names[6:]])
+
+        pages, _ = self.get_all_pages({'sortby': '+id', 'limit': 3})
+        self.assertEqual(pages, [names[:3], names[3:6], names[6:]])
+
+        names.reverse()
+        pages, last_page = self.get_all_pages({'sortby': '-id', 'limit': 3})
+        self.assertEqual(pages, [names[:3], names[3:6], names[6:]])
+
+        # walk back from the last page
+        previous_link = get_link(last_page['links'], 'previous')
+        self.assertIsNotNone(previous_link, msg='No previous link found')
+        response = self.client.get(previous_link['href'])
+        self.assertStatusCode(200, response)
+        self.assertEqual([feature['id'] for feature in response.json()['features']], names[3:6])
+        previous_link = get_link(response.json()['links'], 'previous')
+        response = self.client.get(previous_link['href'])
+        self.assertStatusCode(200, response)
+        self.assertEqual([feature['id'] for feature in response.json()['features']], names[:3])
+        self.assertIsNone(get_link(response.json()['links'], 'previous'))
+
+    def test_get_sortby_datetime(self):
+        pages, _ = self.get_all_pages({'sortby': '-properties.datetime', 'limit': 2})
+        expected = Item.objects.order_by('-properties_datetime_range__startswith', '-pk')
+        self.assertEqual(sum(pages, []), list(expected.values_list('name', flat=True)))
+
+    def test_post_sortby(self):
+        query = {'sortby': [{'field': 'created', 'direction': 'desc'}], 'limit': 4}
+        response = self.client.post(self.path, data=query, content_type="application/json")
+        self.assertStatusCode(200, response)
+        json_data = response.json()
+        next_link = get_link(json_data['links'], 'next')
+        self.assertEqual(next_link['method'], 'POST')
+        response = self.client.post(
+            next_link['href'], data={
+                **query, **next_link['body']
+            }, content_type="application/json"
+        )
+        self.assertStatusCode(200, response)
+        features = json_data['features'] + response.json()['features']
+        expected = Item.objects.order_by('-created', '-pk')
+        self.assertEqual([feature['id'] for feature in features],
+                         list(expected.values_list('name', flat=True)))
+        self.assertIsNone(get_link(response.json()['links'], 'next'))
+
+    def test_sortby_invalid(self):
+        response = self.client.get(self.path, {'sortby': 'title'})
+        self.assertStatusCode(400, response)
+        response = self.client.get(self.path, {'sortby': '-datetime,id'})
+        self.assertStatusCode(400, response)
+        response = self.client.post(
+            self.path,
+            data={'sortby': [{
+                'field': 'datetime', 'direction': 'up'
+            }]},
+            content_type="application/json"
+        )
+        self.assertStatusCode(400, response)
+        response = self.client.get(self.path, {'sortby': 'id', 'cursor': 'invalid'})
+        self.assertStatusCode(404, response)
+
+
 class SearchEndpointTestCaseOne(StacBaseTestCase):
 
     @classmethod
@@ -352,6 +447,24 @@ class SearchEndpointTestCaseOne(StacBaseTestCase):
         self.assertStatusCode(200, response)
         self.assertEqual(json_data_get['features'][0]['id'], 'item-3')
 
+    def test_post_intersects_subdivided(self):
+        # circle of 200 vertices over the west of Switzerland
+        coordinates = [[
+            6.8 + 0.6 * math.cos(2 * math.pi * i / 200),
+            46.8 + 0.4 * math.sin(2 * math.pi * i / 200)
+        ] for i in range(200)]
+        coordinates.append(coordinates[0])
+        data = {"intersects": {"type": "Polygon", "coordinates": [coordinates]}}
+        response = self.client.post(self.path, data=data, content_type="application/json")
+        self.assertStatusCode(200, response)
+        expected = sorted(feature['id'] for feature in response.json()['features'])
+        self.assertIn('item-switzerland-west', expected)
+
+        with override_settings(INTERSECTS_SUBDIVIDE_THRESHOLD=50):
+            response = self.client.post(self.path, data=data, content_type="application/json")
+        self.assertStatusCode(200, response)
+        self.assertEqual(sorted(feature['id'] for feature in response.json()['features']), expected)
+
     def test_post_intersects_invalid(self):
         data = {"intersects": {"type": "POINT", "coordinates": [6, 47, "kaputt"]}}
         response = self.client.post(self.path, data=data, content_type="application/json")
@@ -646,6 +759,24 @@ class SearchEndpointTestForecast(StacBaseTestCase):
         self.path = f'/{STAC_BASE_V}/search'
         self.maxDiff = None  # pylint: disable=invalid-name
 
+    def test_latest_forecast_runs(self):
+        path = f'/{STAC_BASE_V}/collections/{self.collection.name}/forecast-runs'
+        response = self.client.get(path)
+        self.assertStatusCode(200, response)
+        self.assertEqual(response.json()['forecast:reference_datetime'], ['2025-04-01T13:05:10Z'])
+
+        response = self.client.get(path, {'limit': 5})
+        self.assertStatusCode(200, response)
+        self.assertEqual(
+            response.json()['forecast:reference_datetime'],
+            ['2025-04-01T13:05:10Z', '2025-02-01T13:05:10Z', '2025-01-01T13:05:10Z']
+        )
+
+        response = self.client.get(path, {'limit': 0})
+        self.assertStatusCode(400, response)
+        response = self.client.get(f'/{STAC_BASE_V}/collections/unknown/forecast-runs')
+        self.assertStatusCode(404, response)
+
     def test_reference_datetime_exact(self):
         payload = {"forecast:reference_datetime": "2025-01-01T13:05:10Z"}
         response = self.client.post(self.path, data=payload, content_type="application/json")
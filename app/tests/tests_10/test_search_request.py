@@ -0,0 +1,102 @@
+import logging
+
+from django.test import TestCase
+
+from rest_framework import serializers
+from rest_framework.parsers import JSONParser
+from rest_framework.request import Request
+from rest_framework.test import APIRequestFactory
+
+from stac_api.search_request import SearchRequest
+
+logger = logging.getLogger(__name__)
+
+INTERSECTS = {"type": "Point", "coordinates": [7.4, 46.9]}
+
+
+class SearchRequestTestCase(TestCase):
+
+    def setUp(self):
+        self.factory = APIRequestFactory()
+
+    def get(self, query):
+        return SearchRequest.from_request(Request(self.factory.get('/search', query)))
+
+    def post(self, data):
+        request = self.factory.post('/search', data, format='json')
+        return SearchRequest.from_request(Request(request, parsers=[JSONParser()]))
+
+    def test_search_request_get_post(self):
+        get_request = self.get({
+            'bbox': '5.96,45.82,10.49,47.81',
+            'collections': 'collection-2,collection-1',
+            'datetime': '2020-10-28T13:05:10Z/..',
+            'query': '{"title": {"eq": "My item"}}',
+            'limit': '10',
+        })
+        post_request = self.post({
+            'bbox': [5.96, 45.82, 10.49, 47.81],
+            'collections': ['collection-1', 'collection-2'],
+            'datetime': '2020-10-28T13:05:10Z/..',
+            'query': {
+                'title': {
+                    'eq': 'My item'
+                }
+            },
+            'limit': 20,
+        })
+        self.assertEqual(post_request.collections, ('collection-1', 'collection-2'))
+        self.assertEqual(post_request.query, {'title': {'eq': 'My item'}})
+        self.assertEqual(post_request.datetime[1], '..')
+        self.assertEqual(get_request.canonical_hash, post_request.canonical_hash)
+
+        self.assertNotEqual(
+            get_request.canonical_hash,
+            self.get({
+                'bbox': '5.96,45.82,10.49,47.81', 'collections': 'collection-1'
+            }).canonical_hash
+        )
+
+    def test_search_request_ids(self):
+        # the other filters are ignored when ids are given
+        self.assertEqual(
+            self.get({
+                'ids': 'item-1,item-2'
+            }).canonical_hash,
+            self.get({
+                'ids': 'item-2,item-1', 'datetime': '2020-10-28T13:05:10Z'
+            }).canonical_hash
+        )
+
+    def test_search_request_intersects(self):
+        search_request = self.post({'intersects': INTERSECTS})
+        self.assertEqual(search_request.intersects.coords, (7.4, 46.9))
+        self.assertEqual(
+            search_request.canonical_hash,
+            self.get({
+                'intersects': '{"coordinates": [7.4, 46.9], "type": "Point"}'
+            }).canonical_hash
+        )
+
+        with self.assertRaises(serializers.ValidationError):
+            self.get({'intersects': 'POINT (7.4 46.9)'})
+
+    def test_search_request_sortby(self):
+        self.assertEqual(
+            self.get({
+                'sortby': '-datetime'
+            }).canonical_hash,
+            self.post({
+                'sortby': [{
+                    'field': 'properties.datetime', 'direction': 'desc'
+                }]
+            }).canonical_hash
+        )
+        self.assertNotEqual(
+            self.get({
+                'sortby': '-datetime'
+            }).canonical_hash,
+            self.get({
+                'sortby': 'datetime'
+            }).canonical_hash
+        )
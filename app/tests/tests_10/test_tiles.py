@@ -0,0 +1,118 @@
+import logging
+from datetime import timedelta
+from unittest.mock import patch
+
+from django.test import Client
+from django.test import TestCase
+
+from stac_api.tiles import MVT_MEDIA_TYPE
+from stac_api.tiles import get_tile_bounds
+from stac_api.tiles import is_valid_tile
+from stac_api.views.filters import get_expiry_cutoff
+
+from tests.tests_10.base_test import StacBaseTestCase
+from tests.tests_10.data_factory import Factory
+from tests.tests_10.utils import reverse_version
+from tests.utils import MockS3PerClassMixin
+
+logger = logging.getLogger(__name__)
+
+
+class TileMatrixTestCase(TestCase):
+
+    def test_is_valid_tile(self):
+        self.assertTrue(is_valid_tile(0, 0, 0))
+        self.assertTrue(is_valid_tile(8, 255, 255))
+        self.assertFalse(is_valid_tile(8, 256, 0))
+        self.assertFalse(is_valid_tile(8, 0, 256))
+        self.assertFalse(is_valid_tile(25, 0, 0))
+
+    def test_tile_bounds(self):
+        xmin, ymin, xmax, ymax = get_tile_bounds(0, 0, 0).extent
+        self.assertAlmostEqual(xmin, -180)
+        self.assertAlmostEqual(xmax, 180)
+        self.assertAlmostEqual(ymin, -85.0511287798066)
+        self.assertAlmostEqual(ymax, 85.0511287798066)
+
+        xmin, ymin, xmax, ymax = get_tile_bounds(8, 133, 90).extent
+        self.assertAlmostEqual(xmin, 7.03125)
+        self.assertAlmostEqual(xmax, 8.4375)
+        self.assertTrue(ymin < 46.5 < ymax)
+
+        # the buffer is added around the tile
+        buffered = get_tile_bounds(8, 133, 90, buffer=64).extent
+        self.assertLess(buffered[0], xmin)
+        self.assertGreater(buffered[2], xmax)
+
+
+class TilesEndpointTestCase(MockS3PerClassMixin, StacBaseTestCase):
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.factory = Factory()
+        cls.collection = cls.factory.create_collection_sample().model
+        cls.factory.create_item_samples(
+            ['item-switzerland-west', 'item-switzerland-east'],
+            cls.collection,
+            db_create=True,
+        )
+
+    def setUp(self):  # pylint: disable=invalid-name
+        self.client = Client()
+
+    def get_tile(self, path, params=None, **extra):
+        response = self.client.get(path, params, **extra)
+        self.assertStatusCode(200, response)
+        self.assertEqual(response['Content-Type'], MVT_MEDIA_TYPE)
+        return response
+
+    def test_collection_tile(self):
+        path = reverse_version('items-tile', args=[self.collection.name, 8, 133, 90])
+        response = self.get_tile(path)
+        self.assertIn(b'item-switzerland-west', response.content)
+        self.assertIn(b'item-switzerland-east', response.content)
+
+        response = self.get_tile(
+            reverse_version('items-tile', args=[self.collection.name, 8, 134, 90])
+        )
+        self.assertNotIn(b'item-switzerland-west', response.content)
+        self.assertIn(b'item-switzerland-east', response.content)
+
+        response = self.get_tile(path, {'datetime': '2021-01-01T00:00:00Z/..'})
+        self.assertEqual(response.content, b'')
+
+    def test_collection_tile_etag(self):
+        path = reverse_version('items-tile', args=[self.collection.name, 8, 133, 90])
+        cutoff = get_expiry_cutoff()
+        with patch('stac_api.views.item.get_expiry_cutoff', return_value=cutoff):
+            response = self.get_tile(path)
+        # the collection etag changes with its items
+        self.collection.refresh_from_db()
+        self.assertEqual(response['ETag'], f'"{self.collection.etag}-{int(cutoff.timestamp())}"')
+
+        with patch('stac_api.views.item.get_expiry_cutoff', return_value=cutoff):
+            response = self.client.get(path, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertStatusCode(304, response)
+
+        # the etag changes with the expiry cut-off, as the expired items are hidden
+        later_cutoff = cutoff + timedelta(hours=1)
+        with patch('stac_api.views.item.get_expiry_cutoff', return_value=later_cutoff):
+            response = self.get_tile(path, HTTP_IF_NONE_MATCH=response['ETag'])
+        self.assertEqual(
+            response['ETag'], f'"{self.collection.etag}-{int(later_cutoff.timestamp())}"'
+        )
+
+    def test_collection_tile_not_found(self):
+        for args in [[self.collection.name, 8, 256, 90], ['unknown', 8, 133, 90]]:
+            with self.subTest(args=args):
+                response = self.client.get(reverse_version('items-tile', args=args))
+                self.assertStatusCode(404, response)
+                self.assertEqual(response['Content-Type'], 'application/json')
+
+    def test_tiles(self):
+        path = reverse_version('tiles', args=[8, 133, 90])
+        response = self.get_tile(path, {'collections': self.collection.name})
+        self.assertIn(b'item-switzerland-west', response.content)
+
+        response = self.get_tile(path, {'collections': 'unknown'})
+        self.assertEqual(response.content, b'')